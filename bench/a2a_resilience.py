@@ -0,0 +1,282 @@
+"""
+The concierge's A2A call to zoo_show_agent through an outage, with and without its guard.
+
+A local A2A stand-in for zoo_show_agent (a scripted model served with
+`to_a2a`) sits behind a fault injector that adds latency and answers 503
+for a share of requests. --concurrency visitors ask about shows, pausing
+--think-time seconds between turns, while it goes through four phases of
+--phase-seconds each:
+
+- healthy: answers in --model-latency seconds.
+- errors: every request fails with 503.
+- slow: every request takes --slow-latency seconds, as a cold or stalled service.
+- recovered: healthy again.
+
+"unguarded" is RemoteA2aAgent as the concierge used it (600 s timeout).
+"guarded" is GuardedRemoteA2aAgent with a short deadline and a circuit
+breaker; its degraded answers list show names from a ShowCatalog. Turns
+are counted in the phase they started in, by outcome ("ok", "error", or
+"degraded:<reason>"), with their latency and the requests the stand-in
+received. "recovery_s" is how long after the recovered phase began a turn
+started in it was first answered; null if none was. The guarded run's
+outcomes are checked, and so is the breaker's half-open probing, on a
+fake clock.
+
+    python bench/a2a_resilience.py --concurrency 16 --phase-seconds 6
+"""
+
+import argparse
+import asyncio
+import collections
+import json
+import logging
+import os
+import random
+import statistics
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# Importing the agent package builds its agents, which require this setting.
+os.environ.setdefault("MCP_SERVER_URL", "http://127.0.0.1:9/mcp")
+os.environ.setdefault("LAZY_INIT", "TRUE")
+
+import uvicorn  # noqa: E402
+from google.adk import Agent  # noqa: E402
+from google.adk.a2a.utils.agent_to_a2a import to_a2a  # noqa: E402
+from google.adk.agents.remote_a2a_agent import RemoteA2aAgent  # noqa: E402
+from google.adk.runners import InMemoryRunner  # noqa: E402
+from google.genai import types  # noqa: E402
+from starlette.responses import JSONResponse  # noqa: E402
+
+from fakes import ScriptedLlm, text_response  # noqa: E402
+from servers import REPO_ROOT, free_port  # noqa: E402
+from zoo_concierge_agent.a2a_resilience import (  # noqa: E402
+    DEGRADED_KEY,
+    A2aGuard,
+    CircuitBreaker,
+    GuardedRemoteA2aAgent,
+    ShowCatalog,
+)
+
+PHASES = ("healthy", "errors", "slow", "recovered")
+
+
+class FaultInjector:
+    """ASGI middleware that delays A2A requests and fails a share of them with 503."""
+
+    def __init__(self, app):
+        self.app = app
+        self.latency = 0.0
+        self.error_rate = 0.0
+        self.requests = 0
+        self._rng = random.Random(0)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] != "POST":
+            await self.app(scope, receive, send)
+            return
+        self.requests += 1
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        if self._rng.random() < self.error_rate:
+            await JSONResponse({"error": "injected"}, status_code=503)(scope, receive, send)
+            return
+        await self.app(scope, receive, send)
+
+
+def serve_stand_in(args) -> tuple[str, FaultInjector]:
+    """Serves a stand-in zoo_show_agent over A2A and returns its agent card file and fault injector."""
+    port = free_port()
+    with open(os.path.join(REPO_ROOT, "zoo_show_agent", "agent.json")) as f:
+        card = json.load(f)
+    card["url"] = f"http://127.0.0.1:{port}"
+    card["capabilities"] = {}
+    card_path = os.path.join(tempfile.mkdtemp(), "agent.json")
+    with open(card_path, "w") as f:
+        json.dump(card, f)
+
+    show_agent = Agent(
+        name="zoo_show_agent",
+        model=ScriptedLlm(
+            responder=lambda _: text_response("펭귄 퍼레이드는 오후 2시 15분에 열려요."),
+            latency=args.model_latency,
+        ),
+    )
+    faults = FaultInjector(to_a2a(show_agent, host="127.0.0.1", port=port, agent_card=card_path))
+    server = uvicorn.Server(
+        uvicorn.Config(faults, host="127.0.0.1", port=port, log_level="critical")
+    )
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.05)
+    return card_path, faults
+
+
+def show_names() -> list[str]:
+    with open(os.path.join(REPO_ROOT, "zoo_show_mcp_server", "zoo_shows.json")) as f:
+        return sorted({show["name"] for show in json.load(f)})
+
+
+def outcome(events) -> str:
+    for event in events:
+        if event.custom_metadata and DEGRADED_KEY in event.custom_metadata:
+            return f"degraded:{event.custom_metadata[DEGRADED_KEY]}"
+        if event.error_message:
+            return "error"
+    return "ok"
+
+
+async def run_mode(args, remote, faults: FaultInjector) -> dict:
+    runner = InMemoryRunner(agent=remote, app_name="resilience_bench")
+    faults.latency, faults.error_rate = args.model_latency, 0.0
+    phase = {"name": PHASES[0]}
+    turns = []
+
+    async def visitor(stop: asyncio.Event):
+        while not stop.is_set():
+            session = await runner.session_service.create_session(
+                app_name=runner.app_name, user_id="bench"
+            )
+            message = types.Content(role="user", parts=[types.Part(text="펭귄 쇼 언제야?")])
+            started_in, start = phase["name"], time.perf_counter()
+            events = [
+                event
+                async for event in runner.run_async(
+                    user_id="bench", session_id=session.id, new_message=message
+                )
+            ]
+            turns.append((started_in, start, time.perf_counter() - start, outcome(events)))
+            await asyncio.sleep(args.think_time)
+
+    stop = asyncio.Event()
+    visitors = [asyncio.create_task(visitor(stop)) for _ in range(args.concurrency)]
+    requests, starts = {}, {}
+    for name in PHASES:
+        phase["name"] = name
+        faults.latency = args.slow_latency if name == "slow" else args.model_latency
+        faults.error_rate = 1.0 if name == "errors" else 0.0
+        before, starts[name] = faults.requests, time.perf_counter()
+        await asyncio.sleep(args.phase_seconds)
+        requests[name] = faults.requests - before
+    stop.set()
+    await asyncio.gather(*visitors)
+
+    report = {}
+    for name in PHASES:
+        mine = [turn for turn in turns if turn[0] == name]
+        latencies = sorted(turn[2] for turn in mine) or [0.0]
+        report[name] = {
+            "turns": len(mine),
+            "outcomes": dict(collections.Counter(turn[3] for turn in mine)),
+            "p50_ms": 1000 * statistics.median(latencies),
+            "p99_ms": 1000 * latencies[int(0.99 * (len(latencies) - 1))],
+            "max_ms": 1000 * latencies[-1],
+            "stand_in_requests": requests[name],
+        }
+    answered = [
+        turn[1] + turn[2] - starts["recovered"]
+        for turn in turns
+        if turn[0] == "recovered" and turn[3] == "ok"
+    ]
+    report["recovery_s"] = min(answered) if answered else None
+    return report
+
+
+# Steps a CircuitBreaker through open, half-open and closed on a fake clock.
+def check_breaker():
+    now = [0.0]
+    breaker = CircuitBreaker(
+        "fake", failure_threshold=2, reset_timeout=10.0, half_open_probes=1,
+        clock=lambda: now[0],
+    )
+    breaker.record_failure()
+    assert breaker.state == "closed", "opened below the failure threshold"
+    breaker.record_failure()
+    assert breaker.state == "open" and not breaker.allow(), "did not open at the threshold"
+
+    now[0] = 9.9
+    assert not breaker.allow(), "allowed a call before reset_timeout"
+    now[0] = 10.0
+    assert breaker.state == "half_open", "not half-open after reset_timeout"
+    assert breaker.allow(), "refused the probe"
+    assert not breaker.allow(), "allowed more than half_open_probes probes"
+    breaker.release()
+    assert breaker.allow(), "a released probe did not free its slot"
+
+    breaker.record_failure()
+    assert breaker.state == "open" and breaker.opened == 2, "a failed probe did not reopen"
+    now[0] = 19.9
+    assert not breaker.allow(), "reopened circuit did not wait reset_timeout again"
+    now[0] = 20.0
+    assert breaker.allow()
+    breaker.record_success()
+    assert breaker.state == "closed" and breaker.allow(), "a successful probe did not close"
+
+
+# Checks that the guarded run opened, timed out and recovered as it should.
+def check_guarded(args, report: dict):
+    errors, slow = report["errors"]["outcomes"], report["slow"]["outcomes"]
+    assert errors.get("degraded:circuit_open"), f"circuit never opened on errors: {errors}"
+    assert slow.get("degraded:timeout"), f"no slow call timed out: {slow}"
+    assert "ok" not in slow and "error" not in slow, f"slow calls were waited for: {slow}"
+    # A timed out call ends at the deadline, well before the slow answer.
+    assert report["slow"]["max_ms"] < 1000 * args.slow_latency, "a slow call waited for the answer"
+    # At worst the circuit reopens on a probe that times out as the phase
+    # begins, and closes on the next probe reset_timeout later.
+    recovery = report["recovery_s"]
+    assert recovery is not None, "never answered after recovering"
+    assert recovery <= args.deadline + args.reset_timeout + 1.0, (
+        f"took {recovery:.1f}s to recover"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="A2A resilience benchmark")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--phase-seconds", type=float, default=6.0)
+    parser.add_argument("--think-time", type=float, default=0.5)
+    parser.add_argument("--model-latency", type=float, default=0.1)
+    parser.add_argument("--slow-latency", type=float, default=10.0)
+    parser.add_argument("--deadline", type=float, default=2.0)
+    parser.add_argument("--max-in-flight", type=int, default=8)
+    parser.add_argument("--failure-threshold", type=int, default=5)
+    parser.add_argument("--reset-timeout", type=float, default=2.0)
+    args = parser.parse_args()
+
+    logging.disable(logging.WARNING)
+    check_breaker()
+    card_path, faults = serve_stand_in(args)
+    catalog = ShowCatalog(load_shows=show_names)
+    catalog.refresh()
+    guard = A2aGuard(
+        breaker=CircuitBreaker(
+            "zoo_show_agent",
+            failure_threshold=args.failure_threshold,
+            reset_timeout=args.reset_timeout,
+        ),
+        max_in_flight=args.max_in_flight,
+        queue_timeout=0.2,
+        deadline=args.deadline,
+        idle_timeout=args.deadline,
+        catalog=catalog,
+    )
+    remotes = {
+        "unguarded": RemoteA2aAgent(name="zoo_show_agent", agent_card=card_path),
+        "guarded": GuardedRemoteA2aAgent(
+            name="zoo_show_agent", agent_card=card_path, guard=guard
+        ),
+    }
+    results = {mode: asyncio.run(run_mode(args, remote, faults)) for mode, remote in remotes.items()}
+    results["guarded"]["guard"] = {
+        **guard.metrics.as_dict(),
+        "circuit_opened": guard.breaker.opened,
+    }
+    print(json.dumps(results, indent=2, ensure_ascii=False))
+    check_guarded(args, results["guarded"])
+
+
+if __name__ == "__main__":
+    main()
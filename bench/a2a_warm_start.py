@@ -0,0 +1,193 @@
+"""
+First-request latency of the concierge's A2A call on a new instance, cold vs warm-started.
+
+A local A2A stand-in for zoo_show_agent (a scripted model served with
+`to_a2a`) publishes a card whose version can be changed. Each trial runs
+in a new process, as a new instance would: it builds the remote agent,
+waits --routing-latency seconds for the greeter's routing model call, then
+sends two turns through it.
+
+- cold: RemoteA2aAgent, which reads its card, builds its clients and
+  connects on the first call.
+- warm: WarmRemoteA2aAgent. The card and clients are resolved when the
+  agent is built ("construct_ms"), and start_warm_up is called as the turn
+  begins, as the greeter's callback does, so the connection opens during
+  the routing call.
+
+"first_turn_ms" is the latency the first visitor sees after routing;
+"saved_ms" is how much the warm start takes off it. A refresh check then
+keeps one warm agent running while the published card's version changes:
+it is adopted once, and a version without a usable URL is skipped.
+
+The stand-in is plain HTTP on loopback; against a Cloud Run service the
+first connection also pays for a TLS handshake, which warm-up takes off
+as well.
+
+    python bench/a2a_warm_start.py --trials 10
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# Importing the agent package builds its agents, which require this setting.
+os.environ.setdefault("MCP_SERVER_URL", "http://127.0.0.1:9/mcp")
+os.environ.setdefault("LAZY_INIT", "TRUE")
+
+import uvicorn  # noqa: E402
+from google.adk import Agent  # noqa: E402
+from google.adk.a2a.utils.agent_to_a2a import to_a2a  # noqa: E402
+from google.adk.agents.remote_a2a_agent import RemoteA2aAgent  # noqa: E402
+from google.adk.runners import InMemoryRunner  # noqa: E402
+from google.genai import types  # noqa: E402
+from starlette.responses import JSONResponse  # noqa: E402
+
+from fakes import ScriptedLlm, text_response  # noqa: E402
+from servers import REPO_ROOT, free_port  # noqa: E402
+from zoo_concierge_agent.a2a_warm_start import WarmRemoteA2aAgent  # noqa: E402
+
+
+class PublishedCard:
+    """ASGI middleware that serves an agent card which can be changed while running."""
+
+    def __init__(self, app, card: dict):
+        self.app = app
+        self.card = card
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http" and scope["path"].endswith("/.well-known/agent-card.json"):
+            await JSONResponse(self.card)(scope, receive, send)
+            return
+        await self.app(scope, receive, send)
+
+
+def serve_stand_in(args) -> tuple[str, PublishedCard]:
+    """Serves a stand-in zoo_show_agent over A2A and returns its agent card file and card server."""
+    port = free_port()
+    with open(os.path.join(REPO_ROOT, "zoo_show_agent", "agent.json")) as f:
+        card = json.load(f)
+    card["url"] = f"http://127.0.0.1:{port}"
+    card["capabilities"] = {}
+    card_path = os.path.join(tempfile.mkdtemp(), "agent.json")
+    with open(card_path, "w") as f:
+        json.dump(card, f)
+
+    show_agent = Agent(
+        name="zoo_show_agent",
+        model=ScriptedLlm(
+            responder=lambda _: text_response("펭귄 퍼레이드는 오후 2시 15분에 열려요."),
+            latency=args.model_latency,
+        ),
+    )
+    published = PublishedCard(
+        to_a2a(show_agent, host="127.0.0.1", port=port, agent_card=card_path), dict(card)
+    )
+    server = uvicorn.Server(
+        uvicorn.Config(published, host="127.0.0.1", port=port, log_level="critical")
+    )
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.05)
+    return card_path, published
+
+
+async def turn(runner: InMemoryRunner) -> float:
+    session = await runner.session_service.create_session(app_name=runner.app_name, user_id="bench")
+    message = types.Content(role="user", parts=[types.Part(text="펭귄 쇼 언제야?")])
+    start = time.perf_counter()
+    async for event in runner.run_async(user_id="bench", session_id=session.id, new_message=message):
+        if event.error_message:
+            raise RuntimeError(event.error_message)
+    return time.perf_counter() - start
+
+
+# Runs in a new process: builds the agent and times its first two turns.
+def trial(mode: str, card_path: str, routing_latency: float):
+    start = time.perf_counter()
+    if mode == "warm":
+        remote = WarmRemoteA2aAgent(name="zoo_show_agent", agent_card=card_path)
+    else:
+        remote = RemoteA2aAgent(name="zoo_show_agent", agent_card=card_path)
+    construct = time.perf_counter() - start
+
+    async def run():
+        runner = InMemoryRunner(agent=remote, app_name="warm_start_bench")
+        if mode == "warm":
+            remote.start_warm_up()
+        await asyncio.sleep(routing_latency)
+        return await turn(runner), await turn(runner)
+
+    first, second = asyncio.run(run())
+    result = {"construct_ms": 1000 * construct, "first_turn_ms": 1000 * first, "second_turn_ms": 1000 * second}
+    if mode == "warm":
+        result.update(remote.warm_start_metrics.as_dict())
+    print(json.dumps(result))
+
+
+def run_trials(mode: str, args, card_path: str) -> dict:
+    results = []
+    for _ in range(args.trials):
+        output = subprocess.run(
+            [sys.executable, "-W", "ignore", __file__, "--trial", mode, card_path, str(args.routing_latency)],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout
+        results.append(json.loads(output.strip().splitlines()[-1]))
+    return {key: statistics.median(result[key] for result in results) for key in results[0]}
+
+
+async def refresh_check(card_path: str, published: PublishedCard, interval: float) -> dict:
+    remote = WarmRemoteA2aAgent(
+        name="zoo_show_agent", agent_card=card_path, card_refresh_interval=interval
+    )
+    runner = InMemoryRunner(agent=remote, app_name="warm_start_bench")
+    remote.start_warm_up()
+    versions = {}
+    steps = [
+        ("unchanged", {}),
+        ("new_version", {"version": "1.1.0"}),
+        ("invalid_url", {"version": "1.2.0", "url": "your_agent_server_url"}),
+    ]
+    for name, change in steps:
+        published.card = {**published.card, **change}
+        await asyncio.sleep(5 * interval)
+        await turn(runner)
+        versions[name] = remote._agent_card.version
+    remote._refresh_task.cancel()
+    return {"versions": versions, **remote.warm_start_metrics.as_dict()}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="A2A warm-start benchmark")
+    parser.add_argument("--trials", type=int, default=10)
+    parser.add_argument("--model-latency", type=float, default=0.05)
+    parser.add_argument("--routing-latency", type=float, default=0.5)
+    parser.add_argument("--refresh-interval", type=float, default=0.2)
+    parser.add_argument("--trial", nargs=3, metavar=("MODE", "CARD", "ROUTING_LATENCY"))
+    args = parser.parse_args()
+
+    logging.disable(logging.WARNING)
+    if args.trial:
+        mode, card_path, routing_latency = args.trial
+        trial(mode, card_path, float(routing_latency))
+        return
+
+    card_path, published = serve_stand_in(args)
+    runs = {mode: run_trials(mode, args, card_path) for mode in ("cold", "warm")}
+    runs["saved_ms"] = runs["cold"]["first_turn_ms"] - runs["warm"]["first_turn_ms"]
+    runs["refresh"] = asyncio.run(refresh_check(card_path, published, args.refresh_interval))
+    print(json.dumps(runs, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,181 @@
+"""
+Answer cache hit rate and latency on repeated visitor questions.
+
+Replays a skewed mix of Korean and English questions (a few are asked
+most of the time, some refer to the visitor and must bypass the cache)
+through a concierge pipeline with scripted models and a stubbed zoo tool.
+Halfway through, the zoo data version changes, which must invalidate
+every cached answer. Every third turn is marked as having had the
+visitor's memories injected; its answer must not be stored.
+
+- uncached: the pipeline as is.
+- cached: the pipeline behind the concierge's AnswerCache callbacks.
+
+    python bench/answer_cache.py --turns 300 --model-latency 0.3
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import random
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# Importing the agent package builds its agents, which require this setting.
+os.environ.setdefault("MCP_SERVER_URL", "http://127.0.0.1:9/mcp")
+os.environ.setdefault("LAZY_INIT", "TRUE")
+
+from google.adk import Agent  # noqa: E402
+from google.adk.agents import SequentialAgent  # noqa: E402
+from google.adk.models import LlmRequest, LlmResponse  # noqa: E402
+from google.adk.runners import InMemoryRunner  # noqa: E402
+from google.adk.tools import FunctionTool  # noqa: E402
+from google.genai import types  # noqa: E402
+
+from fakes import ScriptedLlm, text_response  # noqa: E402
+from zoo_concierge_agent.answer_cache import AnswerCache  # noqa: E402
+from zoo_concierge_agent.fast_router import LexicalIndex  # noqa: E402
+
+SPECIES = ["lion", "penguin", "giraffe", "tiger", "polar bear", "사자", "펭귄", "기린", "호랑이", "북극곰"]
+
+QUESTIONS = [
+    "사자 어디 있어?",
+    "사자는 어디 있어",
+    "펭귄은 몇 마리야?",
+    "기린 나이 알려줘",
+    "호랑이 어디서 볼 수 있어?",
+    "북극곰은 뭘 먹어?",
+    "Where are the lions?",
+    "How old are the giraffes?",
+    "Tell me about penguins",
+    "Which tigers are older than 5?",
+    # Personal: must never be served from the cache.
+    "내가 좋아하는 사자 어디 있어?",
+    "Do you remember the penguin I asked about?",
+]
+
+
+def call_response(name: str, args: dict) -> LlmResponse:
+    return LlmResponse(
+        content=types.Content(
+            role="model", parts=[types.Part.from_function_call(name=name, args=args)]
+        )
+    )
+
+
+def build_pipeline(args, data: dict, cache: AnswerCache = None) -> SequentialAgent:
+    async def get_animals_by_species(species: str) -> dict:
+        await asyncio.sleep(args.zoo_latency)
+        return {
+            "structuredContent": {"result": [{"name": "Leo"}]},
+            "meta": {"data_version": data["version"]},
+        }
+
+    def research(request: LlmRequest) -> LlmResponse:
+        if not any(part.function_response for part in request.contents[-1].parts or []):
+            return call_response("get_animals_by_species", {"species": "lion"})
+        return text_response("ZOO DATA: ...")
+
+    return SequentialAgent(
+        name="zoo_concierge_agent",
+        sub_agents=[
+            Agent(
+                name="comprehensive_researcher",
+                model=ScriptedLlm(responder=research, latency=args.model_latency),
+                tools=[FunctionTool(get_animals_by_species)],
+                output_key="research_data",
+            ),
+            Agent(
+                name="response_formatter",
+                model=ScriptedLlm(
+                    responder=lambda _: text_response(f"data {data['version']}: ..."),
+                    latency=args.model_latency,
+                ),
+            ),
+        ],
+        before_agent_callback=cache.before_agent_callback if cache is not None else None,
+        after_agent_callback=cache.after_agent_callback if cache is not None else None,
+    )
+
+
+async def run_mode(args, cached: bool) -> dict:
+    data = {"version": "v1"}
+    index = LexicalIndex(SPECIES)
+    # Turns of visitors whose requests carried their memories.
+    with_memories: set[str] = set()
+    cache = (
+        AnswerCache(
+            index=lambda: index,
+            ttl=args.ttl,
+            memories_injected=lambda invocation_id: invocation_id in with_memories,
+        )
+        if cached
+        else None
+    )
+    runner = InMemoryRunner(agent=build_pipeline(args, data, cache), app_name="cache_bench")
+    rng = random.Random(0)
+    # Zipf-like: the first questions are asked far more often.
+    weights = [1 / (rank + 1) for rank in range(len(QUESTIONS))]
+    latencies, stale = [], 0
+
+    for turn in range(args.turns):
+        if turn == args.turns // 2:
+            data["version"] = "v2"
+            if cache is not None:
+                cache.observe_version("v2")
+        prompt = rng.choices(QUESTIONS, weights)[0]
+        session = await runner.session_service.create_session(
+            app_name="cache_bench", user_id="bench", state={"PROMPT": prompt}
+        )
+        message = types.Content(role="user", parts=[types.Part(text=prompt)])
+        personal = turn % 3 == 0
+        stores = cache.metrics.stores if cache is not None else 0
+        start = time.perf_counter()
+        answer = ""
+        async for event in runner.run_async(
+            user_id="bench", session_id=session.id, new_message=message
+        ):
+            if personal:
+                with_memories.add(event.invocation_id)
+            if event.content and event.content.parts and event.content.parts[0].text:
+                answer = event.content.parts[0].text
+        latencies.append(time.perf_counter() - start)
+        stale += not answer.startswith(f"data {data['version']}")
+        if cache is not None and personal:
+            assert cache.metrics.stores == stores, "stored an answer built with memories"
+
+    latencies.sort()
+    result = {
+        "p50_ms": 1000 * statistics.median(latencies),
+        "p99_ms": 1000 * latencies[int(0.99 * (len(latencies) - 1))],
+        "mean_ms": 1000 * statistics.mean(latencies),
+        "stale_answers": stale,
+    }
+    if cache is not None:
+        assert cache.metrics.personalized, "no answer built with memories was skipped"
+        result["cache"] = {**cache.metrics.as_dict(), "entries": len(cache), "bytes": cache.bytes}
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Answer cache benchmark")
+    parser.add_argument("--turns", type=int, default=200)
+    parser.add_argument("--model-latency", type=float, default=0.2)
+    parser.add_argument("--zoo-latency", type=float, default=0.05)
+    parser.add_argument("--ttl", type=float, default=600.0)
+    args = parser.parse_args()
+
+    logging.disable(logging.WARNING)
+    results = {
+        mode: asyncio.run(run_mode(args, mode == "cached"))
+        for mode in ("uncached", "cached")
+    }
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+"""
+Measures import-to-first-response time of zoo_concierge_agent with stubbed backends.
+
+Each sample runs in a fresh interpreter so module caches do not hide import
+cost. The ID token issuer, Cloud Logging and the model are local fakes with
+configurable latency, so the numbers isolate the agent's own startup path.
+
+    python bench/cold_start.py --samples 5 --token-latency 0.3 --logging-latency 1.0
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+async def first_response(root_agent) -> str:
+    from google.adk.runners import InMemoryRunner
+    from google.genai import types
+
+    runner = InMemoryRunner(agent=root_agent, app_name="cold_start_bench")
+    session = await runner.session_service.create_session(
+        app_name="cold_start_bench", user_id="bench"
+    )
+    message = types.Content(role="user", parts=[types.Part(text="안녕하세요")])
+    async for event in runner.run_async(
+        user_id="bench", session_id=session.id, new_message=message
+    ):
+        if event.content and event.content.parts and event.content.parts[0].text:
+            return event.content.parts[0].text
+    return ""
+
+
+def run_child(args):
+    sys.path.insert(0, REPO_ROOT)
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+    os.environ.setdefault("MCP_SERVER_URL", "http://127.0.0.1:9/mcp")
+    os.environ["LAZY_INIT"] = "TRUE" if args.mode == "lazy" else "FALSE"
+
+    # Stubs are installed before the clock starts; their import cost is not the agent's.
+    from fakes import ScriptedLlm, install_backend_stubs
+
+    install_backend_stubs(args.token_latency, args.logging_latency)
+
+    start = time.perf_counter()
+    from zoo_concierge_agent import agent
+
+    imported = time.perf_counter()
+    agent.root_agent.model = ScriptedLlm(latency=args.model_latency)
+    asyncio.run(first_response(agent.root_agent))
+    responded = time.perf_counter()
+
+    print(
+        json.dumps(
+            {
+                "import_s": imported - start,
+                "first_response_s": responded - start,
+            }
+        )
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Cold-start benchmark")
+    parser.add_argument("--mode", choices=["lazy", "eager", "both"], default="both")
+    parser.add_argument("--samples", type=int, default=3)
+    parser.add_argument("--token-latency", type=float, default=0.3)
+    parser.add_argument("--logging-latency", type=float, default=1.0)
+    parser.add_argument("--model-latency", type=float, default=0.0)
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        run_child(args)
+        return
+
+    modes = ["eager", "lazy"] if args.mode == "both" else [args.mode]
+    results = {}
+    for mode in modes:
+        samples = []
+        for _ in range(args.samples):
+            output = subprocess.run(
+                [
+                    sys.executable,
+                    os.path.abspath(__file__),
+                    "--child",
+                    "--mode", mode,
+                    "--token-latency", str(args.token_latency),
+                    "--logging-latency", str(args.logging_latency),
+                    "--model-latency", str(args.model_latency),
+                ],
+                capture_output=True,
+                text=True,
+                check=True,
+            ).stdout
+            samples.append(json.loads(output.strip().splitlines()[-1]))
+        results[mode] = {
+            key: statistics.median(sample[key] for sample in samples)
+            for key in ("import_s", "first_response_s")
+        }
+
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
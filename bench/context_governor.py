@@ -0,0 +1,298 @@
+"""
+Model request size over long sessions, with and without the context governor.
+
+A scripted pipeline built like the concierge's: a greeter transfers every
+turn to a sequential agent whose researcher calls a zoo lookup tool (a
+local function returning --records animal records) and whose formatter
+answers from the research injected into its instruction. Visitors ask
+about a handful of species, so lookups repeat. Every model request is
+sized (estimated tokens over the instruction and contents) when the
+scripted model receives it, i.e. after the callbacks ran.
+
+- baseline: the agents as they were, re-sending the whole history.
+- governed: the concierge's ContextGovernor as each agent's
+  before_model_callback, with --budget tokens per request.
+
+Each request is also checked for what the governor must keep: the
+visitor's current message, and the researcher's own latest tool result
+("violations" should be 0). Governed requests are compared with what the
+governor received: every tool call keeps its result, the current turn
+keeps all its parts, the --keep-turns turns before it are not folded,
+and each turn is summarized once per session and agent, the rolling
+summary being reused after that. "governor_us" is the time the callback
+takes.
+
+    python bench/context_governor.py --sessions 5 --turns 30
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# Importing the agent package builds its agents, which require this setting.
+os.environ.setdefault("MCP_SERVER_URL", "http://127.0.0.1:9/mcp")
+os.environ.setdefault("LAZY_INIT", "TRUE")
+
+from google.adk import Agent  # noqa: E402
+from google.adk.agents import SequentialAgent  # noqa: E402
+from google.adk.models import LlmRequest, LlmResponse  # noqa: E402
+from google.adk.runners import InMemoryRunner  # noqa: E402
+from google.genai import types  # noqa: E402
+
+from fakes import ScriptedLlm, text_response  # noqa: E402
+from zoo_concierge_agent.context_governor import (  # noqa: E402
+    ContextGovernor,
+    is_relayed,
+    is_visitor_message,
+    request_tokens,
+)
+
+SPECIES = ["사자", "펭귄", "기린", "호랑이", "북극곰"]
+QUESTIONS = ["{}는 어디 있어?", "{} 몇 살이야?", "{}는 뭘 먹어?", "{} 이름 알려줘"]
+
+
+def function_call(name: str, args: dict) -> LlmResponse:
+    return LlmResponse(
+        content=types.Content(
+            role="model", parts=[types.Part(function_call=types.FunctionCall(name=name, args=args))]
+        )
+    )
+
+
+def visitor_message(llm_request: LlmRequest) -> str:
+    for content in reversed(llm_request.contents):
+        if is_visitor_message(content):
+            return next(part.text for part in content.parts if part.text)
+    return ""
+
+
+# Returns what the governor broke in a request, comparing its contents before and after.
+def check_trimmed(
+    original: list[types.Content], trimmed: list[types.Content], keep_turns: int
+) -> list[str]:
+    problems = []
+    # Call ids are stripped from requests, so a result pairs with the content before it.
+    calls = [
+        sorted(part.function_call.name for part in content.parts or [] if part.function_call)
+        for content in trimmed
+    ]
+    results = [
+        sorted(part.function_response.name for part in content.parts or [] if part.function_response)
+        for content in trimmed
+    ]
+    for i in range(len(trimmed)):
+        if calls[i] and (i + 1 == len(trimmed) or results[i + 1] != calls[i]):
+            problems.append(f"tool calls {calls[i]} lost their results")
+        if results[i] and (i == 0 or calls[i - 1] != results[i]):
+            problems.append(f"tool results {results[i]} lost their calls")
+
+    starts = [i for i, content in enumerate(original) if is_visitor_message(content)]
+    if not starts:
+        return problems
+    current = [
+        part
+        for content in original[starts[-1] :]
+        # Merged runs of relayed contents keep only their first preamble.
+        for part in (content.parts[1:] if is_relayed(content) else content.parts)
+    ]
+    sent = {id(part) for content in trimmed for part in content.parts or []}
+    if any(id(part) not in sent for part in current):
+        problems.append("the current turn lost a part")
+
+    kept = [original[i] for i in starts[-1 - keep_turns :]]
+    visible = [content for content in trimmed if is_visitor_message(content)]
+    if visible[-len(kept) :] != kept:
+        problems.append(f"one of the last {keep_turns} turns was folded")
+    return problems
+
+
+class Pipeline:
+    """The scripted agents, and what their model received."""
+
+    def __init__(self, args, governor):
+        self.records = args.records
+        self.sizes: dict[str, list[int]] = {}
+        self.violations = 0
+        self.current = ""
+        callbacks = [governor.before_model_callback] if governor else []
+
+        def get_animals_by_species(species: str) -> dict:
+            """Returns the zoo's animals of a species."""
+            return {
+                "result": [
+                    {
+                        "name": f"{species} {i}",
+                        "species": species,
+                        "age": 2 + i % 15,
+                        "enclosure": f"{species} 사파리 구역 {i % 4}",
+                        "trail": "아프리카 트레일" if i % 2 else "극지방 트레일",
+                    }
+                    for i in range(self.records)
+                ]
+            }
+
+        self.formatter = Agent(
+            name="response_formatter",
+            model=ScriptedLlm(responder=self.respond("response_formatter", self.format)),
+            instruction="Answer from the research, in Korean.\n\nRESEARCH_DATA:\n{research_data}",
+            before_model_callback=callbacks,
+        )
+        self.researcher = Agent(
+            name="zoo_researcher",
+            model=ScriptedLlm(responder=self.respond("zoo_researcher", self.research)),
+            instruction="Look up the animals the visitor asks about.",
+            tools=[get_animals_by_species],
+            output_key="research_data",
+            before_model_callback=callbacks,
+        )
+        self.greeter = Agent(
+            name="greeter",
+            model=ScriptedLlm(responder=self.respond("greeter", self.route)),
+            instruction="You are the zoo concierge. Call zoo_concierge_agent for animal questions.",
+            before_model_callback=callbacks,
+            sub_agents=[
+                SequentialAgent(
+                    name="zoo_concierge_agent", sub_agents=[self.researcher, self.formatter]
+                )
+            ],
+        )
+
+    def respond(self, agent: str, answer):
+        def responder(llm_request: LlmRequest) -> LlmResponse:
+            self.sizes.setdefault(agent, []).append(request_tokens(llm_request))
+            if visitor_message(llm_request) != self.current:
+                self.violations += 1
+            return answer(llm_request)
+
+        return responder
+
+    def route(self, llm_request: LlmRequest) -> LlmResponse:
+        return function_call("transfer_to_agent", {"agent_name": "zoo_concierge_agent"})
+
+    def research(self, llm_request: LlmRequest) -> LlmResponse:
+        last = llm_request.contents[-1]
+        response = next((part.function_response for part in last.parts if part.function_response), None)
+        species = next(name for name in SPECIES if name in self.current)
+        if response is None:
+            return function_call("get_animals_by_species", {"species": species})
+        records = response.response.get("result")
+        if not isinstance(records, list) or not records or records[0]["species"] != species:
+            self.violations += 1
+            return text_response("ZOO DATA: 없음")
+        names = ", ".join(record["name"] for record in records[:5])
+        return text_response(
+            f"{species}는 {records[0]['enclosure']}에 있고 모두 {len(records)}마리예요. "
+            f"대표적인 친구들은 {names}이고, 나이는 {records[0]['age']}살부터 다양해요. "
+            f"{records[0]['trail']}을 따라가면 가장 잘 보여요."
+        )
+
+    def format(self, llm_request: LlmRequest) -> LlmResponse:
+        return text_response(
+            f"안녕하세요! 물어보신 내용을 정리해 드릴게요. {self.current} 에 대한 답이에요. "
+            "동물원 데이터에 따르면 아이들은 각자의 구역에서 건강하게 지내고 있고, "
+            "사육사들이 매일 먹이와 건강 상태를 확인하고 있어요. 오후에는 설명회도 열리니 "
+            "시간이 되시면 꼭 들러 주세요. 더 궁금한 점이 있으면 언제든지 물어보세요!"
+        )
+
+
+async def run_session(pipeline: Pipeline, runner: InMemoryRunner, session_index: int, turns: int):
+    session = await runner.session_service.create_session(app_name=runner.app_name, user_id="bench")
+    for turn in range(turns):
+        species = SPECIES[(session_index + turn) % len(SPECIES)]
+        pipeline.current = QUESTIONS[turn % len(QUESTIONS)].format(species)
+        message = types.Content(role="user", parts=[types.Part(text=pipeline.current)])
+        async for _ in runner.run_async(user_id="bench", session_id=session.id, new_message=message):
+            pass
+
+
+def run_mode(args, governed: bool) -> dict:
+    governor = (
+        ContextGovernor(
+            budget=args.budget,
+            keep_turns=args.keep_turns,
+            summary_tokens=args.summary_tokens,
+        )
+        if governed
+        else None
+    )
+    overhead, problems = [], []
+    if governor:
+        callback = governor.before_model_callback
+
+        def timed(callback_context, llm_request):
+            original = list(llm_request.contents)
+            start = time.perf_counter()
+            callback(callback_context, llm_request)
+            overhead.append(time.perf_counter() - start)
+            problems.extend(check_trimmed(original, llm_request.contents, args.keep_turns))
+
+        governor.before_model_callback = timed
+    pipeline = Pipeline(args, governor)
+    runner = InMemoryRunner(agent=pipeline.greeter, app_name="context_bench")
+
+    async def run():
+        for session_index in range(args.sessions):
+            await run_session(pipeline, runner, session_index, args.turns)
+
+    asyncio.run(run())
+    calls_per_session = {agent: len(sizes) // args.sessions for agent, sizes in pipeline.sizes.items()}
+    result = {"violations": pipeline.violations, "agents": {}}
+    for agent, sizes in pipeline.sizes.items():
+        per_turn = calls_per_session[agent] // args.turns
+        last_turn = [
+            size
+            for session in range(args.sessions)
+            for size in sizes[(session + 1) * calls_per_session[agent] - per_turn : (session + 1) * calls_per_session[agent]]
+        ]
+        result["agents"][agent] = {
+            "tokens_avg": statistics.mean(sizes),
+            "tokens_last_turn": statistics.mean(last_turn),
+            "tokens_max": max(sizes),
+        }
+    if governor:
+        assert not problems, f"{len(problems)} malformed requests, e.g.: {problems[0]}"
+        metrics = governor.metrics
+        assert metrics.turns_summarized, "no turns were summarized; raise --turns"
+        assert metrics.summary_lines_reused, "the rolling summary was never reused"
+        # Per session and agent, each turn's line is built once and then reused.
+        built_max = args.sessions * args.turns * len(pipeline.sizes)
+        assert metrics.summary_lines_built <= built_max, (
+            f"built {metrics.summary_lines_built} summary lines for {built_max} turns"
+        )
+        result["governor"] = governor.metrics.as_dict()
+        overhead.sort()
+        result["governor_us"] = {
+            "p50": 1e6 * statistics.median(overhead),
+            "p99": 1e6 * overhead[int(0.99 * (len(overhead) - 1))],
+        }
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Context governor benchmark")
+    parser.add_argument("--sessions", type=int, default=5)
+    parser.add_argument("--turns", type=int, default=30)
+    parser.add_argument("--records", type=int, default=20)
+    parser.add_argument("--budget", type=int, default=4000)
+    parser.add_argument("--keep-turns", type=int, default=2)
+    parser.add_argument("--summary-tokens", type=int, default=600)
+    args = parser.parse_args()
+
+    logging.disable(logging.WARNING)
+    baseline = run_mode(args, governed=False)
+    governed = run_mode(args, governed=True)
+    saved = {
+        agent: 1 - governed["agents"][agent]["tokens_avg"] / stats["tokens_avg"]
+        for agent, stats in baseline["agents"].items()
+    }
+    print(json.dumps({"baseline": baseline, "governed": governed, "saved": saved}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,163 @@
+import asyncio
+import base64
+import json
+import random
+import sys
+import time
+import types
+from typing import AsyncGenerator, Callable, Optional
+
+from google.adk.memory import BaseMemoryService
+from google.adk.memory.base_memory_service import SearchMemoryResponse
+from google.adk.models import BaseLlm, LlmRequest, LlmResponse
+from google.genai import types as genai_types
+
+
+# Builds a model response that contains a single text part.
+def text_response(text: str) -> LlmResponse:
+    return LlmResponse(
+        content=genai_types.Content(
+            role="model", parts=[genai_types.Part.from_text(text=text)]
+        )
+    )
+
+
+class ScriptedLlm(BaseLlm):
+    """
+    Local stand-in for Gemini that answers from a script instead of the network.
+
+    `responder` maps each request to a response; `latency` is slept before every
+    response to approximate model time. With `chunk_size` set, text is
+    generated `chunk_size` characters per `chunk_latency` seconds after the
+    first chunk; streamed calls yield each chunk as a partial response
+    before the final one, others only yield the final response.
+    """
+
+    model: str = "scripted-llm"
+    responder: Callable[[LlmRequest], LlmResponse] = lambda _: text_response(
+        "안녕하세요! 무엇을 도와드릴까요?"
+    )
+    latency: float = 0.0
+    chunk_size: int = 0
+    chunk_latency: float = 0.0
+
+    async def generate_content_async(
+        self, llm_request: LlmRequest, stream: bool = False
+    ) -> AsyncGenerator[LlmResponse, None]:
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        response = self.responder(llm_request)
+        parts = response.content.parts if response.content else []
+        text = "".join(part.text or "" for part in parts)
+        if not self.chunk_size or not text or any(part.function_call for part in parts):
+            yield response
+            return
+
+        chunks = [text[i : i + self.chunk_size] for i in range(0, len(text), self.chunk_size)]
+        if not stream:
+            await asyncio.sleep(self.chunk_latency * (len(chunks) - 1))
+            yield response
+            return
+        for i, chunk in enumerate(chunks):
+            if i:
+                await asyncio.sleep(self.chunk_latency)
+            partial = text_response(chunk)
+            partial.partial = True
+            yield partial
+        yield response
+
+
+# Returns an unsigned JWT that expires `lifetime` seconds from now, or from `issued_at`.
+def fake_id_token(lifetime: float = 3600.0, issued_at: Optional[float] = None) -> str:
+    issued_at = time.time() if issued_at is None else issued_at
+    claims = json.dumps({"exp": issued_at + lifetime}).encode()
+    payload = base64.urlsafe_b64encode(claims).decode().rstrip("=")
+    return f"e30.{payload}.fake-signature"
+
+
+# Replaces the Google ID token and Cloud Logging backends with slow local fakes.
+def install_backend_stubs(token_latency: float = 0.0, logging_latency: float = 0.0):
+    """
+    Stubs the network-bound backends used while importing the agent packages.
+
+    Args:
+        token_latency (float): Seconds each ID token fetch takes.
+        logging_latency (float): Seconds creating the Cloud Logging client takes.
+    """
+    import google.cloud
+    import google.oauth2.id_token
+
+    def fetch_id_token(request, audience):
+        time.sleep(token_latency)
+        return fake_id_token()
+
+    google.oauth2.id_token.fetch_id_token = fetch_id_token
+
+    class Client:
+        def __init__(self):
+            time.sleep(logging_latency)
+
+        def setup_logging(self):
+            pass
+
+    cloud_logging = types.ModuleType("google.cloud.logging")
+    cloud_logging.Client = Client
+    sys.modules["google.cloud.logging"] = cloud_logging
+    google.cloud.logging = cloud_logging
+
+
+class FakeMemoryService(BaseMemoryService):
+    """
+    In-memory stand-in for the Vertex AI memory bank.
+
+    Every write sleeps `latency` seconds to approximate memory generation
+    and fails with probability `failure_rate`. Searches sleep
+    `search_latency` seconds and return `memories`, whatever the query. With `deltas` off,
+    `add_events_to_memory` is unsupported, as in the base class. The
+    events received per session are kept in `events` to check that
+    nothing was lost or written twice.
+    """
+
+    def __init__(
+        self,
+        latency: float = 0.0,
+        failure_rate: float = 0.0,
+        deltas: bool = True,
+        seed: int = 0,
+        memories: list = (),
+        search_latency: float = 0.0,
+    ):
+        self.latency = latency
+        self.memories = list(memories)
+        self.search_latency = search_latency
+        self.searches = 0
+        self.failure_rate = failure_rate
+        self.deltas = deltas
+        self.rng = random.Random(seed)
+        self.calls = 0
+        self.events: dict[str, list] = {}
+
+    async def _write(self, session_id: str, events: list, replace: bool):
+        self.calls += 1
+        await asyncio.sleep(self.latency)
+        if self.rng.random() < self.failure_rate:
+            raise ConnectionError("memory bank unavailable")
+        if replace:
+            self.events[session_id] = list(events)
+        else:
+            self.events.setdefault(session_id, []).extend(events)
+
+    async def add_session_to_memory(self, session):
+        await self._write(session.id, session.events, replace=True)
+
+    async def add_events_to_memory(
+        self, *, app_name, user_id, events, session_id=None, custom_metadata=None
+    ):
+        if not self.deltas:
+            raise NotImplementedError
+        await self._write(session_id, events, replace=False)
+
+    async def search_memory(self, *, app_name, user_id, query):
+        self.searches += 1
+        await asyncio.sleep(self.search_latency)
+        return SearchMemoryResponse(memories=self.memories)
@@ -0,0 +1,194 @@
+"""
+Greeter overhead per turn with and without the fast-path router.
+
+Launches a local zoo_animal_mcp_server for the router's species names and
+runs the real `root_agent` with a scripted greeter model, timing each turn
+until the greeter hands off to an expert (or answers itself):
+
+- llm: the router is disabled; the greeter model saves PROMPT, then transfers.
+- fast_path: the router routes clear turns; the rest go to the model.
+
+Turns come from a labelled English/Korean corpus, so the output also
+reports how often the router routed a turn and whether it picked the
+expected agent. Before timing, the router's own decisions on ROUTES are
+checked: "show me ..." is about animals, and a show with a species but no
+time or booking word is left to the model.
+
+    python bench/fast_router.py --rounds 20 --model-latency 0.5
+"""
+
+import argparse
+import asyncio
+import contextlib
+import json
+import logging
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from google.adk.models import LlmRequest, LlmResponse  # noqa: E402
+from google.adk.runners import InMemoryRunner  # noqa: E402
+from google.genai import types  # noqa: E402
+
+from fakes import ScriptedLlm, install_backend_stubs, text_response  # noqa: E402
+from servers import run_mcp_server  # noqa: E402
+
+SHOWS = "zoo_show_agent"
+CONCIERGE = "zoo_concierge_agent"
+
+# (prompt, the agent a person would pick; None for the greeter itself)
+CORPUS = [
+    ("안녕하세요!", None),
+    ("사자 어디 있어?", CONCIERGE),
+    ("펭귄들은 뭘 먹어?", CONCIERGE),
+    ("호랑이 나이가 몇 살이야?", CONCIERGE),
+    ("북극곰에 대해 알려줘", CONCIERGE),
+    ("돌고래 쇼 예약하고 싶어요", SHOWS),
+    ("펭귄 쇼 몇 시에 해?", SHOWS),
+    ("오늘 공연 일정 알려줘", SHOWS),
+    ("Where are the polar bears?", CONCIERGE),
+    ("How old is the oldest giraffe?", CONCIERGE),
+    ("Tell me about zebras", CONCIERGE),
+    ("Book 2 seats for the penguin show", SHOWS),
+    ("What time is the sea lion show?", SHOWS),
+    ("What do lions eat, and is there a lion show?", None),
+    ("Hi there", None),
+    ("뭐 물어봤었는지 기억나?", None),
+    ("Show me the lions", CONCIERGE),
+    ("Can you show me where the penguins are?", CONCIERGE),
+    ("Tell me about the penguin show", SHOWS),
+]
+
+# (prompt, what the router alone must decide; None leaves it to the greeter model)
+ROUTES = [
+    ("Show me the lions", CONCIERGE),
+    ("Can you show me where the penguins are?", CONCIERGE),
+    ("Show me the lion show times", SHOWS),
+    ("Tell me about the penguin show", None),
+    ("사자 쇼", None),
+    ("What time is the sea lion show?", SHOWS),
+    ("Book 2 seats for the penguin show", SHOWS),
+    ("When is the next show?", SHOWS),
+    ("펭귄 쇼 몇 시에 해?", SHOWS),
+    ("오늘 공연 일정 알려줘", SHOWS),
+    ("I'd like to book a table", None),
+    ("What do lions eat, and is there a lion show?", None),
+]
+
+
+def check_routes(router):
+    wrong = [
+        (prompt, expected, router.classify(prompt))
+        for prompt, expected in ROUTES
+        if router.route(prompt) != expected
+    ]
+    assert not wrong, f"fast path misrouted: {wrong}"
+
+
+def call_response(name: str, args: dict) -> LlmResponse:
+    return LlmResponse(
+        content=types.Content(
+            role="model", parts=[types.Part.from_function_call(name=name, args=args)]
+        )
+    )
+
+
+def scripted_greeter(request: LlmRequest) -> LlmResponse:
+    # Calls add_prompt_to_state, then transfers to the labelled agent.
+    prompt = next(
+        part.text
+        for content in reversed(request.contents)
+        if content.role == "user"
+        for part in content.parts or []
+        if part.text
+    )
+    responses = [
+        part.function_response
+        for part in request.contents[-1].parts or []
+        if part.function_response
+    ]
+    if not responses:
+        return call_response("add_prompt_to_state", {"prompt": prompt})
+    target = dict(CORPUS).get(prompt)
+    if target is None:
+        return text_response("안녕하세요! 무엇을 도와드릴까요?")
+    return call_response("transfer_to_agent", {"agent_name": target})
+
+
+async def run_turn(runner, prompt: str) -> tuple[float, str]:
+    session = await runner.session_service.create_session(
+        app_name=runner.app_name, user_id="bench"
+    )
+    message = types.Content(role="user", parts=[types.Part(text=prompt)])
+    start = time.perf_counter()
+    async with contextlib.aclosing(
+        runner.run_async(user_id="bench", session_id=session.id, new_message=message)
+    ) as events:
+        async for event in events:
+            if event.actions.transfer_to_agent:
+                return time.perf_counter() - start, event.actions.transfer_to_agent
+            if event.author == "greeter" and event.is_final_response():
+                break
+    return time.perf_counter() - start, None
+
+
+async def run_mode(agent_module, mode: str, rounds: int) -> dict:
+    root_agent = agent_module.root_agent
+    router = agent_module.fast_router
+    callbacks = root_agent.before_model_callback
+    if mode == "llm":
+        root_agent.before_model_callback = [agent_module.log_query_to_model]
+    runner = InMemoryRunner(agent=root_agent, app_name="fast_router_bench")
+    latencies, correct, routed = [], 0, 0
+    try:
+        for _ in range(rounds):
+            for prompt, expected in CORPUS:
+                hits = router.metrics.hits
+                elapsed, target = await run_turn(runner, prompt)
+                latencies.append(elapsed)
+                correct += target == expected
+                routed += router.metrics.hits > hits
+    finally:
+        root_agent.before_model_callback = callbacks
+    latencies.sort()
+    return {
+        "turns": len(latencies),
+        "routed_by_fast_path": routed,
+        "correct_handoffs": correct,
+        "p50_ms": 1000 * statistics.median(latencies),
+        "p99_ms": 1000 * latencies[int(0.99 * (len(latencies) - 1))],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fast-path router benchmark")
+    parser.add_argument("--rounds", type=int, default=10)
+    parser.add_argument("--model-latency", type=float, default=0.5)
+    args = parser.parse_args()
+
+    install_backend_stubs()
+    with run_mcp_server("zoo_animal_mcp_server") as url:
+        os.environ["MCP_SERVER_URL"] = url
+        from zoo_concierge_agent import agent
+
+        logging.disable(logging.WARNING)
+        deadline = time.time() + 30
+        while not agent.fast_router.index.phrases and time.time() < deadline:
+            time.sleep(0.1)
+        check_routes(agent.fast_router)
+        agent.root_agent.model = ScriptedLlm(
+            responder=scripted_greeter, latency=args.model_latency
+        )
+        results = {
+            mode: asyncio.run(run_mode(agent, mode, args.rounds))
+            for mode in ("llm", "fast_path")
+        }
+        results["router"] = agent.fast_router.metrics.as_dict()
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
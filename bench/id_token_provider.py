@@ -0,0 +1,186 @@
+"""
+IdTokenProvider's refresh schedule, first-token wait and retries, on a fake clock.
+
+The provider's clock is a fake one that only moves when told to, and its
+fetcher a fake issuer that mints unsigned tokens expiring --lifetime
+seconds after the fake now. The issuer can be made to fail, or to hold a
+fetch until released. Checked:
+
+- refresh: a token is renewed once the clock is within --refresh-margin of
+  its expiry, before it expires, and not earlier.
+- first_token: the first get_headers waits for the first fetch without
+  blocking the event loop, then returns its token.
+- retry: after failed fetches the refresher retries every
+  --retry-interval seconds until one succeeds, and a failed renewal keeps
+  the cached token.
+
+The refresher's thread sleeps in real seconds for the delays it computes
+from the fake clock, so tokens are made to expire just past the margin.
+
+    python bench/id_token_provider.py
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# Importing the agent package builds its agents, which require this setting.
+os.environ.setdefault("MCP_SERVER_URL", "http://127.0.0.1:9/mcp")
+os.environ.setdefault("LAZY_INIT", "TRUE")
+
+from fakes import fake_id_token  # noqa: E402
+from zoo_concierge_agent.id_token_provider import IdTokenProvider, decode_token_expiry  # noqa: E402
+
+
+class FakeClock:
+    def __init__(self, now: float = 1_000_000.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class FakeIssuer:
+    """Mints tokens on a fake clock; can fail the next `failures` fetches or hold them at `gate`."""
+
+    def __init__(self, clock: FakeClock, lifetime: float):
+        self.clock = clock
+        self.lifetime = lifetime
+        self.failures = 0
+        self.gate = threading.Event()
+        self.gate.set()
+        # The fake time of every fetch, and whether it failed.
+        self.fetches: list[tuple[float, bool]] = []
+
+    def __call__(self, audience: str) -> str:
+        self.gate.wait()
+        failed = self.failures > 0
+        self.fetches.append((self.clock(), failed))
+        if failed:
+            self.failures -= 1
+            raise ConnectionError("metadata server unavailable")
+        return fake_id_token(self.lifetime, issued_at=self.clock())
+
+
+def wait_until(condition, timeout: float = 5.0) -> bool:
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            return False
+        time.sleep(0.01)
+    return True
+
+
+def check_refresh(args) -> dict:
+    clock = FakeClock()
+    # Expires just past the margin, so the refresher rechecks every 0.2 s.
+    issuer = FakeIssuer(clock, lifetime=args.refresh_margin + 0.2)
+    provider = IdTokenProvider(
+        "https://zoo-mcp.example", fetcher=issuer, clock=clock, refresh_margin=args.refresh_margin
+    )
+    provider.start()
+    try:
+        assert wait_until(lambda: provider.token is not None), "no first token"
+        first, expires_at = provider.token, provider.expires_at
+        assert expires_at == decode_token_expiry(first)
+
+        time.sleep(0.5)
+        assert len(issuer.fetches) == 1, "renewed before the refresh margin"
+
+        clock.now = expires_at - args.refresh_margin
+        assert wait_until(lambda: provider.token != first), "not renewed within the margin"
+        renewed_at = issuer.fetches[-1][0]
+        assert renewed_at < expires_at, "renewed only after the token expired"
+        return {"fetches": len(issuer.fetches), "renewed_s_before_expiry": expires_at - renewed_at}
+    finally:
+        provider.stop()
+
+
+def check_first_token(args) -> dict:
+    clock = FakeClock()
+    issuer = FakeIssuer(clock, lifetime=3600.0)
+    issuer.gate.clear()
+    provider = IdTokenProvider("https://zoo-mcp.example", fetcher=issuer, clock=clock)
+
+    async def run():
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                await asyncio.sleep(0.01)
+                ticks += 1
+
+        ticking = asyncio.create_task(ticker())
+        headers = asyncio.create_task(provider.get_headers())
+        await asyncio.sleep(args.issuer_latency)
+        assert not headers.done(), "get_headers returned before the first token"
+        issuer.gate.set()
+        result = await asyncio.wait_for(headers, 5.0)
+        ticking.cancel()
+        return result, ticks
+
+    try:
+        headers, ticks = asyncio.run(run())
+    finally:
+        provider.stop()
+    assert headers == {"Authorization": f"Bearer {provider.token}"}
+    assert ticks > 0, "waiting for the first token blocked the event loop"
+    return {"loop_ticks_while_waiting": ticks}
+
+
+def check_retry(args) -> dict:
+    clock = FakeClock()
+    issuer = FakeIssuer(clock, lifetime=args.refresh_margin + 0.2)
+    issuer.failures = 3
+    provider = IdTokenProvider(
+        "https://zoo-mcp.example",
+        fetcher=issuer,
+        clock=clock,
+        refresh_margin=args.refresh_margin,
+        retry_interval=args.retry_interval,
+    )
+    provider.start()
+    try:
+        assert wait_until(lambda: provider.token is not None), "never recovered from failed fetches"
+        assert [failed for _, failed in issuer.fetches] == [True, True, True, False]
+        first = provider.token
+
+        # The renewal fails twice; the cached token is still served meanwhile.
+        issuer.failures = 2
+        clock.now = provider.expires_at - args.refresh_margin
+        assert wait_until(lambda: len(issuer.fetches) >= 5), "no renewal attempt"
+        assert provider.token == first, "a failed renewal dropped the cached token"
+        headers = asyncio.run(provider.get_headers())
+        assert headers == {"Authorization": f"Bearer {first}"}
+        assert wait_until(lambda: provider.token != first), "renewal was not retried"
+        return {"fetches": len(issuer.fetches), "failed": sum(f for _, f in issuer.fetches)}
+    finally:
+        provider.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="IdTokenProvider checks")
+    parser.add_argument("--refresh-margin", type=float, default=300.0)
+    parser.add_argument("--retry-interval", type=float, default=0.05)
+    parser.add_argument("--issuer-latency", type=float, default=0.3)
+    args = parser.parse_args()
+
+    # The failed fetches are expected here.
+    logging.disable(logging.ERROR)
+    results = {
+        "refresh": check_refresh(args),
+        "first_token": check_first_token(args),
+        "retry": check_retry(args),
+    }
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
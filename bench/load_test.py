@@ -0,0 +1,408 @@
+"""
+Load test of the whole concierge: the real `root_agent` graph end to end.
+
+Launches both FastMCP `server.py` apps, serves the real `zoo_show_agent`
+over A2A from a local port, and drives the concierge's `root_agent` with
+scripted models, so everything but the model runs as deployed: the
+fast-path router, the answer cache, the parallel research, the MCP
+session pools, the A2A hop and memory preloading and writing.
+
+--concurrency visitors hold conversations of --turns-per-session turns
+until --turns turns have run, asking a mix of animal, show and greeting
+questions, --korean-share of them in Korean. Every model call takes
+--model-latency seconds, the web researcher's --search-latency more.
+
+Reported, as JSON:
+- cold_start: importing the agent package, and the first turn.
+- turns: throughput and p50/p95/p99 turn latency, after --warmup turns.
+- stages: p50/p95/p99 per ADK span (agent runs, model calls per agent,
+  tool calls), recorded through the tracing setup.
+- memory: the process's resident set now and at its peak.
+- components: the router's, answer cache's and memory writer's metrics.
+
+--output writes the report to a file; --compare reads an earlier report
+and adds the relative change of every number to it.
+
+    python bench/load_test.py --turns 300 --concurrency 20 --output run.json
+    python bench/load_test.py --turns 300 --concurrency 20 --compare run.json
+"""
+
+import argparse
+import asyncio
+import datetime
+import json
+import logging
+import os
+import platform
+import random
+import resource
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("LAZY_INIT", "TRUE")
+os.environ.setdefault("TRACE_EXPORTER", "none")
+# The servers are local; offline, ADK's mTLS probe waits seconds on the metadata server.
+os.environ.setdefault("GOOGLE_API_USE_CLIENT_CERTIFICATE", "false")
+
+from google.adk.models import LlmRequest, LlmResponse  # noqa: E402
+from google.genai import types  # noqa: E402
+from opentelemetry.sdk.trace.export import SpanExporter, SpanExportResult  # noqa: E402
+
+from fakes import ScriptedLlm, install_backend_stubs, text_response  # noqa: E402
+from servers import REPO_ROOT, free_port, run_mcp_server  # noqa: E402
+
+CONCIERGE = "zoo_concierge_agent"
+SHOWS = "zoo_show_agent"
+
+# (Korean query, English query, the agent that should answer, species)
+CORPUS = [
+    ("사자 어디 있어?", "Where are the lions?", CONCIERGE, "lion"),
+    ("펭귄들은 뭘 먹어?", "What do penguins eat?", CONCIERGE, "penguin"),
+    ("기린 나이가 몇 살이야?", "How old are the giraffes?", CONCIERGE, "giraffe"),
+    ("북극곰에 대해 알려줘", "Tell me about the polar bears", CONCIERGE, "polar bear"),
+    ("호랑이는 어디서 볼 수 있어?", "Where can I see the tigers?", CONCIERGE, "tiger"),
+    ("펭귄 쇼 몇 시에 해?", "What time is the penguin show?", SHOWS, "penguin"),
+    ("돌고래 쇼 알려줘", "Tell me about the dolphin show", SHOWS, "dolphin"),
+    ("물개 쇼 일정이 궁금해요", "When is the seal show?", SHOWS, "seal"),
+    ("안녕하세요!", "Hi there!", None, None),
+]
+QUERIES = {
+    query: (target, species)
+    for korean, english, target, species in CORPUS
+    for query in (korean, english)
+}
+ANSWER = "사자 '레오'는 사바나 구역에 있어요. 일곱 살이고, 오후 두 시에 먹이를 먹어요. " * 4
+
+
+def call_response(name: str, args: dict) -> LlmResponse:
+    return LlmResponse(
+        content=types.Content(
+            role="model", parts=[types.Part.from_function_call(name=name, args=args)]
+        )
+    )
+
+
+def request_text(request: LlmRequest) -> str:
+    texts = [str(request.config.system_instruction or "")] if request.config else []
+    for content in request.contents:
+        for part in content.parts or []:
+            # Preloaded memories quote earlier turns; they are not this turn's query.
+            if part.text and "<PAST_CONVERSATIONS>" not in part.text:
+                texts.append(part.text)
+    return "\n".join(texts)
+
+
+def current_query(request: LlmRequest) -> str:
+    """Returns the corpus query that appears last in the request."""
+    text = request_text(request)
+    return max(QUERIES, key=lambda query: text.rfind(query))
+
+
+def called_since_query(request: LlmRequest, name: str) -> bool:
+    query = current_query(request)
+    called = False
+    for content in request.contents:
+        for part in content.parts or []:
+            if part.text and query in part.text and "<PAST_CONVERSATIONS>" not in part.text:
+                called = False
+            elif part.function_response and part.function_response.name == name:
+                called = True
+    return called
+
+
+def greeter(request: LlmRequest) -> LlmResponse:
+    query = current_query(request)
+    target, _ = QUERIES[query]
+    if not called_since_query(request, "add_prompt_to_state"):
+        return call_response("add_prompt_to_state", {"prompt": query})
+    if target is None:
+        return text_response("안녕하세요! 무엇을 도와드릴까요?")
+    return call_response("transfer_to_agent", {"agent_name": target})
+
+
+def researcher(tool: str):
+    def respond(request: LlmRequest) -> LlmResponse:
+        _, species = QUERIES[current_query(request)]
+        if not called_since_query(request, tool):
+            return call_response(tool, {"species": species or "lion"})
+        return text_response(f"{tool}: {species} ...")
+
+    return respond
+
+
+def build_models(args) -> dict[str, ScriptedLlm]:
+    def model(responder, latency=args.model_latency, **kwargs):
+        # GoogleSearchTool only accepts Gemini model names.
+        return ScriptedLlm(model="gemini-scripted", responder=responder, latency=latency, **kwargs)
+
+    return {
+        "greeter": model(greeter),
+        "zoo_researcher": model(researcher("get_animals_by_species")),
+        "web_researcher": model(
+            lambda _: text_response("Lions live 10-14 years and eat meat."),
+            latency=args.model_latency + args.search_latency,
+        ),
+        "response_formatter": model(
+            lambda _: text_response(ANSWER),
+            chunk_size=args.chunk_size,
+            chunk_latency=args.chunk_latency,
+        ),
+        "zoo_show_agent": model(
+            researcher("get_shows_by_species"),
+            chunk_size=args.chunk_size,
+            chunk_latency=args.chunk_latency,
+        ),
+    }
+
+
+class StageRecorder(SpanExporter):
+    """Keeps the duration of every finished span, by stage."""
+
+    def __init__(self):
+        self.durations: dict[str, list[float]] = {}
+        self._lock = threading.Lock()
+
+    def export(self, spans) -> SpanExportResult:
+        with self._lock:
+            for span in spans:
+                stage = span.name
+                if stage == "call_llm":
+                    stage += f" {span.attributes.get('zoo.agent', '?')}"
+                self.durations.setdefault(stage, []).append(
+                    (span.end_time - span.start_time) / 1e6
+                )
+        return SpanExportResult.SUCCESS
+
+    def clear(self):
+        with self._lock:
+            self.durations.clear()
+
+
+def percentiles(values: list[float]) -> dict[str, float]:
+    values = sorted(values)
+    return {
+        "count": len(values),
+        "p50_ms": statistics.median(values),
+        "p95_ms": values[int(0.95 * (len(values) - 1))],
+        "p99_ms": values[int(0.99 * (len(values) - 1))],
+    }
+
+
+def memory_footprint() -> dict[str, float]:
+    footprint = {"peak_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024}
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    footprint["rss_mb"] = int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return footprint
+
+
+def serve_show_agent(show_module, model) -> str:
+    """Serves the real zoo_show_agent over A2A and returns its agent card file."""
+    import uvicorn
+    from google.adk.a2a.utils.agent_to_a2a import to_a2a
+
+    port = free_port()
+    with open(os.path.join(REPO_ROOT, "zoo_show_agent", "agent.json")) as f:
+        card = json.load(f)
+    card["url"] = f"http://127.0.0.1:{port}"
+    card_path = os.path.join(tempfile.mkdtemp(), "agent.json")
+    with open(card_path, "w") as f:
+        json.dump(card, f)
+
+    show_module.root_agent.model = model
+    app = to_a2a(show_module.root_agent, host="127.0.0.1", port=port, agent_card=card_path)
+    server = uvicorn.Server(
+        uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning")
+    )
+    threading.Thread(target=server.run, name="show-agent", daemon=True).start()
+    while not server.started:
+        time.sleep(0.05)
+    return card_path
+
+
+async def run_turn(runner, user_id: str, session_id: str, query: str) -> float:
+    message = types.Content(role="user", parts=[types.Part(text=query)])
+    start = time.perf_counter()
+    async for _ in runner.run_async(user_id=user_id, session_id=session_id, new_message=message):
+        pass
+    return time.perf_counter() - start
+
+
+async def first_turn(agent) -> float:
+    from google.adk.runners import InMemoryRunner
+
+    runner = InMemoryRunner(agent=agent.root_agent, app_name="load_test")
+    session = await runner.session_service.create_session(app_name="load_test", user_id="cold")
+    return await run_turn(runner, "cold", session.id, CORPUS[0][0])
+
+
+async def run_load(args, agent, turns: int) -> dict:
+    from google.adk.runners import InMemoryRunner
+
+    runner = InMemoryRunner(agent=agent.root_agent, app_name="load_test")
+    rng = random.Random(args.seed)
+    queue = [
+        (korean if rng.random() < args.korean_share else english)
+        for korean, english, _, _ in rng.choices(CORPUS, k=turns)
+    ]
+    latencies, failures = [], 0
+
+    # Each visitor is one user, so their memories carry over between sessions.
+    async def visitor(user_id: str):
+        nonlocal failures
+        turns_in_session, session_id = args.turns_per_session, None
+        while queue:
+            query = queue.pop()
+            if turns_in_session >= args.turns_per_session:
+                session = await runner.session_service.create_session(
+                    app_name="load_test", user_id=user_id
+                )
+                session_id, turns_in_session = session.id, 0
+            turns_in_session += 1
+            try:
+                latencies.append(await run_turn(runner, user_id, session_id, query))
+            except Exception as e:
+                failures += 1
+                logging.getLogger(__name__).error(f"❌ Turn failed: {e!r}")
+
+    start = time.perf_counter()
+    await asyncio.gather(*(visitor(f"visitor-{i}") for i in range(args.concurrency)))
+    elapsed = time.perf_counter() - start
+    await agent.memory_writer.flush()
+    return {
+        "turns": len(latencies),
+        "failures": failures,
+        "throughput_turns_per_s": len(latencies) / elapsed,
+        **percentiles([1000 * latency for latency in latencies]),
+    }
+
+
+async def run(args, agent, stages: StageRecorder) -> tuple[float, dict]:
+    """Runs the first turn, the warm-up and the measured turns on one event loop, as served."""
+    from opentelemetry import trace
+
+    cold_turn = await first_turn(agent)
+    # Warm-up turns fill the MCP session pools and the router's index.
+    await run_load(args, agent, args.warmup)
+    trace.get_tracer_provider().force_flush()
+    stages.clear()
+    turns = await run_load(args, agent, args.turns)
+    trace.get_tracer_provider().force_flush()
+    return cold_turn, turns
+
+
+def compare(report: dict, baseline: dict) -> dict:
+    """Returns the relative change of every number in the report from the baseline."""
+    changes = {}
+    for key, value in report.items():
+        before = baseline.get(key) if isinstance(baseline, dict) else None
+        if isinstance(value, dict):
+            nested = compare(value, before or {})
+            if nested:
+                changes[key] = nested
+        elif isinstance(value, (int, float)) and isinstance(before, (int, float)) and before:
+            changes[key] = round((value - before) / before, 4)
+    return changes
+
+
+def git_revision() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=REPO_ROOT, capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="End-to-end load test")
+    parser.add_argument("--turns", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--turns-per-session", type=int, default=3)
+    parser.add_argument("--warmup", type=int, default=20)
+    parser.add_argument("--korean-share", type=float, default=0.5)
+    parser.add_argument("--model-latency", type=float, default=0.2)
+    parser.add_argument("--search-latency", type=float, default=0.3)
+    parser.add_argument("--chunk-size", type=int, default=0)
+    parser.add_argument("--chunk-latency", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output")
+    parser.add_argument("--compare")
+    args = parser.parse_args()
+
+    install_backend_stubs()
+    with run_mcp_server("zoo_animal_mcp_server") as animal_url, run_mcp_server(
+        "zoo_show_mcp_server"
+    ) as show_url:
+        models = build_models(args)
+        # Each agent package reads its MCP server's URL when imported.
+        os.environ["MCP_SERVER_URL"] = show_url
+        from zoo_show_agent import agent as show_agent
+        from zoo_show_agent.tracing import setup_tracing
+
+        stages = StageRecorder()
+        setup_tracing("load-test", exporter=stages)
+        card_path = serve_show_agent(show_agent, models["zoo_show_agent"])
+
+        os.environ["MCP_SERVER_URL"] = animal_url
+        start = time.perf_counter()
+        from zoo_concierge_agent import agent
+
+        imported = time.perf_counter() - start
+        logging.disable(logging.WARNING)
+        for name in ("greeter", "zoo_researcher", "web_researcher", "response_formatter"):
+            agent.root_agent.find_agent(name).model = models[name]
+        # The deployed card is copied in at deploy time; point at the local server.
+        agent.zoo_show_agent._agent_card_source = card_path
+
+        cold_turn, turns = asyncio.run(run(args, agent, stages))
+
+        report = {
+            "meta": {
+                "revision": git_revision(),
+                "time": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+                "python": platform.python_version(),
+                "args": vars(args),
+            },
+            "cold_start": {"import_s": imported, "first_turn_s": cold_turn},
+            "turns": turns,
+            # The A2A SDK's own spans (one per queued event) are left out.
+            "stages": {
+                stage: percentiles(durations)
+                for stage, durations in sorted(stages.durations.items())
+                if not stage.startswith("a2a.")
+            },
+            "memory": memory_footprint(),
+            "components": {
+                "fast_router": agent.fast_router.metrics.as_dict(),
+                "answer_cache": agent.answer_cache.metrics.as_dict(),
+                "memory_writer": agent.memory_writer.metrics.as_dict(),
+                "memory_retrieval": agent.preload_memory.metrics.as_dict(),
+            },
+        }
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+        report["change_from_baseline"] = compare(
+            {key: value for key, value in report.items() if key != "meta"}, baseline
+        )
+    output = json.dumps(report, indent=2, ensure_ascii=False)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(output)
+    print(output)
+
+
+if __name__ == "__main__":
+    main()
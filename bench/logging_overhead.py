@@ -0,0 +1,163 @@
+"""
+Logging time per request on the request path, direct handlers vs the queue.
+
+Each request logs what a concierge turn logs: the query and the response
+through the agents' model callbacks, a function call and two MCP tool-call
+lines, plus --debug-records DEBUG records when --debug is set. Records go to
+Cloud Logging's StructuredLogHandler, which Cloud Run uses, writing to a
+file. Requests run inside a span, as with tracing on, since the handler
+reads the current span for trace correlation.
+
+- direct: the handler is on the root logger, as before.
+- async: the handler sits behind AsyncLogHandler.
+
+With --sink-latency, each write to the file first sleeps that long, as when
+stdout is backed up; the async queue then drops records instead of
+stalling requests, and reports how many.
+
+    python bench/logging_overhead.py --requests 5000
+    python bench/logging_overhead.py --sink-latency 0.002 --queue-size 1000
+"""
+
+import argparse
+import json
+import logging
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# Importing the agent package builds its agents, which require this setting.
+os.environ.setdefault("MCP_SERVER_URL", "http://127.0.0.1:9/mcp")
+os.environ.setdefault("LAZY_INIT", "TRUE")
+os.environ.setdefault("LOG_ASYNC", "FALSE")
+os.environ.setdefault("TRACE_EXPORTER", "none")
+
+from google.adk.models import LlmRequest, LlmResponse  # noqa: E402
+from google.cloud.logging_v2.handlers import StructuredLogHandler  # noqa: E402
+from google.genai import types  # noqa: E402
+from opentelemetry import trace  # noqa: E402
+from opentelemetry.sdk.trace import TracerProvider  # noqa: E402
+
+from zoo_concierge_agent.async_logging import AsyncLogHandler  # noqa: E402
+from zoo_concierge_agent.callback_logging import (  # noqa: E402
+    log_model_response,
+    log_query_to_model,
+)
+
+ANSWER = "사자 '레오'는 사바나 구역에 있어요. 올해 다섯 살이고, 오후 두 시에 먹이를 먹어요. " * 8
+
+
+class SlowFile:
+    """File whose writes wait first, like a backed-up stdout pipe."""
+
+    def __init__(self, path: str, latency: float):
+        self._file = open(path, "w", encoding="utf-8")
+        self._latency = latency
+
+    def write(self, text: str):
+        if self._latency:
+            time.sleep(self._latency)
+        return self._file.write(text)
+
+    def flush(self):
+        self._file.flush()
+
+
+class Context:
+    agent_name = "greeter"
+
+
+def make_request(query: str) -> LlmRequest:
+    return LlmRequest(
+        contents=[types.Content(role="user", parts=[types.Part(text=query)])]
+    )
+
+
+def run_mode(args, mode: str) -> dict:
+    path = os.path.join(tempfile.mkdtemp(), "log.jsonl")
+    handler = StructuredLogHandler(stream=SlowFile(path, args.sink_latency), project_id="bench")
+    root = logging.getLogger()
+    root.handlers.clear()
+    root.setLevel(logging.DEBUG if args.debug else logging.INFO)
+    queue = None
+    if mode == "async":
+        queue = AsyncLogHandler(
+            targets=[handler],
+            max_size=args.queue_size,
+            sample_rate=args.debug_sample_rate,
+        )
+        root.addHandler(queue)
+    else:
+        root.addHandler(handler)
+
+    tool_logger = logging.getLogger("zoo_animal_mcp_server")
+    adk_logger = logging.getLogger("google_adk.bench")
+    tracer = trace.get_tracer(__name__)
+    context = Context()
+    response = LlmResponse(
+        content=types.Content(role="model", parts=[types.Part(text=ANSWER)])
+    )
+    call = LlmResponse(
+        content=types.Content(
+            role="model",
+            parts=[types.Part.from_function_call(name="zoo_concierge_agent", args={})],
+        )
+    )
+
+    latencies = []
+    wall_start = time.perf_counter()
+    for i in range(args.requests):
+        request = make_request(f"사자 어디 있어? #{i}")
+        with tracer.start_as_current_span("invoke_agent"):
+            start = time.perf_counter()
+            log_query_to_model(context, request)
+            log_model_response(context, call)
+            tool_logger.info(">>> 🛠️ Tool: 'get_animals_by_species' called for '%s'", "lion")
+            tool_logger.info(">>> 🛠️ Tool: 'list_available_species' called")
+            for n in range(args.debug_records if args.debug else 0):
+                adk_logger.debug("LLM Request: %s", request.contents)
+            log_model_response(context, response)
+            latencies.append(time.perf_counter() - start)
+    request_seconds = time.perf_counter() - wall_start
+
+    if queue is not None:
+        queue.close()
+        root.removeHandler(queue)
+    handler.flush()
+    with open(path, encoding="utf-8") as f:
+        written = sum(1 for _ in f)
+
+    latencies.sort()
+    result = {
+        "log_us_p50": 1e6 * statistics.median(latencies),
+        "log_us_p99": 1e6 * latencies[int(0.99 * (len(latencies) - 1))],
+        "log_us_mean": 1e6 * statistics.mean(latencies),
+        "requests_per_s": args.requests / request_seconds,
+        "records_written": written,
+    }
+    if queue is not None:
+        result.update(queue.metrics.as_dict())
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Request-path logging benchmark")
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--sink-latency", type=float, default=0.0)
+    parser.add_argument("--queue-size", type=int, default=10000)
+    parser.add_argument("--debug", action="store_true")
+    parser.add_argument("--debug-records", type=int, default=10)
+    parser.add_argument("--debug-sample-rate", type=float, default=0.1)
+    args = parser.parse_args()
+
+    trace.set_tracer_provider(TracerProvider())
+    results = {mode: run_mode(args, mode) for mode in ("direct", "async")}
+    logging.getLogger().handlers.clear()
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
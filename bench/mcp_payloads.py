@@ -0,0 +1,83 @@
+"""
+Payload bytes and estimated tokens that MCP tool results add to the model context.
+
+Each call goes through an in-memory FastMCP client, and the result is
+dumped the way ADK's McpTool hands it to the model, so the sizes include
+both the text content and the structured copy. Tokens are counted with
+google-genai's local tokenizer when sentencepiece is installed, and
+otherwise estimated from the character mix.
+
+    python bench/mcp_payloads.py
+"""
+
+import asyncio
+import json
+import logging
+
+from fastmcp import Client
+from google.adk.tools.mcp_tool.mcp_tool import _dump_mcp_model
+
+from servers import load_server_module
+
+SCENARIOS = {
+    "zoo_animal_mcp_server": [
+        ("get_animals_by_species", {"species": "penguin"}),
+        ("get_animals_by_species", {"species": "penguin", "fields": ["name", "enclosure"]}),
+        ("get_animals_by_species", {"species": "penguin", "compact": True}),
+        ("get_animals_by_species", {"species": "penguin", "fields": ["name", "enclosure"], "compact": True}),
+        ("get_animals_by_species_batch", {"species": ["lion", "tiger", "bear"]}),
+        ("get_animals_by_species_batch", {"species": ["lion", "tiger", "bear"], "fields": ["name", "age"], "compact": True}),
+    ],
+    "zoo_show_mcp_server": [
+        ("get_shows_by_species", {"species": "lion"}),
+        ("get_shows_by_species", {"species": "lion", "fields": ["name", "time"]}),
+        ("get_shows_by_species", {"species": "lion", "compact": True}),
+        ("get_shows_by_species", {"species": "lion", "fields": ["name", "time"], "compact": True}),
+        ("get_shows_by_species", {"species": "lion", "fields": ["name", "time"], "limit": 1}),
+        ("get_shows_by_species_batch", {"species": []}),
+        ("get_shows_by_species_batch", {"species": [], "fields": ["show_id", "name", "time"], "compact": True}),
+    ],
+}
+
+
+def token_counter():
+    """Returns a function counting tokens, exact when a local tokenizer is available."""
+    try:
+        from google.genai.local_tokenizer import LocalTokenizer
+
+        tokenizer = LocalTokenizer(model_name="gemini-2.5-flash")
+        return lambda text: tokenizer.count_tokens(text).total_tokens, "local_tokenizer"
+    except Exception:
+        # Roughly 4 ASCII characters per token; Hangul is about one per token.
+        def estimate(text: str) -> int:
+            ascii_chars = sum(1 for char in text if ord(char) < 128)
+            return ascii_chars // 4 + (len(text) - ascii_chars)
+
+        return estimate, "estimate"
+
+
+async def run() -> dict:
+    count_tokens, method = token_counter()
+    results = {"token_count": method}
+    for server_dir, scenarios in SCENARIOS.items():
+        module = load_server_module(server_dir)
+        async with Client(module.mcp) as client:
+            for name, arguments in scenarios:
+                result = await client.call_tool_mcp(name, arguments)
+                payload = json.dumps(_dump_mcp_model(result), ensure_ascii=False)
+                options = {key: value for key, value in arguments.items() if key != "species"}
+                label = f"{name}({arguments['species']!r}, {json.dumps(options, ensure_ascii=False)})"
+                results[label] = {
+                    "bytes": len(payload.encode()),
+                    "tokens": count_tokens(payload),
+                }
+    return results
+
+
+def main():
+    logging.disable(logging.INFO)
+    print(json.dumps(asyncio.run(run()), indent=2, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+"""
+Compares per-turn MCP latency with and without the pooled session manager.
+
+Launches a local copy of zoo_animal_mcp_server and runs agent-like turns
+(list_tools, then one get_animals_by_species call) against it:
+
+- fresh: a new toolset per turn, so every turn pays the session handshake.
+- pooled: one shared PooledMCPToolset, as the agents use it.
+
+    python bench/mcp_pool.py --turns 200 --concurrency 8
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# Importing the agent package builds its agents, which require this setting.
+os.environ.setdefault("MCP_SERVER_URL", "http://127.0.0.1:9/mcp")
+
+from google.adk.tools.mcp_tool.mcp_toolset import (  # noqa: E402
+    McpToolset,
+    StreamableHTTPConnectionParams,
+)
+
+from servers import run_mcp_server  # noqa: E402
+from zoo_concierge_agent.mcp_session_pool import PooledMCPToolset  # noqa: E402
+
+SPECIES = ["lion", "penguin", "사자", "giraffe", "펭귄"]
+
+
+async def run_turn(toolset, species: str) -> float:
+    start = time.perf_counter()
+    await toolset.get_tools()
+    # PooledMCPToolset calls tools through the McpToolset it wraps.
+    await getattr(toolset, "toolset", toolset)._execute_with_session(
+        lambda session: session.call_tool(
+            "get_animals_by_species", {"species": species}
+        ),
+        "Failed to call get_animals_by_species",
+    )
+    return time.perf_counter() - start
+
+
+async def run_mode(mode: str, url: str, turns: int, concurrency: int) -> dict:
+    params = StreamableHTTPConnectionParams(url=url)
+    pooled = PooledMCPToolset(connection_params=params) if mode == "pooled" else None
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one(i: int) -> float:
+        async with semaphore:
+            if pooled is not None:
+                return await run_turn(pooled, SPECIES[i % len(SPECIES)])
+            toolset = McpToolset(connection_params=params)
+            try:
+                return await run_turn(toolset, SPECIES[i % len(SPECIES)])
+            finally:
+                await toolset.close()
+
+    start = time.perf_counter()
+    latencies = sorted(await asyncio.gather(*(one(i) for i in range(turns))))
+    elapsed = time.perf_counter() - start
+
+    result = {
+        "turns_per_s": turns / elapsed,
+        "p50_ms": 1000 * statistics.median(latencies),
+        "p95_ms": 1000 * latencies[int(0.95 * (len(latencies) - 1))],
+    }
+    if pooled is not None:
+        result["pool"] = pooled.pool_metrics.as_dict()
+        await pooled.close()
+    return result
+
+
+# A new server version must drop the cached tool list right away.
+async def check_version_invalidation(url: str):
+    pooled = PooledMCPToolset(
+        connection_params=StreamableHTTPConnectionParams(url=url), retire_after=0
+    )
+    try:
+        await pooled.get_tools()
+        deployed = pooled.server_version
+        assert deployed, "the MCP server advertised no version"
+        before = pooled.toolset
+
+        await pooled.get_tools()
+        assert pooled.toolset is before, "same version, but the toolset was rebuilt"
+
+        # As if the server had been redeployed since the last session.
+        pooled.server_version = f"{deployed}-previous"
+        await pooled._session_manager.close()
+        tools = await pooled.get_tools()
+        assert pooled.toolset is not before, "new version, but the tool list was reused"
+        assert pooled.server_version == deployed
+        assert tools, "no tools listed after the rebuild"
+    finally:
+        await pooled.close()
+
+
+def main():
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    parser = argparse.ArgumentParser(description="MCP session pool benchmark")
+    parser.add_argument("--turns", type=int, default=100)
+    parser.add_argument("--concurrency", type=int, default=8)
+    args = parser.parse_args()
+
+    with run_mcp_server("zoo_animal_mcp_server") as url:
+        asyncio.run(check_version_invalidation(url))
+        results = {
+            mode: asyncio.run(run_mode(mode, url, args.turns, args.concurrency))
+            for mode in ("fresh", "pooled")
+        }
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""
+Per-call latency and allocations of the MCP servers' read tools.
+
+"before" re-registers the original implementations (index lookup, then
+FastMCP serializes the list on every call; the list tools rebuild and sort a
+set) on a scratch FastMCP app fed the same data. "after" calls the real
+servers, which look records up in the store's indexes and serialize them per
+call. Both go through FastMCP's `call_tool`, so validation and result
+conversion are included.
+
+    python bench/mcp_read_tools.py --calls 2000
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import time
+import tracemalloc
+from typing import Any, Dict, List
+
+from fastmcp import FastMCP
+
+from servers import load_server_module
+
+
+def legacy_app(by_species_tool: str, list_tool: str, records, index, list_field: str):
+    app = FastMCP("legacy")
+
+    def by_species(species: str) -> List[Dict[str, Any]]:
+        return index.get(species.lower(), [])
+
+    def list_names() -> List[str]:
+        unique = set()
+        for record in records:
+            if list_field in record:
+                unique.add(record[list_field])
+        return sorted(list(unique))
+
+    app.tool(name=by_species_tool)(by_species)
+    app.tool(name=list_tool)(list_names)
+    return app
+
+
+async def measure(app: FastMCP, name: str, arguments: dict, calls: int) -> dict:
+    for _ in range(50):
+        await app.call_tool(name, arguments)
+
+    start = time.perf_counter()
+    for _ in range(calls):
+        await app.call_tool(name, arguments)
+    elapsed = time.perf_counter() - start
+
+    samples = min(calls, 200)
+    tracemalloc.start()
+    allocated = 0
+    for _ in range(samples):
+        tracemalloc.reset_peak()
+        baseline = tracemalloc.get_traced_memory()[0]
+        await app.call_tool(name, arguments)
+        allocated += tracemalloc.get_traced_memory()[1] - baseline
+    tracemalloc.stop()
+
+    return {
+        "us_per_call": 1e6 * elapsed / calls,
+        "peak_bytes_per_call": allocated // samples,
+    }
+
+
+async def run(calls: int) -> dict:
+    servers = [
+        ("zoo_animal_mcp_server", "zoo_data", "get_animals_by_species", "list_available_species", "species"),
+        ("zoo_show_mcp_server", "show_data", "get_shows_by_species", "list_available_shows", "name"),
+    ]
+    results = {}
+    for server_dir, reloader, by_species_tool, list_tool, list_field in servers:
+        module = load_server_module(server_dir)
+        store = getattr(module, reloader).current
+        before = legacy_app(by_species_tool, list_tool, store.records, store.by_species, list_field)
+
+        for name, arguments in [
+            (by_species_tool, {"species": "penguin"}),
+            (by_species_tool, {"species": "사자"}),
+            (list_tool, {}),
+        ]:
+            label = f"{name}({arguments.get('species', '')})"
+            results[label] = {
+                "before": await measure(before, name, arguments, calls),
+                "after": await measure(module.mcp, name, arguments, calls),
+            }
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="MCP read tool micro-benchmark")
+    parser.add_argument("--calls", type=int, default=2000)
+    args = parser.parse_args()
+
+    logging.disable(logging.INFO)
+    print(json.dumps(asyncio.run(run(args.calls)), indent=2, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
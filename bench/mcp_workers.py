@@ -0,0 +1,183 @@
+"""
+Throughput and memory of the MCP animal server by number of worker processes.
+
+For each WORKERS value the server is started on a synthetic dataset of
+--records animals and loaded by --clients client processes, each holding
+--concurrency MCP sessions that call get_animals_by_species back to back
+for --duration seconds. The server then gets SIGTERM, as on Cloud Run, and
+the time it takes to stop is reported.
+
+Memory is read from /proc for the server and its workers: "rss" counts
+pages shared with the parent in every worker, "pss" splits them between
+the processes sharing them, and "private" is what each worker copied.
+Workers only add throughput on as many cores as there are workers, and
+the clients need cores too; "cpus" reports what this machine has.
+
+    python bench/mcp_workers.py --workers 1 2 4 --clients 4 --duration 10
+"""
+
+import argparse
+import asyncio
+import contextlib
+import json
+import multiprocessing
+import os
+import random
+import signal
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+import httpx
+from fastmcp import Client
+
+from servers import REPO_ROOT, free_port
+from storage_backends import SPECIES_COUNT, synthetic_animals
+
+
+def memory_kb(pid: int) -> dict:
+    fields = {}
+    with open(f"/proc/{pid}/smaps_rollup") as f:
+        for line in f:
+            parts = line.split()
+            if parts[0] in ("Rss:", "Pss:", "Private_Clean:", "Private_Dirty:"):
+                fields[parts[0][:-1]] = int(parts[1])
+    return {
+        "rss": fields["Rss"],
+        "pss": fields["Pss"],
+        "private": fields["Private_Clean"] + fields["Private_Dirty"],
+    }
+
+
+def child_pids(pid: int) -> list:
+    with open(f"/proc/{pid}/task/{pid}/children") as f:
+        return [int(child) for child in f.read().split()]
+
+
+async def client_loop(url: str, species: list, deadline: float, latencies: list, errors: list):
+    rng = random.Random()
+    async with Client(url) as client:
+        while time.monotonic() < deadline:
+            start = time.perf_counter()
+            try:
+                await client.call_tool(
+                    "get_animals_by_species",
+                    {"species": rng.choice(species), "fields": ["name"], "limit": 5},
+                )
+            except Exception:
+                errors.append(1)
+                continue
+            latencies.append(time.perf_counter() - start)
+
+
+# Runs in a client process: concurrent sessions until the deadline.
+def load(url: str, concurrency: int, start_at: float, duration: float) -> tuple:
+    species = [f"species-{i}" for i in range(SPECIES_COUNT)]
+    latencies, errors = [], []
+
+    async def run():
+        await asyncio.sleep(max(0.0, start_at - time.time()))
+        deadline = time.monotonic() + duration
+        await asyncio.gather(
+            *(client_loop(url, species, deadline, latencies, errors) for _ in range(concurrency))
+        )
+
+    asyncio.run(run())
+    return latencies, len(errors)
+
+
+@contextlib.contextmanager
+def server(workers: int, data_path: str, port: int):
+    process = subprocess.Popen(
+        [sys.executable, "server.py"],
+        cwd=os.path.join(REPO_ROOT, "zoo_animal_mcp_server"),
+        env={
+            **os.environ,
+            "PORT": str(port),
+            "WORKERS": str(workers),
+            "DATA_PATH": data_path,
+        },
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    try:
+        deadline = time.monotonic() + 60
+        while True:
+            try:
+                httpx.get(f"http://127.0.0.1:{port}/metrics", timeout=1).raise_for_status()
+                if workers == 1 or len(child_pids(process.pid)) == workers:
+                    break
+            except httpx.HTTPError:
+                pass
+            if process.poll() is not None or time.monotonic() > deadline:
+                raise RuntimeError(f"server with {workers} workers did not start")
+            time.sleep(0.2)
+        yield process
+    finally:
+        if process.poll() is None:
+            process.kill()
+            process.wait()
+
+
+def run(workers: int, args, data_path: str) -> dict:
+    port = free_port()
+    url = f"http://127.0.0.1:{port}/mcp"
+    with server(workers, data_path, port) as process:
+        pids = child_pids(process.pid) if workers > 1 else []
+        with multiprocessing.Pool(args.clients) as pool:
+            start_at = time.time() + 2.0
+            results = pool.starmap(
+                load, [(url, args.concurrency, start_at, args.duration)] * args.clients
+            )
+        memory = {"server": memory_kb(process.pid)}
+        memory["workers"] = [memory_kb(pid) for pid in pids]
+
+        start = time.perf_counter()
+        process.send_signal(signal.SIGTERM)
+        process.wait(timeout=30)
+        stop_s = time.perf_counter() - start
+
+    latencies = sorted(latency for result in results for latency in result[0])
+    total = {
+        key: memory["server"][key] + sum(worker[key] for worker in memory["workers"])
+        for key in ("rss", "pss", "private")
+    }
+    return {
+        "workers": workers,
+        "requests_per_s": len(latencies) / args.duration,
+        "p50_ms": 1e3 * statistics.median(latencies),
+        "p99_ms": 1e3 * latencies[int(0.99 * (len(latencies) - 1))],
+        "errors": sum(result[1] for result in results),
+        "memory_mb": {key: value / 1024 for key, value in total.items()},
+        "worker_private_mb": [worker["private"] / 1024 for worker in memory["workers"]],
+        "stop_s": stop_s,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="MCP server worker scaling benchmark")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--records", type=int, default=100000)
+    parser.add_argument("--clients", type=int, default=4)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--duration", type=float, default=10.0)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        data_path = os.path.join(tmp, "animals.json")
+        with open(data_path, "w") as f:
+            json.dump(synthetic_animals(args.records), f, ensure_ascii=False)
+        results = [run(workers, args, data_path) for workers in args.workers]
+
+    print(
+        json.dumps(
+            {"cpus": len(os.sched_getaffinity(0)), "records": args.records, "runs": results},
+            indent=2,
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
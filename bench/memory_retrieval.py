@@ -0,0 +1,240 @@
+"""
+Memory preloading cost per turn, PreloadMemoryTool vs the cached, bounded tool.
+
+Simulates visitors holding multi-turn conversations with a greeter built
+like the concierge's root agent: each turn calls a scripted model twice
+(the add_prompt_to_state call, then the answer), and the memory tool runs
+before both. The fake memory bank holds --memories past facts about the
+user, and every search takes --search-latency seconds. Halfway through each
+conversation a new memory write is reported, which must refresh the cache.
+
+- uncached: ADK's PreloadMemoryTool, as the root agent used.
+- cached: the concierge's CachedPreloadMemoryTool with a --max-tokens budget.
+
+Prompt tokens are estimated over the text the model receives. Before the
+runs, the cached tool is checked to search again when a message turns to
+a topic none of its cached memories mention, and only then.
+
+    python bench/memory_retrieval.py --sessions 20 --turns 6
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import random
+import statistics
+import sys
+import time
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# Importing the agent package builds its agents, which require this setting.
+os.environ.setdefault("MCP_SERVER_URL", "http://127.0.0.1:9/mcp")
+os.environ.setdefault("LAZY_INIT", "TRUE")
+
+from google.adk import Agent  # noqa: E402
+from google.adk.memory.memory_entry import MemoryEntry  # noqa: E402
+from google.adk.memory.base_memory_service import SearchMemoryResponse  # noqa: E402
+from google.adk.models import LlmRequest, LlmResponse  # noqa: E402
+from google.adk.runners import Runner  # noqa: E402
+from google.adk.sessions import InMemorySessionService  # noqa: E402
+from google.adk.tools.preload_memory_tool import PreloadMemoryTool  # noqa: E402
+from google.adk.tools.tool_context import ToolContext  # noqa: E402
+from google.genai import types  # noqa: E402
+
+from fakes import FakeMemoryService, ScriptedLlm, text_response  # noqa: E402
+from zoo_concierge_agent.memory_retrieval import (  # noqa: E402
+    CachedPreloadMemoryTool,
+    estimate_tokens,
+)
+
+ANIMALS = ["사자", "펭귄", "기린", "호랑이", "북극곰", "lion", "penguin", "giraffe"]
+FACTS = [
+    "좋아하는 동물은 {}이고 지난번에 {} 우리 앞에서 사진을 찍었다.",
+    "아이와 함께 {} 먹이 주기 쇼를 예약했고 {} 설명을 재미있어했다.",
+    "The visitor asked how old the {} is and wanted to see the {} again.",
+]
+PROMPTS = ["사자 어디 있어?", "펭귄 쇼 언제야?", "How old is the giraffe?", "호랑이는 뭘 먹어?"]
+
+
+def make_memories(count: int) -> list[MemoryEntry]:
+    rng = random.Random(0)
+    memories = []
+    for i in range(count):
+        animal = rng.choice(ANIMALS)
+        text = rng.choice(FACTS).format(animal, animal)
+        memories.append(
+            MemoryEntry(
+                author="user",
+                content=types.Content(role="user", parts=[types.Part(text=text)]),
+                timestamp=f"2026-09-{1 + i % 28:02d}T10:00:00",
+            )
+        )
+    return memories
+
+
+def add_prompt_to_state(tool_context: ToolContext, prompt: str) -> dict[str, str]:
+    tool_context.state["PROMPT"] = prompt
+    return {"status": "success"}
+
+
+# Checks that a message on a new topic searches memory again, and adds what it finds.
+async def check_topic_change():
+    memories = {
+        "lion": MemoryEntry(
+            author="user",
+            content=types.Content(role="user", parts=[types.Part(text="The lion is my favorite.")]),
+        ),
+        "giraffe": MemoryEntry(
+            author="user",
+            content=types.Content(
+                role="user", parts=[types.Part(text="We fed the giraffe last time.")]
+            ),
+        ),
+    }
+    queries = []
+
+    # Stands in for a memory bank that only returns memories matching the query.
+    async def search_memory(query: str) -> SearchMemoryResponse:
+        queries.append(query)
+        return SearchMemoryResponse(
+            memories=[memory for word, memory in memories.items() if word in query.lower()]
+        )
+
+    tool = CachedPreloadMemoryTool()
+    session = SimpleNamespace(id="s1")
+
+    async def ask(text: str) -> str:
+        tool_context = SimpleNamespace(
+            _invocation_context=SimpleNamespace(app_name="bench", user_id="u1", session=session),
+            user_content=types.Content(role="user", parts=[types.Part(text=text)]),
+            search_memory=search_memory,
+            invocation_id=text,
+        )
+        request = LlmRequest()
+        await tool.process_llm_request(tool_context=tool_context, llm_request=request)
+        return " ".join(part.text for content in request.contents for part in content.parts)
+
+    assert "lion" in await ask("Where is the lion?")
+    assert "giraffe" not in await ask("When does the lion eat?"), "searched on the same topic"
+    assert len(queries) == 1, "searched again on the same topic"
+    injected = await ask("How tall is the giraffe?")
+    assert len(queries) == 2, "did not search on a new topic"
+    assert "giraffe" in injected and "lion" in injected, "new topic's memories were not merged"
+    await ask("How tall is the giraffe?")
+    assert len(queries) == 2, "searched the same message twice"
+    assert tool.metrics.topic_searches == 1
+    assert tool.injected("Where is the lion?") and not tool.injected("unknown")
+
+
+async def run_mode(args, cached: bool) -> dict:
+    memory = FakeMemoryService(
+        memories=make_memories(args.memories), search_latency=args.search_latency
+    )
+    writes: dict[tuple[str, str], int] = {}
+    prompt_tokens = []
+
+    def greet(request: LlmRequest) -> LlmResponse:
+        prompt_tokens.append(
+            sum(
+                estimate_tokens(part.text)
+                for content in request.contents
+                for part in content.parts or []
+                if part.text
+            )
+        )
+        # Preloaded memories may follow the message or function response.
+        recent = [part for content in request.contents[-2:] for part in content.parts or []]
+        if any(part.function_response for part in recent):
+            return text_response("안녕하세요! 무엇을 도와드릴까요?")
+        prompt = " ".join(
+            part.text for part in recent if part.text and "<PAST_CONVERSATIONS>" not in part.text
+        )
+        return LlmResponse(
+            content=types.Content(
+                role="model",
+                parts=[
+                    types.Part.from_function_call(
+                        name="add_prompt_to_state", args={"prompt": prompt}
+                    )
+                ],
+            )
+        )
+
+    tool = (
+        CachedPreloadMemoryTool(
+            generation=lambda app, user: writes.get((app, user), 0),
+            max_tokens=args.max_tokens,
+        )
+        if cached
+        else PreloadMemoryTool()
+    )
+    greeter = Agent(
+        name="greeter",
+        model=ScriptedLlm(responder=greet, latency=args.model_latency),
+        tools=[add_prompt_to_state, tool],
+    )
+    runner = Runner(
+        app_name="memory_bench",
+        agent=greeter,
+        session_service=InMemorySessionService(),
+        memory_service=memory,
+    )
+    latencies = []
+
+    async def conversation(index: int):
+        user_id = f"u{index}"
+        session = await runner.session_service.create_session(
+            app_name="memory_bench", user_id=user_id
+        )
+        for turn in range(args.turns):
+            if turn == args.turns // 2:
+                # The memory writer saved this conversation's earlier turns.
+                writes[("memory_bench", user_id)] = writes.get(("memory_bench", user_id), 0) + 1
+            message = types.Content(
+                role="user", parts=[types.Part(text=PROMPTS[(index + turn) % len(PROMPTS)])]
+            )
+            start = time.perf_counter()
+            async for _ in runner.run_async(
+                user_id=user_id, session_id=session.id, new_message=message
+            ):
+                pass
+            latencies.append(time.perf_counter() - start)
+
+    await asyncio.gather(*(conversation(i) for i in range(args.sessions)))
+
+    latencies.sort()
+    result = {
+        "turn_ms_p50": 1000 * statistics.median(latencies),
+        "turn_ms_p99": 1000 * latencies[int(0.99 * (len(latencies) - 1))],
+        "memory_searches_per_turn": memory.searches / len(latencies),
+        "prompt_tokens_avg": statistics.mean(prompt_tokens),
+    }
+    if cached:
+        result["retrieval"] = tool.metrics.as_dict()
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Memory preloading benchmark")
+    parser.add_argument("--sessions", type=int, default=20)
+    parser.add_argument("--turns", type=int, default=6)
+    parser.add_argument("--memories", type=int, default=60)
+    parser.add_argument("--search-latency", type=float, default=0.3)
+    parser.add_argument("--model-latency", type=float, default=0.2)
+    parser.add_argument("--max-tokens", type=int, default=400)
+    args = parser.parse_args()
+
+    logging.disable(logging.WARNING)
+    asyncio.run(check_topic_change())
+    results = {
+        mode: asyncio.run(run_mode(args, mode == "cached"))
+        for mode in ("uncached", "cached")
+    }
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,156 @@
+"""
+Memory-save latency on the response path, inline vs background writer.
+
+Simulates visitors holding multi-turn conversations at the same time. After
+every turn the root agent's after_agent_callback saves the session to a fake
+memory bank whose writes take --write-latency seconds and fail with
+probability --failure-rate.
+
+- inline: the callback awaits `add_session_to_memory` itself.
+- background: the callback submits to the concierge's MemoryWriter, and
+  each conversation ends with a flush, as when a session is closed.
+- shutdown: as background, but with no flush; once every conversation's
+  last turn is submitted the process gets SIGTERM, as Cloud Run sends when
+  it scales an instance down, and the writer drains its queue.
+
+Reported per mode: the callback's latency, the number of memory writes per
+turn, and for the writer its metrics (queue depth, retries, drops). `lost`
+counts sessions whose stored events differ from the session's own.
+
+    python bench/memory_writer.py --sessions 50 --turns 6
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import random
+import signal
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# Importing the agent package builds its agents, which require this setting.
+os.environ.setdefault("MCP_SERVER_URL", "http://127.0.0.1:9/mcp")
+os.environ.setdefault("LAZY_INIT", "TRUE")
+
+from google.adk.events import Event  # noqa: E402
+from google.adk.sessions import Session  # noqa: E402
+from google.genai import types  # noqa: E402
+
+from fakes import FakeMemoryService  # noqa: E402
+from zoo_concierge_agent.memory_writer import MemoryWriter  # noqa: E402
+from zoo_concierge_agent.tracing import flush_on_sigterm  # noqa: E402
+
+
+def turn_events(turn: int) -> list[Event]:
+    return [
+        Event(
+            author=author,
+            content=types.Content(role=role, parts=[types.Part(text=f"{author} {turn}")]),
+        )
+        for author, role in (("user", "user"), ("greeter", "model"))
+    ]
+
+
+async def run_mode(args, mode: str) -> dict:
+    background = mode != "inline"
+    memory = FakeMemoryService(
+        latency=args.write_latency, failure_rate=args.failure_rate, deltas=args.deltas
+    )
+    writer = MemoryWriter(
+        debounce=args.debounce,
+        max_delay=args.max_delay,
+        max_pending=args.max_pending,
+        retry_backoff=0.05,
+    )
+    rng = random.Random(0)
+    latencies, depths = [], []
+
+    async def save(session: Session):
+        start = time.perf_counter()
+        if background:
+            await writer.submit(memory, session)
+            depths.append(writer.queue_depth)
+        else:
+            try:
+                await memory.add_session_to_memory(session)
+            except Exception:
+                pass  # The inline callback logs the error and moves on.
+        latencies.append(time.perf_counter() - start)
+
+    async def conversation(index: int) -> Session:
+        session = Session(id=f"s{index}", app_name="memory_bench", user_id=f"u{index}")
+        await asyncio.sleep(rng.uniform(0, args.think_time))
+        for turn in range(args.turns):
+            session.events.extend(turn_events(turn))
+            await save(session)
+            await asyncio.sleep(rng.uniform(0.5, 1.5) * args.think_time)
+        if mode == "background":
+            await writer.flush(session, memory)
+        return session
+
+    start = time.perf_counter()
+    sessions = await asyncio.gather(*(conversation(i) for i in range(args.sessions)))
+    if mode == "shutdown":
+        # Stands in for uvicorn's handler, which would stop the process.
+        signal.signal(signal.SIGTERM, lambda signum, frame: None)
+        flush_on_sigterm(writer.drain)
+        signal.raise_signal(signal.SIGTERM)
+        # The drain wrote the sessions in flight too; their cancelled writes
+        # must not land (or crash the worker) when this loop runs again.
+        await asyncio.sleep(2 * args.write_latency)
+        assert not writer._worker.done(), "the writer's worker stopped after the drain"
+        assert writer.queue_depth == 0, "the drain left sessions queued"
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    turns = args.sessions * args.turns
+    result = {
+        "callback_ms_p50": 1000 * statistics.median(latencies),
+        "callback_ms_p99": 1000 * latencies[int(0.99 * (len(latencies) - 1))],
+        "memory_calls_per_turn": memory.calls / turns,
+        "lost": sum(
+            [e.id for e in memory.events.get(s.id, [])] != [e.id for e in s.events]
+            for s in sessions
+        ),
+        "elapsed_s": elapsed,
+    }
+    if mode == "shutdown":
+        assert result["lost"] == 0, f"{result['lost']} sessions lost at shutdown"
+    if background:
+        result["writer"] = {
+            **writer.metrics.as_dict(),
+            "queue_depth_avg": statistics.mean(depths),
+        }
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Background memory writer benchmark")
+    parser.add_argument("--sessions", type=int, default=30)
+    parser.add_argument("--turns", type=int, default=5)
+    parser.add_argument("--think-time", type=float, default=0.2)
+    parser.add_argument("--write-latency", type=float, default=0.5)
+    parser.add_argument("--failure-rate", type=float, default=0.1)
+    parser.add_argument("--debounce", type=float, default=0.5)
+    parser.add_argument("--max-delay", type=float, default=2.0)
+    parser.add_argument("--max-pending", type=int, default=1000)
+    parser.add_argument(
+        "--no-deltas", dest="deltas", action="store_false",
+        help="Fake a memory service without add_events_to_memory.",
+    )
+    args = parser.parse_args()
+
+    logging.disable(logging.WARNING)
+    results = {
+        mode: asyncio.run(run_mode(args, mode))
+        for mode in ("inline", "background", "shutdown")
+    }
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,214 @@
+"""
+End-to-end latency of the concierge research stage, sequential vs parallel.
+
+Both pipelines run the researcher and then the response formatter with
+scripted models and stubbed tools, so only the orchestration differs:
+
+- sequential: the original single researcher. It calls the zoo DB, waits,
+  then searches, then writes its findings.
+- parallel: ParallelResearchAgent runs a zoo researcher and a search
+  researcher at once. It cancels the search when the zoo has no such animal.
+
+Every model call takes --model-latency, the zoo DB --zoo-latency and the
+search --search-latency. --miss-rate of the turns ask about an animal the
+zoo does not have.
+
+    python bench/research_fanout.py --turns 200 --model-latency 0.4
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import random
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# Importing the agent package builds its agents, which require this setting.
+os.environ.setdefault("MCP_SERVER_URL", "http://127.0.0.1:9/mcp")
+os.environ.setdefault("LAZY_INIT", "TRUE")
+
+from google.adk import Agent  # noqa: E402
+from google.adk.agents import SequentialAgent  # noqa: E402
+from google.adk.models import LlmRequest, LlmResponse  # noqa: E402
+from google.adk.runners import InMemoryRunner  # noqa: E402
+from google.adk.tools import FunctionTool  # noqa: E402
+from google.genai import types  # noqa: E402
+
+from fakes import ScriptedLlm, text_response  # noqa: E402
+from zoo_concierge_agent.parallel_research import ParallelResearchAgent  # noqa: E402
+
+ZOO = {"lion": [{"name": "Leo", "age": 7, "enclosure": "The Big Cat Plains"}]}
+
+
+def call_response(name: str, args: dict) -> LlmResponse:
+    return LlmResponse(
+        content=types.Content(
+            role="model", parts=[types.Part.from_function_call(name=name, args=args)]
+        )
+    )
+
+
+def tool_results(request: LlmRequest) -> list:
+    return [
+        part.function_response
+        for content in request.contents
+        for part in content.parts or []
+        if part.function_response
+    ]
+
+
+def zoo_is_empty(results: list) -> bool:
+    return not any(
+        result.response.get("structuredContent", {}).get("result")
+        for result in results
+        if result.name == "get_animals_by_species"
+    )
+
+
+def build_tools(zoo_latency: float, search_latency: float, counts: dict):
+    async def get_animals_by_species(species: str) -> dict:
+        await asyncio.sleep(zoo_latency)
+        return {"structuredContent": {"result": ZOO.get(species, [])}}
+
+    async def google_search(query: str) -> dict:
+        await asyncio.sleep(search_latency)
+        counts["searches"] += 1
+        return {"result": f"{query}: lives 10-14 years, eats meat."}
+
+    return FunctionTool(get_animals_by_species), FunctionTool(google_search)
+
+
+def species_of(request: LlmRequest) -> str:
+    text = " ".join(
+        part.text
+        for content in request.contents
+        for part in content.parts or []
+        if part.text
+    )
+    return "lion" if "lion" in text else "dragon"
+
+
+def sequential_researcher(zoo_tool, search_tool, latency: float):
+    def respond(request: LlmRequest) -> LlmResponse:
+        results = tool_results(request)
+        species = species_of(request)
+        if not results:
+            return call_response("get_animals_by_species", {"species": species})
+        if len(results) == 1 and not zoo_is_empty(results):
+            return call_response("google_search", {"query": species})
+        return text_response("Findings: ...")
+
+    return Agent(
+        name="comprehensive_researcher",
+        model=ScriptedLlm(responder=respond, latency=latency),
+        instruction="Research the animal.",
+        tools=[zoo_tool, search_tool],
+        output_key="research_data",
+    )
+
+
+def parallel_researcher(zoo_tool, search_tool, latency: float):
+    def respond_zoo(request: LlmRequest) -> LlmResponse:
+        if not tool_results(request):
+            return call_response("get_animals_by_species", {"species": species_of(request)})
+        return text_response("Zoo findings: ...")
+
+    def respond_search(request: LlmRequest) -> LlmResponse:
+        if not tool_results(request):
+            return call_response("google_search", {"query": species_of(request)})
+        return text_response("General findings: ...")
+
+    return ParallelResearchAgent(
+        name="comprehensive_researcher",
+        sub_agents=[
+            Agent(
+                name="zoo_researcher",
+                model=ScriptedLlm(responder=respond_zoo, latency=latency),
+                instruction="Look up the animal at the zoo.",
+                tools=[zoo_tool],
+                output_key="zoo_research",
+            ),
+            Agent(
+                name="web_researcher",
+                model=ScriptedLlm(responder=respond_search, latency=latency),
+                instruction="Search for the animal.",
+                tools=[search_tool],
+                output_key="web_research",
+            ),
+        ],
+    )
+
+
+def build_pipeline(mode: str, args, counts: dict) -> SequentialAgent:
+    zoo_tool, search_tool = build_tools(args.zoo_latency, args.search_latency, counts)
+    build = parallel_researcher if mode == "parallel" else sequential_researcher
+    return SequentialAgent(
+        name="zoo_concierge_agent",
+        sub_agents=[
+            build(zoo_tool, search_tool, args.model_latency),
+            Agent(
+                name="response_formatter",
+                model=ScriptedLlm(latency=args.model_latency),
+                instruction="Format the research.",
+            ),
+        ],
+    )
+
+
+async def run_mode(mode: str, args) -> dict:
+    counts = {"searches": 0}
+    runner = InMemoryRunner(
+        agent=build_pipeline(mode, args, counts), app_name="fanout_bench"
+    )
+    rng = random.Random(0)
+    semaphore = asyncio.Semaphore(args.concurrency)
+
+    async def turn() -> float:
+        species = "dragon" if rng.random() < args.miss_rate else "lion"
+        async with semaphore:
+            session = await runner.session_service.create_session(
+                app_name="fanout_bench", user_id="bench"
+            )
+            message = types.Content(
+                role="user", parts=[types.Part(text=f"Tell me about the {species}")]
+            )
+            start = time.perf_counter()
+            async for _ in runner.run_async(
+                user_id="bench", session_id=session.id, new_message=message
+            ):
+                pass
+            return time.perf_counter() - start
+
+    latencies = sorted(await asyncio.gather(*(turn() for _ in range(args.turns))))
+    return {
+        "p50_ms": 1000 * statistics.median(latencies),
+        "p99_ms": 1000 * latencies[int(0.99 * (len(latencies) - 1))],
+        # Searches that ran to completion; the rest were skipped or cancelled.
+        "searches_completed": counts["searches"],
+    }
+
+
+async def run(args) -> dict:
+    return {mode: await run_mode(mode, args) for mode in ("sequential", "parallel")}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Research fan-out benchmark")
+    parser.add_argument("--turns", type=int, default=100)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--model-latency", type=float, default=0.4)
+    parser.add_argument("--zoo-latency", type=float, default=0.05)
+    parser.add_argument("--search-latency", type=float, default=0.6)
+    parser.add_argument("--miss-rate", type=float, default=0.2)
+    args = parser.parse_args()
+
+    logging.disable(logging.WARNING)
+    print(json.dumps(asyncio.run(run(args)), indent=2))
+
+
+if __name__ == "__main__":
+    main()
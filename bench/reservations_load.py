@@ -0,0 +1,149 @@
+"""
+Load test for the show server's reservation engine.
+
+Fires thousands of concurrent `reserve_show` calls through FastMCP's
+`call_tool` (sync tools run on worker threads, as in the server), with a
+share of them retried under the same idempotency key, against a fresh
+journal. Bookings are spread over the daily showings of the next --days
+days, each with its own seats. Demand exceeds capacity, so showings sell
+out. It then checks that:
+
+- no showing holds more seats than its capacity;
+- a showing that turned a party away has fewer seats left than the largest party;
+- seats confirmed to callers, the book's counts and the journal agree;
+- every retry got the original reservation back, and was not booked twice;
+- a book reopened from the journal has the same counts.
+
+--shared books as the server's workers do (WORKERS=2): counts are read from
+the journal, and each booking is one write transaction.
+
+    python bench/reservations_load.py --requests 5000 --capacity 50 --days 3
+"""
+
+import argparse
+import asyncio
+import collections
+import datetime
+import json
+import logging
+import os
+import random
+import sqlite3
+import statistics
+import tempfile
+import time
+
+from fastmcp.exceptions import ToolError
+
+from servers import load_server_module
+
+
+async def run(args) -> dict:
+    capacity, max_party = args.capacity, args.max_party
+    tmp = tempfile.mkdtemp()
+    os.environ["RESERVATIONS_PATH"] = os.path.join(tmp, "reservations.db")
+    os.environ["SHOW_CAPACITY"] = str(capacity)
+    os.environ["WORKERS"] = "2" if args.shared else "1"
+    module = load_server_module("zoo_show_mcp_server")
+    show_ids = [show["show_id"] for show in module.show_data.current.records]
+    # From tomorrow, so no showing has started yet.
+    today = datetime.datetime.now(module.show_schedule(module.show_data.current).default_timezone)
+    dates = [
+        (today.date() + datetime.timedelta(days=n)).isoformat()
+        for n in range(1, args.days + 1)
+    ]
+    showings = [(show_id, date) for show_id in show_ids for date in dates]
+
+    rng = random.Random(0)
+    calls = []
+    for i in range(args.requests):
+        show_id, date = rng.choice(showings)
+        arguments = {
+            "show_id": show_id,
+            "date": date,
+            "party_size": rng.randint(1, max_party),
+            "idempotency_key": f"booking-{i}",
+        }
+        calls.append(arguments)
+        if rng.random() < args.retry_rate:
+            calls.append(dict(arguments))
+    rng.shuffle(calls)
+
+    latencies = []
+    confirmed = {}
+    rejected = collections.Counter()
+
+    async def reserve(arguments):
+        start = time.perf_counter()
+        try:
+            result = await module.mcp.call_tool("reserve_show", arguments)
+            confirmed.setdefault(arguments["idempotency_key"], []).append(
+                result.structured_content
+            )
+        except ToolError as e:
+            rejected[arguments["show_id"], arguments["date"]] += 1
+            # A retry may be rejected only if its original was rejected too.
+            confirmed.setdefault(arguments["idempotency_key"], [])
+            assert "not enough seats" in str(e), e
+        latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(reserve(arguments) for arguments in calls))
+    elapsed = time.perf_counter() - start
+
+    book = module.reservation_book
+    seats = collections.Counter()
+    for key, results in confirmed.items():
+        assert len({result["reservation_id"] for result in results}) <= 1, key
+        if results:
+            seats[results[0]["show_id"], results[0]["show_date"]] += results[0]["party_size"]
+
+    journal = {
+        (show_id, show_date): total
+        for show_id, show_date, total in sqlite3.connect(os.environ["RESERVATIONS_PATH"]).execute(
+            "SELECT show_id, show_date, SUM(party_size) FROM reservations"
+            " GROUP BY show_id, show_date"
+        )
+    }
+    assert set(journal) <= set(showings), set(journal) - set(showings)
+    reopened = type(book)(os.environ["RESERVATIONS_PATH"])
+    for showing in showings:
+        booked = book.reserved(*showing)
+        assert booked <= capacity, showing
+        assert booked == seats[showing] == journal.get(showing, 0), showing
+        assert reopened.reserved(*showing) == booked, showing
+        if not book.shared:
+            assert book._reserved.get(showing, 0) == booked, showing
+        if rejected[showing]:
+            assert capacity - booked < max_party, showing
+
+    latencies.sort()
+    return {
+        "calls": len(calls),
+        "retries": len(calls) - args.requests,
+        "calls_per_s": len(calls) / elapsed,
+        "latency_ms_p50": 1000 * statistics.median(latencies),
+        "latency_ms_p99": 1000 * latencies[int(0.99 * (len(latencies) - 1))],
+        "seats_booked": sum(seats.values()),
+        "seats_total": capacity * len(showings),
+        "book": book.metrics(),
+        "invariants": "ok",
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Reservation engine load test")
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--capacity", type=int, default=50)
+    parser.add_argument("--retry-rate", type=float, default=0.2)
+    parser.add_argument("--max-party", type=int, default=4)
+    parser.add_argument("--days", type=int, default=3)
+    parser.add_argument("--shared", action="store_true")
+    args = parser.parse_args()
+
+    logging.disable(logging.ERROR)
+    print(json.dumps(asyncio.run(run(args)), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+import contextlib
+import importlib.util
+import os
+import socket
+import subprocess
+import sys
+import time
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+# Returns a TCP port that is free on localhost.
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+# Imports a server.py in-process under a unique module name.
+def load_server_module(server_dir: str):
+    """
+    Loads the `server.py` of an MCP server directory without starting it.
+
+    Args:
+        server_dir (str): Directory name under the repo root, e.g. "zoo_show_mcp_server".
+    """
+    directory = os.path.join(REPO_ROOT, server_dir)
+    spec = importlib.util.spec_from_file_location(
+        f"{server_dir}_server", os.path.join(directory, "server.py")
+    )
+    module = importlib.util.module_from_spec(spec)
+    # Sibling modules share names across servers, so they are unloaded again
+    # once this server holds its references to them.
+    loaded_before = set(sys.modules)
+    sys.path.insert(0, directory)
+    try:
+        spec.loader.exec_module(module)
+    finally:
+        sys.path.remove(directory)
+        for name in set(sys.modules) - loaded_before:
+            if (getattr(sys.modules[name], "__file__", None) or "").startswith(directory):
+                del sys.modules[name]
+    return module
+
+
+@contextlib.contextmanager
+def run_mcp_server(server_dir: str, port: int = 0, env: dict = None, timeout: float = 30.0):
+    """
+    Launches one of the repo's FastMCP `server.py` apps and yields its MCP URL.
+
+    Args:
+        server_dir (str): Directory name under the repo root, e.g. "zoo_animal_mcp_server".
+        port (int): Port to listen on; a free one is picked when 0.
+        env (dict): Extra environment variables for the server process.
+        timeout (float): Seconds to wait for the server to accept connections.
+    """
+    port = port or free_port()
+    process = subprocess.Popen(
+        [sys.executable, "server.py"],
+        cwd=os.path.join(REPO_ROOT, server_dir),
+        env={**os.environ, "PORT": str(port), **(env or {})},
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    try:
+        deadline = time.monotonic() + timeout
+        while True:
+            try:
+                socket.create_connection(("127.0.0.1", port), timeout=0.5).close()
+                break
+            except OSError:
+                if process.poll() is not None or time.monotonic() > deadline:
+                    raise RuntimeError(f"{server_dir} did not start on port {port}")
+                time.sleep(0.1)
+        yield f"http://127.0.0.1:{port}/mcp"
+    finally:
+        process.terminate()
+        process.wait()
@@ -0,0 +1,249 @@
+"""
+Query latency of the show server's schedule index against a linear scan.
+
+Synthetic multi-site schedules are generated at each size: sites in several
+timezones, each with daily shows and one-off dated shows over the next
+month, with times and durations in the free-text forms the data uses
+("02:15 PM", "14:15", "1 hour", "1시간 30분"). Three queries run against both:
+
+- next: the next 5 showings after a random time in the coming week.
+- window: showings on during a random 2-hour window, including running ones.
+- overlap: showings overlapping one random show, as check_show_conflicts does.
+
+The baseline parses every record's time and duration on each query and
+scans them all, as answering from the records alone would. Every query's
+results are compared between the two ("mismatches" should be 0).
+
+"sqlite" builds the same schedule from a SQLite store (python storage.py),
+as the server does: from the time fields SQLite extracts, loading records
+by id only for the showings returned. It is compared with building it from
+every record loaded into memory first, by build time and peak Python
+memory (tracemalloc), and its window results with the in-memory index's.
+
+    python bench/show_schedule.py --sizes 1000 10000 100000 --queries 500
+"""
+
+import argparse
+import datetime
+import json
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from zoneinfo import ZoneInfo
+
+from servers import REPO_ROOT
+
+sys.path.insert(0, os.path.join(REPO_ROOT, "zoo_show_mcp_server"))
+
+from schedule import (  # noqa: E402
+    DEFAULT_DURATION_MINUTES,
+    SCHEDULE_FIELDS,
+    ShowSchedule,
+    Slot,
+    load_records,
+    parse_clock,
+    parse_duration,
+)
+from storage import SqliteStore, build_sqlite  # noqa: E402
+
+SITES = ["Asia/Seoul", "America/New_York", "Europe/London", "Australia/Sydney"]
+DURATIONS = ["20 mins", "30 mins", "45 minutes", "1 hour", "1h 15m", "1시간 30분", "90"]
+SPECIES = ["lion", "penguin", "giraffe", "elephant", "bear", "tiger", "seal", "otter"]
+WINDOW = datetime.timedelta(hours=2)
+
+
+def clock_text(minute: int, rng: random.Random) -> str:
+    hour, minute = divmod(minute, 60)
+    if rng.random() < 0.5:
+        return f"{hour:02d}:{minute:02d}"
+    return f"{(hour - 1) % 12 + 1:02d}:{minute:02d} {'AM' if hour < 12 else 'PM'}"
+
+
+def synthetic_shows(size: int, today: datetime.date, rng: random.Random) -> list:
+    shows = []
+    for i in range(size):
+        record = {
+            "show_id": f"S{i:06d}",
+            "name": f"Show {i}",
+            "species": rng.choice(SPECIES),
+            "time": clock_text(rng.randrange(8 * 60, 20 * 60, 5), rng),
+            "duration": rng.choice(DURATIONS),
+            "location": f"Stage {rng.randrange(40)}",
+            "timezone": rng.choice(SITES),
+        }
+        # A quarter are one-off showings on a day of the next month.
+        if rng.random() < 0.25:
+            record["date"] = (today + datetime.timedelta(days=rng.randrange(30))).isoformat()
+        shows.append(record)
+    return shows
+
+
+# The baseline: reads a record's showings on the days around a time range, from its text fields.
+def linear_slots(records, low: datetime.datetime, high: datetime.datetime):
+    def load(ids):
+        return [records[record_id] for record_id in ids]
+
+    for record_id, record in enumerate(records):
+        start_minute = parse_clock(record.get("time"))
+        if start_minute is None:
+            continue
+        duration = parse_duration(record.get("duration")) or DEFAULT_DURATION_MINUTES
+        tz = ZoneInfo(record["timezone"])
+        if record.get("date"):
+            days = [datetime.date.fromisoformat(record["date"])]
+        else:
+            first = low.astimezone(tz).date() - datetime.timedelta(days=1)
+            last = high.astimezone(tz).date()
+            days = [first + datetime.timedelta(days=n) for n in range((last - first).days + 1)]
+        for day in days:
+            start = datetime.datetime.combine(day, datetime.time(), tz)
+            start += datetime.timedelta(minutes=start_minute)
+            yield Slot(start, start + datetime.timedelta(minutes=duration), record_id, load)
+
+
+def linear_next(records, when, count):
+    slots = [s for s in linear_slots(records, when, when + datetime.timedelta(days=1)) if s.start >= when]
+    return sorted(slots, key=lambda s: (s.start, s.record["show_id"]))[:count]
+
+
+def linear_running(records, low, high):
+    slots = [s for s in linear_slots(records, low, high) if s.start < high and s.end > low]
+    return sorted(slots, key=lambda s: (s.start, s.record["show_id"]))
+
+
+def keys(slots) -> list:
+    return sorted((slot.start, slot.record["show_id"]) for slot in slots)
+
+
+# Showings at the same instant may be cut at the count in either order, so only starts must match.
+def starts(slots) -> list:
+    return [slot.start for slot in slots]
+
+
+def timed(fn, args_list) -> tuple:
+    latencies, results = [], []
+    for args in args_list:
+        start = time.perf_counter()
+        results.append(fn(*args))
+        latencies.append(time.perf_counter() - start)
+    latencies.sort()
+    return results, {
+        "p50_us": 1e6 * statistics.median(latencies),
+        "p99_us": 1e6 * latencies[int(0.99 * (len(latencies) - 1))],
+    }
+
+
+# Times a build, then repeats it under tracemalloc, which slows it, for its peak memory.
+def measured(build) -> tuple:
+    start = time.perf_counter()
+    result = build()
+    elapsed = time.perf_counter() - start
+    tracemalloc.start()
+    build()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, {"build_ms": 1e3 * elapsed, "peak_kb": peak / 1024}
+
+
+def window_dicts(schedule: ShowSchedule, low: datetime.datetime) -> list:
+    slots = list(schedule.running_between(low, low + WINDOW))
+    load_records(slots)
+    return [slot.as_dict(low) for slot in slots]
+
+
+def sqlite_check(records, schedule: ShowSchedule, times) -> dict:
+    with tempfile.TemporaryDirectory() as tmp:
+        json_path, db_path = os.path.join(tmp, "shows.json"), os.path.join(tmp, "shows.db")
+        with open(json_path, "w") as f:
+            json.dump(records, f)
+        build_sqlite(json_path, db_path)
+        store = SqliteStore(db_path, "name")
+        projected, projected_stats = measured(
+            lambda: ShowSchedule(store.project(SCHEDULE_FIELDS), store.get_records, SITES[0], False)
+        )
+        _, loaded_stats = measured(
+            lambda: ShowSchedule.from_records(store._fetch(sorted(store._all_ids())), SITES[0], False)
+        )
+        mismatches = sum(
+            keys(projected.running_between(low, low + WINDOW))
+            != keys(schedule.running_between(low, low + WINDOW))
+            for low in times
+        )
+        _, query_stats = timed(lambda low: window_dicts(projected, low), [(low,) for low in times])
+        _, memory_stats = timed(lambda low: window_dicts(schedule, low), [(low,) for low in times])
+    return {
+        "projected": projected_stats,
+        "all_records": loaded_stats,
+        "window_with_records": query_stats,
+        "window_with_records_in_memory": memory_stats,
+        "mismatches": mismatches,
+    }
+
+
+def run_size(size: int, queries: int, rng: random.Random) -> dict:
+    now = datetime.datetime.now(ZoneInfo(SITES[0])).replace(second=0, microsecond=0)
+    records = synthetic_shows(size, now.date(), rng)
+
+    start = time.perf_counter()
+    schedule = ShowSchedule.from_records(records, SITES[0], by_species=False)
+    build_ms = 1e3 * (time.perf_counter() - start)
+
+    times = [now + datetime.timedelta(minutes=rng.randrange(7 * 24 * 60)) for _ in range(queries)]
+    picked = [rng.randrange(size) for _ in range(queries)]
+    overlaps = [schedule.occurrence(record_id, when) for record_id, when in zip(picked, times)]
+    # Fewer baseline runs at large sizes, where each one scans every record.
+    linear_queries = max(10, min(queries, 2_000_000 // size))
+
+    result = {"records": size, "build_ms": build_ms, "mismatches": 0}
+    cases = {
+        "next": (
+            lambda when: schedule.next_shows(when, 5),
+            lambda when: linear_next(records, when, 5),
+            [(when,) for when in times],
+            starts,
+        ),
+        "window": (
+            lambda low: list(schedule.running_between(low, low + WINDOW)),
+            lambda low: linear_running(records, low, low + WINDOW),
+            [(when,) for when in times],
+            keys,
+        ),
+        "overlap": (
+            lambda slot: [s for s in schedule.running_between(slot.start, slot.end) if s.record_id != slot.record_id],
+            lambda slot: [s for s in linear_running(records, slot.start, slot.end) if s.record_id != slot.record_id],
+            [(slot,) for slot in overlaps],
+            keys,
+        ),
+    }
+    for name, (indexed, linear, args_list, compared) in cases.items():
+        indexed_results, indexed_stats = timed(indexed, args_list)
+        linear_results, linear_stats = timed(linear, args_list[:linear_queries])
+        for got, expected in zip(indexed_results, linear_results):
+            if compared(got) != compared(expected):
+                result["mismatches"] += 1
+        result[name] = {
+            "indexed": indexed_stats,
+            "linear": linear_stats,
+            "speedup_p50": linear_stats["p50_us"] / indexed_stats["p50_us"],
+        }
+    result["sqlite"] = sqlite_check(records, schedule, times)
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Show schedule index benchmark")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--queries", type=int, default=500)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    print(json.dumps([run_size(size, args.queries, rng) for size in args.sizes], indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""
+Build time and per-query latency of the MCP servers' species resolver.
+
+Vocabularies of pseudo-random English and Korean species names are
+generated at each size; queries are drawn from them as exact keys,
+plurals, spacing variants and one-edit typos. The query cache is disabled
+so every lookup runs the full resolution path. Random vocabularies are
+dense, so a typo often lands as close to another key as to its own:
+"optimal" counts matches at least as close as the intended key, "accuracy"
+only the intended key itself.
+
+    python bench/species_resolution.py --sizes 1000 10000 100000 --queries 2000
+"""
+
+import argparse
+import json
+import os
+import random
+import statistics
+import sys
+import time
+
+from servers import REPO_ROOT
+
+sys.path.insert(0, os.path.join(REPO_ROOT, "zoo_animal_mcp_server"))
+
+from species_resolver import SpeciesResolver, edit_distance, normalize  # noqa: E402
+
+ENGLISH_SYLLABLES = ["ba", "ko", "ri", "ta", "len", "mo", "zu", "pha", "gri", "nor", "vel", "ant"]
+KOREAN_SYLLABLES = ["사", "자", "코", "끼", "리", "펭", "귄", "호", "랑", "이", "곰", "기", "린", "얼", "룩", "말"]
+
+
+def vocabulary(size: int, rng: random.Random) -> list:
+    words = set()
+    while len(words) < size:
+        if len(words) % 2:
+            words.add("".join(rng.choices(KOREAN_SYLLABLES, k=rng.randint(2, 4))))
+        else:
+            word = "".join(rng.choices(ENGLISH_SYLLABLES, k=rng.randint(2, 4)))
+            words.add(word if rng.random() < 0.8 else f"{word} {rng.choice(ENGLISH_SYLLABLES)}x")
+    return sorted(words)
+
+
+def variant(key: str, kind: str, rng: random.Random) -> str:
+    if kind == "exact":
+        return key
+    if kind == "plural":
+        return key + ("들" if "가" <= key[-1] <= "힣" else "s")
+    if kind == "spacing":
+        return f"  {key.upper()} " if " " not in key else key.replace(" ", "")
+    # One substitution typo.
+    i = rng.randrange(len(key))
+    return key[:i] + rng.choice("aeiou사리") + key[i + 1 :]
+
+
+def distance(a: str, b: str) -> int:
+    return edit_distance(normalize(a).replace(" ", ""), normalize(b).replace(" ", ""))
+
+
+def run(sizes: list, queries: int) -> dict:
+    rng = random.Random(0)
+    results = {}
+    for size in sizes:
+        keys = vocabulary(size, rng)
+        start = time.perf_counter()
+        resolver = SpeciesResolver(keys, cache_size=0)
+        built = time.perf_counter() - start
+
+        by_kind = {"build_ms": 1000 * built}
+        for kind in ["exact", "plural", "spacing", "typo"]:
+            samples, resolved, optimal = [], 0, 0
+            for _ in range(queries):
+                key = rng.choice(keys)
+                query = variant(key, kind, rng)
+                t = time.perf_counter()
+                match = resolver.resolve(query)
+                samples.append(time.perf_counter() - t)
+                resolved += bool(match and match.species == key)
+                optimal += bool(
+                    match
+                    and distance(query, match.species) <= distance(query, key)
+                )
+            samples.sort()
+            by_kind[kind] = {
+                "us_p50": 1e6 * statistics.median(samples),
+                "us_p99": 1e6 * samples[int(0.99 * (len(samples) - 1))],
+                "accuracy": resolved / queries,
+                "optimal": optimal / queries,
+            }
+        results[str(size)] = by_kind
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Species resolver benchmark")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--queries", type=int, default=2000)
+    args = parser.parse_args()
+    print(json.dumps(run(args.sizes, args.queries), indent=2, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
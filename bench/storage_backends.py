@@ -0,0 +1,134 @@
+"""
+Startup time, RSS and lookup latency of the MCP servers' storage backends.
+
+Synthetic animal datasets of each size are written as JSON and converted to
+SQLite with `storage.build_sqlite`. Each (backend, size) pair is opened in a
+fresh interpreter, so RSS and startup are not shared between samples.
+"Cold" lookups hit keys for the first time; "warm" ones repeat them.
+
+    python bench/storage_backends.py --sizes 1000 10000 100000 --lookups 2000
+"""
+
+import argparse
+import json
+import os
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+from servers import REPO_ROOT
+
+STORAGE_DIR = os.path.join(REPO_ROOT, "zoo_animal_mcp_server")
+SPECIES_COUNT = 500
+
+
+def synthetic_animals(size: int) -> list:
+    return [
+        {
+            "species": f"species-{i % SPECIES_COUNT}",
+            "species_kr": f"동물{i % SPECIES_COUNT}",
+            "name": f"Animal {i}",
+            "age": i % 30,
+            "enclosure": f"Enclosure {i % 97}",
+            "trail": f"Trail {i % 13}",
+        }
+        for i in range(size)
+    ]
+
+
+def rss_kb() -> int:
+    with open("/proc/self/status") as f:
+        for line in f:
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1])
+    return 0
+
+
+def run_child(args):
+    sys.path.insert(0, STORAGE_DIR)
+    import storage
+
+    baseline = rss_kb()
+    start = time.perf_counter()
+    store = storage.open_store(args.path, list_field="species")
+    opened = time.perf_counter()
+    after_open = rss_kb()
+
+    keys = [f"species-{i}" for i in range(SPECIES_COUNT)]
+    keys += [f"동물{i}" for i in range(SPECIES_COUNT)]
+    rng = random.Random(0)
+    rng.shuffle(keys)
+    lookups = [rng.choice(keys) for _ in range(args.lookups)]
+
+    def timed(sequence):
+        samples = []
+        for key in sequence:
+            t = time.perf_counter()
+            store.find_by_species(key)
+            samples.append(time.perf_counter() - t)
+        return samples
+
+    cold = timed(keys)
+    warm = timed(lookups)
+    print(
+        json.dumps(
+            {
+                "startup_ms": 1000 * (opened - start),
+                "rss_mb": (after_open - baseline) / 1024,
+                "cold_lookup_us_p50": 1e6 * statistics.median(cold),
+                "warm_lookup_us_p50": 1e6 * statistics.median(warm),
+                "peak_rss_mb": rss_kb() / 1024,
+            }
+        )
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Storage backend benchmark")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--lookups", type=int, default=2000)
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--path", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        run_child(args)
+        return
+
+    sys.path.insert(0, STORAGE_DIR)
+    import storage
+
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in args.sizes:
+            json_path = os.path.join(tmp, f"animals_{size}.json")
+            db_path = os.path.join(tmp, f"animals_{size}.db")
+            with open(json_path, "w") as f:
+                json.dump(synthetic_animals(size), f, ensure_ascii=False)
+            storage.build_sqlite(json_path, db_path)
+
+            for backend, path in [("json", json_path), ("sqlite", db_path)]:
+                output = subprocess.run(
+                    [
+                        sys.executable,
+                        os.path.abspath(__file__),
+                        "--child",
+                        "--path", path,
+                        "--lookups", str(args.lookups),
+                    ],
+                    capture_output=True,
+                    text=True,
+                    check=True,
+                ).stdout
+                results.setdefault(str(size), {})[backend] = json.loads(
+                    output.strip().splitlines()[-1]
+                )
+
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,179 @@
+"""
+Time to first token of the concierge's answers, buffered vs streamed.
+
+Models are scripted: each answer takes --model-latency seconds to its first
+chunk of --chunk-size characters, then --chunk-latency seconds per chunk.
+Time to first token (TTFT) is measured from sending the message to the
+first event with answer text. Two paths are measured:
+
+- formatter: a researcher followed by response_formatter, run with and
+  without the concierge's `enable_streaming` callback.
+- show_a2a: a local A2A stand-in for zoo_show_agent, built from its
+  agent.json and `enable_streaming` callback, called the way the concierge
+  calls it. The buffered case uses RemoteA2aAgent with a card that does
+  not advertise streaming. The streamed case uses StreamingRemoteA2aAgent
+  with the card as shipped.
+
+    python bench/streaming_ttft.py --turns 20
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import statistics
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# Importing the agent package builds its agents, which require this setting.
+os.environ.setdefault("MCP_SERVER_URL", "http://127.0.0.1:9/mcp")
+os.environ.setdefault("LAZY_INIT", "TRUE")
+
+import uvicorn  # noqa: E402
+from google.adk import Agent  # noqa: E402
+from google.adk.a2a.utils.agent_to_a2a import to_a2a  # noqa: E402
+from google.adk.agents import SequentialAgent  # noqa: E402
+from google.adk.agents.remote_a2a_agent import RemoteA2aAgent  # noqa: E402
+from google.adk.runners import InMemoryRunner  # noqa: E402
+from google.genai import types  # noqa: E402
+
+from fakes import ScriptedLlm, text_response  # noqa: E402
+from servers import REPO_ROOT, free_port  # noqa: E402
+from zoo_concierge_agent import streaming as concierge_streaming  # noqa: E402
+from zoo_show_agent import streaming as show_streaming  # noqa: E402
+
+ANSWER = (
+    "안녕하세요! 펭귄 먹이 주기 쇼는 매일 오전 11시에 펭귄 코브에서 열립니다. "
+    "약 20분 동안 진행되며, 사육사가 펭귄들의 습성과 먹이에 대해 설명해 드려요. "
+    "현재 남은 좌석은 32석입니다. 예약을 도와드릴까요? "
+) * 2
+
+
+def answer_text(event) -> bool:
+    parts = event.content.parts if event.content else []
+    return any(part.text and not part.thought for part in parts)
+
+
+async def time_turns(runner, author: str, turns: int, concurrency: int) -> dict:
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def turn():
+        async with semaphore:
+            session = await runner.session_service.create_session(
+                app_name=runner.app_name, user_id="bench"
+            )
+            message = types.Content(
+                role="user", parts=[types.Part(text="펭귄 쇼 알려줘")]
+            )
+            start = time.perf_counter()
+            first = None
+            async for event in runner.run_async(
+                user_id="bench", session_id=session.id, new_message=message
+            ):
+                if first is None and event.author == author and answer_text(event):
+                    first = time.perf_counter() - start
+            return first, time.perf_counter() - start
+
+    results = await asyncio.gather(*(turn() for _ in range(turns)))
+    ttft = sorted(first for first, _ in results)
+    total = sorted(elapsed for _, elapsed in results)
+    return {
+        "ttft_ms_p50": 1000 * statistics.median(ttft),
+        "ttft_ms_p99": 1000 * ttft[int(0.99 * (len(ttft) - 1))],
+        "total_ms_p50": 1000 * statistics.median(total),
+    }
+
+
+def scripted_model(args) -> ScriptedLlm:
+    return ScriptedLlm(
+        responder=lambda _: text_response(ANSWER),
+        latency=args.model_latency,
+        chunk_size=args.chunk_size,
+        chunk_latency=args.chunk_latency,
+    )
+
+
+async def run_formatter(args, streamed: bool) -> dict:
+    pipeline = SequentialAgent(
+        name="zoo_concierge_agent",
+        before_agent_callback=(
+            concierge_streaming.enable_streaming if streamed else None
+        ),
+        sub_agents=[
+            Agent(
+                name="comprehensive_researcher",
+                model=ScriptedLlm(
+                    responder=lambda _: text_response("ZOO DATA: ..."),
+                    latency=args.model_latency,
+                ),
+                output_key="research_data",
+            ),
+            Agent(name="response_formatter", model=scripted_model(args)),
+        ],
+    )
+    runner = InMemoryRunner(agent=pipeline, app_name="ttft_bench")
+    return await time_turns(runner, "response_formatter", args.turns, args.concurrency)
+
+
+def serve_show_stand_in(args, streamed: bool) -> str:
+    """Serves a stand-in zoo_show_agent over A2A and returns its agent card file."""
+    port = free_port()
+    with open(os.path.join(REPO_ROOT, "zoo_show_agent", "agent.json")) as f:
+        card = json.load(f)
+    card["url"] = f"http://127.0.0.1:{port}"
+    if not streamed:
+        card["capabilities"] = {}
+    card_path = os.path.join(tempfile.mkdtemp(), "agent.json")
+    with open(card_path, "w") as f:
+        json.dump(card, f)
+
+    show_agent = Agent(
+        name="zoo_show_agent",
+        model=scripted_model(args),
+        before_agent_callback=show_streaming.enable_streaming if streamed else None,
+    )
+    app = to_a2a(show_agent, host="127.0.0.1", port=port, agent_card=card_path)
+    server = uvicorn.Server(
+        uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning")
+    )
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.05)
+    return card_path
+
+
+async def run_show(args, card_path: str, streamed: bool) -> dict:
+    agent_class = (
+        concierge_streaming.StreamingRemoteA2aAgent if streamed else RemoteA2aAgent
+    )
+    remote = agent_class(name="zoo_show_agent", agent_card=card_path)
+    runner = InMemoryRunner(agent=remote, app_name="ttft_bench")
+    return await time_turns(runner, "zoo_show_agent", args.turns, args.concurrency)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Streaming time-to-first-token benchmark")
+    parser.add_argument("--turns", type=int, default=10)
+    parser.add_argument("--concurrency", type=int, default=5)
+    parser.add_argument("--model-latency", type=float, default=0.5)
+    parser.add_argument("--chunk-size", type=int, default=8)
+    parser.add_argument("--chunk-latency", type=float, default=0.02)
+    args = parser.parse_args()
+
+    logging.disable(logging.WARNING)
+    cards = {streamed: serve_show_stand_in(args, streamed) for streamed in (False, True)}
+    results = {}
+    for streamed, mode in ((False, "buffered"), (True, "streamed")):
+        results[mode] = {
+            "formatter": asyncio.run(run_formatter(args, streamed)),
+            "show_a2a": asyncio.run(run_show(args, cards[streamed], streamed)),
+        }
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
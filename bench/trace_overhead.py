@@ -0,0 +1,256 @@
+"""
+Tracing overhead per turn, and whether one trace spans agents, A2A and MCP.
+
+Each turn runs a researcher that calls the animal MCP server (launched as a
+subprocess) through a PooledMCPToolset, then a local A2A stand-in for
+zoo_show_agent, called the way the concierge calls it. Models are
+scripted. Every mode runs in its own process, since a process installs one
+tracer provider:
+
+- off: no exporter, as with TRACE_EXPORTER=none.
+- jsonl: TRACE_EXPORTER=jsonl in the agents and the MCP server.
+
+For jsonl, `linked_turns` counts turns whose MCP server span and A2A server
+span carry the trace id of the turn's agent spans, and `show_model_spans_linked`
+counts the show agent's model spans in those traces. The run fails unless
+every turn is linked, including the show agent's model calls behind the hop.
+
+    python bench/trace_overhead.py --turns 100
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# Importing the agent package builds its agents, which require this setting.
+os.environ.setdefault("MCP_SERVER_URL", "http://127.0.0.1:9/mcp")
+os.environ.setdefault("LAZY_INIT", "TRUE")
+os.environ.setdefault("TRACE_EXPORTER", "none")
+
+
+def call_response(name: str, args: dict):
+    from google.adk.models import LlmResponse
+    from google.genai import types
+
+    return LlmResponse(
+        content=types.Content(
+            role="model", parts=[types.Part.from_function_call(name=name, args=args)]
+        )
+    )
+
+
+def serve_show_stand_in(args, model) -> str:
+    """Serves a stand-in zoo_show_agent over A2A and returns its agent card file."""
+    import uvicorn
+    from google.adk import Agent
+    from google.adk.a2a.utils.agent_to_a2a import to_a2a
+
+    from servers import REPO_ROOT, free_port
+    from zoo_show_agent.callback_logging import trace_model_request, trace_model_response
+    from zoo_show_agent.tracing import A2aServerSpans
+
+    port = free_port()
+    with open(os.path.join(REPO_ROOT, "zoo_show_agent", "agent.json")) as f:
+        card = json.load(f)
+    card["url"] = f"http://127.0.0.1:{port}"
+    card["capabilities"] = {}
+    card_path = os.path.join(tempfile.mkdtemp(), "agent.json")
+    with open(card_path, "w") as f:
+        json.dump(card, f)
+
+    spans = A2aServerSpans()
+    show_agent = Agent(
+        name="zoo_show_agent",
+        model=model,
+        before_agent_callback=spans.before_agent_callback,
+        after_agent_callback=spans.after_agent_callback,
+        before_model_callback=trace_model_request,
+        after_model_callback=trace_model_response,
+    )
+    app = to_a2a(show_agent, host="127.0.0.1", port=port, agent_card=card_path)
+    server = uvicorn.Server(
+        uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning")
+    )
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.05)
+    return card_path
+
+
+async def run_turns(args, mcp_url: str) -> list[float]:
+    from google.adk import Agent
+    from google.adk.agents import SequentialAgent
+    from google.adk.agents.remote_a2a_agent import RemoteA2aAgent
+    from google.adk.models import LlmRequest
+    from google.adk.runners import InMemoryRunner
+    from google.adk.tools.mcp_tool.mcp_toolset import StreamableHTTPConnectionParams
+    from google.genai import types
+
+    from fakes import ScriptedLlm, text_response
+    from zoo_concierge_agent.callback_logging import (
+        trace_model_request,
+        trace_model_response,
+        trace_tool_call,
+        trace_tool_response,
+    )
+    from zoo_concierge_agent.mcp_session_pool import PooledMCPToolset
+    from zoo_concierge_agent.tracing import a2a_request_metadata
+
+    def research(request: LlmRequest):
+        if not any(part.function_response for part in request.contents[-1].parts or []):
+            return call_response("get_animals_by_species", {"species": "lion"})
+        return text_response("ZOO DATA: ...")
+
+    show_model = ScriptedLlm(
+        responder=lambda _: text_response("펭귄 쇼는 11시에 열려요."),
+        latency=args.model_latency,
+    )
+    card_path = serve_show_stand_in(args, show_model)
+    pipeline = SequentialAgent(
+        name="zoo_concierge_agent",
+        sub_agents=[
+            Agent(
+                name="zoo_researcher",
+                model=ScriptedLlm(responder=research, latency=args.model_latency),
+                tools=[
+                    PooledMCPToolset(
+                        connection_params=StreamableHTTPConnectionParams(url=mcp_url)
+                    )
+                ],
+                before_model_callback=trace_model_request,
+                after_model_callback=trace_model_response,
+                before_tool_callback=trace_tool_call,
+                after_tool_callback=trace_tool_response,
+            ),
+            RemoteA2aAgent(
+                name="zoo_show_agent",
+                agent_card=card_path,
+                a2a_request_meta_provider=a2a_request_metadata,
+            ),
+        ],
+    )
+    runner = InMemoryRunner(agent=pipeline, app_name="trace_bench")
+    latencies = []
+    for _ in range(args.turns):
+        session = await runner.session_service.create_session(
+            app_name="trace_bench", user_id="bench"
+        )
+        message = types.Content(role="user", parts=[types.Part(text="사자 어디 있어?")])
+        start = time.perf_counter()
+        async for _ in runner.run_async(
+            user_id="bench", session_id=session.id, new_message=message
+        ):
+            pass
+        latencies.append(time.perf_counter() - start)
+    return latencies
+
+
+def linked_turns(agent_file: str, server_file: str) -> dict:
+    def load(path):
+        if not os.path.exists(path):
+            return []
+        with open(path, encoding="utf-8") as f:
+            return [json.loads(line) for line in f]
+
+    agent_spans, server_spans = load(agent_file), load(server_file)
+    turns = {s["trace_id"] for s in agent_spans if s["name"].startswith("execute_tool")}
+    mcp = {s["trace_id"] for s in server_spans if s["kind"] == "SERVER"}
+    a2a = {s["trace_id"] for s in agent_spans if s["name"].startswith("a2a ")}
+    show_models = [
+        s["trace_id"]
+        for s in agent_spans
+        if s["attributes"].get("zoo.agent") == "zoo_show_agent"
+    ]
+    return {
+        "agent_spans": len(agent_spans),
+        "mcp_server_spans": len(server_spans),
+        "turns": len(turns),
+        "linked_turns": len(turns & mcp & a2a),
+        "show_model_spans": len(show_models),
+        "show_model_spans_linked": sum(trace_id in turns for trace_id in show_models),
+    }
+
+
+def child(args):
+    from servers import run_mcp_server
+    from zoo_concierge_agent.tracing import setup_tracing
+
+    logging.disable(logging.WARNING)
+    server_env = {"TRACE_EXPORTER": args.mode}
+    if args.mode == "jsonl":
+        server_env["TRACE_FILE"] = os.path.join(args.trace_dir, "server.jsonl")
+        os.environ["TRACE_FILE"] = os.path.join(args.trace_dir, "agents.jsonl")
+    os.environ["TRACE_EXPORTER"] = args.mode
+    setup_tracing("trace-bench")
+
+    with run_mcp_server("zoo_animal_mcp_server", env=server_env) as url:
+        latencies = asyncio.run(run_turns(args, url))
+    from opentelemetry import trace
+
+    provider = trace.get_tracer_provider()
+    if hasattr(provider, "shutdown"):
+        provider.shutdown()
+
+    latencies = sorted(latencies[args.warmup :])
+    print(
+        json.dumps(
+            {
+                "turn_ms_p50": 1000 * statistics.median(latencies),
+                "turn_ms_p99": 1000 * latencies[int(0.99 * (len(latencies) - 1))],
+                "turn_ms_mean": 1000 * statistics.mean(latencies),
+            }
+        )
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Tracing overhead benchmark")
+    parser.add_argument("--turns", type=int, default=60)
+    parser.add_argument("--warmup", type=int, default=5)
+    parser.add_argument("--model-latency", type=float, default=0.0)
+    parser.add_argument("--mode", choices=["off", "jsonl"])
+    parser.add_argument("--trace-dir")
+    args = parser.parse_args()
+
+    if args.mode:
+        child(args)
+        return
+
+    results = {}
+    for mode in ("off", "jsonl"):
+        trace_dir = tempfile.mkdtemp()
+        output = subprocess.run(
+            [sys.executable, __file__, "--mode", mode, "--trace-dir", trace_dir,
+             "--turns", str(args.turns), "--warmup", str(args.warmup),
+             "--model-latency", str(args.model_latency)],
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout
+        results[mode] = json.loads(output.strip().splitlines()[-1])
+        if mode == "jsonl":
+            results[mode].update(
+                linked_turns(
+                    os.path.join(trace_dir, "agents.jsonl"),
+                    os.path.join(trace_dir, "server.jsonl"),
+                )
+            )
+    print(json.dumps(results, indent=2))
+    linked = results["jsonl"]
+    assert linked["turns"] and linked["linked_turns"] == linked["turns"], linked
+    assert linked["show_model_spans"] >= linked["turns"], linked
+    assert linked["show_model_spans_linked"] == linked["show_model_spans"], linked
+
+
+if __name__ == "__main__":
+    main()
@@ -1,101 +1,226 @@
-import asyncio
+import hashlib
 import logging
 import os
-import json
-from typing import List, Dict, Any
+from typing import List, Optional
 
 from fastmcp import FastMCP
+from fastmcp.server.middleware import Middleware
+from fastmcp.tools import ToolResult
+from opentelemetry import trace
+from starlette.requests import Request
+from starlette.responses import JSONResponse
+
+from async_logging import setup_async_logging
+from data_reloader import DataReloader
+from serving import serve
+from storage import MemoryStore, ResultView, open_store
+from tracing import flush_on_sigterm, payload_bytes, setup_tracing
 
 logger = logging.getLogger(__name__)
 logging.basicConfig(format="[%(levelname)s]: %(message)s", level=logging.INFO)
+# Records are queued and written in batches from a thread (LOG_ASYNC).
+log_handler = setup_async_logging()
+
+# Export FastMCP's tool spans (TRACE_EXPORTER), which continue the calling
+# agent's trace from the request's _meta.traceparent.
+setup_tracing("zoo-animal-mcp-server")
+if log_handler:
+    flush_on_sigterm(log_handler.flush)
+
+# Version advertised to clients, which cache tool schemas until it changes.
+# Cloud Run sets K_REVISION per deploy; locally the source hash stands in.
+SERVER_VERSION = os.getenv("K_REVISION")
+if not SERVER_VERSION:
+    with open(__file__, "rb") as f:
+        SERVER_VERSION = hashlib.sha256(f.read()).hexdigest()[:12]
 
 # Initialize FastMCP server for zoo animal data.
-mcp = FastMCP("Zoo Animal MCP Server 🦁🐧🐻")
-
-# Global Data Stores
-ZOO_ANIMALS: List[Dict[str, Any]] = []
-# Index for querying by species (e.g., "lion" -> [Leo, Nala...], "사자" -> [Leo, Nala...])
-ZOO_ANIMALS_BY_SPECIES: Dict[str, List[Dict[str, Any]]] = {}
+mcp = FastMCP("Zoo Animal MCP Server 🦁🐧🐻", version=SERVER_VERSION)
+
+
+class ResultSizeMiddleware(Middleware):
+    """Records the size of each tool result on the tool call's span."""
+
+    async def on_call_tool(self, context, call_next):
+        result = await call_next(context)
+        span = trace.get_current_span()
+        if span.is_recording():
+            text_bytes = sum(len(getattr(c, "text", "").encode()) for c in result.content)
+            span.set_attribute("zoo.tool.content_bytes", text_bytes)
+            span.set_attribute(
+                "zoo.tool.structured_bytes", payload_bytes(result.structured_content)
+            )
+        return result
+
+
+mcp.add_middleware(ResultSizeMiddleware())
+
+# Output schemas matching what FastMCP derives from the list return types,
+# plus the {"columns", "rows"} table returned in compact mode.
+RECORDS_SCHEMA = {
+    "anyOf": [
+        {"type": "array", "items": {"type": "object", "additionalProperties": True}},
+        {
+            "type": "object",
+            "properties": {
+                "columns": {"type": "array", "items": {"type": "string"}},
+                "rows": {"type": "array", "items": {"type": "array"}},
+            },
+            "required": ["columns", "rows"],
+        },
+    ]
+}
+RECORDS_OUTPUT_SCHEMA = {
+    "type": "object",
+    "properties": {"result": RECORDS_SCHEMA},
+    "required": ["result"],
+    "x-fastmcp-wrap-result": True,
+}
+NAMES_OUTPUT_SCHEMA = {
+    "type": "object",
+    "properties": {"result": {"type": "array", "items": {"type": "string"}}},
+    "required": ["result"],
+    "x-fastmcp-wrap-result": True,
+}
+GROUPS_OUTPUT_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "result": {
+            "type": "object",
+            "additionalProperties": RECORDS_SCHEMA,
+        }
+    },
+    "required": ["result"],
+    "x-fastmcp-wrap-result": True,
+}
+
+
+# The data file can point at a mounted volume; it is reloaded when it changes.
+# A .db/.sqlite file (built with `python storage.py`) is served from SQLite,
+# anything else is loaded as JSON into memory. FILTER_FIELDS get secondary
+# indexes for the batch tool; pass them to the SQLite build as well:
+#   python storage.py zoo_animals.json zoo_animals.db enclosure trail age
+DATA_PATH = os.getenv(
+    "DATA_PATH",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "zoo_animals.json"),
+)
+FILTER_FIELDS = ("enclosure", "trail", "age")
+zoo_data = DataReloader(
+    DATA_PATH,
+    build=lambda path: open_store(path, "species", FILTER_FIELDS),
+    empty=lambda: MemoryStore([], "", "species", FILTER_FIELDS),
+    interval=float(os.getenv("DATA_RELOAD_INTERVAL", "30")),
+)
 
 
 def load_zoo_data():
-    """Loads zoo animal data from JSON and builds species-based indexes."""
-    global ZOO_ANIMALS, ZOO_ANIMALS_BY_SPECIES
-
-    current_dir = os.path.dirname(os.path.abspath(__file__))
-    json_path = os.path.join(current_dir, "zoo_animals.json")
-
-    try:
-        logger.info(f"📖 Loading zoo data from {json_path}...")
-        with open(json_path, "r", encoding="utf-8") as f:
-            loaded_animals = json.load(f)
-            ZOO_ANIMALS = loaded_animals
-
-        # Build index for O(1) lookup by species (English and Korean)
-        ZOO_ANIMALS_BY_SPECIES = {}
-        for animal in ZOO_ANIMALS:
-            species_en = animal.get("species", "").lower()
-            species_kr = animal.get("species_kr", "")
-
-            # Index by English species name
-            if species_en:
-                if species_en not in ZOO_ANIMALS_BY_SPECIES:
-                    ZOO_ANIMALS_BY_SPECIES[species_en] = []
-                ZOO_ANIMALS_BY_SPECIES[species_en].append(animal)
-
-            # Index by Korean species name
-            if species_kr:
-                if species_kr not in ZOO_ANIMALS_BY_SPECIES:
-                    ZOO_ANIMALS_BY_SPECIES[species_kr] = []
-                ZOO_ANIMALS_BY_SPECIES[species_kr].append(animal)
-
+    """Loads zoo animal data into the configured storage backend."""
+    logger.info(f"📖 Loading zoo data from {DATA_PATH}...")
+    if zoo_data.load():
+        store = zoo_data.current
         logger.info(
-            f"✅ Successfully loaded {len(ZOO_ANIMALS)} animals across {len(ZOO_ANIMALS_BY_SPECIES)} species keys."
+            f"✅ Successfully loaded {len(store)} animals ({store.backend} backend)."
         )
 
-    except Exception as e:
-        logger.error(f"❌ Unexpected error loading data: {e}")
-        ZOO_ANIMALS = []
-        ZOO_ANIMALS_BY_SPECIES = {}
-
 
 # Load data on startup
 load_zoo_data()
 
 
-@mcp.tool()
-def get_animals_by_species(species: str) -> List[Dict[str, Any]]:
+@mcp.tool(output_schema=RECORDS_OUTPUT_SCHEMA)
+def get_animals_by_species(
+    species: str,
+    fields: Optional[List[str]] = None,
+    limit: Optional[int] = None,
+    cursor: Optional[str] = None,
+    compact: bool = False,
+) -> ToolResult:
     """
     Retrieves a list of animals belonging to a specific species.
     Args:
         species: The species name in English (e.g., 'lion') or Korean (e.g., '사자').
+            Plurals, spacing variants, common synonyms and small typos are
+            resolved to the closest species; the match and its confidence are
+            returned in the response meta.
+        fields: Only return these keys of each record (e.g., ['name', 'enclosure']).
+        limit: Return at most this many records; the response meta has a
+            next_cursor when more remain.
+        cursor: The next_cursor of a previous response, to fetch the next page.
+        compact: Return a {"columns", "rows"} table instead of a list of objects.
     """
-    logger.info(f">>> 🛠️ Tool: 'get_animals_by_species' called for '{species}'")
-    # O(1) Lookup using the pre-built index
-    return ZOO_ANIMALS_BY_SPECIES.get(species.lower(), [])
-
-
-@mcp.tool()
-def list_available_species() -> List[str]:
+    logger.info(">>> 🛠️ Tool: 'get_animals_by_species' called for '%s'", species)
+    # Indexed lookup in the current snapshot's store, resolving near misses
+    view = ResultView(tuple(fields) if fields else None, limit, cursor, compact)
+    return zoo_data.current.find_by_species(species, view)
+
+
+@mcp.tool(output_schema=GROUPS_OUTPUT_SCHEMA)
+def get_animals_by_species_batch(
+    species: List[str],
+    enclosure: Optional[str] = None,
+    trail: Optional[str] = None,
+    min_age: Optional[int] = None,
+    max_age: Optional[int] = None,
+    fields: Optional[List[str]] = None,
+    limit: Optional[int] = None,
+    cursor: Optional[str] = None,
+    compact: bool = False,
+) -> ToolResult:
+    """
+    Retrieves animals of several species in one call, grouped by the species asked for.
+    Use this instead of repeated get_animals_by_species calls when a question
+    mentions more than one species or filters by place or age.
+    Args:
+        species: Species names in English or Korean (e.g., ['lion', '펭귄']).
+            An empty list matches every species.
+        enclosure: Only animals in this enclosure (e.g., 'The Big Cat Plains').
+        trail: Only animals along this trail (e.g., 'Savannah Heights').
+        min_age: Only animals at least this old.
+        max_age: Only animals at most this old.
+        fields: Only return these keys of each record (e.g., ['name', 'enclosure']).
+        limit: Return at most this many records per species; the response meta has a
+            next_cursor when more remain.
+        cursor: The next_cursor of a previous response, to fetch the next page.
+        compact: Return a {"columns", "rows"} table instead of a list of objects.
     """
-    Retrieves a list of all unique animal species available in the zoo (English names only).
+    logger.info(">>> 🛠️ Tool: 'get_animals_by_species_batch' called for %s", species)
+    ranges = {}
+    if enclosure is not None:
+        ranges["enclosure"] = (enclosure, enclosure)
+    if trail is not None:
+        ranges["trail"] = (trail, trail)
+    if min_age is not None or max_age is not None:
+        ranges["age"] = (min_age, max_age)
+    view = ResultView(tuple(fields) if fields else None, limit, cursor, compact)
+    return zoo_data.current.find_many(species, ranges, view)
+
+
+@mcp.tool(output_schema=NAMES_OUTPUT_SCHEMA)
+def list_available_species(include_korean: bool = False) -> ToolResult:
+    """
+    Retrieves a list of all unique animal species available in the zoo (English names, unless include_korean is set).
+
+    Args:
+        include_korean: Also list the Korean species names, with English names lowercased.
     """
     logger.info(">>> 🛠️ Tool: 'list_available_species' called")
-    unique_species = set()
-    for animal in ZOO_ANIMALS:
-        if "species" in animal:
-            unique_species.add(animal["species"])
-    return sorted(list(unique_species))
+    if include_korean:
+        return zoo_data.current.list_keys()
+    return zoo_data.current.list_names()
+
+
+# Exposes data reload metrics.
+@mcp.custom_route("/metrics", methods=["GET"])
+async def metrics(request: Request) -> JSONResponse:
+    return JSONResponse(
+        {
+            "data": {**zoo_data.metrics(), "version": zoo_data.current.version},
+            "pid": os.getpid(),
+        }
+    )
 
 
 # Entry point for running the MCP server.
+# WORKERS=auto serves from a process per CPU; see serving.py.
 if __name__ == "__main__":
-    port = int(os.getenv("PORT", 8080))
-    logger.info(f"🚀 MCP server started on port {port}")
-    asyncio.run(
-        mcp.run_async(
-            transport="streamable-http",
-            host="0.0.0.0",
-            port=port,
-        )
-    )
+    serve(mcp, zoo_data, after_fork=lambda: zoo_data.current.reopen())
@@ -0,0 +1,693 @@
+import collections
+import dataclasses
+import hashlib
+import json
+import bisect
+import os
+import re
+import sqlite3
+import sys
+import threading
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from fastmcp.tools import ToolResult
+from mcp.types import TextContent
+
+from species_resolver import MIN_CONFIDENCE, SpeciesResolver
+
+# Columns a record's list tool may read names from.
+LIST_FIELDS = ("species", "name")
+SQLITE_EXTENSIONS = (".db", ".sqlite", ".sqlite3")
+
+# Clock times such as "09:30 AM", "3 pm" or "14:00".
+_CLOCK_TIME = re.compile(r"^(\d{1,2})(?::(\d{2}))?\s*(?:([ap])\.?m\.?)?$", re.IGNORECASE)
+
+
+def build_response(result: Any, data_version: str) -> ToolResult:
+    """Serializes a tool result once, in the compact form FastMCP would emit."""
+    text = json.dumps(result, ensure_ascii=False, separators=(",", ":"))
+    return ToolResult(
+        content=[TextContent(type="text", text=text)],
+        structured_content={"result": result},
+        meta={"data_version": data_version},
+    )
+
+
+def species_keys(record: Dict[str, Any]) -> List[str]:
+    """Returns the index keys of a record: English species (lowercased) and Korean species."""
+    keys = []
+    species_en = record.get("species", "").lower()
+    species_kr = record.get("species_kr", "")
+
+    # Index by English species name
+    if species_en:
+        keys.append(species_en)
+
+    # Index by Korean species name
+    if species_kr:
+        keys.append(species_kr)
+    return keys
+
+
+def filter_key(value: Any) -> Tuple[int, Any]:
+    """
+    Returns the sortable index key of a filterable field value.
+
+    Numbers sort numerically, clock times ("09:30 AM", "14:00") as minutes
+    past midnight, and other strings case-insensitively after both.
+    """
+    if isinstance(value, (int, float)):
+        return (0, value)
+    text = str(value).strip()
+    match = _CLOCK_TIME.match(text)
+    # A bare number is not a time; it needs minutes or AM/PM.
+    if match and (match[2] or match[3]):
+        hours, minutes = int(match[1]), int(match[2] or 0)
+        if match[3]:
+            hours = hours % 12 + (12 if match[3].lower() == "p" else 0)
+        return (0, hours * 60 + minutes)
+    return (1, text.casefold())
+
+
+def _key_bounds(low: Any, high: Any) -> Tuple[Tuple, Tuple]:
+    """Turns an inclusive value range into index key bounds; None leaves a side open."""
+    low_key = filter_key(low) if low is not None else None
+    high_key = filter_key(high) if high is not None else None
+    # An open side stays within the kind (number or text) of the other side.
+    if low_key is None:
+        low_key = (high_key[0],) if high_key else (0,)
+    if high_key is None:
+        high_key = (low_key[0] + 1,) if len(low_key) > 1 else (2,)
+    else:
+        high_key = (*high_key, 1)
+    return low_key, high_key
+
+
+@dataclasses.dataclass(frozen=True)
+class ResultView:
+    """
+    How a tool shapes the records it returns.
+
+    `fields` projects each record, `limit` and `cursor` page through the
+    matches, and `compact` returns a {"columns", "rows"} table that states
+    each key once. The default view returns records unchanged.
+    """
+
+    fields: Optional[Tuple[str, ...]] = None
+    limit: Optional[int] = None
+    cursor: Optional[str] = None
+    compact: bool = False
+
+    def __post_init__(self):
+        if self.limit is not None and self.limit < 1:
+            raise ValueError("limit must be at least 1")
+
+    def is_default(self) -> bool:
+        return not (self.fields or self.limit or self.cursor or self.compact)
+
+    def page(self, total: int, version: str) -> Tuple[int, int, Optional[str]]:
+        """Returns the slice of `total` matches on this page and the next page's cursor."""
+        start = 0
+        if self.cursor:
+            # Cursors carry the data version, so they cannot skip or repeat
+            # records across a reload.
+            cursor_version, _, offset = self.cursor.rpartition(":")
+            if cursor_version != version or not offset.isdigit():
+                raise ValueError(
+                    "cursor is invalid or the data changed since it was issued;"
+                    " repeat the query without a cursor"
+                )
+            start = int(offset)
+        end = total if self.limit is None else min(total, start + self.limit)
+        return start, end, f"{version}:{end}" if end < total else None
+
+    def shape(self, records: List[Dict[str, Any]]) -> Any:
+        if self.fields:
+            records = [
+                {field: record[field] for field in self.fields if field in record}
+                for record in records
+            ]
+        if not self.compact:
+            return records
+        columns = list(self.fields or dict.fromkeys(key for record in records for key in record))
+        return {
+            "columns": columns,
+            "rows": [[record.get(column) for column in columns] for record in records],
+        }
+
+
+DEFAULT_VIEW = ResultView()
+
+
+class SpeciesStore:
+    """
+    Base for stores: an exact index lookup, then species resolution.
+
+    A query that misses the index is resolved to the closest species key
+    (plurals, spacing, synonyms, typos) and that key's records are served,
+    with the resolution and its confidence attached to the response meta.
+    """
+
+    version: str
+    resolver: Optional[SpeciesResolver] = None
+    _keys: Optional[ToolResult] = None
+
+    def reopen(self):
+        """Reopens process-local resources, as a forked worker must; a no-op by default."""
+
+    def _lookup(self, key: str) -> Optional[ToolResult]:
+        raise NotImplementedError
+
+    def _matches(self, key: str) -> Optional[List[Dict[str, Any]]]:
+        """Returns the records of a species key, or None if the index has no such key."""
+        response = self._lookup(key)
+        return None if response is None else response.structured_content["result"]
+
+    def _species_keys(self) -> Iterable[str]:
+        raise NotImplementedError
+
+    def _species_ids(self, key: str) -> List[int]:
+        raise NotImplementedError
+
+    def _all_ids(self) -> Iterable[int]:
+        raise NotImplementedError
+
+    def _filter_ids(self, field: str, low: Any, high: Any) -> set:
+        raise NotImplementedError
+
+    def _is_filter_field(self, field: str) -> bool:
+        raise NotImplementedError
+
+    def _fetch(self, ids: Sequence[int]) -> List[Dict[str, Any]]:
+        raise NotImplementedError
+
+    def project(self, fields: Sequence[str]) -> Iterator[Tuple[int, Dict[str, Any]]]:
+        """Yields every record's id and `fields` (those it has), in load order."""
+        raise NotImplementedError
+
+    def _get_resolver(self) -> SpeciesResolver:
+        if self.resolver is None:
+            self.resolver = SpeciesResolver(self._species_keys())
+        return self.resolver
+
+    def _resolve_query(self, species: str) -> Tuple[Optional[str], Dict[str, Any]]:
+        """Resolves a query that missed the index; the key is None below MIN_CONFIDENCE."""
+        match = self._get_resolver().resolve(species)
+        if match and match.confidence >= MIN_CONFIDENCE:
+            return match.species, {
+                "query": species,
+                "match": match.species,
+                "confidence": match.confidence,
+                "method": match.method,
+            }
+        resolution = {"query": species, "match": None}
+        if match:
+            resolution.update(suggestion=match.species, confidence=match.confidence)
+        return None, resolution
+
+    def resolve_species(self, species: str) -> Tuple[Optional[str], Optional[Dict[str, Any]]]:
+        """Returns the index key a species query answers to, and how it was resolved if inexact."""
+        if self._species_ids(species.lower()):
+            return species.lower(), None
+        return self._resolve_query(species)
+
+    def record(self, record_id: int) -> Dict[str, Any]:
+        """Returns one record by the id `project` and `find_id` give it."""
+        return self._fetch([record_id])[0]
+
+    def get_records(self, ids: Sequence[int]) -> List[Dict[str, Any]]:
+        """Returns records by id, in the order of `ids`, fetching each once."""
+        unique = sorted(set(ids))
+        by_id = dict(zip(unique, self._fetch(unique)))
+        return [by_id[record_id] for record_id in ids]
+
+    def find_by_species(self, species: str, view: ResultView = DEFAULT_VIEW) -> ToolResult:
+        resolution = None
+        key = species.lower()
+        records = self._matches(key)
+        if records is None:
+            key, resolution = self._resolve_query(species)
+            records = self._matches(key) if key is not None else None
+
+        meta = {"data_version": self.version}
+        if resolution is not None:
+            meta["resolution"] = resolution
+
+        if view.is_default():
+            response = self._lookup(key) if records is not None else self._empty
+            if resolution is None:
+                return response
+            # Reuses the serialized content; only the meta differs per query.
+            return ToolResult(
+                content=response.content,
+                structured_content=response.structured_content,
+                meta=meta,
+            )
+
+        records = records or []
+        start, end, next_cursor = view.page(len(records), self.version)
+        shaped = build_response(view.shape(records[start:end]), self.version)
+        shaped.meta.update(meta, total=len(records))
+        if next_cursor:
+            shaped.meta["next_cursor"] = next_cursor
+        return shaped
+
+    def list_keys(self) -> ToolResult:
+        """Returns every name the species index answers to, English and Korean."""
+        if self._keys is None:
+            self._keys = build_response(sorted(self._species_keys()), self.version)
+        return self._keys
+
+    def find_id(self, field: str, value: Any) -> Optional[int]:
+        """
+        Returns the id of the first record whose `field` equals `value`, if any.
+
+        Values compare as filter keys do. A filter field is an index lookup;
+        any other field is a scan of the records' values of it.
+        """
+        if self._is_filter_field(field):
+            ids = self._filter_ids(field, value, value)
+            return min(ids) if ids else None
+        wanted = filter_key(value)
+        for record_id, record in self.project([field]):
+            if field in record and filter_key(record[field]) == wanted:
+                return record_id
+        return None
+
+    def find_record(self, field: str, value: Any) -> Optional[Dict[str, Any]]:
+        """Returns the first record whose `field` equals `value`, if any."""
+        record_id = self.find_id(field, value)
+        return self.record(record_id) if record_id is not None else None
+
+    def find_many(
+        self,
+        species: List[str],
+        ranges: Dict[str, Tuple[Any, Any]],
+        view: ResultView = DEFAULT_VIEW,
+    ) -> ToolResult:
+        """
+        Returns the records of several species in one response, grouped by query.
+
+        Args:
+            species (List[str]): Species queries; an empty list matches every
+                record and groups them under "all".
+            ranges (Dict[str, Tuple[Any, Any]]): Inclusive (low, high) bounds per
+                filter field; None leaves a side open, equal bounds match one value.
+            view (ResultView): Applied to each group; one cursor pages all groups.
+        """
+        # Filters are answered from the secondary indexes, then intersected.
+        allowed = None
+        for field, (low, high) in ranges.items():
+            ids = self._filter_ids(field, low, high)
+            allowed = ids if allowed is None else allowed & ids
+
+        matches, resolutions = {}, {}
+        if not species:
+            ids = allowed if allowed is not None else self._all_ids()
+            matches["all"] = sorted(ids)
+        for query in species:
+            ids = self._species_ids(query.lower())
+            if not ids:
+                key, resolutions[query] = self._resolve_query(query)
+                ids = self._species_ids(key) if key is not None else []
+            if allowed is not None:
+                ids = [i for i in ids if i in allowed]
+            matches[query] = ids
+
+        # Only the records on the requested page are fetched.
+        groups, next_cursor = {}, None
+        for query, ids in matches.items():
+            start, end, group_cursor = view.page(len(ids), self.version)
+            groups[query] = view.shape(self._fetch(ids[start:end]))
+            next_cursor = next_cursor or group_cursor
+
+        response = build_response(groups, self.version)
+        if resolutions:
+            response.meta["resolution"] = resolutions
+        if not view.is_default():
+            response.meta["totals"] = {query: len(ids) for query, ids in matches.items()}
+        if next_cursor:
+            response.meta["next_cursor"] = next_cursor
+        return response
+
+
+class MemoryStore(SpeciesStore):
+    """
+    The whole JSON dataset in memory, indexed by species.
+
+    Lookups are a dict access and responses are serialized per call, as
+    FastMCP would; startup time and RSS grow with the dataset.
+    """
+
+    backend = "json"
+
+    def __init__(
+        self,
+        records: List[Dict[str, Any]],
+        version: str,
+        list_field: str,
+        filter_fields: Sequence[str] = (),
+    ):
+        self.records = records
+        self.version = version
+
+        # Build index for O(1) lookup by species (English and Korean)
+        self.by_species: Dict[str, List[Dict[str, Any]]] = {}
+        self._ids_by_species: Dict[str, List[int]] = {}
+        for record_id, record in enumerate(records):
+            for key in species_keys(record):
+                self.by_species.setdefault(key, []).append(record)
+                self._ids_by_species.setdefault(key, []).append(record_id)
+
+        # Secondary indexes: per filter field, record ids sorted by filter_key
+        self._filters: Dict[str, Tuple[List[Tuple], List[int]]] = {}
+        for field in filter_fields:
+            entries = sorted(
+                (filter_key(record[field]), record_id)
+                for record_id, record in enumerate(records)
+                if record.get(field) is not None
+            )
+            self._filters[field] = (
+                [key for key, _ in entries],
+                [record_id for _, record_id in entries],
+            )
+
+        self._empty = build_response([], version)
+        self._names = sorted({record[list_field] for record in records if list_field in record})
+        self.resolver = SpeciesResolver(self.by_species)
+
+    @classmethod
+    def from_json(
+        cls, path: str, list_field: str, filter_fields: Sequence[str] = ()
+    ) -> "MemoryStore":
+        """Loads a JSON list of records; the file hash becomes the data version."""
+        with open(path, "rb") as f:
+            raw_data = f.read()
+        records = json.loads(raw_data)
+        if not isinstance(records, list):
+            raise ValueError(f"expected a JSON list of records in {path}")
+        return cls(
+            records, hashlib.sha256(raw_data).hexdigest()[:12], list_field, filter_fields
+        )
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def _lookup(self, key: str) -> Optional[ToolResult]:
+        matches = self.by_species.get(key)
+        return None if matches is None else build_response(matches, self.version)
+
+    def _matches(self, key: str) -> Optional[List[Dict[str, Any]]]:
+        return self.by_species.get(key)
+
+    def _species_keys(self) -> Iterable[str]:
+        return self.by_species
+
+    def _species_ids(self, key: str) -> List[int]:
+        return self._ids_by_species.get(key, [])
+
+    def _all_ids(self) -> Iterable[int]:
+        return range(len(self.records))
+
+    def _filter_ids(self, field: str, low: Any, high: Any) -> set:
+        keys, ids = self._filters[field]
+        low_key, high_key = _key_bounds(low, high)
+        start = bisect.bisect_left(keys, low_key)
+        end = bisect.bisect_left(keys, high_key)
+        return set(ids[start:end])
+
+    def _is_filter_field(self, field: str) -> bool:
+        return field in self._filters
+
+    def _fetch(self, ids: Sequence[int]) -> List[Dict[str, Any]]:
+        return [self.records[record_id] for record_id in ids]
+
+    def project(self, fields: Sequence[str]) -> Iterator[Tuple[int, Dict[str, Any]]]:
+        # The records are in memory already; readers only look at `fields`.
+        return enumerate(self.records)
+
+    def list_names(self) -> ToolResult:
+        return build_response(self._names, self.version)
+
+
+class SqliteStore(SpeciesStore):
+    """
+    Records in an indexed SQLite file, as written by `build_sqlite`.
+
+    Opening the store reads only its metadata and SQLite pages rows in as
+    queries touch them, so startup time and RSS stay flat as the dataset
+    grows. Recently used responses are kept in a small LRU cache, and the
+    species resolver is built on the first query that misses the index.
+    """
+
+    backend = "sqlite"
+
+    def __init__(self, path: str, list_field: str, cache_size: int = 1024):
+        if list_field not in LIST_FIELDS:
+            raise ValueError(f"unsupported list field: {list_field}")
+        self._path = path
+        # Connections inherited over fork; kept open, as closing them in a
+        # child would touch the parent's database state.
+        self._inherited: List[sqlite3.Connection] = []
+        self._conn = self._connect()
+        meta = dict(self._conn.execute("SELECT key, value FROM meta"))
+        self.version = meta["version"]
+        self._count = int(meta["count"])
+        self._filter_fields = set(filter(None, meta.get("filter_fields", "").split(",")))
+        self._list_field = list_field
+        self._empty = build_response([], self.version)
+        self._names = None
+        self._cache: collections.OrderedDict[str, ToolResult] = collections.OrderedDict()
+        self._cache_size = cache_size
+        self._lock = threading.Lock()
+        self._resolver_lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(
+            f"file:{self._path}?mode=ro&immutable=1", uri=True, check_same_thread=False
+        )
+
+    def reopen(self):
+        """Opens this process's own connection; SQLite connections must not cross fork."""
+        self._inherited.append(self._conn)
+        self._conn = self._connect()
+        self._lock = threading.Lock()
+        self._resolver_lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return self._count
+
+    def _species_keys(self) -> Iterable[str]:
+        with self._lock:
+            return [
+                row[0]
+                for row in self._conn.execute(
+                    "SELECT species_key FROM records WHERE species_key IS NOT NULL"
+                    " UNION SELECT species_kr FROM records WHERE species_kr IS NOT NULL"
+                )
+            ]
+
+    def _get_resolver(self) -> SpeciesResolver:
+        with self._resolver_lock:
+            return super()._get_resolver()
+
+    def _species_ids(self, key: str) -> List[int]:
+        with self._lock:
+            return [
+                row[0]
+                for row in self._conn.execute(
+                    "SELECT id FROM records WHERE species_key = ?1 OR species_kr = ?1"
+                    " ORDER BY id",
+                    (key,),
+                )
+            ]
+
+    def _all_ids(self) -> Iterable[int]:
+        with self._lock:
+            return [row[0] for row in self._conn.execute("SELECT id FROM records")]
+
+    def _filter_ids(self, field: str, low: Any, high: Any) -> set:
+        if field not in self._filter_fields:
+            raise ValueError(f"field '{field}' is not indexed in this store")
+        low_key, high_key = _key_bounds(low, high)
+        # Numbers sort before text in SQLite, as kind 0 does before kind 1.
+        query = "SELECT record_id FROM record_keys WHERE field = ?"
+        params = [field]
+        if len(low_key) > 1:
+            query += " AND key >= ?"
+            params.append(low_key[1])
+        elif low_key[0] == 1:
+            query += " AND typeof(key) = 'text'"
+        if len(high_key) > 2:
+            query += " AND key <= ?"
+            params.append(high_key[1])
+        elif high_key[0] == 1:
+            query += " AND typeof(key) != 'text'"
+        with self._lock:
+            return {row[0] for row in self._conn.execute(query, params)}
+
+    def _is_filter_field(self, field: str) -> bool:
+        return field in self._filter_fields
+
+    def project(self, fields: Sequence[str]) -> Iterator[Tuple[int, Dict[str, Any]]]:
+        # SQLite extracts the fields, so only they reach Python; rows are read in pages.
+        columns = ", ".join("json_extract(data, ?)" for _ in fields)
+        paths = [f'$."{field}"' for field in fields]
+        last_id = -1
+        while True:
+            with self._lock:
+                rows = self._conn.execute(
+                    f"SELECT id, {columns} FROM records WHERE id > ? ORDER BY id LIMIT 1000",
+                    [*paths, last_id],
+                ).fetchall()
+            if not rows:
+                return
+            for record_id, *values in rows:
+                yield record_id, {
+                    field: value for field, value in zip(fields, values) if value is not None
+                }
+            last_id = rows[-1][0]
+
+    def _fetch(self, ids: Sequence[int]) -> List[Dict[str, Any]]:
+        records = []
+        with self._lock:
+            for start in range(0, len(ids), 500):
+                chunk = ids[start : start + 500]
+                rows = self._conn.execute(
+                    f"SELECT data FROM records WHERE id IN ({','.join('?' * len(chunk))})"
+                    " ORDER BY id",
+                    chunk,
+                )
+                records += [json.loads(row[0]) for row in rows]
+        return records
+
+    def _lookup(self, key: str) -> Optional[ToolResult]:
+        with self._lock:
+            response = self._cache.get(key)
+            if response is not None:
+                self._cache.move_to_end(key)
+                return response
+
+            rows = self._conn.execute(
+                "SELECT data FROM records WHERE species_key = ?1 OR species_kr = ?1"
+                " ORDER BY id",
+                (key,),
+            ).fetchall()
+            if not rows:
+                return None
+
+            # Rows are stored pre-serialized; only the array brackets are added.
+            text = "[" + ",".join(row[0] for row in rows) + "]"
+            response = ToolResult(
+                content=[TextContent(type="text", text=text)],
+                structured_content={"result": json.loads(text)},
+                meta={"data_version": self.version},
+            )
+            self._cache[key] = response
+            if len(self._cache) > self._cache_size:
+                self._cache.popitem(last=False)
+            return response
+
+    def list_names(self) -> ToolResult:
+        if self._names is None:
+            with self._lock:
+                names = [
+                    row[0]
+                    for row in self._conn.execute(
+                        f"SELECT DISTINCT {self._list_field} FROM records"
+                        f" WHERE {self._list_field} IS NOT NULL"
+                        f" ORDER BY {self._list_field}"
+                    )
+                ]
+            self._names = build_response(names, self.version)
+        return self._names
+
+
+def open_store(path: str, list_field: str, filter_fields: Sequence[str] = ()):
+    """Opens the store for a data file, choosing the backend from its extension."""
+    if path.endswith(SQLITE_EXTENSIONS):
+        return SqliteStore(path, list_field)
+    return MemoryStore.from_json(path, list_field, filter_fields)
+
+
+def build_sqlite(json_path: str, db_path: str, filter_fields: Sequence[str] = ()):
+    """
+    Converts a JSON list of records into an indexed SQLite store.
+
+    Each of `filter_fields` gets a row per record in `record_keys`, holding
+    the value's filter_key, so batch filters are index range scans.
+
+    The file is written next to `db_path` and renamed into place, so a
+    running server's reloader only ever sees a complete database.
+    """
+    with open(json_path, "rb") as f:
+        raw_data = f.read()
+    records = json.loads(raw_data)
+
+    tmp_path = f"{db_path}.tmp"
+    if os.path.exists(tmp_path):
+        os.remove(tmp_path)
+    conn = sqlite3.connect(tmp_path)
+    with conn:
+        conn.executescript(
+            """
+            CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+            CREATE TABLE records (
+                id INTEGER PRIMARY KEY,
+                species TEXT,
+                species_key TEXT,
+                species_kr TEXT,
+                name TEXT,
+                data TEXT NOT NULL
+            );
+            CREATE TABLE record_keys (field TEXT NOT NULL, key, record_id INTEGER NOT NULL);
+            """
+        )
+        conn.executemany(
+            "INSERT INTO records (id, species, species_key, species_kr, name, data)"
+            " VALUES (?, ?, ?, ?, ?, ?)",
+            (
+                (
+                    record_id,
+                    record.get("species"),
+                    record.get("species", "").lower() or None,
+                    record.get("species_kr") or None,
+                    record.get("name"),
+                    json.dumps(record, ensure_ascii=False, separators=(",", ":")),
+                )
+                for record_id, record in enumerate(records, 1)
+            ),
+        )
+        conn.executemany(
+            "INSERT INTO record_keys (field, key, record_id) VALUES (?, ?, ?)",
+            (
+                (field, filter_key(record[field])[1], record_id)
+                for record_id, record in enumerate(records, 1)
+                for field in filter_fields
+                if record.get(field) is not None
+            ),
+        )
+        conn.executescript(
+            """
+            CREATE INDEX records_species_key ON records (species_key);
+            CREATE INDEX records_species_kr ON records (species_kr);
+            CREATE INDEX records_species ON records (species);
+            CREATE INDEX records_name ON records (name);
+            CREATE INDEX record_keys_field_key ON record_keys (field, key);
+            """
+        )
+        conn.executemany(
+            "INSERT INTO meta (key, value) VALUES (?, ?)",
+            [
+                ("version", hashlib.sha256(raw_data).hexdigest()[:12]),
+                ("count", str(len(records))),
+                ("filter_fields", ",".join(filter_fields)),
+            ],
+        )
+    conn.close()
+    os.replace(tmp_path, db_path)
+
+
+# Usage: python storage.py zoo_animals.json zoo_animals.db [filter_field ...]
+if __name__ == "__main__":
+    build_sqlite(sys.argv[1], sys.argv[2], sys.argv[3:])
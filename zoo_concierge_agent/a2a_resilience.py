@@ -0,0 +1,382 @@
+import asyncio
+import contextlib
+import dataclasses
+import logging
+import threading
+import time
+from typing import AsyncGenerator, Callable, Iterable, Optional
+
+from google.adk.agents.invocation_context import InvocationContext
+from google.adk.events import Event
+from google.genai import types
+
+from .a2a_warm_start import WarmRemoteA2aAgent, WarmStreamingA2aAgent
+
+logger = logging.getLogger(__name__)
+
+# Custom metadata key on a degraded answer, holding why the call was not made or failed.
+DEGRADED_KEY = "zoo:degraded"
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """
+    Stops calling a remote service after repeated failures, and probes it to recover.
+
+    Closed, calls go through. After `failure_threshold` consecutive
+    failures it opens, and calls are refused for `reset_timeout` seconds.
+    Then it is half-open: up to `half_open_probes` calls go through as
+    probes; a successful probe closes it, a failed one opens it again.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int = 5,
+        reset_timeout: float = 30.0,
+        half_open_probes: int = 1,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Args:
+            name (str): The remote service, for logs.
+            failure_threshold (int): Consecutive failures that open the circuit.
+            reset_timeout (float): Seconds the circuit stays open before probing.
+            half_open_probes (int): Probes allowed at once while half-open.
+            clock (Callable[[], float]): Monotonic clock, in seconds.
+        """
+        self.name = name
+        self._failure_threshold = failure_threshold
+        self._reset_timeout = reset_timeout
+        self._half_open_probes = half_open_probes
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._state = CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probes = 0
+        self.opened = 0
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._current_state()
+
+    def _current_state(self) -> str:
+        if self._state == OPEN and self._clock() - self._opened_at >= self._reset_timeout:
+            self._state = HALF_OPEN
+            self._probes = 0
+        return self._state
+
+    def allow(self) -> bool:
+        """Returns True if a call may be made now; a half-open circuit counts it as a probe."""
+        with self._lock:
+            state = self._current_state()
+            if state == CLOSED:
+                return True
+            if state == HALF_OPEN and self._probes < self._half_open_probes:
+                self._probes += 1
+                return True
+            return False
+
+    def record_success(self):
+        with self._lock:
+            if self._state == HALF_OPEN:
+                logger.info(f"🔌 Circuit to {self.name} closed; the probe succeeded.")
+            self._state = CLOSED
+            self._failures = 0
+            self._probes = 0
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            state = self._current_state()
+            if state == HALF_OPEN or (
+                state == CLOSED and self._failures >= self._failure_threshold
+            ):
+                logger.warning(
+                    f"🔌 Circuit to {self.name} opened after {self._failures} failures;"
+                    f" retrying in {self._reset_timeout:.0f} s."
+                )
+                self._state = OPEN
+                self._opened_at = self._clock()
+                self.opened += 1
+
+    def release(self):
+        """Ends an allowed call that neither succeeded nor failed, e.g. one the caller cancelled."""
+        with self._lock:
+            if self._state == HALF_OPEN and self._probes:
+                self._probes -= 1
+
+
+@dataclasses.dataclass
+class A2aGuardMetrics:
+    """Counters for calls through an A2aGuard."""
+
+    calls: int = 0
+    succeeded: int = 0
+    failed: int = 0
+    timed_out: int = 0
+    rejected: int = 0
+    short_circuited: int = 0
+    cancelled: int = 0
+    in_flight: int = 0
+    in_flight_max: int = 0
+
+    def as_dict(self) -> dict[str, float]:
+        return {
+            "calls": self.calls,
+            "succeeded": self.succeeded,
+            "failed": self.failed,
+            "timed_out": self.timed_out,
+            "rejected": self.rejected,
+            "short_circuited": self.short_circuited,
+            "cancelled": self.cancelled,
+            "degraded": self.failed + self.timed_out + self.rejected + self.short_circuited,
+            "in_flight_max": self.in_flight_max,
+        }
+
+
+class ShowCatalog:
+    """
+    The show names last returned by the show server's `list_available_shows`.
+
+    Loaded by `load_shows` on a background thread and refreshed every
+    `refresh_interval` seconds; a failed load keeps the previous names.
+    Degraded answers list them when the show agent cannot be reached.
+    """
+
+    def __init__(
+        self,
+        load_shows: Callable[[], Iterable[str]],
+        refresh_interval: float = 600.0,
+        retry_interval: float = 30.0,
+    ):
+        """
+        Args:
+            load_shows (Callable[[], Iterable[str]]): Returns the show names.
+            refresh_interval (float): Seconds between reloads.
+            retry_interval (float): Seconds to wait after a failed load.
+        """
+        self._load_shows = load_shows
+        self._refresh_interval = refresh_interval
+        self._retry_interval = retry_interval
+        self.names: list[str] = []
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def refresh(self) -> bool:
+        """Reloads the show names; returns False if the load failed."""
+        try:
+            names = list(self._load_shows())
+        except Exception as e:
+            logger.warning(f"⚠️ Failed to load show names for degraded answers: {e}")
+            return False
+        self.names = names
+        logger.info(f"🎟️ Loaded {len(names)} show names for degraded answers.")
+        return True
+
+    def _run(self):
+        while not self._stopped.is_set():
+            delay = self._refresh_interval if self.refresh() else self._retry_interval
+            self._stopped.wait(delay)
+
+    def start(self):
+        """Starts the background loader if it is not running."""
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._stopped.clear()
+            self._thread = threading.Thread(target=self._run, name="show-catalog", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        """Stops the background loader."""
+        self._stopped.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+
+# Builds the answer given in place of the show agent's.
+def degraded_answer(reason: str, show_names: list[str]) -> str:
+    if reason == "overloaded":
+        text = "지금은 공연 안내 요청이 많아 바로 도와드리기 어려워요."
+    else:
+        text = "지금은 공연 안내 서비스에 연결할 수 없어요."
+    text += " 예약은 잠시 후 다시 시도해 주세요."
+    if show_names:
+        text += " 참고로 현재 진행 중인 공연은 " + ", ".join(show_names) + "이에요."
+    return text
+
+
+class A2aGuard:
+    """
+    Admission control, deadlines and circuit breaking for calls to a remote agent.
+
+    A call is refused at once while the circuit is open. Otherwise it waits
+    at most `queue_timeout` seconds for one of `max_in_flight` slots, then
+    has `deadline` seconds in total and `idle_timeout` seconds between
+    events. An error event from the remote agent, or a missed deadline,
+    counts as a failure for the circuit breaker. Refused, failed and timed
+    out calls end with a degraded answer that lists the cached show names,
+    so the visitor hears back at once instead of waiting on a stalled
+    service.
+
+    The in-flight limit holds per event loop.
+    """
+
+    def __init__(
+        self,
+        breaker: CircuitBreaker,
+        max_in_flight: int = 32,
+        queue_timeout: float = 0.5,
+        deadline: float = 60.0,
+        idle_timeout: float = 20.0,
+        catalog: Optional[ShowCatalog] = None,
+    ):
+        """
+        Args:
+            breaker (CircuitBreaker): Tracks the remote agent's health.
+            max_in_flight (int): Calls in progress at once.
+            queue_timeout (float): Seconds a call waits for a free slot.
+            deadline (float): Seconds a call may take in total.
+            idle_timeout (float): Seconds a call may go without an event.
+            catalog (Optional[ShowCatalog]): Show names for degraded answers.
+        """
+        self.breaker = breaker
+        self._max_in_flight = max_in_flight
+        self._queue_timeout = queue_timeout
+        self.deadline = deadline
+        self._idle_timeout = idle_timeout
+        self._catalog = catalog
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._slots: Optional[asyncio.Semaphore] = None
+        self.metrics = A2aGuardMetrics()
+
+    def _semaphore(self) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            # Semaphores belong to one loop; build one for a new loop.
+            self._loop = loop
+            self._slots = asyncio.Semaphore(self._max_in_flight)
+        return self._slots
+
+    async def _admit(self) -> bool:
+        slots = self._semaphore()
+        try:
+            await asyncio.wait_for(slots.acquire(), self._queue_timeout)
+        except asyncio.TimeoutError:
+            return False
+        return True
+
+    def _degraded(self, ctx: InvocationContext, author: str, reason: str) -> Event:
+        names = self._catalog.names if self._catalog else []
+        return Event(
+            author=author,
+            invocation_id=ctx.invocation_id,
+            branch=ctx.branch,
+            content=types.Content(
+                role="model", parts=[types.Part(text=degraded_answer(reason, names))]
+            ),
+            custom_metadata={DEGRADED_KEY: reason},
+        )
+
+    async def run(
+        self,
+        ctx: InvocationContext,
+        author: str,
+        events: AsyncGenerator[Event, None],
+    ) -> AsyncGenerator[Event, None]:
+        """
+        Passes on the events of one call to the remote agent, within the limits.
+
+        Args:
+            ctx (InvocationContext): The invocation the call belongs to.
+            author (str): The remote agent's name, the author of degraded answers.
+            events (AsyncGenerator[Event, None]): The call's events; only
+                started once the call is admitted.
+        """
+        self.metrics.calls += 1
+        async with contextlib.aclosing(events):
+            if not self.breaker.allow():
+                self.metrics.short_circuited += 1
+                yield self._degraded(ctx, author, "circuit_open")
+                return
+            if not await self._admit():
+                self.breaker.release()
+                self.metrics.rejected += 1
+                logger.warning(f"⚠️ {author} is at {self._max_in_flight} calls; refusing one.")
+                yield self._degraded(ctx, author, "overloaded")
+                return
+
+            slots = self._slots
+            self.metrics.in_flight += 1
+            self.metrics.in_flight_max = max(self.metrics.in_flight_max, self.metrics.in_flight)
+            loop = asyncio.get_running_loop()
+            deadline = loop.time() + self.deadline
+            outcome = None
+            try:
+                while True:
+                    try:
+                        async with asyncio.timeout_at(
+                            min(deadline, loop.time() + self._idle_timeout)
+                        ):
+                            event = await anext(events)
+                    except StopAsyncIteration:
+                        break
+                    except TimeoutError:
+                        outcome = "timeout"
+                        self.metrics.timed_out += 1
+                        logger.warning(f"⏱️ {author} did not answer in time; giving a degraded answer.")
+                        yield self._degraded(ctx, author, "timeout")
+                        return
+                    if event.error_message:
+                        outcome = "error"
+                        self.metrics.failed += 1
+                        logger.warning(f"⚠️ {author} failed: {event.error_message}")
+                        yield self._degraded(ctx, author, "error")
+                        return
+                    yield event
+                outcome = "success"
+                self.metrics.succeeded += 1
+            finally:
+                self.metrics.in_flight -= 1
+                slots.release()
+                if outcome == "success":
+                    self.breaker.record_success()
+                elif outcome is not None:
+                    self.breaker.record_failure()
+                else:
+                    # Cancelled by the caller; says nothing about the remote agent.
+                    self.metrics.cancelled += 1
+                    self.breaker.release()
+
+
+class GuardedA2aAgentMixin:
+    """Runs a RemoteA2aAgent's calls through an A2aGuard (see A2aGuard)."""
+
+    def __init__(self, *args, guard: A2aGuard, **kwargs):
+        # The HTTP timeout of the underlying client follows the call deadline.
+        kwargs.setdefault("timeout", guard.deadline)
+        super().__init__(*args, **kwargs)
+        self._guard = guard
+
+    async def _run_async_impl(self, ctx: InvocationContext) -> AsyncGenerator[Event, None]:
+        async with contextlib.aclosing(
+            self._guard.run(ctx, self.name, super()._run_async_impl(ctx))
+        ) as events:
+            async for event in events:
+                yield event
+
+
+class GuardedRemoteA2aAgent(GuardedA2aAgentMixin, WarmRemoteA2aAgent):
+    """WarmRemoteA2aAgent with admission control, deadlines and circuit breaking."""
+
+
+class GuardedStreamingA2aAgent(GuardedA2aAgentMixin, WarmStreamingA2aAgent):
+    """WarmStreamingA2aAgent with admission control, deadlines and circuit breaking."""
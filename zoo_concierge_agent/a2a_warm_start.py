@@ -0,0 +1,218 @@
+import asyncio
+import contextlib
+import dataclasses
+import logging
+import threading
+import time
+from typing import AsyncGenerator, Optional
+
+import httpx
+from a2a.utils.constants import AGENT_CARD_WELL_KNOWN_PATH
+from google.adk.a2a import _compat as a2a_compat
+from google.adk.agents.callback_context import CallbackContext
+from google.adk.agents.invocation_context import InvocationContext
+from google.adk.agents.remote_a2a_agent import AgentCardResolutionError, RemoteA2aAgent
+from google.adk.events import Event
+
+from .streaming import StreamingRemoteA2aAgent
+
+logger = logging.getLogger(__name__)
+
+# Seconds to wait after a failed card fetch before trying again.
+CARD_RETRY_INTERVAL = 15.0
+
+
+@dataclasses.dataclass
+class WarmStartMetrics:
+    """What a WarmA2aAgentMixin did ahead of, and in between, visitor requests."""
+
+    startup_resolve_seconds: float = 0.0
+    warm_up_seconds: float = 0.0
+    refreshes: int = 0
+    refresh_failures: int = 0
+    card_changes: int = 0
+    client_rebuilds: int = 0
+
+    def as_dict(self) -> dict[str, float]:
+        return {
+            # Off the first request: card parsing, validation and client setup.
+            "startup_resolve_ms": 1000 * self.startup_resolve_seconds,
+            # Off the first request if it finished in time: the first connection.
+            "warm_up_ms": 1000 * self.warm_up_seconds,
+            "refreshes": self.refreshes,
+            "refresh_failures": self.refresh_failures,
+            "card_changes": self.card_changes,
+            "client_rebuilds": self.client_rebuilds,
+        }
+
+
+class WarmA2aAgentMixin:
+    """
+    Resolves a RemoteA2aAgent's card at startup and keeps its client warm.
+
+    RemoteA2aAgent reads its card, builds its HTTP client and A2A client,
+    and connects, all on the first call. Here the card is read and
+    validated, and the clients built, when the agent is constructed; a bad
+    card is logged and left to fail on the first call as before. Once
+    running on an event loop (start_warm_up, or the first call), a
+    background task fetches the card the remote agent publishes every
+    `card_refresh_interval` seconds. The first fetch opens the pooled
+    connection that calls then reuse, and later ones keep it from expiring
+    between visitors. The card and client are only replaced when the
+    published card's `version` changes.
+
+    HTTP connections belong to one event loop; on a new loop the clients
+    are built again, keeping the card.
+
+    RemoteA2aAgent has no public way to resolve early or swap its card, so
+    this drives its private resolution steps and client attributes; the
+    google-adk pin in requirements.txt lists them.
+    """
+
+    def __init__(
+        self,
+        *args,
+        card_refresh_interval: float = 60.0,
+        keepalive_expiry: float = 120.0,
+        **kwargs,
+    ):
+        super().__init__(*args, **kwargs)
+        self._card_refresh_interval = card_refresh_interval
+        self._keepalive_expiry = keepalive_expiry
+        self._client_loop: Optional[asyncio.AbstractEventLoop] = None
+        self._refresh_task: Optional[asyncio.Task] = None
+        self._skipped_version: Optional[str] = None
+        self._warm_start_metrics = WarmStartMetrics()
+        self._resolve_at_startup()
+
+    @property
+    def warm_start_metrics(self) -> WarmStartMetrics:
+        return self._warm_start_metrics
+
+    def _new_http_client(self) -> httpx.AsyncClient:
+        # Idle connections outlive the refresh interval, so one stays open.
+        return httpx.AsyncClient(
+            timeout=httpx.Timeout(timeout=self._timeout),
+            limits=httpx.Limits(keepalive_expiry=self._keepalive_expiry),
+        )
+
+    def _resolve_at_startup(self):
+        # Runs on its own thread and loop, as agents may be imported from
+        # within a running loop. Nothing it builds is tied to that loop.
+        start = time.perf_counter()
+        if self._httpx_client is None:
+            self._httpx_client = self._new_http_client()
+        errors = []
+
+        def run():
+            try:
+                asyncio.run(self._ensure_resolved())
+            except Exception as e:
+                errors.append(e)
+
+        thread = threading.Thread(target=run, name="a2a-card-resolve")
+        thread.start()
+        thread.join()
+        if errors:
+            logger.error(f"❌ Could not resolve the agent card of {self.name}: {errors[0]}")
+            return
+        self._warm_start_metrics.startup_resolve_seconds = time.perf_counter() - start
+        logger.info(
+            f"🪪 Resolved the agent card of {self.name} (version {self._agent_card.version})."
+        )
+
+    def _bind_loop(self):
+        loop = asyncio.get_running_loop()
+        if self._client_loop is loop:
+            return
+        if self._client_loop is not None and self._httpx_client_needs_cleanup:
+            # Pooled connections of another loop cannot be used here.
+            self._httpx_client = self._new_http_client()
+            self._a2a_client_factory = None
+            self._a2a_client = None
+            self._is_resolved = False
+            self._warm_start_metrics.client_rebuilds += 1
+        self._client_loop = loop
+
+    def start_warm_up(self):
+        """Starts the card refresh on the running loop, if any and not already started."""
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        self._bind_loop()
+        task = self._refresh_task
+        if task is None or task.done() or task.get_loop() is not loop:
+            self._refresh_task = loop.create_task(self._refresh_loop())
+
+    # Callback that warms the connection while the routing model call runs.
+    def warm_up_callback(self, callback_context: CallbackContext):
+        self.start_warm_up()
+
+    async def _refresh_loop(self):
+        while True:
+            refreshed = await self.refresh_card()
+            await asyncio.sleep(
+                self._card_refresh_interval
+                if refreshed
+                else min(CARD_RETRY_INTERVAL, self._card_refresh_interval)
+            )
+
+    async def refresh_card(self) -> bool:
+        """
+        Fetches the card the remote agent publishes, and adopts it if its version changed.
+
+        A published card with a different version that fails validation is
+        skipped and the current one kept.
+
+        Returns:
+            bool: False if the card could not be fetched.
+        """
+        first = not self._warm_start_metrics.refreshes
+        start = time.perf_counter()
+        try:
+            await self._ensure_resolved()
+            url = a2a_compat.agent_card_url(self._agent_card).rstrip("/")
+            card = await self._resolve_agent_card_from_url(url + AGENT_CARD_WELL_KNOWN_PATH)
+        except AgentCardResolutionError as e:
+            self._warm_start_metrics.refresh_failures += 1
+            logger.warning(f"⚠️ Could not refresh the agent card of {self.name}: {e}")
+            return False
+        self._warm_start_metrics.refreshes += 1
+        if first:
+            self._warm_start_metrics.warm_up_seconds = time.perf_counter() - start
+
+        if card.version == self._agent_card.version:
+            return True
+        try:
+            await self._validate_agent_card(card)
+        except AgentCardResolutionError as e:
+            if card.version != self._skipped_version:
+                self._skipped_version = card.version
+                logger.warning(
+                    f"⚠️ Keeping version {self._agent_card.version} of the agent card of"
+                    f" {self.name}; its published version {card.version} is invalid: {e}"
+                )
+            return True
+        logger.info(
+            f"🪪 Agent card of {self.name} changed from version"
+            f" {self._agent_card.version} to {card.version}."
+        )
+        self._agent_card = card
+        self._a2a_client = self._a2a_client_factory.create(card)
+        self._warm_start_metrics.card_changes += 1
+        return True
+
+    async def _run_async_impl(self, ctx: InvocationContext) -> AsyncGenerator[Event, None]:
+        self.start_warm_up()
+        async with contextlib.aclosing(super()._run_async_impl(ctx)) as events:
+            async for event in events:
+                yield event
+
+
+class WarmRemoteA2aAgent(WarmA2aAgentMixin, RemoteA2aAgent):
+    """RemoteA2aAgent with its card resolved at startup and its connection kept warm."""
+
+
+class WarmStreamingA2aAgent(WarmA2aAgentMixin, StreamingRemoteA2aAgent):
+    """StreamingRemoteA2aAgent with its card resolved at startup and its connection kept warm."""
@@ -1,31 +1,43 @@
+import asyncio
 import os
 import logging
 from dotenv import load_dotenv
 
-import google.cloud.logging
-import google.auth
-import google.auth.transport.requests
-import google.oauth2.id_token
-
 from google.adk import Agent
 from google.adk.agents import SequentialAgent
-from google.adk.agents.remote_a2a_agent import RemoteA2aAgent
 from google.adk.agents.callback_context import CallbackContext
 
-from google.adk.tools.mcp_tool.mcp_toolset import (
-    MCPToolset,
-    StreamableHTTPConnectionParams,
-)
+from google.adk.tools.mcp_tool.mcp_toolset import StreamableHTTPConnectionParams
 from google.adk.tools.tool_context import ToolContext
 from google.adk.tools.google_search_tool import GoogleSearchTool
-from google.adk.tools.preload_memory_tool import PreloadMemoryTool
-
-from .callback_logging import log_query_to_model, log_model_response
 
-# Setup Logging
-google.cloud.logging.Client().setup_logging()
-logger = logging.getLogger(__name__)
-logging.basicConfig(format="[%(levelname)s]: %(message)s", level=logging.INFO)
+from .a2a_resilience import (
+    A2aGuard,
+    CircuitBreaker,
+    GuardedRemoteA2aAgent,
+    GuardedStreamingA2aAgent,
+    ShowCatalog,
+)
+from .answer_cache import AnswerCache
+from .async_logging import setup_async_logging
+from .callback_logging import (
+    log_query_to_model,
+    log_model_response,
+    setup_cloud_logging,
+    trace_model_request,
+    trace_model_response,
+    trace_tool_call,
+    trace_tool_response,
+)
+from .context_governor import ContextGovernor
+from .fast_router import FastPathRouter
+from .id_token_provider import IdTokenProvider
+from .mcp_session_pool import PooledMCPToolset
+from .memory_retrieval import CachedPreloadMemoryTool
+from .memory_writer import MemoryWriter
+from .parallel_research import ParallelResearchAgent
+from .streaming import enable_streaming
+from .tracing import a2a_request_metadata, flush_on_sigterm, setup_tracing
 
 # Setup Environment
 load_dotenv()
@@ -34,25 +46,61 @@ mcp_server_url = os.getenv("MCP_SERVER_URL")
 if not mcp_server_url:
     raise ValueError("The environment variable MCP_SERVER_URL is not set.")
 
+# In lazy mode, network-bound setup runs in the background instead of at import.
+lazy_init = os.getenv("LAZY_INIT", "TRUE").upper() == "TRUE"
 
-# Helper to generate ID tokens for MCP server authentication.
-def get_id_token():
-    audience = mcp_server_url.split("/mcp")[0]
-    request = google.auth.transport.requests.Request()
-    id_token = google.oauth2.id_token.fetch_id_token(request, audience)
-    logger.info("🔑 Successfully generated ID token.")
-    return id_token
-
+# Stream model output token by token, including the show agent's over A2A.
+streaming = os.getenv("STREAMING", "TRUE").upper() == "TRUE"
 
-# Configures MCPToolset for the animal data server.
-mcp_tools = MCPToolset(
-    connection_params=StreamableHTTPConnectionParams(
-        url=mcp_server_url,
-        headers={
-            "Authorization": f"Bearer {get_id_token()}",
-        },
-    ),
+# Setup Logging
+logger = logging.getLogger(__name__)
+logging.basicConfig(format="[%(levelname)s]: %(message)s", level=logging.INFO)
+# Records are queued and written in batches from a thread (LOG_ASYNC).
+log_handler = setup_async_logging()
+setup_cloud_logging(background=lazy_init)
+
+# Export spans of model calls, tool calls and the A2A hop (TRACE_EXPORTER).
+setup_tracing("zoo-concierge-agent")
+if log_handler:
+    flush_on_sigterm(log_handler.flush)
+
+# Provides ID tokens for MCP server authentication, renewed in the background.
+id_token_provider = IdTokenProvider(audience=mcp_server_url.split("/mcp")[0])
+if not lazy_init:
+    id_token_provider.refresh()
+id_token_provider.start()
+
+# Configures a pooled MCPToolset for the animal data server.
+mcp_tools = PooledMCPToolset(
+    connection_params=StreamableHTTPConnectionParams(url=mcp_server_url),
+    header_provider=id_token_provider.get_headers,
+)
+mcp_tools.start_warm_up()
+
+
+# Loads the zoo's species names (English and Korean) for the fast-path router.
+def load_species_names() -> list[str]:
+    result = asyncio.run(
+        mcp_tools.call_tool("list_available_species", {"include_korean": True})
+    )
+    if result.is_error:
+        raise RuntimeError(result.content[0].text if result.content else "tool error")
+    # The periodic reload doubles as a check for new zoo data.
+    answer_cache.observe_version((result.meta or {}).get("data_version"))
+    return (result.structured_content or {}).get("result", [])
+
+
+# Routes obvious turns to the right expert before the greeter calls the model.
+fast_router = FastPathRouter(load_species=load_species_names)
+
+# Serves repeated, impersonal animal questions without running the pipeline.
+answer_cache = AnswerCache(
+    index=lambda: fast_router.index,
+    ttl=float(os.getenv("ANSWER_CACHE_TTL", 600)),
+    max_bytes=int(os.getenv("ANSWER_CACHE_MAX_BYTES", 4 * 1024 * 1024)),
+    memories_injected=lambda invocation_id: preload_memory.injected(invocation_id),
 )
+fast_router.start()
 
 
 # Tool to save the initial user prompt to the agent's state.
@@ -62,6 +110,33 @@ def add_prompt_to_state(tool_context: ToolContext, prompt: str) -> dict[str, str
     return {"status": "success"}
 
 
+# Writes sessions to memory in the background, one write per burst of turns,
+# and writes whatever is still queued when the instance is stopped.
+memory_writer = MemoryWriter(
+    debounce=float(os.getenv("MEMORY_WRITE_DEBOUNCE", 5)),
+    max_delay=float(os.getenv("MEMORY_WRITE_MAX_DELAY", 30)),
+    max_pending=int(os.getenv("MEMORY_WRITE_MAX_PENDING", 1000)),
+    drain_timeout=float(os.getenv("MEMORY_WRITE_DRAIN_TIMEOUT", 8)),
+)
+flush_on_sigterm(memory_writer.drain)
+
+# Preloads the user's memories once per session, capped to a token budget,
+# and again after the writer saves new ones.
+preload_memory = CachedPreloadMemoryTool(
+    generation=memory_writer.generation,
+    max_tokens=int(os.getenv("MEMORY_MAX_TOKENS", 1000)),
+)
+
+# Keeps each model request within a token budget as sessions grow: repeated
+# and stale tool results are dropped and older turns summarized.
+context_governor = ContextGovernor(
+    budget=int(os.getenv("CONTEXT_TOKEN_BUDGET", 8000)),
+    budgets={"response_formatter": int(os.getenv("FORMATTER_CONTEXT_TOKEN_BUDGET", 4000))},
+    keep_turns=int(os.getenv("CONTEXT_KEEP_TURNS", 2)),
+    summary_tokens=int(os.getenv("CONTEXT_SUMMARY_TOKENS", 600)),
+)
+
+
 # Callback to automatically save the session to memory after agent execution.
 async def auto_save_session_to_memory_callback(callback_context: CallbackContext):
     try:
@@ -70,47 +145,67 @@ async def auto_save_session_to_memory_callback(callback_context: CallbackContext
             logger.warning("⚠️ Memory Service not set, skipping memory save.")
             return
 
-        logger.info(f"💾 Saving session {inv_ctx.session.id} to memory...")
-        added_memories = await inv_ctx.memory_service.add_session_to_memory(
-            inv_ctx.session
+        await memory_writer.submit(inv_ctx.memory_service, inv_ctx.session)
+        logger.info(
+            f"💾 Queued session {inv_ctx.session.id} for memory "
+            f"(queue depth {memory_writer.queue_depth})."
         )
 
-        if added_memories:
-            logger.info(f"✨ Saved Memory Content: {added_memories}")
-        else:
-            logger.info("🚫 No new memories generated.")
-
     except Exception as e:
         logger.error(f"❌ Error saving memory: {e}", exc_info=True)
 
 
-# Agent for researching animal facts from internal and external sources.
-comprehensive_researcher = Agent(
-    name="comprehensive_researcher",
+# Agent for looking up animals in the zoo's internal data.
+zoo_researcher = Agent(
+    name="zoo_researcher",
     model=model_name,
-    description="The primary researcher that can access both internal zoo data and external knowledge from Google Search..",
+    description="Looks up animals at our zoo (names, ages, locations) in the zoo database.",
     instruction="""
-    You are a helpful research assistant. Your goal is to fully answer the user's PROMPT.
-    You have access to two tools:
-    1. A tool for getting specific data about animals AT OUR ZOO (names, ages, locations).
-    2. A tool for google search for general knowledge (facts, lifespan, diet, habitat).
-
-    First, analyze the user's PROMPT.
-    - Check if the requested animal exists in our zoo using the zoo database tool FIRST.
-    - If the animal exists in the zoo:
-        - Get the internal data (names, ages, locations).
-        - Then, use google search for general knowledge if needed.
-        - Synthesize the results.
-    - If the animal DOES NOT exist in the zoo:
-        - Explicitly state that "This animal is currently not in our zoo, so I cannot provide information about it."
-        - DO NOT provide general information or use google search for animals not in the zoo.
-    
+    You are a research assistant for the zoo's internal data.
+    Use the zoo database tool to find the animals mentioned in the user's PROMPT
+    at OUR ZOO (names, ages, locations).
+    - If the PROMPT mentions several animals, or filters by enclosure, trail or age, look them all up in ONE call with `get_animals_by_species_batch`.
+    - Report only what the zoo database returned. If an animal is not in the zoo, say so.
+
+    PROMPT:
+    {{ PROMPT }}
+    """,
+    tools=[mcp_tools],
+    before_model_callback=[context_governor.before_model_callback, trace_model_request],
+    after_model_callback=trace_model_response,
+    before_tool_callback=trace_tool_call,
+    after_tool_callback=trace_tool_response,
+    output_key="zoo_research",
+)
+
+
+# Agent for general animal knowledge from Google Search, run alongside the zoo lookup.
+web_researcher = Agent(
+    name="web_researcher",
+    model=model_name,
+    description="Finds general knowledge about animals (facts, lifespan, diet, habitat) with Google Search.",
+    instruction="""
+    You are a research assistant for general animal knowledge.
+    Use google search to find facts about the animals mentioned in the user's PROMPT
+    (facts, lifespan, diet, habitat). Do not describe any particular zoo.
+
     PROMPT:
     {{ PROMPT }}
-        
-    You MUST prioritize the zoo's internal data. Only provide information for animals present in the zoo.
     """,
-    tools=[mcp_tools, GoogleSearchTool(bypass_multi_tools_limit=True)],
+    tools=[GoogleSearchTool(bypass_multi_tools_limit=True)],
+    before_model_callback=[context_governor.before_model_callback, trace_model_request],
+    after_model_callback=trace_model_response,
+    output_key="web_research",
+)
+
+
+# Runs the zoo lookup and the web search at the same time and merges their
+# findings into research_data. The search is cancelled if the animal is not
+# in the zoo, since only animals present in the zoo are described.
+comprehensive_researcher = ParallelResearchAgent(
+    name="comprehensive_researcher",
+    description="The primary researcher that can access both internal zoo data and external knowledge from Google Search.",
+    sub_agents=[zoo_researcher, web_researcher],
     output_key="research_data",  # A key to store the combined findings
 )
 
@@ -135,6 +230,8 @@ response_formatter = Agent(
     RESEARCH_DATA:
     {{ research_data }}
     """,
+    before_model_callback=[context_governor.before_model_callback, trace_model_request],
+    after_model_callback=trace_model_response,
 )
 
 
@@ -146,15 +243,67 @@ zoo_concierge_agent = SequentialAgent(
         comprehensive_researcher,  # Step 1: Gather all data
         response_formatter,  # Step 2: Format the final response
     ],
+    before_agent_callback=answer_cache.before_agent_callback,
+    after_agent_callback=answer_cache.after_agent_callback,
+)
+
+# Show names for the answer given when the show agent cannot be reached,
+# read from the show MCP server (SHOW_MCP_SERVER_URL) if it is configured.
+show_mcp_server_url = os.getenv("SHOW_MCP_SERVER_URL")
+show_catalog = None
+if show_mcp_server_url:
+    show_id_token_provider = IdTokenProvider(audience=show_mcp_server_url.split("/mcp")[0])
+    show_id_token_provider.start()
+    show_mcp_tools = PooledMCPToolset(
+        connection_params=StreamableHTTPConnectionParams(url=show_mcp_server_url),
+        header_provider=show_id_token_provider.get_headers,
+    )
+
+    def load_show_names() -> list[str]:
+        result = asyncio.run(show_mcp_tools.call_tool("list_available_shows", {}))
+        if result.is_error:
+            raise RuntimeError(result.content[0].text if result.content else "tool error")
+        return (result.structured_content or {}).get("result", [])
+
+    show_catalog = ShowCatalog(
+        load_shows=load_show_names,
+        refresh_interval=float(os.getenv("SHOW_CATALOG_REFRESH", 600)),
+    )
+    show_catalog.start()
+
+# Bounds the calls to the show agent: a deadline per call, a cap on calls in
+# flight, and a circuit breaker that answers at once from the show catalog
+# while the show agent's service is failing.
+show_agent_guard = A2aGuard(
+    breaker=CircuitBreaker(
+        "zoo_show_agent",
+        failure_threshold=int(os.getenv("A2A_FAILURE_THRESHOLD", 5)),
+        reset_timeout=float(os.getenv("A2A_RESET_TIMEOUT", 30)),
+    ),
+    max_in_flight=int(os.getenv("A2A_MAX_IN_FLIGHT", 32)),
+    queue_timeout=float(os.getenv("A2A_QUEUE_TIMEOUT", 0.5)),
+    deadline=float(os.getenv("A2A_DEADLINE", 60)),
+    idle_timeout=float(os.getenv("A2A_IDLE_TIMEOUT", 20)),
+    catalog=show_catalog,
 )
 
 # Remote agent for handling show inquiries and bookings via A2A.
+# Its streamed tokens are passed on as partial events, and the request
+# metadata carries the trace context to it. Its card is resolved here, and
+# the card it publishes is fetched every A2A_CARD_REFRESH seconds, which
+# keeps a connection open for the next call.
 current_dir = os.path.dirname(os.path.abspath(__file__))
-zoo_show_agent = RemoteA2aAgent(
+zoo_show_agent = (GuardedStreamingA2aAgent if streaming else GuardedRemoteA2aAgent)(
     name="zoo_show_agent",
     description="Used to check animal show schedules or make show reservations.",
     agent_card=os.path.join(current_dir, "agent.json"),
+    a2a_request_meta_provider=a2a_request_metadata,
+    guard=show_agent_guard,
+    card_refresh_interval=float(os.getenv("A2A_CARD_REFRESH", 60)),
+    keepalive_expiry=float(os.getenv("A2A_KEEPALIVE", 120)),
 )
+# Connects now if the server's loop is already running; otherwise at the first turn.
+zoo_show_agent.start_warm_up()
 
 
 # Root agent for orchestrating overall user interactions and routing.
@@ -177,9 +326,24 @@ root_agent = Agent(
 
     All responses must be in Korean.
     """,
-    before_model_callback=log_query_to_model,
-    after_model_callback=log_model_response,
+    before_agent_callback=[
+        *([enable_streaming] if streaming else []),
+        zoo_show_agent.warm_up_callback,
+    ],
+    before_model_callback=[
+        log_query_to_model,
+        context_governor.before_model_callback,
+        trace_model_request,
+        fast_router.before_model_callback,
+    ],
+    after_model_callback=[
+        log_model_response,
+        trace_model_response,
+        fast_router.after_model_callback,
+    ],
+    before_tool_callback=trace_tool_call,
+    after_tool_callback=trace_tool_response,
     after_agent_callback=auto_save_session_to_memory_callback,
-    tools=[add_prompt_to_state, PreloadMemoryTool()],
+    tools=[add_prompt_to_state, preload_memory],
     sub_agents=[zoo_concierge_agent, zoo_show_agent],
 )
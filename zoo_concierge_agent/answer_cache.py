@@ -0,0 +1,236 @@
+import collections
+import dataclasses
+import logging
+import re
+import threading
+import time
+from typing import Callable, Optional
+
+from google.adk.agents.callback_context import CallbackContext
+from google.genai import types
+
+from .fast_router import LexicalIndex, normalize
+
+logger = logging.getLogger(__name__)
+
+# Digits matter for the answer ("older than 5"), so they are kept in keys.
+KEY_WORD_RE = re.compile(r"[a-z0-9]+|[가-힣]+")
+
+# Words that tie an answer to the visitor, their memories or earlier turns.
+PERSONAL_WORDS = frozenset(
+    {
+        "i", "me", "my", "mine", "we", "our", "us", "remember", "again", "last",
+        "previous", "before", "favorite", "favourite", "it", "they", "them",
+        "that", "those",
+        "나", "내", "나의", "저", "제", "저의", "우리", "기억", "지난번", "저번",
+        "아까", "전에", "좋아하는", "그거", "그것", "걔", "걔네", "그", "거기",
+    }
+)
+
+
+@dataclasses.dataclass
+class CachedAnswer:
+    text: str
+    data_version: str
+    expires_at: float
+    size: int
+
+
+@dataclasses.dataclass
+class AnswerCacheMetrics:
+    """Counters for answer cache lookups and evictions."""
+
+    hits: int = 0
+    misses: int = 0
+    bypassed: int = 0
+    personalized: int = 0
+    expired: int = 0
+    invalidated: int = 0
+    evictions: int = 0
+    stores: int = 0
+
+    def as_dict(self) -> dict[str, float]:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "bypassed": self.bypassed,
+            "personalized": self.personalized,
+            "expired": self.expired,
+            "invalidated": self.invalidated,
+            "evictions": self.evictions,
+            "stores": self.stores,
+        }
+
+
+class AnswerCache:
+    """
+    Caches zoo_concierge_agent answers to repeated, impersonal questions.
+
+    Used as the agent's before/after_agent_callback. A question is keyed on
+    its normalized words with species names replaced by a placeholder, plus
+    the species found, so "사자는 어디 있어?" and "사자 어디 있어" share an
+    answer while other animals do not. Only questions that name a species
+    and do not refer to the visitor, their memories or earlier turns are
+    cached; those are counted as bypassed. Answers of turns whose requests
+    carried the visitor's memories (`memories_injected`) may draw on them,
+    so they are served from the cache but not stored; those are counted as
+    personalized.
+
+    Entries expire after `ttl` seconds and are evicted least recently used
+    first once they take more than `max_bytes`. Each entry remembers the
+    data version of the MCP results it was built from (the `data_version`
+    in their meta), and every entry is dropped once the server reports a
+    new version, whether in a tool result or through `observe_version`.
+    """
+
+    def __init__(
+        self,
+        index: Callable[[], LexicalIndex],
+        ttl: float = 600.0,
+        max_bytes: int = 4 * 1024 * 1024,
+        answer_author: str = "response_formatter",
+        memories_injected: Callable[[str], bool] = lambda invocation_id: False,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Args:
+            index (Callable[[], LexicalIndex]): Returns the current species index.
+            ttl (float): Seconds an answer stays valid.
+            max_bytes (int): Approximate memory cap for keys and answers.
+            answer_author (str): The agent whose final text is the answer.
+            memories_injected (Callable[[str], bool]): Returns True if
+                memories were injected into the invocation's model requests.
+            clock (Callable[[], float]): Returns the current time in seconds.
+        """
+        self._index = index
+        self._ttl = ttl
+        self._max_bytes = max_bytes
+        self._answer_author = answer_author
+        self._memories_injected = memories_injected
+        self._clock = clock
+        self._entries: collections.OrderedDict[str, CachedAnswer] = collections.OrderedDict()
+        self.data_version: Optional[str] = None
+        self._lock = threading.Lock()
+        self.bytes = 0
+        self.metrics = AnswerCacheMetrics()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def key(self, prompt: str) -> Optional[str]:
+        """Returns the cache key of a question, or None if it must not be cached."""
+        words = KEY_WORD_RE.findall(normalize(prompt))
+        if not words or any(word in PERSONAL_WORDS for word in words):
+            return None
+        tokens, species = self._index().template(words)
+        if not species:
+            return None
+        return " ".join(tokens) + "|" + ",".join(sorted(species))
+
+    def _drop(self, key: str):
+        entry = self._entries.pop(key)
+        self.bytes -= entry.size
+
+    def observe_version(self, version: Optional[str]):
+        """
+        Records the data version the MCP server reported, dropping answers built from another.
+
+        Args:
+            version (Optional[str]): The server's current data version.
+        """
+        if not version or version == self.data_version:
+            return
+        with self._lock:
+            self.data_version = version
+            dropped = len(self._entries)
+            self._entries.clear()
+            self.bytes = 0
+            self.metrics.invalidated += dropped
+        if dropped:
+            logger.info(f"🧹 Zoo data is now {version}; dropped {dropped} cached answers.")
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.metrics.misses += 1
+                return None
+            if entry.expires_at <= self._clock():
+                self._drop(key)
+                self.metrics.expired += 1
+                self.metrics.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.metrics.hits += 1
+            return entry.text
+
+    def put(self, key: str, text: str, data_version: str):
+        size = len(key.encode()) + len(text.encode())
+        if size > self._max_bytes:
+            return
+        with self._lock:
+            if data_version != self.data_version:
+                # Built from data that has since been replaced.
+                return
+            if key in self._entries:
+                self._drop(key)
+            self._entries[key] = CachedAnswer(
+                text, data_version, self._clock() + self._ttl, size
+            )
+            self.bytes += size
+            self.metrics.stores += 1
+            while self.bytes > self._max_bytes:
+                self._drop(next(iter(self._entries)))
+                self.metrics.evictions += 1
+
+    def before_agent_callback(self, callback_context: CallbackContext) -> Optional[types.Content]:
+        """
+        Answers from the cache, skipping the agent, when the question was answered before.
+
+        Args:
+            callback_context (CallbackContext): The callback context information.
+        """
+        key = self.key(callback_context.state.get("PROMPT", ""))
+        if key is None:
+            self.metrics.bypassed += 1
+            return None
+        text = self.get(key)
+        if text is None:
+            return None
+        logger.info(f"💡 [Answer cache] hit for {key}")
+        return types.Content(role="model", parts=[types.Part(text=text)])
+
+    def after_agent_callback(self, callback_context: CallbackContext):
+        """
+        Caches the answer of this invocation, tagged with the data version it used.
+
+        Args:
+            callback_context (CallbackContext): The callback context information.
+        """
+        inv_ctx = getattr(callback_context, "_invocation_context", None)
+        key = self.key(callback_context.state.get("PROMPT", ""))
+        if inv_ctx is None or key is None:
+            return
+        if self._memories_injected(callback_context.invocation_id):
+            self.metrics.personalized += 1
+            return
+
+        answer, versions = None, set()
+        for event in inv_ctx.session.events:
+            if event.invocation_id != callback_context.invocation_id or event.partial:
+                continue
+            for response in event.get_function_responses():
+                meta = (response.response or {}).get("meta") or {}
+                if meta.get("data_version"):
+                    versions.add(meta["data_version"])
+            if event.author == self._answer_author and event.content and event.content.parts:
+                text = "".join(part.text or "" for part in event.content.parts if not part.thought)
+                answer = text or answer
+        # Answers not backed by zoo data, or by data that changed mid-turn, are not kept.
+        if not answer or len(versions) != 1:
+            return
+        (version,) = versions
+        self.observe_version(version)
+        self.put(key, answer, version)
@@ -1,9 +1,58 @@
 
 import logging
-import google.cloud.logging
+import threading
+from typing import Any, Optional
 
 from google.adk.agents.callback_context import CallbackContext
 from google.adk.models import LlmResponse, LlmRequest
+from google.adk.tools.base_tool import BaseTool
+from google.adk.tools.tool_context import ToolContext
+from google.genai import types
+from opentelemetry import trace
+
+from .async_logging import find_async_handler
+from .tracing import payload_bytes
+
+
+# Attaches Cloud Logging to the root logger.
+def setup_cloud_logging(background: bool = False):
+    """
+    Routes log records to Cloud Logging instead of the stdout handler.
+
+    Creating the client resolves credentials and the project, which takes a
+    network round-trip on Cloud Run and fails offline, so it can run on a
+    background thread. Until it completes, records keep going to stdout.
+    With setup_async_logging, the Cloud Logging handler takes stdout's
+    place behind the queue.
+
+    Args:
+        background (bool): Run the setup on a daemon thread and return at once.
+    """
+    if background:
+        threading.Thread(
+            target=setup_cloud_logging, name="cloud-logging-setup", daemon=True
+        ).start()
+        return
+
+    root_logger = logging.getLogger()
+    fallback_handlers = list(root_logger.handlers)
+    try:
+        import google.cloud.logging
+
+        google.cloud.logging.Client().setup_logging()
+    except Exception as e:
+        logging.warning(f"⚠️ Cloud Logging unavailable, logging to stdout: {e}")
+        return
+
+    async_handler = find_async_handler(root_logger)
+    if async_handler is not None:
+        added = [h for h in root_logger.handlers if h not in fallback_handlers]
+        for handler in added:
+            root_logger.removeHandler(handler)
+        async_handler.targets = added
+        return
+    for handler in fallback_handlers:
+        root_logger.removeHandler(handler)
 
 
 # Callback to log the user query sent to the model.
@@ -19,8 +68,9 @@ def log_query_to_model(callback_context: CallbackContext, llm_request: LlmReques
     if llm_request.contents and llm_request.contents[-1].role == "user":
         if llm_request.contents[-1].parts[-1].text:
             last_user_message = llm_request.contents[-1].parts[0].text
+            # Arguments are formatted lazily, off the request path.
             logging.info(
-                f"🗣️ [Query to {callback_context.agent_name}]: " + last_user_message
+                "🗣️ [Query to %s]: %s", callback_context.agent_name, last_user_message
             )
 
 
@@ -33,16 +83,98 @@ def log_model_response(callback_context: CallbackContext, llm_response: LlmRespo
         callback_context (CallbackContext): The callback context information.
         llm_response (LlmResponse): The response object from the model.
     """
+    # Streamed chunks are logged once, as the final response.
+    if llm_response.partial:
+        return
     # Log only if there is response content and parts.
     if llm_response.content and llm_response.content.parts:
         for part in llm_response.content.parts:
             if part.text:
                 logging.info(
-                    f"🤖 [Response from {callback_context.agent_name}]: " + part.text
+                    "🤖 [Response from %s]: %s", callback_context.agent_name, part.text
                 )
             elif part.function_call:
                 logging.info(
-                    f"🛠️ [Function Call from {callback_context.agent_name}]: "
-                    + part.function_call.name
+                    "🛠️ [Function Call from %s]: %s",
+                    callback_context.agent_name,
+                    part.function_call.name,
                 )
 
+
+# Returns the size of model request or response contents as sent over the wire.
+def content_bytes(contents: list[Optional[types.Content]]) -> int:
+    size = 0
+    for content in contents:
+        for part in (content.parts if content else None) or []:
+            if part.text:
+                size += len(part.text.encode())
+            elif part.function_call:
+                size += payload_bytes(part.function_call.args)
+            elif part.function_response:
+                size += payload_bytes(part.function_response.response)
+    return size
+
+
+# Callback to record the model request's size on the model call's span.
+def trace_model_request(callback_context: CallbackContext, llm_request: LlmRequest):
+    """
+    Adds the request payload size to ADK's call_llm span, which already
+    carries the model call's duration and token counts.
+
+    Args:
+        callback_context (CallbackContext): The callback context information.
+        llm_request (LlmRequest): The request object sent to the model.
+    """
+    span = trace.get_current_span()
+    if span.is_recording():
+        span.set_attribute("zoo.agent", callback_context.agent_name)
+        span.set_attribute("zoo.request.contents", len(llm_request.contents))
+        span.set_attribute("zoo.request.bytes", content_bytes(llm_request.contents))
+
+
+# Callback to record the model response's size on the model call's span.
+def trace_model_response(callback_context: CallbackContext, llm_response: LlmResponse):
+    """
+    Adds the response payload size to ADK's call_llm span.
+
+    Args:
+        callback_context (CallbackContext): The callback context information.
+        llm_response (LlmResponse): The response object from the model.
+    """
+    span = trace.get_current_span()
+    if not llm_response.partial and span.is_recording():
+        span.set_attribute("zoo.response.bytes", content_bytes([llm_response.content]))
+
+
+# Callback to record the tool arguments' size on the tool call's span.
+def trace_tool_call(tool: BaseTool, args: dict[str, Any], tool_context: ToolContext):
+    """
+    Adds the argument size to ADK's execute_tool span, which already carries
+    the tool call's duration.
+
+    Args:
+        tool (BaseTool): The tool being called.
+        args (dict[str, Any]): The arguments of the call.
+        tool_context (ToolContext): The tool context information.
+    """
+    span = trace.get_current_span()
+    if span.is_recording():
+        span.set_attribute("zoo.tool.args_bytes", payload_bytes(args))
+
+
+# Callback to record the tool result's size on the tool call's span.
+def trace_tool_response(
+    tool: BaseTool, args: dict[str, Any], tool_context: ToolContext, tool_response: Any
+):
+    """
+    Adds the result size to ADK's execute_tool span.
+
+    Args:
+        tool (BaseTool): The tool that was called.
+        args (dict[str, Any]): The arguments of the call.
+        tool_context (ToolContext): The tool context information.
+        tool_response (Any): The result of the call.
+    """
+    span = trace.get_current_span()
+    if span.is_recording():
+        span.set_attribute("zoo.tool.response_bytes", payload_bytes(tool_response))
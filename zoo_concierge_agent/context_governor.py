@@ -0,0 +1,411 @@
+import collections
+import dataclasses
+import json
+import logging
+import re
+import threading
+from typing import Any, Optional
+
+from google.adk.agents.callback_context import CallbackContext
+from google.adk.models import LlmRequest
+from google.genai import types
+
+from .memory_retrieval import estimate_tokens
+
+logger = logging.getLogger(__name__)
+
+# ADK relays other agents' events to a model as user content that starts
+# with this preamble, one part per relayed text, tool call or tool result.
+RELAYED_PREAMBLE = "For context:"
+RELAYED_RE = re.compile(
+    r"\[(?P<author>[^\]\n]*)\] (?:said|called tool `(?P<call>[^`\n]*)` with parameters"
+    r"|`(?P<result>[^`\n]*)` tool returned result):\n"
+)
+QUOTE_RE = re.compile(r"<<<(?:BEGIN|END)_QUOTED_AGENT_CONTENT>>>")
+
+SUMMARY_HEADER = (
+    "For context: a summary of the earlier conversation with the visitor,"
+    " oldest first. The full turns were left out to save space."
+)
+STALE_RESULT = "(Result from an earlier turn, left out. Call the tool again if it is needed.)"
+REPEATED_RESULT = "(Same result as a later `{tool}` call, left out.)"
+IN_INSTRUCTION = "(Left out: repeated in the instruction.)"
+
+# Relayed texts shorter than this are not checked against the instruction.
+MIN_REPEATED_CHARS = 200
+
+
+# Serializes a function call's arguments or a function response for sizing and comparing.
+def payload_text(payload: Any) -> str:
+    return json.dumps(payload, ensure_ascii=False, sort_keys=True, default=str)
+
+
+def part_tokens(part: types.Part) -> int:
+    """Estimates the tokens a content part takes in a model request."""
+    if part.text:
+        return estimate_tokens(part.text)
+    if part.function_call:
+        call = part.function_call
+        return estimate_tokens(f"{call.name}{payload_text(call.args)}")
+    if part.function_response:
+        response = part.function_response
+        return estimate_tokens(f"{response.name}{payload_text(response.response)}")
+    return 0
+
+
+def content_tokens(content: types.Content) -> int:
+    return sum(part_tokens(part) for part in content.parts or [])
+
+
+def instruction_text(llm_request: LlmRequest) -> str:
+    instruction = llm_request.config.system_instruction if llm_request.config else None
+    if isinstance(instruction, str):
+        return instruction
+    if isinstance(instruction, types.Content):
+        return "".join(part.text or "" for part in instruction.parts or [])
+    return ""
+
+
+def request_tokens(llm_request: LlmRequest) -> int:
+    """Estimates the tokens of a model request's instruction and contents."""
+    return estimate_tokens(instruction_text(llm_request)) + sum(
+        content_tokens(content) for content in llm_request.contents
+    )
+
+
+def is_relayed(content: types.Content) -> bool:
+    parts = content.parts or []
+    return bool(parts and parts[0].text and parts[0].text.startswith(RELAYED_PREAMBLE))
+
+
+def is_visitor_message(content: types.Content) -> bool:
+    """True for the visitor's own message, which starts a turn."""
+    if content.role != "user" or not content.parts or is_relayed(content):
+        return False
+    if any(part.function_response for part in content.parts):
+        return False
+    return any(part.text for part in content.parts)
+
+
+# Returns the quoted text of a relayed part, without its header and quote markers.
+def relayed_body(text: str, match: re.Match) -> str:
+    return QUOTE_RE.sub("", text[match.end() :]).strip()
+
+
+# Returns the tool name and result of a part holding a tool result, else None.
+def tool_result(part: types.Part) -> Optional[tuple[str, str]]:
+    if part.function_response:
+        response = part.function_response
+        return response.name or "", payload_text(response.response)
+    if part.text and (match := RELAYED_RE.match(part.text)) and match["result"] is not None:
+        return match["result"], relayed_body(part.text, match)
+    return None
+
+
+# Builds a part that stands in for a tool result, keeping what pairs it with its call.
+def replace_result(part: types.Part, note: str) -> types.Part:
+    if part.function_response:
+        response = part.function_response
+        return types.Part(
+            function_response=types.FunctionResponse(
+                id=response.id, name=response.name, response={"result": note}
+            )
+        )
+    match = RELAYED_RE.match(part.text)
+    return types.Part(text=part.text[: match.end()] + note)
+
+
+def shorten(text: str, limit: int) -> str:
+    text = " ".join(text.split())
+    return text if len(text) <= limit else text[: limit - 1] + "…"
+
+
+def summarize_turn(turn: list[types.Content]) -> str:
+    """Summarizes a turn as the visitor's message and the last answer given."""
+    visitor = next((part.text for part in turn[0].parts if part.text), "")
+    answer = ""
+    for content in turn[1:]:
+        for part in content.parts or []:
+            if not part.text or part.thought:
+                continue
+            if content.role == "model":
+                answer = part.text
+            elif (match := RELAYED_RE.match(part.text)) and match["call"] is None and match["result"] is None:
+                answer = relayed_body(part.text, match)
+    line = f"- Visitor: {shorten(visitor, 80)}"
+    if answer:
+        line += f"\n  Answer: {shorten(answer, 160)}"
+    return line
+
+
+@dataclasses.dataclass
+class RollingSummary:
+    # The visitor message of each summarized turn, to check they are still the same turns.
+    visitor_messages: list[str]
+    lines: list[str]
+
+
+@dataclasses.dataclass
+class ContextGovernorMetrics:
+    """Counters for model requests passed through a ContextGovernor."""
+
+    calls: int = 0
+    trimmed: int = 0
+    over_budget: int = 0
+    tokens_in_total: int = 0
+    tokens_out_total: int = 0
+    deduplicated: int = 0
+    preambles_merged: int = 0
+    stale_dropped: int = 0
+    turns_summarized: int = 0
+    summary_lines_reused: int = 0
+    summary_lines_built: int = 0
+
+    def as_dict(self) -> dict[str, float]:
+        return {
+            "calls": self.calls,
+            "trimmed": self.trimmed,
+            "over_budget": self.over_budget,
+            "tokens_in_avg": self.tokens_in_total / self.calls if self.calls else 0.0,
+            "tokens_out_avg": self.tokens_out_total / self.calls if self.calls else 0.0,
+            "saved_ratio": (
+                1 - self.tokens_out_total / self.tokens_in_total if self.tokens_in_total else 0.0
+            ),
+            "deduplicated": self.deduplicated,
+            "preambles_merged": self.preambles_merged,
+            "stale_dropped": self.stale_dropped,
+            "turns_summarized": self.turns_summarized,
+            "summary_lines_reused": self.summary_lines_reused,
+            "summary_lines_built": self.summary_lines_built,
+        }
+
+
+class ContextGovernor:
+    """
+    Keeps each model request of a session within a token budget.
+
+    Used as a before_model_callback. Every request gets tool results that
+    repeat a later one's, and relayed texts repeated in the instruction
+    (the researchers' findings in the formatter's research_data), replaced
+    by a short note, and consecutive texts relayed from other agents share
+    one "For context:" preamble. If the request is still over its agent's budget
+    (`budgets`, else `budget`, in estimated tokens), tool results of
+    earlier turns are replaced too, then the oldest turns are folded into
+    a summary of each visitor message and the answer it got, until the
+    request fits. The current turn and the `keep_turns` before it are
+    never folded, and tool calls keep their results, so every request
+    stays well formed.
+
+    The summary is cached per session and agent and extended as turns are
+    folded. Once over budget, turns are folded until the request is under
+    `low_water` of the budget, so the same summary starts the requests of
+    the next turns instead of changing on every one.
+    """
+
+    def __init__(
+        self,
+        budget: int = 8000,
+        budgets: Optional[dict[str, int]] = None,
+        keep_turns: int = 2,
+        summary_tokens: int = 600,
+        low_water: float = 0.75,
+        max_sessions: int = 1000,
+    ):
+        """
+        Args:
+            budget (int): Estimated tokens a request may take, by default.
+            budgets (Optional[dict[str, int]]): Budgets by agent name.
+            keep_turns (int): Complete turns kept before the current one.
+            summary_tokens (int): Estimated tokens the summary may take; the
+                oldest lines are left out beyond it.
+            low_water (float): Share of the budget to fold down to.
+            max_sessions (int): Sessions whose summaries are cached.
+        """
+        self._budget = budget
+        self._budgets = budgets or {}
+        self._keep_turns = keep_turns
+        self._summary_tokens = summary_tokens
+        self._low_water = low_water
+        self._max_sessions = max_sessions
+        self._summaries: collections.OrderedDict[tuple[str, str], RollingSummary] = (
+            collections.OrderedDict()
+        )
+        self._lock = threading.Lock()
+        self.metrics = ContextGovernorMetrics()
+
+    def budget_for(self, agent_name: str) -> int:
+        return self._budgets.get(agent_name, self._budget)
+
+    def _deduplicate(self, contents: list[types.Content], sizes: list[int], instruction: str) -> int:
+        # Newest first, so the latest copy of a result is the one kept.
+        seen = set()
+        replaced = 0
+        for i in range(len(contents) - 1, -1, -1):
+            parts = list(contents[i].parts or [])
+            for j, part in enumerate(parts):
+                if (result := tool_result(part)) is not None:
+                    note = REPEATED_RESULT.format(tool=result[0])
+                    if result in seen and estimate_tokens(result[1]) > estimate_tokens(note):
+                        parts[j] = replace_result(part, note)
+                    seen.add(result)
+                elif part.text and (match := RELAYED_RE.match(part.text)):
+                    body = relayed_body(part.text, match)
+                    if len(body) >= MIN_REPEATED_CHARS and body in instruction:
+                        parts[j] = types.Part(text=part.text[: match.end()] + IN_INSTRUCTION)
+            changed = sum(new is not old for new, old in zip(parts, contents[i].parts or []))
+            if changed:
+                contents[i] = types.Content(role=contents[i].role, parts=parts)
+                sizes[i] = content_tokens(contents[i])
+                replaced += changed
+        return replaced
+
+    def _merge_relayed(self, contents: list[types.Content], sizes: list[int]) -> int:
+        # Runs of relayed contents share one preamble instead of one each.
+        merged = 0
+        i = 0
+        while i < len(contents) - 1:
+            if is_relayed(contents[i]) and is_relayed(contents[i + 1]):
+                contents[i] = types.Content(
+                    role=contents[i].role,
+                    parts=list(contents[i].parts) + list(contents[i + 1].parts[1:]),
+                )
+                sizes[i] += sizes[i + 1] - part_tokens(contents[i + 1].parts[0])
+                del contents[i + 1], sizes[i + 1]
+                merged += 1
+            else:
+                i += 1
+        return merged
+
+    def _drop_stale(self, contents: list[types.Content], sizes: list[int], end: int) -> int:
+        dropped = 0
+        for i in range(end):
+            content = contents[i]
+            parts = list(content.parts or [])
+            changed = False
+            for j, part in enumerate(parts):
+                result = tool_result(part)
+                if result is None or estimate_tokens(result[1]) <= estimate_tokens(STALE_RESULT):
+                    continue
+                parts[j] = replace_result(part, STALE_RESULT)
+                changed = True
+                dropped += 1
+            if changed:
+                contents[i] = types.Content(role=content.role, parts=parts)
+                sizes[i] = content_tokens(contents[i])
+        return dropped
+
+    def _summary(self, key: tuple[str, str], turns: list[list[types.Content]]) -> str:
+        visitor_messages = [summarize_turn(turn[:1]) for turn in turns]
+        with self._lock:
+            cached = self._summaries.get(key)
+            if cached is not None:
+                self._summaries.move_to_end(key)
+        reused = 0
+        if cached is not None:
+            for cached_message, message in zip(cached.visitor_messages, visitor_messages):
+                if cached_message != message:
+                    break
+                reused += 1
+        lines = (cached.lines[:reused] if cached else []) + [
+            summarize_turn(turn) for turn in turns[reused:]
+        ]
+        self.metrics.summary_lines_reused += reused
+        self.metrics.summary_lines_built += len(turns) - reused
+        with self._lock:
+            self._summaries[key] = RollingSummary(visitor_messages, lines)
+            self._summaries.move_to_end(key)
+            while len(self._summaries) > self._max_sessions:
+                self._summaries.popitem(last=False)
+
+        shown = list(lines)
+        tokens = estimate_tokens(SUMMARY_HEADER) + sum(estimate_tokens(line) for line in shown)
+        while len(shown) > 1 and tokens > self._summary_tokens:
+            tokens -= estimate_tokens(shown.pop(0))
+        text = SUMMARY_HEADER
+        if len(shown) < len(lines):
+            text += f"\n({len(lines) - len(shown)} earlier turns not shown.)"
+        return text + "\n" + "\n".join(shown)
+
+    def _folded_turns(self, key: tuple[str, str]) -> int:
+        with self._lock:
+            cached = self._summaries.get(key)
+        return len(cached.lines) if cached else 0
+
+    # Callback to trim the model request to the agent's budget.
+    def before_model_callback(self, callback_context: CallbackContext, llm_request: LlmRequest):
+        """
+        Trims the model request's contents to the agent's token budget.
+
+        Args:
+            callback_context (CallbackContext): The callback context information.
+            llm_request (LlmRequest): The request object sent to the model.
+        """
+        agent_name = callback_context.agent_name
+        budget = self.budget_for(agent_name)
+        instruction = instruction_text(llm_request)
+        instruction_tokens = estimate_tokens(instruction)
+        contents = list(llm_request.contents)
+        sizes = [content_tokens(content) for content in contents]
+        before = instruction_tokens + sum(sizes)
+        self.metrics.calls += 1
+        self.metrics.tokens_in_total += before
+
+        deduplicated = self._deduplicate(contents, sizes, instruction)
+        starts = [i for i, content in enumerate(contents) if is_visitor_message(content)]
+        total = instruction_tokens + sum(sizes)
+
+        stale = 0
+        if total > budget and len(starts) > 1:
+            stale = self._drop_stale(contents, sizes, starts[-1])
+            total = instruction_tokens + sum(sizes)
+
+        foldable = len(starts) - 1 - self._keep_turns
+        inv_ctx = getattr(callback_context, "_invocation_context", None)
+        key = (inv_ctx.session.id if inv_ctx else "", agent_name)
+        # Turns folded for an earlier request stay folded, so the summary is unchanged.
+        folded = min(self._folded_turns(key), max(foldable, 0))
+        remaining = total
+        if folded:
+            remaining += self._summary_tokens - sum(sizes[: starts[folded]])
+        if remaining > budget and foldable > folded:
+            if not folded:
+                remaining += self._summary_tokens
+            while folded < foldable and remaining > budget * self._low_water:
+                remaining -= sum(sizes[starts[folded] : starts[folded + 1]])
+                folded += 1
+        if folded:
+            turns = [contents[starts[k] : starts[k + 1]] for k in range(folded)]
+            summary = types.Content(
+                role="user", parts=[types.Part(text=self._summary(key, turns))]
+            )
+            contents = [summary] + contents[starts[folded] :]
+            sizes = [content_tokens(summary)] + sizes[starts[folded] :]
+            self.metrics.turns_summarized += folded
+        # Last, so only what is sent is merged.
+        merged = self._merge_relayed(contents, sizes)
+
+        if not (deduplicated or merged or stale or folded):
+            self.metrics.tokens_out_total += before
+            if before > budget:
+                self.metrics.over_budget += 1
+            return None
+        llm_request.contents = contents
+        after = instruction_tokens + sum(sizes)
+        self.metrics.trimmed += 1
+        self.metrics.tokens_out_total += after
+        self.metrics.deduplicated += deduplicated
+        self.metrics.preambles_merged += merged
+        self.metrics.stale_dropped += stale
+        if after > budget:
+            self.metrics.over_budget += 1
+        logger.info(
+            "✂️ [Context for %s]: %d → %d tokens (saved %d; %d repeated, %d stale, %d turns summarized)",
+            agent_name,
+            before,
+            after,
+            before - after,
+            deduplicated,
+            stale,
+            folded,
+        )
+        return None
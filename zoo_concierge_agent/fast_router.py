@@ -0,0 +1,386 @@
+import dataclasses
+import logging
+import re
+import threading
+import time
+import unicodedata
+from typing import Callable, Iterable, Optional
+
+from google.adk.agents.callback_context import CallbackContext
+from google.adk.models import LlmRequest, LlmResponse
+from google.genai import types
+
+logger = logging.getLogger(__name__)
+
+SHOW_AGENT = "zoo_show_agent"
+CONCIERGE_AGENT = "zoo_concierge_agent"
+
+# Words that only come up when asking about shows or booking them. The bare
+# verbs "show" and "book" are left out ("show me the lions").
+SHOW_KEYWORDS = frozenset(
+    {
+        "shows", "performance", "performances", "reserve", "reservation",
+        "reservations", "booking", "ticket", "tickets",
+        "쇼", "공연", "예약", "예매", "티켓",
+    }
+)
+# Times and booking words; with a show word, they make a show question clear.
+SHOW_CONTEXT_KEYWORDS = frozenset(
+    {
+        "time", "times", "when", "today", "tonight", "tomorrow", "schedule",
+        "book", "seat", "seats", "reserve", "reservation", "reservations",
+        "booking", "ticket", "tickets",
+        "일정", "시간표", "시간", "언제", "오늘", "내일", "몇시", "좌석", "예약", "예매", "티켓",
+    }
+)
+# Words before "show" that make it the noun ("the penguin show", "next show").
+SHOW_DETERMINERS = frozenset(
+    {
+        "<species>", "the", "a", "an", "this", "that", "next", "which", "what",
+        "any", "first", "last",
+    }
+)
+# Questions about the animals themselves; with a show word the intent is mixed.
+KNOWLEDGE_KEYWORDS = frozenset(
+    {
+        "eat", "eats", "diet", "food", "lifespan", "habitat", "age", "old",
+        "fact", "facts", "live", "lives",
+        "먹어", "먹는", "먹고", "먹이", "수명", "서식", "서식지", "나이", "몇살", "특징", "정보",
+    }
+)
+# What may follow a Korean word inside the same token: particles,
+# plural and the stems of 하다/있다 ("쇼를", "사자들은", "예약하고").
+KOREAN_SUFFIXES = (
+    "들", "은", "는", "이", "가", "을", "를", "의", "에", "도", "만", "와", "과",
+    "랑", "로", "으로", "요", "야", "하", "해", "할", "합", "했", "한", "있", "좀",
+)
+
+WORD_RE = re.compile(r"[a-z]+|[가-힣]+")
+
+
+def normalize(text: str) -> str:
+    return unicodedata.normalize("NFC", text).casefold()
+
+
+def is_hangul(word: str) -> bool:
+    return "가" <= word[0] <= "힣"
+
+
+class LexicalIndex:
+    """
+    Matches show words, knowledge words and species names in a prompt.
+
+    English names match whole words, including plurals and multi-word names
+    ("polar bears"). Korean names match at the start of a word followed by
+    nothing or a particle, so "사자는" matches 사자 but "쇼핑" does not match 쇼.
+    """
+
+    def __init__(self, species: Iterable[str] = ()):
+        self.phrases: dict[tuple[str, ...], str] = {}
+        self.korean: dict[str, str] = {}
+        for name in species:
+            key = normalize(name).strip()
+            if not key:
+                continue
+            if is_hangul(key):
+                self.korean[key.replace(" ", "")] = key
+            else:
+                self.phrases[tuple(key.split())] = key
+        self.max_words = max((len(phrase) for phrase in self.phrases), default=0)
+
+    @staticmethod
+    def _korean_match(word: str, names: Iterable[str]) -> Optional[str]:
+        for name in names:
+            if word.startswith(name):
+                rest = word[len(name):]
+                if not rest or rest.startswith(KOREAN_SUFFIXES):
+                    return name
+        return None
+
+    @staticmethod
+    def _singular(word: str) -> str:
+        if word.endswith("es") and word[:-2] and word[-3] in "sxz":
+            return word[:-2]
+        if word.endswith("s") and len(word) > 3:
+            return word[:-1]
+        return word
+
+    def _english_match(self, words: list[str], start: int) -> tuple[Optional[str], int]:
+        # Longest name first, so "polar bears" is a polar bear and not a bear.
+        for size in range(min(self.max_words, len(words) - start), 0, -1):
+            phrase = words[start : start + size]
+            if any(is_hangul(word) for word in phrase):
+                continue
+            for candidate in (phrase, phrase[:-1] + [self._singular(phrase[-1])]):
+                name = self.phrases.get(tuple(candidate))
+                if name:
+                    return name, size
+        return None, 1
+
+    def template(self, words: list[str]) -> tuple[list[str], set[str]]:
+        """
+        Replaces species names in a message with a placeholder.
+
+        Returns:
+            tuple[list[str], set[str]]: The words with every species name
+                (and its particle or plural) replaced by "<species>", and
+                the species found.
+        """
+        tokens, found = [], set()
+        start = 0
+        while start < len(words):
+            word = words[start]
+            if is_hangul(word):
+                name = self._korean_match(word, self.korean)
+                name, size = (self.korean[name], 1) if name else (None, 1)
+            else:
+                name, size = self._english_match(words, start)
+            if name:
+                found.add(name)
+                tokens.append("<species>")
+            else:
+                tokens.append(word)
+            start += size
+        return tokens, found
+
+    def species(self, words: list[str]) -> set[str]:
+        return self.template(words)[1]
+
+    @staticmethod
+    def show_noun(tokens: list[str]) -> bool:
+        """Returns whether "show" is used as the noun in templated words."""
+        for i, token in enumerate(tokens):
+            if token != "show":
+                continue
+            if i > 0 and tokens[i - 1] in SHOW_DETERMINERS:
+                return True
+            if i + 1 < len(tokens) and tokens[i + 1] in ("time", "times"):
+                return True
+        return False
+
+    def keywords(self, words: list[str], keywords: frozenset) -> bool:
+        korean = [word for word in words if is_hangul(word)]
+        # Korean spacing varies ("몇 살" / "몇살"), so also try adjacent pairs.
+        korean += [a + b for a, b in zip(korean, korean[1:])]
+        if any(self._korean_match(word, keywords) for word in korean):
+            return True
+        return any(word in keywords for word in words if not is_hangul(word))
+
+
+@dataclasses.dataclass
+class RouterMetrics:
+    """Counters for fast-path routing and the greeter model time it saves."""
+
+    turns: int = 0
+    routed_to_shows: int = 0
+    routed_to_concierge: int = 0
+    ambiguous: int = 0
+    no_match: int = 0
+    route_seconds_total: float = 0.0
+    model_calls: int = 0
+    model_seconds_total: float = 0.0
+    # Greeter model calls a routed turn skips: add_prompt_to_state and the transfer.
+    calls_saved_per_hit: int = 2
+
+    @property
+    def hits(self) -> int:
+        return self.routed_to_shows + self.routed_to_concierge
+
+    @property
+    def model_seconds_avg(self) -> float:
+        return self.model_seconds_total / self.model_calls if self.model_calls else 0.0
+
+    def as_dict(self) -> dict[str, float]:
+        return {
+            "turns": self.turns,
+            "hits": self.hits,
+            "hit_rate": self.hits / self.turns if self.turns else 0.0,
+            "routed_to_shows": self.routed_to_shows,
+            "routed_to_concierge": self.routed_to_concierge,
+            "ambiguous": self.ambiguous,
+            "no_match": self.no_match,
+            "route_ms_avg": (
+                1000 * self.route_seconds_total / self.turns if self.turns else 0.0
+            ),
+            "greeter_model_ms_avg": 1000 * self.model_seconds_avg,
+            # Estimated from the greeter model calls of turns that fell back.
+            "latency_saved_ms_total": (
+                1000 * self.hits * self.calls_saved_per_hit * self.model_seconds_avg
+            ),
+        }
+
+
+class FastPathRouter:
+    """
+    Routes obvious turns without the greeter's model calls.
+
+    Used as the greeter's before_model_callback. On the first model call of
+    a turn it matches the user's message against show and booking words
+    and the zoo's species names. A clear match writes PROMPT to state and
+    answers with a `transfer_to_agent` call in place of the model, so the
+    turn goes straight to the expert. Greetings, mixed intents, a show and
+    a species with no time or booking word, and anything else fall through
+    to the model.
+
+    Species names are loaded by `load_species` on a background thread and
+    refreshed every `refresh_interval` seconds; until the first load,
+    only show and booking words are routed.
+    """
+
+    def __init__(
+        self,
+        load_species: Optional[Callable[[], Iterable[str]]] = None,
+        refresh_interval: float = 600.0,
+        retry_interval: float = 30.0,
+    ):
+        """
+        Args:
+            load_species (Callable[[], Iterable[str]]): Returns the species
+                names to match, English and Korean.
+            refresh_interval (float): Seconds between species reloads.
+            retry_interval (float): Seconds to wait after a failed load.
+        """
+        self._load_species = load_species
+        self._refresh_interval = refresh_interval
+        self._retry_interval = retry_interval
+        self.index = LexicalIndex()
+        self.metrics = RouterMetrics()
+        self._model_started: dict[str, float] = {}
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def refresh(self) -> bool:
+        """Reloads the species names; returns False if the load failed."""
+        try:
+            species = list(self._load_species())
+        except Exception as e:
+            logger.warning(f"⚠️ Failed to load species for the fast-path router: {e}")
+            return False
+        self.index = LexicalIndex(species)
+        logger.info(f"⚡ Fast-path router loaded {len(species)} species names.")
+        return True
+
+    def _run(self):
+        while not self._stopped.is_set():
+            delay = self._refresh_interval if self.refresh() else self._retry_interval
+            self._stopped.wait(delay)
+
+    def start(self):
+        """Starts the background species loader if there is one and it is not running."""
+        if self._load_species is None:
+            return
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._stopped.clear()
+            self._thread = threading.Thread(
+                target=self._run, name="fast-router-species", daemon=True
+            )
+            self._thread.start()
+
+    def stop(self):
+        """Stops the background species loader."""
+        self._stopped.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def classify(self, text: str) -> tuple[Optional[str], str]:
+        """
+        Returns the agent a message clearly belongs to (or None) and why.
+
+        Args:
+            text (str): The user's message.
+        """
+        words = WORD_RE.findall(normalize(text))
+        index = self.index
+        tokens, species = index.template(words)
+        show = index.keywords(words, SHOW_KEYWORDS) or index.show_noun(tokens)
+        if show and index.keywords(words, KNOWLEDGE_KEYWORDS):
+            return None, "ambiguous"
+        # "the penguin show" alone may be about the show or the penguins.
+        if show and species and not index.keywords(words, SHOW_CONTEXT_KEYWORDS):
+            return None, "ambiguous"
+        if show:
+            return SHOW_AGENT, "show"
+        if species:
+            return CONCIERGE_AGENT, "species"
+        return None, "no_match"
+
+    def route(self, text: str) -> Optional[str]:
+        """Returns the agent a message clearly belongs to, or None to ask the model."""
+        return self.classify(text)[0]
+
+    def before_model_callback(
+        self, callback_context: CallbackContext, llm_request: LlmRequest
+    ) -> Optional[LlmResponse]:
+        """
+        Answers the greeter's first model call of a turn with a transfer when the route is clear.
+
+        Args:
+            callback_context (CallbackContext): The callback context information.
+            llm_request (LlmRequest): The request object sent to the model.
+        """
+        text = user_text(llm_request)
+        if text is None:
+            # A follow-up call within the turn (after a tool response).
+            self._model_started[callback_context.invocation_id] = time.perf_counter()
+            return None
+
+        start = time.perf_counter()
+        target, reason = self.classify(text)
+        self.metrics.turns += 1
+        self.metrics.route_seconds_total += time.perf_counter() - start
+
+        if target is None:
+            if reason == "ambiguous":
+                self.metrics.ambiguous += 1
+            else:
+                self.metrics.no_match += 1
+            self._model_started[callback_context.invocation_id] = time.perf_counter()
+            return None
+
+        if target == SHOW_AGENT:
+            self.metrics.routed_to_shows += 1
+        else:
+            self.metrics.routed_to_concierge += 1
+        callback_context.state["PROMPT"] = text
+        logger.info(
+            f"⚡ [Fast path] {callback_context.agent_name} → {target}"
+            f" (saved ~{1000 * self.metrics.calls_saved_per_hit * self.metrics.model_seconds_avg:.0f} ms)"
+        )
+        return LlmResponse(
+            content=types.Content(
+                role="model",
+                parts=[
+                    types.Part.from_function_call(
+                        name="transfer_to_agent", args={"agent_name": target}
+                    )
+                ],
+            )
+        )
+
+    def after_model_callback(
+        self, callback_context: CallbackContext, llm_response: LlmResponse
+    ):
+        """Times the greeter's model calls, to estimate what a routed turn saves."""
+        if llm_response.partial:
+            return
+        start = self._model_started.pop(callback_context.invocation_id, None)
+        if start is not None:
+            self.metrics.model_calls += 1
+            self.metrics.model_seconds_total += time.perf_counter() - start
+
+
+# Returns the text of the user's message if it is the last content of the request.
+def user_text(llm_request: LlmRequest) -> Optional[str]:
+    if not llm_request.contents:
+        return None
+    last = llm_request.contents[-1]
+    if last.role != "user" or not last.parts:
+        return None
+    if any(part.function_response for part in last.parts):
+        return None
+    text = "".join(part.text or "" for part in last.parts).strip()
+    return text or None
@@ -0,0 +1,351 @@
+import asyncio
+import dataclasses
+import inspect
+import logging
+import threading
+import time
+from typing import Callable, Optional
+
+from google.adk.tools.base_toolset import BaseToolset
+from google.adk.tools.mcp_tool.mcp_session_manager import MCPSessionManager
+from google.adk.tools.mcp_tool.mcp_toolset import McpToolset
+from mcp import ClientSession
+
+logger = logging.getLogger(__name__)
+
+
+# Reads the version an MCP server advertised in its initialize response.
+def server_version(session) -> Optional[str]:
+    """
+    Returns the server version from an initialized MCP session, if it has one.
+
+    Args:
+        session (ClientSession): An initialized MCP client session.
+    """
+    server_info = getattr(session, "server_info", None)
+    if server_info is None:
+        initialize_result = getattr(session, "initialize_result", None)
+        server_info = getattr(initialize_result, "serverInfo", None)
+    return getattr(server_info, "version", None) or None
+
+
+@dataclasses.dataclass
+class SessionPoolMetrics:
+    """Counters for MCP session reuse and handshake cost."""
+
+    hits: int = 0
+    misses: int = 0
+    health_check_failures: int = 0
+    handshake_seconds_total: float = 0.0
+    handshake_seconds_max: float = 0.0
+
+    def record_handshake(self, seconds: float):
+        self.misses += 1
+        self.handshake_seconds_total += seconds
+        self.handshake_seconds_max = max(self.handshake_seconds_max, seconds)
+
+    def as_dict(self) -> dict[str, float]:
+        checkouts = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / checkouts if checkouts else 0.0,
+            "health_check_failures": self.health_check_failures,
+            "handshake_ms_avg": (
+                1000 * self.handshake_seconds_total / self.misses
+                if self.misses
+                else 0.0
+            ),
+            "handshake_ms_max": 1000 * self.handshake_seconds_max,
+        }
+
+
+@dataclasses.dataclass
+class _PooledSession:
+    session: ClientSession
+    loop: asyncio.AbstractEventLoop
+    last_used: float
+
+
+class PooledMCPSessionManager(MCPSessionManager):
+    """
+    MCPSessionManager with keep-alive pings and pool metrics.
+
+    ADK already reuses one initialized session per header set and closes
+    the ones left idle. This only wraps the public `create_session`: it
+    counts hits, misses and handshake time, and a background task pings
+    the sessions used in the last `idle_ttl` seconds so the server and any
+    proxy in between keep their connections open.
+    """
+
+    def __init__(
+        self,
+        *args,
+        idle_ttl: float = 300.0,
+        keepalive_interval: float = 60.0,
+        health_check_timeout: float = 5.0,
+        metrics: Optional[SessionPoolMetrics] = None,
+        on_session: Optional[Callable[[ClientSession], None]] = None,
+        **kwargs,
+    ):
+        """
+        Args:
+            idle_ttl (float): Seconds an unused session is still kept warm.
+            keepalive_interval (float): Seconds between keep-alive pings.
+            health_check_timeout (float): Seconds a ping may take before the
+                session is considered dead.
+            metrics (Optional[SessionPoolMetrics]): Counters to add to, e.g.
+                shared with the manager this one replaces.
+            on_session (Optional[Callable[[ClientSession], None]]): Called
+                with every session the manager opens.
+        """
+        super().__init__(*args, **kwargs)
+        self.idle_ttl = idle_ttl
+        self.keepalive_interval = keepalive_interval
+        self.health_check_timeout = health_check_timeout
+        self.metrics = metrics or SessionPoolMetrics()
+        self._on_session = on_session
+        # The session last handed out per header set.
+        self._pooled: dict[tuple, _PooledSession] = {}
+        self._keepalive_task: Optional[asyncio.Task] = None
+
+    @staticmethod
+    def _key(headers: Optional[dict[str, str]]) -> tuple:
+        return tuple(sorted((headers or {}).items()))
+
+    def session_for(
+        self, headers: Optional[dict[str, str]] = None
+    ) -> Optional[ClientSession]:
+        """Returns the session last handed out for these headers, if it is still pooled."""
+        pooled = self._pooled.get(self._key(headers))
+        return pooled.session if pooled else None
+
+    async def create_session(self, headers: Optional[dict[str, str]] = None):
+        key = self._key(headers)
+        start = time.perf_counter()
+        session = await super().create_session(headers)
+        elapsed = time.perf_counter() - start
+
+        pooled = self._pooled.get(key)
+        if pooled is not None and pooled.session is session:
+            self.metrics.hits += 1
+        else:
+            # ADK opened a session: the first for these headers, or a
+            # replacement for one it closed.
+            self.metrics.record_handshake(elapsed)
+            logger.info(f"🔌 Opened MCP session in {elapsed * 1000:.0f} ms.")
+            if self._on_session is not None:
+                self._on_session(session)
+        self._pooled[key] = _PooledSession(
+            session, asyncio.get_running_loop(), time.monotonic()
+        )
+
+        self._ensure_keepalive()
+        return session
+
+    def _ensure_keepalive(self):
+        if self._keepalive_task is None or self._keepalive_task.done():
+            self._keepalive_task = asyncio.ensure_future(self._keepalive_loop())
+
+    async def _keepalive_loop(self):
+        current_loop = asyncio.get_running_loop()
+        while self._pooled:
+            await asyncio.sleep(self.keepalive_interval)
+            now = time.monotonic()
+            for key, pooled in list(self._pooled.items()):
+                if now - pooled.last_used >= self.idle_ttl:
+                    # Left to ADK's own idle sweep from here on.
+                    del self._pooled[key]
+                elif pooled.loop is current_loop and not await self._ping(pooled.session):
+                    self.metrics.health_check_failures += 1
+                    logger.warning("⚠️ MCP session failed health check; it will be reopened.")
+                    # The next create_session for these headers counts as a miss.
+                    self._pooled.pop(key, None)
+
+    async def _ping(self, session) -> bool:
+        try:
+            await asyncio.wait_for(session.send_ping(), self.health_check_timeout)
+            return True
+        except Exception:
+            return False
+
+    async def close(self):
+        if self._keepalive_task is not None:
+            self._keepalive_task.cancel()
+            self._keepalive_task = None
+        self._pooled.clear()
+        await super().close()
+
+
+class PooledMCPToolset(BaseToolset):
+    """
+    An McpToolset on a PooledMCPSessionManager, rebuilt when the server is redeployed.
+
+    Module-level toolsets are shared by every invocation of an agent, so the
+    pool (and its initialized sessions) outlives individual turns. Tool lists
+    come from McpToolset's own cache (`tool_list_cache_ttl_seconds`), which
+    is keyed by headers and time only. The zoo MCP servers advertise their
+    deployed revision as their version, so when a new session reports
+    another version the McpToolset is rebuilt, dropping the old tool list
+    at once instead of when its TTL runs out.
+
+    McpToolset takes no session manager, so the pooled one replaces its
+    `_mcp_session_manager`; that is the one ADK internal this relies on.
+    """
+
+    def __init__(
+        self,
+        *,
+        tool_list_cache_ttl: float = 3600.0,
+        idle_ttl: float = 300.0,
+        keepalive_interval: float = 60.0,
+        health_check_timeout: float = 5.0,
+        retire_after: float = 60.0,
+        **kwargs,
+    ):
+        """
+        Args:
+            tool_list_cache_ttl (float): Seconds a tool list is reused while
+                the server version stays the same.
+            idle_ttl (float): Seconds an unused session is still kept warm.
+            keepalive_interval (float): Seconds between keep-alive pings.
+            health_check_timeout (float): Seconds a ping may take before the
+                session is considered dead.
+            retire_after (float): Seconds a replaced toolset stays open for
+                the turns still using its tools.
+            **kwargs: McpToolset arguments.
+        """
+        super().__init__()
+        self._toolset_kwargs = dict(kwargs, tool_list_cache_ttl_seconds=tool_list_cache_ttl)
+        self._pool_kwargs = dict(
+            idle_ttl=idle_ttl,
+            keepalive_interval=keepalive_interval,
+            health_check_timeout=health_check_timeout,
+        )
+        self._retire_after = retire_after
+        self.metrics = SessionPoolMetrics()
+        self.server_version: Optional[str] = None
+        self._stale = False
+        self._retiring: set[asyncio.Task] = set()
+        self.toolset, self._session_manager = self._build()
+
+    def _build(self) -> tuple[McpToolset, PooledMCPSessionManager]:
+        toolset = McpToolset(**self._toolset_kwargs)
+        session_manager = PooledMCPSessionManager(
+            connection_params=toolset.connection_params,
+            errlog=toolset.errlog,
+            sampling_callback=self._toolset_kwargs.get("sampling_callback"),
+            sampling_capabilities=self._toolset_kwargs.get("sampling_capabilities"),
+            elicitation_callback=self._toolset_kwargs.get("elicitation_callback"),
+            metrics=self.metrics,
+            on_session=self._observe_version,
+            **self._pool_kwargs,
+        )
+        toolset._mcp_session_manager = session_manager
+        return toolset, session_manager
+
+    @property
+    def pool_metrics(self) -> SessionPoolMetrics:
+        return self.metrics
+
+    def _observe_version(self, session: ClientSession):
+        version = server_version(session)
+        if not version:
+            return
+        if self.server_version and version != self.server_version:
+            logger.info(
+                f"📋 {self.toolset.connection_params.url} is now {version}"
+                f" (was {self.server_version}); its tools will be listed again."
+            )
+            self._stale = True
+        self.server_version = version
+
+    def _rebuild(self):
+        old = self.toolset
+        self.toolset, self._session_manager = self._build()
+        self._stale = False
+        task = asyncio.ensure_future(self._retire(old))
+        self._retiring.add(task)
+        task.add_done_callback(self._retiring.discard)
+
+    async def _retire(self, toolset: McpToolset):
+        # Turns that already listed the old tools may still be calling them.
+        await asyncio.sleep(self._retire_after)
+        await toolset.close()
+
+    async def get_tools(self, readonly_context=None):
+        # Open the pooled session first (a pool hit on most turns), so a
+        # redeployed server is noticed before its cached tool list is used.
+        headers = None
+        provider = self.toolset.header_provider
+        if provider and readonly_context:
+            headers = provider(readonly_context)
+            if inspect.isawaitable(headers):
+                headers = await headers
+        await self._session_manager.create_session(headers or None)
+        if self._stale:
+            self._rebuild()
+        return await self.toolset.get_tools(readonly_context)
+
+    async def close(self):
+        for task in list(self._retiring):
+            task.cancel()
+        await self.toolset.close()
+
+    async def _throwaway_session(self, action):
+        # Sessions are bound to the event loop that opened them, so callers
+        # on other threads' loops must not touch the pool.
+        headers = {}
+        provider = self.toolset.header_provider
+        if provider:
+            headers = provider(None)
+            if inspect.isawaitable(headers):
+                headers = await headers
+
+        session_manager = MCPSessionManager(
+            connection_params=self.toolset.connection_params, errlog=self.toolset.errlog
+        )
+        try:
+            session = await session_manager.create_session(headers or None)
+            return await action(session)
+        finally:
+            await session_manager.close()
+
+    async def warm_up(self):
+        """Opens a throwaway session to wake the server and record its version."""
+
+        async def list_tools(session):
+            result = await session.list_tools()
+            self._observe_version(session)
+            logger.info(
+                f"📋 {self.toolset.connection_params.url} ({self.server_version})"
+                f" serves {len(result.tools)} tools."
+            )
+
+        await self._throwaway_session(list_tools)
+
+    async def call_tool(self, name: str, arguments: dict):
+        """
+        Calls a server tool outside of any agent turn, on a throwaway session.
+
+        Args:
+            name (str): The tool name.
+            arguments (dict): The tool arguments.
+
+        Returns:
+            CallToolResult: The raw MCP result.
+        """
+        return await self._throwaway_session(
+            lambda session: session.call_tool(name, arguments)
+        )
+
+    def start_warm_up(self):
+        """Runs warm_up on a background thread so startup is not delayed."""
+
+        def run():
+            try:
+                asyncio.run(self.warm_up())
+            except Exception as e:
+                logger.warning(f"⚠️ MCP warm-up failed: {e}")
+
+        threading.Thread(target=run, name="mcp-warm-up", daemon=True).start()
@@ -0,0 +1,313 @@
+import collections
+import dataclasses
+import logging
+import math
+import time
+from typing import Callable, Optional
+
+from google.adk.memory.memory_entry import MemoryEntry
+from google.adk.models import LlmRequest
+from google.adk.tools import _memory_entry_utils
+from google.adk.tools.preload_memory_tool import PreloadMemoryTool
+from google.adk.tools.tool_context import ToolContext
+from google.genai import types
+
+from .fast_router import KOREAN_SUFFIXES, WORD_RE, LexicalIndex, is_hangul, normalize
+
+logger = logging.getLogger(__name__)
+
+MEMORY_CONTEXT = """The following content is from your previous conversations with the user.
+They may be useful for answering the user's current query.
+<PAST_CONVERSATIONS>
+{memories}
+</PAST_CONVERSATIONS>
+"""
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Estimates the model tokens in a text without a tokenizer.
+
+    About four characters of English make a token, while Korean and other
+    non-ASCII text is closer to one token per character, so the estimate
+    errs high for Korean.
+    """
+    ascii_chars = len(text.encode("ascii", "ignore"))
+    return math.ceil(ascii_chars / 4) + len(text) - ascii_chars
+
+
+def terms(text: str) -> set[str]:
+    """Returns the words of a text without English plurals or Korean particles."""
+    found = set()
+    for word in WORD_RE.findall(normalize(text)):
+        if is_hangul(word):
+            for suffix in sorted(KOREAN_SUFFIXES, key=len, reverse=True):
+                if len(word) > len(suffix) and word.endswith(suffix):
+                    word = word[: -len(suffix)]
+                    break
+        else:
+            word = LexicalIndex._singular(word)
+        found.add(word)
+    return found
+
+
+# Words that say nothing about a message's topic, in the form `terms` gives them.
+COMMON_WORDS = frozenset(
+    terms(
+        "a an the is are was were be been do does did i you he she we they me my your our"
+        " it its this that these those there what when where who how which why and or but"
+        " to of in on at for with from about can could will would please tell show user"
+        " 어디 언제 뭐 뭘 무엇 몇 어떻게 왜 누구 알려줘 있어 있나요 좀 그 이 저 나 내 제"
+    )
+)
+
+
+def topic_terms(text: str) -> set[str]:
+    """Returns the words of a text that say what it is about."""
+    return terms(text) - COMMON_WORDS
+
+
+def memory_lines(memory: MemoryEntry) -> list[str]:
+    """Formats a memory the way PreloadMemoryTool does."""
+    lines = []
+    if memory.timestamp:
+        lines.append(f"Time: {memory.timestamp}")
+    if text := _memory_entry_utils.extract_text(memory):
+        lines.append(f"{memory.author}: {text}" if memory.author else text)
+    return lines
+
+
+# Identifies a memory across searches, by id when the service sets one.
+def memory_key(memory: MemoryEntry) -> str:
+    return memory.id or "\n".join(memory_lines(memory))
+
+
+@dataclasses.dataclass
+class CachedMemories:
+    memories: list[MemoryEntry]
+    generation: int
+    fetched_at: float
+    # The words of the memories, and the queries already searched with.
+    terms: set[str] = dataclasses.field(default_factory=set)
+    queries: set[str] = dataclasses.field(default_factory=set)
+
+    def add(self, memories: list[MemoryEntry], query: str):
+        known = {memory_key(memory) for memory in self.memories}
+        for memory in memories:
+            if memory_key(memory) not in known:
+                known.add(memory_key(memory))
+                self.memories.append(memory)
+                self.terms |= topic_terms(" ".join(memory_lines(memory)))
+        self.queries.add(query)
+
+
+@dataclasses.dataclass
+class MemoryRetrievalMetrics:
+    """Counters for memory retrieval and prompt injection."""
+
+    requests: int = 0
+    cache_hits: int = 0
+    searches: int = 0
+    topic_searches: int = 0
+    search_errors: int = 0
+    search_seconds_total: float = 0.0
+    injections: int = 0
+    injected_tokens_total: int = 0
+    retrieved_tokens_total: int = 0
+    memories_injected: int = 0
+    memories_dropped: int = 0
+
+    def as_dict(self) -> dict[str, float]:
+        return {
+            "requests": self.requests,
+            "cache_hit_rate": self.cache_hits / self.requests if self.requests else 0.0,
+            "searches": self.searches,
+            "topic_searches": self.topic_searches,
+            "search_errors": self.search_errors,
+            "search_ms_avg": (
+                1000 * self.search_seconds_total / self.searches if self.searches else 0.0
+            ),
+            "injected_tokens_avg": (
+                self.injected_tokens_total / self.injections if self.injections else 0.0
+            ),
+            "retrieved_tokens_avg": (
+                self.retrieved_tokens_total / self.injections if self.injections else 0.0
+            ),
+            "memories_injected": self.memories_injected,
+            "memories_dropped": self.memories_dropped,
+        }
+
+
+class CachedPreloadMemoryTool(PreloadMemoryTool):
+    """
+    PreloadMemoryTool that searches memory once per session and caps what it injects.
+
+    The user's memories are searched with the first message of a session
+    and kept for the rest of it, so later turns, and the greeter's second
+    model call of every turn, skip the search. A later message that shares
+    no words with any cached memory is on a new topic, so memory is
+    searched with it too and the results are added to the cached ones.
+    Everything is searched again once `generation` reports a new memory
+    write for the user, or after `ttl` seconds to pick up writes from
+    other instances.
+
+    Each request gets the cached memories that share the most words with
+    the current message, in the memory service's order on ties, until
+    `max_tokens` (estimated) are used. `injected` tells which invocations
+    got memories, so their answers are not reused for other visitors.
+    """
+
+    def __init__(
+        self,
+        generation: Callable[[str, str], int] = lambda app_name, user_id: 0,
+        max_tokens: int = 1000,
+        ttl: float = 1800.0,
+        max_sessions: int = 10000,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Args:
+            generation (Callable[[str, str], int]): Returns a number that
+                changes when memories are written for an app and user.
+            max_tokens (int): Estimated token budget of the injected memories.
+            ttl (float): Seconds cached memories are used.
+            max_sessions (int): Sessions whose memories are cached.
+            clock (Callable[[], float]): Returns the current time in seconds.
+        """
+        super().__init__()
+        self._generation = generation
+        self._max_tokens = max_tokens
+        self._ttl = ttl
+        self._max_sessions = max_sessions
+        self._clock = clock
+        self._cache: collections.OrderedDict[tuple[str, str, str], CachedMemories] = (
+            collections.OrderedDict()
+        )
+        # The invocations that got memories, most recent last.
+        self._injected: collections.OrderedDict[str, None] = collections.OrderedDict()
+        self.metrics = MemoryRetrievalMetrics()
+
+    def injected(self, invocation_id: str) -> bool:
+        """Returns True if memories were injected into a model request of this invocation."""
+        return invocation_id in self._injected
+
+    async def _search(self, tool_context: ToolContext, query: str) -> Optional[list[MemoryEntry]]:
+        start = time.perf_counter()
+        try:
+            response = await tool_context.search_memory(query)
+        except Exception:
+            self.metrics.search_errors += 1
+            logger.warning(
+                f"⚠️ Failed to preload memory (query length: {len(query)})", exc_info=True
+            )
+            return None
+        finally:
+            self.metrics.searches += 1
+            self.metrics.search_seconds_total += time.perf_counter() - start
+        return response.memories
+
+    async def _memories(self, tool_context: ToolContext, query: str) -> Optional[list[MemoryEntry]]:
+        inv_ctx = tool_context._invocation_context
+        key = (inv_ctx.app_name, inv_ctx.user_id, inv_ctx.session.id)
+        generation = self._generation(inv_ctx.app_name, inv_ctx.user_id)
+        cached = self._cache.get(key)
+        if (
+            cached is not None
+            and cached.generation == generation
+            and self._clock() - cached.fetched_at < self._ttl
+        ):
+            self._cache.move_to_end(key)
+            query_terms = topic_terms(query)
+            # No memories at all means the user has none yet, not a topic they lack.
+            if (
+                not cached.memories
+                or not query_terms
+                or query_terms & cached.terms
+                or query in cached.queries
+            ):
+                self.metrics.cache_hits += 1
+                return cached.memories
+            self.metrics.topic_searches += 1
+            memories = await self._search(tool_context, query)
+            if memories is not None:
+                cached.add(memories, query)
+            return cached.memories
+
+        memories = await self._search(tool_context, query)
+        if memories is None:
+            return None
+        cached = CachedMemories([], generation, self._clock())
+        cached.add(memories, query)
+        self._cache[key] = cached
+        self._cache.move_to_end(key)
+        while len(self._cache) > self._max_sessions:
+            self._cache.popitem(last=False)
+        return cached.memories
+
+    def select(self, memories: list[MemoryEntry], query: str) -> tuple[list[str], int, int]:
+        """
+        Picks the memories most relevant to the query within the token budget.
+
+        Returns:
+            tuple[list[str], int, int]: The lines to inject, their estimated
+                tokens and the estimated tokens of all memories.
+        """
+        query_terms = terms(query)
+        candidates = []
+        for rank, memory in enumerate(memories):
+            lines = memory_lines(memory)
+            if lines:
+                overlap = len(query_terms & terms(" ".join(lines)))
+                candidates.append((-overlap, rank, lines))
+        candidates.sort(key=lambda candidate: candidate[:2])
+
+        selected, used, total = [], 0, 0
+        for _, _, lines in candidates:
+            tokens = estimate_tokens("\n".join(lines)) + 1
+            total += tokens
+            if used + tokens <= self._max_tokens:
+                selected.extend(lines)
+                used += tokens
+                self.metrics.memories_injected += 1
+            else:
+                self.metrics.memories_dropped += 1
+        return selected, used, total
+
+    async def process_llm_request(
+        self, *, tool_context: ToolContext, llm_request: LlmRequest
+    ) -> None:
+        user_content = tool_context.user_content
+        if not user_content or not user_content.parts:
+            return
+        query = " ".join(part.text for part in user_content.parts if part.text)
+        if not query:
+            return
+
+        self.metrics.requests += 1
+        memories = await self._memories(tool_context, query)
+        if not memories:
+            return
+        lines, used, total = self.select(memories, query)
+        if not lines:
+            return
+
+        self.metrics.injections += 1
+        self.metrics.injected_tokens_total += used
+        self.metrics.retrieved_tokens_total += total
+        logger.info(f"🧠 [Memory] injected ~{used} of ~{total} tokens of memories.")
+        self._injected[tool_context.invocation_id] = None
+        self._injected.move_to_end(tool_context.invocation_id)
+        while len(self._injected) > self._max_sessions:
+            self._injected.popitem(last=False)
+        llm_request._insert_transient_user_content(
+            [
+                types.Content(
+                    role="user",
+                    parts=[
+                        types.Part.from_text(
+                            text=MEMORY_CONTEXT.format(memories="\n".join(lines))
+                        )
+                    ],
+                )
+            ]
+        )
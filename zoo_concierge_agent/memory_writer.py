@@ -0,0 +1,437 @@
+import asyncio
+import collections
+import dataclasses
+import logging
+import threading
+import time
+from typing import Any, Optional
+
+from google.adk.sessions import Session
+
+logger = logging.getLogger(__name__)
+
+SessionKey = tuple[str, str, str]
+
+
+@dataclasses.dataclass
+class PendingWrite:
+    memory_service: Any
+    session: Session
+    first_submitted: float
+    due: float
+    attempts: int = 0
+    task: Optional[asyncio.Task] = None
+
+
+@dataclasses.dataclass
+class MemoryWriterMetrics:
+    """Counters for background memory-bank writes."""
+
+    submitted: int = 0
+    coalesced: int = 0
+    written: int = 0
+    events_written: int = 0
+    retries: int = 0
+    failed: int = 0
+    dropped: int = 0
+    write_seconds_total: float = 0.0
+    queue_depth: int = 0
+    queue_depth_max: int = 0
+
+    def as_dict(self) -> dict[str, float]:
+        return {
+            "submitted": self.submitted,
+            "coalesced": self.coalesced,
+            "written": self.written,
+            "events_written": self.events_written,
+            "retries": self.retries,
+            "failed": self.failed,
+            "dropped": self.dropped,
+            "write_ms_avg": (
+                1000 * self.write_seconds_total / self.written if self.written else 0.0
+            ),
+            "queue_depth": self.queue_depth,
+            "queue_depth_max": self.queue_depth_max,
+        }
+
+
+class MemoryWriter:
+    """
+    Writes sessions to the memory bank in the background, coalescing turns.
+
+    `submit` only records the session and returns, so memory generation is
+    off the response path. Each session is written once it has been quiet
+    for `debounce` seconds, or at the latest `max_delay` seconds after its
+    first unwritten turn, so a conversation's turns become one write. Only
+    events added since the last write are sent when the memory service
+    accepts deltas (`add_events_to_memory`); other services get the whole
+    session.
+
+    At most `max_pending` sessions wait at a time. A new session beyond
+    that waits in `submit` for up to `submit_timeout` seconds while the
+    oldest ones are written early, then is dropped; its events go out with
+    the session's next write. Failed writes are retried with exponential
+    backoff up to `max_retries` times.
+
+    Queued turns only live in this process. `drain` writes them, and the
+    sessions whose writes are in flight, when the process is asked to stop
+    (registered with `flush_on_sigterm`), bounded by `drain_timeout`.
+    Turns still unwritten after it, and all queued turns when the process
+    is killed without SIGTERM, are lost: at most the last `max_delay`
+    seconds of each session, plus retries.
+    """
+
+    def __init__(
+        self,
+        debounce: float = 5.0,
+        max_delay: float = 30.0,
+        max_pending: int = 1000,
+        max_concurrent_writes: int = 4,
+        max_retries: int = 3,
+        retry_backoff: float = 1.0,
+        submit_timeout: float = 1.0,
+        tracked_sessions: int = 10000,
+        drain_timeout: float = 8.0,
+    ):
+        """
+        Args:
+            debounce (float): Seconds a session must be quiet before it is written.
+            max_delay (float): Longest a submitted turn waits to be written.
+            max_pending (int): Sessions that may wait to be written at once.
+            max_concurrent_writes (int): Writes in flight at once.
+            max_retries (int): Retries of a failed write before it is dropped.
+            retry_backoff (float): Seconds before the first retry; doubles each time.
+            submit_timeout (float): Seconds `submit` waits for room when full.
+            tracked_sessions (int): Sessions whose written event count is remembered.
+            drain_timeout (float): Longest `drain` waits for its writes.
+        """
+        self._debounce = debounce
+        self._max_delay = max_delay
+        self._max_pending = max_pending
+        self._max_concurrent_writes = max_concurrent_writes
+        self._max_retries = max_retries
+        self._retry_backoff = retry_backoff
+        self._submit_timeout = submit_timeout
+        self._tracked_sessions = tracked_sessions
+        self._drain_timeout = drain_timeout
+
+        self._pending: dict[SessionKey, PendingWrite] = {}
+        self._in_flight: dict[SessionKey, PendingWrite] = {}
+        self._written: collections.OrderedDict[SessionKey, int] = collections.OrderedDict()
+        self._no_deltas: set[type] = set()
+        self._generations: collections.OrderedDict[tuple[str, str], int] = (
+            collections.OrderedDict()
+        )
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_thread: Optional[int] = None
+        self._worker: Optional[asyncio.Task] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self._room: Optional[asyncio.Condition] = None
+        self._idle: Optional[asyncio.Condition] = None
+        self.metrics = MemoryWriterMetrics()
+
+    def generation(self, app_name: str, user_id: str) -> int:
+        """Returns a number that changes each time memories are written for the user."""
+        return self._generations.get((app_name, user_id), 0)
+
+    @property
+    def queue_depth(self) -> int:
+        return len(self._pending)
+
+    def _update_depth(self):
+        self.metrics.queue_depth = len(self._pending)
+        self.metrics.queue_depth_max = max(self.metrics.queue_depth_max, len(self._pending))
+
+    def _ensure_worker(self):
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop or self._worker is None or self._worker.done():
+            # Tasks and conditions belong to one loop; rebuild them for a new one.
+            self._loop = loop
+            self._loop_thread = threading.get_ident()
+            self._wakeup = asyncio.Event()
+            self._room = asyncio.Condition()
+            self._idle = asyncio.Condition()
+            self._worker = loop.create_task(self._run(), name="memory-writer")
+
+    async def submit(self, memory_service: Any, session: Session) -> bool:
+        """
+        Queues a session to be written to memory, replacing an unwritten copy.
+
+        Args:
+            memory_service (BaseMemoryService): The service to write to.
+            session (Session): The session after the latest turn.
+
+        Returns:
+            bool: False if the queue stayed full and the session was dropped.
+        """
+        self._ensure_worker()
+        key = (session.app_name, session.user_id, session.id)
+        self.metrics.submitted += 1
+        now = time.monotonic()
+
+        if self._coalesce(key, memory_service, session):
+            return True
+
+        deadline = now + self._submit_timeout
+        while len(self._pending) >= self._max_pending:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                self.metrics.dropped += 1
+                logger.warning(f"⚠️ Memory write queue is full, dropped session {session.id}.")
+                return False
+            self._wakeup.set()
+            try:
+                async with self._room:
+                    await asyncio.wait_for(self._room.wait(), remaining)
+            except asyncio.TimeoutError:
+                pass
+            # Another turn of this session may have got in while this one waited.
+            if self._coalesce(key, memory_service, session):
+                return True
+
+        now = time.monotonic()
+        self._pending[key] = PendingWrite(
+            memory_service, session, first_submitted=now, due=now + self._debounce
+        )
+        self._update_depth()
+        self._wakeup.set()
+        return True
+
+    def _coalesce(self, key: SessionKey, memory_service: Any, session: Session) -> bool:
+        pending = self._pending.get(key)
+        if pending is None:
+            return False
+        self.metrics.coalesced += 1
+        pending.memory_service = memory_service
+        pending.session = session
+        now = time.monotonic()
+        pending.due = min(now + self._debounce, pending.first_submitted + self._max_delay)
+        self._wakeup.set()
+        return True
+
+    async def flush(self, session: Optional[Session] = None, memory_service: Any = None):
+        """
+        Writes pending sessions now and waits for them.
+
+        Args:
+            session (Optional[Session]): Only flush this session; all if None.
+            memory_service (Any): With `session`, also writes turns of the
+                session that were never queued, such as dropped ones.
+        """
+        if self._worker is None and memory_service is None:
+            return
+        self._ensure_worker()
+        now = time.monotonic()
+        if session is None:
+            keys = list(self._pending)
+        else:
+            keys = [(session.app_name, session.user_id, session.id)]
+            if (
+                memory_service is not None
+                and keys[0] not in self._pending
+                and len(session.events) > self._written.get(keys[0], 0)
+            ):
+                # Session end is not dropped, even when the queue is full.
+                self._pending[keys[0]] = PendingWrite(
+                    memory_service, session, first_submitted=now, due=now
+                )
+                self._update_depth()
+        for key in keys:
+            if key in self._pending:
+                self._pending[key].due = now
+        self._wakeup.set()
+        async with self._idle:
+            await self._idle.wait_for(
+                lambda: not any(key in self._pending or key in self._in_flight for key in keys)
+            )
+
+    def drain(self):
+        """
+        Writes all pending sessions now, e.g. before the process exits.
+
+        Blocks the calling thread, so it can run from a signal handler that
+        interrupted the writer's event loop: the writes run on a new loop
+        in their own thread, and wait up to `drain_timeout` seconds. When
+        the handler interrupted the writer's own thread, the writes in
+        flight there cannot finish, so they are cancelled and their
+        sessions written here too; a write the memory bank already received
+        may then be stored twice. Otherwise drain waits for them as well.
+        """
+        start = time.monotonic()
+        deadline = start + self._drain_timeout
+        pending = {}
+        for key in list(self._pending):
+            entry = self._pending.pop(key, None)
+            if entry is not None:
+                pending[key] = entry
+        self._update_depth()
+        # Writes in flight that finish on the writer's loop, if it runs on another thread.
+        in_flight = self._in_flight
+        if self._loop_thread == threading.get_ident():
+            in_flight = {}
+            for key, entry in self._in_flight.items():
+                # Cancelled before the loop runs again, if it ever does.
+                self._loop.call_soon_threadsafe(entry.task.cancel)
+                pending.setdefault(key, entry)
+        if not pending and not in_flight:
+            return
+
+        async def write_all():
+            semaphore = asyncio.Semaphore(self._max_concurrent_writes)
+
+            async def write(key: SessionKey, entry: PendingWrite):
+                async with semaphore:
+                    while True:
+                        try:
+                            await self._write_once(key, entry)
+                            return
+                        except Exception as e:
+                            delay = self._retry_delay(entry, e)
+                        if delay is None:
+                            return
+                        await asyncio.sleep(delay)
+
+            await asyncio.gather(*(write(key, entry) for key, entry in pending.items()))
+
+        thread = threading.Thread(
+            target=asyncio.run, args=(write_all(),), name="memory-writer-drain", daemon=True
+        )
+        thread.start()
+        thread.join(self._drain_timeout)
+        while in_flight and time.monotonic() < deadline:
+            time.sleep(0.05)
+        if thread.is_alive() or in_flight:
+            logger.error(
+                f"❌ Memory writes of {len(pending) + len(in_flight)} sessions"
+                f" did not finish within {self._drain_timeout:.0f}s of shutdown."
+            )
+            return
+        logger.info(
+            f"💾 Drained {len(pending)} pending sessions to memory at shutdown"
+            f" in {time.monotonic() - start:.2f}s."
+        )
+
+    def _due_keys(self, now: float) -> list[SessionKey]:
+        due = [
+            key
+            for key, pending in self._pending.items()
+            if pending.due <= now and key not in self._in_flight
+        ]
+        if len(self._pending) >= self._max_pending:
+            # Backpressure: write the oldest sessions early to make room.
+            waiting = sorted(
+                (key for key in self._pending if key not in self._in_flight and key not in due),
+                key=lambda key: self._pending[key].first_submitted,
+            )
+            due += waiting[: max(1, self._max_concurrent_writes)]
+        return due
+
+    async def _run(self):
+        semaphore = asyncio.Semaphore(self._max_concurrent_writes)
+        while True:
+            now = time.monotonic()
+            for key in self._due_keys(now):
+                await semaphore.acquire()
+                # drain may have taken the session while this waited for a slot.
+                pending = self._pending.pop(key, None)
+                if pending is None:
+                    semaphore.release()
+                    continue
+                self._in_flight[key] = pending
+                self._update_depth()
+                pending.task = asyncio.create_task(self._write(key, pending, semaphore))
+
+            self._wakeup.clear()
+            waiting = [
+                pending.due for key, pending in self._pending.items() if key not in self._in_flight
+            ]
+            timeout = max(0.0, min(waiting) - time.monotonic()) if waiting else None
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+
+    async def _write(self, key: SessionKey, pending: PendingWrite, semaphore: asyncio.Semaphore):
+        try:
+            await self._write_once(key, pending)
+        except Exception as e:
+            self._retry(key, pending, e)
+        finally:
+            self._in_flight.pop(key, None)
+            semaphore.release()
+            self._wakeup.set()
+            async with self._room:
+                self._room.notify_all()
+            async with self._idle:
+                self._idle.notify_all()
+
+    async def _write_once(self, key: SessionKey, pending: PendingWrite):
+        session = pending.session
+        start = time.monotonic()
+        events = await self._write_session(key, pending.memory_service, session)
+        self.metrics.written += 1
+        self.metrics.events_written += events
+        self.metrics.write_seconds_total += time.monotonic() - start
+        logger.info(f"💾 Saved session {session.id} to memory ({events} new events).")
+
+    async def _write_session(self, key: SessionKey, memory_service: Any, session: Session) -> int:
+        # The session may gain events while the write is in flight; those go next time.
+        written, count = self._written.get(key, 0), len(session.events)
+        events = session.events[written:count]
+        if type(memory_service) not in self._no_deltas:
+            try:
+                if events:
+                    await memory_service.add_events_to_memory(
+                        app_name=session.app_name,
+                        user_id=session.user_id,
+                        events=events,
+                        session_id=session.id,
+                    )
+                self._mark_written(key, count)
+                return len(events)
+            except NotImplementedError:
+                self._no_deltas.add(type(memory_service))
+        await memory_service.add_session_to_memory(session)
+        self._mark_written(key, count)
+        return len(events)
+
+    def _mark_written(self, key: SessionKey, count: int):
+        self._written[key] = count
+        self._written.move_to_end(key)
+        while len(self._written) > self._tracked_sessions:
+            self._written.popitem(last=False)
+        user = key[:2]
+        self._generations[user] = self._generations.get(user, 0) + 1
+        self._generations.move_to_end(user)
+        while len(self._generations) > self._tracked_sessions:
+            self._generations.popitem(last=False)
+
+    # Counts a failed attempt and returns the backoff before the next one, or None to give up.
+    def _retry_delay(self, pending: PendingWrite, error: Exception) -> Optional[float]:
+        pending.attempts += 1
+        if pending.attempts > self._max_retries:
+            self.metrics.failed += 1
+            logger.error(
+                f"❌ Error saving session {pending.session.id} to memory, giving up: {error}",
+                exc_info=True,
+            )
+            return None
+        self.metrics.retries += 1
+        delay = self._retry_backoff * 2 ** (pending.attempts - 1)
+        logger.warning(
+            f"⚠️ Error saving session {pending.session.id} to memory, retrying in {delay:.1f}s: {error}"
+        )
+        return delay
+
+    def _retry(self, key: SessionKey, pending: PendingWrite, error: Exception):
+        delay = self._retry_delay(pending, error)
+        if delay is None:
+            return
+        newer = self._pending.get(key)
+        if newer is not None:
+            # A newer copy was submitted meanwhile; it includes these events.
+            newer.attempts = max(newer.attempts, pending.attempts)
+            return
+        pending.due = time.monotonic() + delay
+        self._pending[key] = pending
+        self._update_depth()
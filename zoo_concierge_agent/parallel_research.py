@@ -0,0 +1,125 @@
+import asyncio
+import contextlib
+import logging
+from typing import Any, AsyncGenerator, Tuple
+
+from google.adk.agents import BaseAgent
+from google.adk.agents.invocation_context import InvocationContext
+from google.adk.events import Event, EventActions
+
+logger = logging.getLogger(__name__)
+
+NOT_IN_ZOO = "This animal is currently not in our zoo, so I cannot provide information about it."
+
+
+def has_records(result: Any) -> bool:
+    """Returns True if a zoo tool result holds at least one record."""
+    if isinstance(result, list):
+        return bool(result)
+    if isinstance(result, dict):
+        # Compact {"columns", "rows"} table, or batch groups keyed by species.
+        if "columns" in result and "rows" in result:
+            return bool(result["rows"])
+        return any(has_records(group) for group in result.values())
+    return False
+
+
+class ParallelResearchAgent(BaseAgent):
+    """
+    Runs the zoo lookup and the web search side by side and merges their findings.
+
+    `sub_agents` are the zoo researcher, then the search researcher; each
+    writes its findings to its own output_key. Events from both branches
+    are forwarded as they arrive. When the zoo researcher finishes without
+    any zoo tool returning records, the search is cancelled (or, within
+    `search_delay`, never started) and the merged research says the
+    animal is not in the zoo. The merged text is written to `output_key`.
+    """
+
+    output_key: str = "research_data"
+    # Zoo tools whose results decide whether the animal is in the zoo.
+    record_tools: Tuple[str, ...] = (
+        "get_animals_by_species",
+        "get_animals_by_species_batch",
+    )
+    # Seconds to hold the search back, so a quick "not in the zoo" skips it.
+    search_delay: float = 0.0
+
+    def _branch_ctx(self, ctx: InvocationContext, agent: BaseAgent) -> InvocationContext:
+        # Separate branches keep each researcher's history to itself.
+        branch_ctx = ctx.model_copy()
+        branch = f"{self.name}.{agent.name}"
+        branch_ctx.branch = f"{ctx.branch}.{branch}" if ctx.branch else branch
+        return branch_ctx
+
+    def _found_records(self, event: Event) -> bool:
+        return any(
+            response.name in self.record_tools
+            and has_records(((response.response or {}).get("structuredContent") or {}).get("result"))
+            for response in event.get_function_responses()
+        )
+
+    async def _run_async_impl(self, ctx: InvocationContext) -> AsyncGenerator[Event, None]:
+        zoo_agent, search_agent = self.sub_agents
+        queue: asyncio.Queue = asyncio.Queue()
+        done = object()
+
+        async def pump(agent: BaseAgent, delay: float = 0.0):
+            error = None
+            try:
+                if delay:
+                    await asyncio.sleep(delay)
+                async for event in agent.run_async(self._branch_ctx(ctx, agent)):
+                    resume = asyncio.Event()
+                    await queue.put((agent, event, resume))
+                    # Wait until the runner has applied the event to the session.
+                    await resume.wait()
+            except Exception as e:
+                error = e
+            finally:
+                queue.put_nowait((agent, done, error))
+
+        # Agents are pydantic models and not hashable, so track them by name.
+        tasks = {
+            zoo_agent.name: asyncio.create_task(pump(zoo_agent)),
+            search_agent.name: asyncio.create_task(pump(search_agent, self.search_delay)),
+        }
+        running = set(tasks)
+        found = False
+        try:
+            while running:
+                agent, event, payload = await queue.get()
+                if agent.name not in running:
+                    continue
+                if event is done:
+                    running.discard(agent.name)
+                    if payload is not None:
+                        raise payload
+                    if agent is zoo_agent and not found and search_agent.name in running:
+                        logger.info("🛑 Animal not in the zoo, cancelling web search.")
+                        running.discard(search_agent.name)
+                        tasks[search_agent.name].cancel()
+                    continue
+                if agent is zoo_agent and self._found_records(event):
+                    found = True
+                yield event
+                payload.set()
+        finally:
+            for task in tasks.values():
+                task.cancel()
+                with contextlib.suppress(asyncio.CancelledError):
+                    await task
+
+        if found:
+            research = (
+                f"ZOO DATA:\n{ctx.session.state.get(zoo_agent.output_key, '')}\n\n"
+                f"GENERAL KNOWLEDGE:\n{ctx.session.state.get(search_agent.output_key, '')}"
+            )
+        else:
+            research = NOT_IN_ZOO
+        yield Event(
+            invocation_id=ctx.invocation_id,
+            author=self.name,
+            branch=ctx.branch,
+            actions=EventActions(state_delta={self.output_key: research}),
+        )
@@ -0,0 +1,75 @@
+import contextlib
+import logging
+from typing import AsyncGenerator, Optional
+
+from google.adk.agents.callback_context import CallbackContext
+from google.adk.agents.invocation_context import InvocationContext
+from google.adk.agents.remote_a2a_agent import RemoteA2aAgent
+from google.adk.agents.run_config import StreamingMode
+from google.adk.events import Event
+
+logger = logging.getLogger(__name__)
+
+
+# Callback to stream model output as partial events for the rest of the invocation.
+def enable_streaming(callback_context: CallbackContext):
+    """
+    Switches the invocation to SSE streaming, so model calls yield partial events.
+
+    Clients that do not render partial events still get the final event of
+    every model call, so this only changes when text becomes visible.
+
+    Args:
+        callback_context (CallbackContext): The callback context information.
+    """
+    inv_ctx = getattr(callback_context, "_invocation_context", None)
+    if inv_ctx and inv_ctx.run_config.streaming_mode == StreamingMode.NONE:
+        inv_ctx.run_config.streaming_mode = StreamingMode.SSE
+
+
+# Returns the text of an event made only of thought text parts, else None.
+def thought_text(event: Event) -> Optional[str]:
+    if event.partial or not event.content or not event.content.parts:
+        return None
+    if not all(part.text is not None and part.thought for part in event.content.parts):
+        return None
+    return "".join(part.text for part in event.content.parts)
+
+
+class StreamingRemoteA2aAgent(RemoteA2aAgent):
+    """
+    RemoteA2aAgent that passes the remote agent's streamed tokens on as partial events.
+
+    When the agent card advertises streaming, the remote agent sends each
+    chunk of model text as a `working` status update, then the whole
+    message once more. RemoteA2aAgent turns every update into a separate
+    thought event, and each one is appended to the session. This agent
+    turns the chunks into partial text events instead. Clients render them
+    as they arrive and the session does not keep them. The whole message
+    and the final result are passed through unchanged.
+    """
+
+    def _streams(self) -> bool:
+        capabilities = getattr(self._agent_card, "capabilities", None)
+        return bool(capabilities and capabilities.streaming)
+
+    async def _run_async_impl(self, ctx: InvocationContext) -> AsyncGenerator[Event, None]:
+        streamed = ""
+        async with contextlib.aclosing(super()._run_async_impl(ctx)) as events:
+            async for event in events:
+                text = thought_text(event)
+                if text is None or not self._streams():
+                    streamed = ""
+                    yield event
+                    continue
+                if streamed and text.strip() == streamed.strip():
+                    # The whole message, sent again after its chunks.
+                    streamed = ""
+                    yield event
+                    continue
+                streamed += text
+                chunk = event.model_copy(deep=True)
+                for part in chunk.content.parts:
+                    part.thought = None
+                chunk.partial = True
+                yield chunk
@@ -1,23 +1,24 @@
 import os
 import logging
-import google.cloud.logging
 from dotenv import load_dotenv
 
 from google.adk import Agent
-from google.adk.tools.mcp_tool.mcp_toolset import (
-    MCPToolset,
-    StreamableHTTPConnectionParams,
-)
-import google.auth
-import google.auth.transport.requests
-import google.oauth2.id_token
-
-from .callback_logging import log_query_to_model, log_model_response
+from google.adk.tools.mcp_tool.mcp_toolset import StreamableHTTPConnectionParams
 
-# Setup Logging
-google.cloud.logging.Client().setup_logging()
-logger = logging.getLogger(__name__)
-logging.basicConfig(format="[%(levelname)s]: %(message)s", level=logging.INFO)
+from .async_logging import setup_async_logging
+from .callback_logging import (
+    log_query_to_model,
+    log_model_response,
+    setup_cloud_logging,
+    trace_model_request,
+    trace_model_response,
+    trace_tool_call,
+    trace_tool_response,
+)
+from .id_token_provider import IdTokenProvider
+from .mcp_session_pool import PooledMCPToolset
+from .streaming import enable_streaming
+from .tracing import A2aServerSpans, flush_on_sigterm, setup_tracing
 
 # Setup Environment
 load_dotenv()
@@ -26,27 +27,38 @@ mcp_server_url = os.getenv("MCP_SERVER_URL")
 if not mcp_server_url:
     raise ValueError("The environment variable MCP_SERVER_URL is not set.")
 
+# In lazy mode, network-bound setup runs in the background instead of at import.
+lazy_init = os.getenv("LAZY_INIT", "TRUE").upper() == "TRUE"
 
-# Helper to generate ID tokens for MCP server authentication.
-def get_id_token():
-    target_url = os.getenv("MCP_SERVER_URL")
-    audience = target_url.split("/mcp")[0]
-    request = google.auth.transport.requests.Request()
-    id_token = google.oauth2.id_token.fetch_id_token(request, audience)
+# Stream model output token by token, as advertised in agent.json.
+streaming = os.getenv("STREAMING", "TRUE").upper() == "TRUE"
 
-    logger.info("🔑 Successfully generated ID token.")
-    return id_token
+# Setup Logging
+logger = logging.getLogger(__name__)
+logging.basicConfig(format="[%(levelname)s]: %(message)s", level=logging.INFO)
+# Records are queued and written in batches from a thread (LOG_ASYNC).
+log_handler = setup_async_logging()
+setup_cloud_logging(background=lazy_init)
 
+# Export spans of model and tool calls (TRACE_EXPORTER), continuing the
+# concierge's trace when it calls over A2A.
+setup_tracing("zoo-show-agent")
+if log_handler:
+    flush_on_sigterm(log_handler.flush)
+a2a_spans = A2aServerSpans()
 
-# Configures MCPToolset for the show data server.
-mcp_tools = MCPToolset(
-    connection_params=StreamableHTTPConnectionParams(
-        url=mcp_server_url,
-        headers={
-            "Authorization": f"Bearer {get_id_token()}",
-        },
-    ),
+# Provides ID tokens for MCP server authentication, renewed in the background.
+id_token_provider = IdTokenProvider(audience=mcp_server_url.split("/mcp")[0])
+if not lazy_init:
+    id_token_provider.refresh()
+id_token_provider.start()
+
+# Configures a pooled MCPToolset for the show data server.
+mcp_tools = PooledMCPToolset(
+    connection_params=StreamableHTTPConnectionParams(url=mcp_server_url),
+    header_provider=id_token_provider.get_headers,
 )
+mcp_tools.start_warm_up()
 
 
 # Root agent for handling show inquiries and bookings.
@@ -60,7 +72,10 @@ root_agent = Agent(
 
     **Workflow:**
     1.  **Information Gathering:**
-        - When a user asks about shows (e.g., "I want to see a giraffe show"), use the available MCP tools (`get_shows_by_animal`, `get_show_details`) to find relevant shows.
+        - When a user asks about shows (e.g., "I want to see a giraffe show"), use the available MCP tools (`get_shows_by_species`, `get_show_details`) to find relevant shows and their remaining seats.
+        - If the user asks about several animals, or about a location or time range, use `get_shows_by_species_batch` to look them all up in one call.
+        - For "what's on next" or "what's on between 1 and 3 PM", use `get_next_shows` or `get_shows_in_window`; before booking several shows, use `check_show_conflicts` to make sure their times do not overlap.
+        - To list or compare shows, request only what you need, e.g. `fields=['show_id', 'name', 'time', 'location']` with `compact=true`; fetch the full description only for the show the user is interested in.
         - Present the details (time, description, location) to the user.
 
     2.  **Booking Proposal:**
@@ -69,7 +84,8 @@ root_agent = Agent(
     3.  **Reservation:**
         - If the user says "yes" or wants to book:
             - Ask for the number of people (if not already provided).
-            - Once you have the show name and the number of people, use the `reserve_show` tool to complete the booking.
+            - Once you have the show and the number of people, use the `reserve_show` tool with the show's `show_id` to complete the booking. Daily shows run every day: pass `date` (YYYY-MM-DD) when the user wants a day other than the next showing.
+            - Pass a new unique `idempotency_key` for each booking, and reuse the same key if you retry that booking after an error.
             - **Confirmation Output:**
                 - After a successful reservation, you MUST respond with a formatted message containing the following details using the information you gathered in step 1:
                     - **Show Name**: [Name of the show]
@@ -82,6 +98,14 @@ root_agent = Agent(
     - Helpful, enthusiastic, and polite.
     """,
     tools=[mcp_tools],
-    before_model_callback=log_query_to_model,
-    after_model_callback=log_model_response,
+    before_agent_callback=(
+        [a2a_spans.before_agent_callback, enable_streaming]
+        if streaming
+        else a2a_spans.before_agent_callback
+    ),
+    after_agent_callback=a2a_spans.after_agent_callback,
+    before_model_callback=[log_query_to_model, trace_model_request],
+    after_model_callback=[log_model_response, trace_model_response],
+    before_tool_callback=trace_tool_call,
+    after_tool_callback=trace_tool_response,
 )
@@ -0,0 +1,178 @@
+import asyncio
+import base64
+import json
+import logging
+import threading
+import time
+from typing import Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+# Callable that mints an ID token for the given audience.
+TokenFetcher = Callable[[str], str]
+
+
+# Default fetcher: asks Google for an ID token (metadata server on Cloud Run).
+def fetch_google_id_token(audience: str) -> str:
+    """
+    Fetches a Google-signed ID token for the given audience.
+
+    Args:
+        audience (str): The base URL of the service being called.
+    """
+    import google.auth.transport.requests
+    import google.oauth2.id_token
+
+    request = google.auth.transport.requests.Request()
+    return google.oauth2.id_token.fetch_id_token(request, audience)
+
+
+# Reads the `exp` claim of a JWT without verifying its signature.
+def decode_token_expiry(token: str) -> Optional[float]:
+    """
+    Returns the expiry of a JWT as epoch seconds, or None if it cannot be read.
+
+    Args:
+        token (str): The encoded JWT.
+    """
+    try:
+        payload = token.split(".")[1]
+        payload += "=" * (-len(payload) % 4)
+        claims = json.loads(base64.urlsafe_b64decode(payload))
+        return float(claims["exp"])
+    except (IndexError, KeyError, TypeError, ValueError):
+        return None
+
+
+class IdTokenProvider:
+    """
+    Caches an ID token and renews it in a background thread before it expires.
+
+    `get_headers` is meant to be passed as the MCPToolset `header_provider`, so
+    every MCP session is opened with a currently valid bearer token. Fetching
+    only ever happens on the refresher thread, never on the request path.
+    """
+
+    def __init__(
+        self,
+        audience: str,
+        fetcher: TokenFetcher = fetch_google_id_token,
+        clock: Callable[[], float] = time.time,
+        refresh_margin: float = 300.0,
+        retry_interval: float = 10.0,
+        default_lifetime: float = 3600.0,
+        initial_timeout: float = 30.0,
+    ):
+        """
+        Args:
+            audience (str): The audience the ID token is minted for.
+            fetcher (TokenFetcher): Mints a new token for the audience.
+            clock (Callable[[], float]): Returns the current epoch time in seconds.
+            refresh_margin (float): Seconds before expiry at which to renew.
+            retry_interval (float): Seconds to wait after a failed fetch.
+            default_lifetime (float): Lifetime assumed when the token has no `exp`.
+            initial_timeout (float): Seconds a caller waits for the first token.
+        """
+        self.audience = audience
+        self._fetcher = fetcher
+        self._clock = clock
+        self._refresh_margin = refresh_margin
+        self._retry_interval = retry_interval
+        self._default_lifetime = default_lifetime
+        self._initial_timeout = initial_timeout
+
+        self._token: Optional[str] = None
+        self._expires_at = 0.0
+        self._lock = threading.Lock()
+        self._ready = threading.Event()
+        self._stopped = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def token(self) -> Optional[str]:
+        return self._token
+
+    @property
+    def expires_at(self) -> float:
+        return self._expires_at
+
+    def needs_refresh(self) -> bool:
+        """Returns True if there is no token or it is within the refresh margin."""
+        if self._token is None:
+            return True
+        return self._clock() >= self._expires_at - self._refresh_margin
+
+    def next_refresh_delay(self) -> float:
+        """Returns the number of seconds until the cached token should be renewed."""
+        if self._token is None:
+            return 0.0
+        return max(0.0, self._expires_at - self._refresh_margin - self._clock())
+
+    def refresh(self) -> bool:
+        """
+        Fetches a new token and caches it along with its decoded expiry.
+
+        Returns:
+            bool: True if a new token was cached, False if the fetch failed.
+        """
+        try:
+            token = self._fetcher(self.audience)
+        except Exception as e:
+            logger.error(f"❌ Failed to generate ID token for {self.audience}: {e}")
+            return False
+
+        expires_at = decode_token_expiry(token)
+        if expires_at is None:
+            expires_at = self._clock() + self._default_lifetime
+
+        with self._lock:
+            self._token = token
+            self._expires_at = expires_at
+        self._ready.set()
+        logger.info("🔑 Successfully generated ID token.")
+        return True
+
+    def _run(self):
+        while not self._stopped.is_set():
+            if self.needs_refresh() and not self.refresh():
+                delay = self._retry_interval
+            else:
+                delay = self.next_refresh_delay()
+            self._stopped.wait(delay)
+
+    def start(self):
+        """Starts the background refresher thread if it is not already running."""
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._stopped.clear()
+            self._thread = threading.Thread(
+                target=self._run, name="id-token-refresher", daemon=True
+            )
+            self._thread.start()
+
+    def stop(self):
+        """Stops the background refresher thread."""
+        self._stopped.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    async def get_headers(self, readonly_context=None) -> dict[str, str]:
+        """
+        Returns the Authorization header built from the cached token.
+
+        Args:
+            readonly_context (ReadonlyContext): The ADK context (unused).
+        """
+        self.start()
+        if not self._ready.is_set():
+            # Only the very first request waits, and it does so off the event loop.
+            await asyncio.to_thread(self._ready.wait, self._initial_timeout)
+
+        token = self._token
+        if token is None:
+            raise RuntimeError(f"ID token for {self.audience} is not available.")
+        if self._clock() >= self._expires_at:
+            logger.warning("⚠️ Using an expired ID token; refresh is failing.")
+        return {"Authorization": f"Bearer {token}"}
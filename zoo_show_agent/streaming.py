@@ -0,0 +1,23 @@
+import logging
+
+from google.adk.agents.callback_context import CallbackContext
+from google.adk.agents.run_config import StreamingMode
+
+logger = logging.getLogger(__name__)
+
+
+# Callback to stream model output as partial events for the rest of the invocation.
+def enable_streaming(callback_context: CallbackContext):
+    """
+    Switches the invocation to SSE streaming, so model calls yield partial events.
+
+    Requests served over A2A do not choose a streaming mode. With this,
+    every chunk of model text is sent to the caller as a `working` status
+    update, as the agent card advertises.
+
+    Args:
+        callback_context (CallbackContext): The callback context information.
+    """
+    inv_ctx = getattr(callback_context, "_invocation_context", None)
+    if inv_ctx and inv_ctx.run_config.streaming_mode == StreamingMode.NONE:
+        inv_ctx.run_config.streaming_mode = StreamingMode.SSE
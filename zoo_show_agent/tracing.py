@@ -0,0 +1,234 @@
+import json
+import logging
+import os
+import signal
+import threading
+from typing import Any, Callable, Optional, Sequence
+
+from opentelemetry import context as otel_context
+from opentelemetry import propagate, trace
+from opentelemetry.sdk.resources import Resource
+from opentelemetry.sdk.trace import ReadableSpan, TracerProvider
+from opentelemetry.sdk.trace.export import (
+    BatchSpanProcessor,
+    SpanExporter,
+    SpanExportResult,
+)
+from opentelemetry.sdk.trace.sampling import ParentBased, TraceIdRatioBased
+
+logger = logging.getLogger(__name__)
+
+
+def span_to_dict(span: ReadableSpan) -> dict[str, Any]:
+    parent = span.parent
+    return {
+        "service": span.resource.attributes.get("service.name"),
+        "name": span.name,
+        "trace_id": format(span.context.trace_id, "032x"),
+        "span_id": format(span.context.span_id, "016x"),
+        "parent_id": format(parent.span_id, "016x") if parent else None,
+        "kind": span.kind.name,
+        "start_ns": span.start_time,
+        "duration_ms": (span.end_time - span.start_time) / 1e6,
+        "status": span.status.status_code.name,
+        "attributes": dict(span.attributes or {}),
+    }
+
+
+class JsonlSpanExporter(SpanExporter):
+    """Appends finished spans to a local file, one JSON object per line."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+
+    def export(self, spans: Sequence[ReadableSpan]) -> SpanExportResult:
+        lines = "".join(
+            json.dumps(span_to_dict(span), ensure_ascii=False, default=str) + "\n"
+            for span in spans
+        )
+        try:
+            with self._lock, open(self.path, "a", encoding="utf-8") as f:
+                f.write(lines)
+        except OSError as e:
+            logger.warning(f"⚠️ Could not write spans to {self.path}: {e}")
+            return SpanExportResult.FAILURE
+        return SpanExportResult.SUCCESS
+
+    def shutdown(self):
+        pass
+
+
+def create_span_exporter(kind: str) -> Optional[SpanExporter]:
+    """
+    Builds the span exporter named by `kind`: "otlp", "jsonl" or "none".
+
+    OTLP sends to OTEL_EXPORTER_OTLP_ENDPOINT (or its traces variant) over
+    HTTP and needs opentelemetry-exporter-otlp-proto-http. JSONL writes to
+    TRACE_FILE. Returns None for "none", or when the exporter is unavailable.
+    """
+    if kind == "otlp":
+        try:
+            from opentelemetry.exporter.otlp.proto.http.trace_exporter import (
+                OTLPSpanExporter,
+            )
+        except ImportError:
+            logger.warning(
+                "⚠️ TRACE_EXPORTER=otlp needs opentelemetry-exporter-otlp-proto-http; tracing is off."
+            )
+            return None
+        return OTLPSpanExporter()
+    if kind == "jsonl":
+        return JsonlSpanExporter(os.getenv("TRACE_FILE", "traces.jsonl"))
+    if kind not in ("", "none"):
+        logger.warning(f"⚠️ Unknown TRACE_EXPORTER '{kind}'; tracing is off.")
+    return None
+
+
+# Flushes queued spans (or log records) when the process is asked to stop.
+def flush_on_sigterm(flush: Callable[[], Any]):
+    """
+    Runs `flush` before the process exits on SIGTERM.
+
+    Cloud Run stops instances with SIGTERM, and uvicorn re-raises it after
+    its graceful shutdown, so atexit hooks (and the batch processor's own
+    flush) never run. Only possible from the main thread; elsewhere this
+    does nothing.
+    """
+    previous = signal.getsignal(signal.SIGTERM)
+
+    def handler(signum, frame):
+        flush()
+        if callable(previous):
+            previous(signum, frame)
+        else:
+            signal.signal(signum, signal.SIG_DFL)
+            signal.raise_signal(signum)
+
+    try:
+        signal.signal(signal.SIGTERM, handler)
+    except ValueError:
+        pass
+
+
+# Installs the tracer provider that ADK's and FastMCP's spans report to.
+def setup_tracing(
+    service_name: str,
+    exporter: Optional[SpanExporter] = None,
+    sample_rate: Optional[float] = None,
+) -> bool:
+    """
+    Exports this process's spans in batches from a background thread.
+
+    ADK already opens spans for agent runs, model calls and tool calls, and
+    FastMCP for tool executions, but they are dropped until a tracer
+    provider is installed. Finished spans are queued and written by the
+    batch processor's thread, so the request path never waits on export;
+    when the queue is full, spans are dropped rather than blocking.
+
+    Configured through TRACE_EXPORTER ("otlp", "jsonl" or "none", the
+    default), TRACE_FILE, TRACE_SAMPLE_RATE and the standard OTEL_BSP_*
+    batch settings. If another component installed a provider first, the
+    exporter is added to it.
+
+    Args:
+        service_name (str): The service.name resource attribute.
+        exporter (Optional[SpanExporter]): Used instead of TRACE_EXPORTER.
+        sample_rate (Optional[float]): Share of new traces recorded; traces
+            started by a caller follow the caller's decision.
+
+    Returns:
+        bool: True if spans are exported.
+    """
+    if exporter is None:
+        exporter = create_span_exporter(os.getenv("TRACE_EXPORTER", "none").lower())
+    if exporter is None:
+        return False
+    if sample_rate is None:
+        sample_rate = float(os.getenv("TRACE_SAMPLE_RATE", 1.0))
+
+    processor = BatchSpanProcessor(exporter)
+    current = trace.get_tracer_provider()
+    if isinstance(current, TracerProvider):
+        current.add_span_processor(processor)
+    else:
+        provider = TracerProvider(
+            resource=Resource.create({"service.name": service_name}),
+            sampler=ParentBased(TraceIdRatioBased(sample_rate)),
+        )
+        provider.add_span_processor(processor)
+        trace.set_tracer_provider(provider)
+    flush_on_sigterm(processor.force_flush)
+    logger.info(f"🔭 Exporting traces of {service_name} with {type(exporter).__name__}.")
+    return True
+
+
+def inject_trace_context(carrier: Optional[dict[str, str]] = None) -> dict[str, str]:
+    """Returns the carrier with the current span's W3C traceparent (and tracestate) added."""
+    carrier = {} if carrier is None else carrier
+    propagate.inject(carrier)
+    return carrier
+
+
+def extract_trace_context(carrier: Optional[dict[str, Any]]) -> otel_context.Context:
+    """Returns the context of the remote span described by a carrier's traceparent."""
+    return propagate.extract({k: str(v) for k, v in (carrier or {}).items()})
+
+
+def payload_bytes(value: Any) -> int:
+    """Returns the size of a value serialized as JSON, for span attributes."""
+    if value is None:
+        return 0
+    if isinstance(value, (str, bytes)):
+        return len(value.encode() if isinstance(value, str) else value)
+    return len(json.dumps(value, ensure_ascii=False, default=str).encode())
+
+
+# Provides the A2A request metadata that carries the caller's trace to a remote agent.
+def a2a_request_metadata(ctx: Any, message: Any) -> dict[str, str]:
+    """Used as RemoteA2aAgent's a2a_request_meta_provider."""
+    return inject_trace_context()
+
+
+class A2aServerSpans:
+    """
+    Continues an A2A caller's trace in the agent that serves the request.
+
+    Used as the served agent's before/after_agent_callback. ADK passes the
+    A2A request metadata on in the run config's custom metadata; when it
+    holds a traceparent, a SERVER span parented to the caller's span covers
+    the agent run, so the hop shows up in the caller's trace. The span is
+    current until the agent finishes, so the agent's model, tool and MCP
+    spans join the caller's trace as its children.
+    """
+
+    def __init__(self, metadata_key: str = "a2a_metadata"):
+        self._metadata_key = metadata_key
+        self._tracer = trace.get_tracer(__name__)
+        self._spans: dict[str, tuple[trace.Span, object]] = {}
+
+    def before_agent_callback(self, callback_context: Any):
+        inv_ctx = getattr(callback_context, "_invocation_context", None)
+        run_config = getattr(inv_ctx, "run_config", None)
+        custom_metadata = getattr(run_config, "custom_metadata", None) or {}
+        carrier = custom_metadata.get(self._metadata_key)
+        if not isinstance(carrier, dict) or "traceparent" not in carrier:
+            return None
+        span = self._tracer.start_span(
+            f"a2a {callback_context.agent_name}",
+            context=extract_trace_context(carrier),
+            kind=trace.SpanKind.SERVER,
+            attributes={"zoo.agent": callback_context.agent_name},
+        )
+        # The agent runs in this task, so the span stays current for its calls.
+        token = otel_context.attach(trace.set_span_in_context(span))
+        self._spans[callback_context.invocation_id] = (span, token)
+        return None
+
+    def after_agent_callback(self, callback_context: Any):
+        entry = self._spans.pop(callback_context.invocation_id, None)
+        if entry is not None:
+            span, token = entry
+            otel_context.detach(token)
+            span.end()
+        return None
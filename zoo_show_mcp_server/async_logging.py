@@ -0,0 +1,267 @@
+import atexit
+import collections
+import dataclasses
+import logging
+import os
+import threading
+import time
+import weakref
+from typing import Optional
+
+from opentelemetry import context as otel_context
+
+# Attribute under which a record keeps the OpenTelemetry context it was logged in.
+CONTEXT_ATTR = "_otel_context"
+
+
+@dataclasses.dataclass
+class AsyncLogMetrics:
+    """Counters for the background log pipeline."""
+
+    records: int = 0
+    emitted: int = 0
+    dropped: int = 0
+    sampled_out: int = 0
+    errors: int = 0
+    batches: int = 0
+    queue_depth_max: int = 0
+
+    def as_dict(self) -> dict[str, float]:
+        return {
+            "records": self.records,
+            "emitted": self.emitted,
+            "dropped": self.dropped,
+            "sampled_out": self.sampled_out,
+            "errors": self.errors,
+            "batches": self.batches,
+            "batch_size_avg": self.emitted / self.batches if self.batches else 0.0,
+            "queue_depth_max": self.queue_depth_max,
+        }
+
+
+# Returns True for handlers whose emit only formats a record and writes it to a stream.
+def writes_stream(handler: logging.Handler) -> bool:
+    if not isinstance(handler, logging.StreamHandler):
+        return False
+    emit = type(handler).emit
+    if emit is logging.StreamHandler.emit:
+        return True
+    # Cloud Logging's structured handler (Cloud Run, GKE) only adds a one-off
+    # diagnostic entry before writing to stdout. Imported here, as only the
+    # agents depend on google-cloud-logging.
+    try:
+        from google.cloud.logging.handlers import StructuredLogHandler
+    except ImportError:
+        return False
+    return isinstance(handler, StructuredLogHandler) and emit is StructuredLogHandler.emit
+
+
+class AsyncLogHandler(logging.Handler):
+    """
+    Queues log records and emits them to its target handlers from a thread.
+
+    Logging on the request path only appends the record to a bounded
+    buffer: the message is not formatted and no handler runs there. A
+    daemon thread takes records in batches, every `flush_interval` seconds
+    or once `batch_size` are waiting, formats them and hands them to the
+    targets; stream targets, such as stdout on Cloud Run, get one write and
+    one flush per batch. Warnings and errors wake the thread at once.
+
+    When `max_size` records are waiting, new ones are dropped and counted
+    instead of blocking. Records at or below `sample_level` are kept at
+    `sample_rate`, evenly spaced. Each record carries the OpenTelemetry
+    context it was logged in, so targets that read the current span, like
+    Cloud Logging's trace correlation, see the request's span.
+
+    Messages are formatted when emitted, so arguments passed for lazy
+    %-formatting must not be changed after the call.
+    """
+
+    def __init__(
+        self,
+        targets: Optional[list[logging.Handler]] = None,
+        max_size: int = 10000,
+        batch_size: int = 256,
+        flush_interval: float = 0.2,
+        sample_level: int = logging.DEBUG,
+        sample_rate: float = 1.0,
+    ):
+        """
+        Args:
+            targets (Optional[list[logging.Handler]]): Handlers records go to.
+            max_size (int): Records that may wait at once.
+            batch_size (int): Records emitted per batch at most.
+            flush_interval (float): Longest a record waits, in seconds.
+            sample_level (int): Highest level that is sampled.
+            sample_rate (float): Share of sampled-level records kept.
+        """
+        super().__init__()
+        self.targets = list(targets or [])
+        self._max_size = max_size
+        self._batch_size = batch_size
+        self._flush_interval = flush_interval
+        self._sample_level = sample_level
+        self._sample_rate = sample_rate
+        self._sampled = 0
+        self._buffer: collections.deque[logging.LogRecord] = collections.deque()
+        self._wakeup = threading.Event()
+        self._drain_lock = threading.RLock()
+        self._closed = False
+        self.metrics = AsyncLogMetrics()
+        self._start_thread()
+        # Runs before logging's own shutdown, which closes the targets.
+        atexit.register(self.flush)
+        # A forked worker gets its own writer thread (see _after_fork).
+        after_fork = weakref.WeakMethod(self._after_fork)
+        os.register_at_fork(after_in_child=lambda: after_fork() and after_fork()())
+
+    def _start_thread(self):
+        self._thread = threading.Thread(target=self._run, name="async-logging", daemon=True)
+        self._thread.start()
+
+    def _after_fork(self):
+        # Only the forking thread survives fork. Records still queued are
+        # the parent's to write, and locks held by its writer are reset.
+        self._buffer.clear()
+        self._wakeup = threading.Event()
+        self._drain_lock = threading.RLock()
+        self.metrics = AsyncLogMetrics()
+        if not self._closed:
+            self._start_thread()
+
+    def handle(self, record: logging.LogRecord) -> bool:
+        # Overridden to skip the handler lock; the buffer is thread-safe.
+        if not self.filter(record):
+            return False
+        self.emit(record)
+        return True
+
+    def emit(self, record: logging.LogRecord):
+        self.metrics.records += 1
+        if record.levelno <= self._sample_level and self._sample_rate < 1.0:
+            self._sampled += 1
+            kept = int(self._sampled * self._sample_rate)
+            if kept == int((self._sampled - 1) * self._sample_rate):
+                self.metrics.sampled_out += 1
+                return
+        depth = len(self._buffer)
+        if depth >= self._max_size or self._closed:
+            self.metrics.dropped += 1
+            return
+        setattr(record, CONTEXT_ATTR, otel_context.get_current())
+        self._buffer.append(record)
+        if depth >= self.metrics.queue_depth_max:
+            self.metrics.queue_depth_max = depth + 1
+        if depth + 1 >= self._batch_size or record.levelno >= logging.WARNING:
+            self._wakeup.set()
+
+    def _run(self):
+        while not self._closed:
+            self._wakeup.wait(self._flush_interval)
+            self._wakeup.clear()
+            self._drain()
+
+    def _drain(self):
+        with self._drain_lock:
+            while self._buffer:
+                batch = []
+                while self._buffer and len(batch) < self._batch_size:
+                    batch.append(self._buffer.popleft())
+                for target in list(self.targets):
+                    self._emit_batch(target, batch)
+                self.metrics.emitted += len(batch)
+                self.metrics.batches += 1
+
+    def _emit_batch(self, target: logging.Handler, batch: list[logging.LogRecord]):
+        lines = []
+        for record in batch:
+            if record.levelno < target.level:
+                continue
+            context = getattr(record, CONTEXT_ATTR, None) or otel_context.Context()
+            token = otel_context.attach(context)
+            try:
+                if not writes_stream(target):
+                    target.handle(record)
+                elif target.filter(record):
+                    lines.append(target.format(record) + target.terminator)
+            except Exception:
+                self.metrics.errors += 1
+                target.handleError(record)
+            finally:
+                otel_context.detach(token)
+            # Lets request threads take the GIL between records, instead of
+            # waiting out the interpreter's switch interval on a long batch.
+            time.sleep(0)
+        if not lines:
+            return
+        target.acquire()
+        try:
+            target.stream.write("".join(lines))
+            target.flush()
+        except Exception:
+            self.metrics.errors += 1
+            target.handleError(batch[-1])
+        finally:
+            target.release()
+
+    def flush(self):
+        """Emits every waiting record before returning."""
+        self._drain()
+        for target in list(self.targets):
+            target.flush()
+
+    def close(self):
+        self._closed = True
+        self._wakeup.set()
+        self.flush()
+        super().close()
+
+
+# Finds the async handler on a logger, as installed by setup_async_logging.
+def find_async_handler(logger: Optional[logging.Logger] = None) -> Optional[AsyncLogHandler]:
+    for handler in (logger or logging.getLogger()).handlers:
+        if isinstance(handler, AsyncLogHandler):
+            return handler
+    return None
+
+
+# Moves the root logger's handlers behind a background queue.
+def setup_async_logging(
+    max_size: Optional[int] = None,
+    batch_size: Optional[int] = None,
+    flush_interval: Optional[float] = None,
+    sample_rate: Optional[float] = None,
+) -> Optional[AsyncLogHandler]:
+    """
+    Puts an AsyncLogHandler in front of the root logger's handlers.
+
+    Configured through LOG_ASYNC ("TRUE" by default), LOG_QUEUE_SIZE,
+    LOG_BATCH_SIZE, LOG_FLUSH_INTERVAL and LOG_DEBUG_SAMPLE_RATE, the share
+    of DEBUG records kept; arguments override them. Handlers added to the
+    root logger later, like Cloud Logging's, are moved behind the queue by
+    setup_cloud_logging.
+
+    Returns:
+        Optional[AsyncLogHandler]: The installed handler, or None if disabled.
+    """
+    if os.getenv("LOG_ASYNC", "TRUE").upper() != "TRUE":
+        return None
+    root_logger = logging.getLogger()
+    if handler := find_async_handler(root_logger):
+        return handler
+
+    handler = AsyncLogHandler(
+        targets=list(root_logger.handlers),
+        max_size=max_size or int(os.getenv("LOG_QUEUE_SIZE", 10000)),
+        batch_size=batch_size or int(os.getenv("LOG_BATCH_SIZE", 256)),
+        flush_interval=flush_interval or float(os.getenv("LOG_FLUSH_INTERVAL", 0.2)),
+        sample_rate=(
+            sample_rate
+            if sample_rate is not None
+            else float(os.getenv("LOG_DEBUG_SAMPLE_RATE", 1.0))
+        ),
+    )
+    for target in handler.targets:
+        root_logger.removeHandler(target)
+    root_logger.addHandler(handler)
+    return handler
@@ -0,0 +1,121 @@
+import logging
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, Generic, Optional, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class DataReloader(Generic[T]):
+    """
+    Holds an immutable snapshot opened from a data file and rebuilds it on change.
+
+    The file's mtime is polled on a background thread. A new snapshot is built
+    completely off the request path and then published with a single
+    attribute assignment, so readers see either the old snapshot or the new
+    one, never a half-built index. A file that fails to load or parse keeps
+    the previous snapshot in place.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        build: Callable[[str], T],
+        empty: Callable[[], T],
+        interval: float = 30.0,
+    ):
+        """
+        Args:
+            path (str): The data file to load.
+            build (Callable[[str], T]): Builds a snapshot from the file at a path.
+            empty (Callable[[], T]): Builds the snapshot served if the first load fails.
+            interval (float): Seconds between mtime checks; 0 disables reloading.
+        """
+        self.path = path
+        self._build = build
+        self._empty = empty
+        self.interval = interval
+        self.current: Optional[T] = None
+        self._mtime_ns: Optional[int] = None
+        self._stopped = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+        self.loads = 0
+        self.swaps = 0
+        self.failures = 0
+        self.last_load_ms = 0.0
+
+    def load(self) -> bool:
+        """
+        Builds a snapshot from the file and swaps it in.
+
+        Returns:
+            bool: True if a new snapshot was published.
+        """
+        self.loads += 1
+        start = time.perf_counter()
+        try:
+            mtime_ns = os.stat(self.path).st_mtime_ns
+            snapshot = self._build(self.path)
+        except Exception as e:
+            self.failures += 1
+            if self.current is None:
+                logger.error(f"❌ Error loading {self.path}, serving no data: {e}")
+                self.current = self._empty()
+            else:
+                logger.error(f"❌ Error reloading {self.path}, keeping previous data: {e}")
+            return False
+
+        self.last_load_ms = 1000 * (time.perf_counter() - start)
+        self._mtime_ns = mtime_ns
+        # Single reference assignment: the swap is atomic for readers.
+        self.current = snapshot
+        self.swaps += 1
+        return True
+
+    def check(self) -> bool:
+        """Reloads the file if its mtime changed since the last load."""
+        try:
+            mtime_ns = os.stat(self.path).st_mtime_ns
+        except OSError:
+            return False
+        if mtime_ns == self._mtime_ns:
+            return False
+        # Record the mtime even on failure, so a broken file is not re-parsed every poll.
+        reloaded = self.load()
+        self._mtime_ns = mtime_ns
+        if reloaded:
+            logger.info(f"🔄 Reloaded {self.path} in {self.last_load_ms:.1f} ms.")
+        return reloaded
+
+    def _run(self):
+        while not self._stopped.wait(self.interval):
+            self.check()
+
+    def start(self):
+        """Starts polling for changes, unless reloading is disabled."""
+        if self.interval <= 0 or self._thread is not None:
+            return
+        self._thread = threading.Thread(
+            target=self._run, name="data-reloader", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self):
+        """Stops polling for changes."""
+        self._stopped.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def metrics(self) -> Dict[str, Any]:
+        return {
+            "path": self.path,
+            "loads": self.loads,
+            "swaps": self.swaps,
+            "failures": self.failures,
+            "last_load_ms": self.last_load_ms,
+        }
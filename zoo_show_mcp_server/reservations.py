@@ -0,0 +1,277 @@
+import contextlib
+import dataclasses
+import logging
+import sqlite3
+import threading
+import time
+import uuid
+from typing import Any, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+# A showing: a show's ID and the date (YYYY-MM-DD, in the show's timezone) it is on.
+ShowingKey = Tuple[str, str]
+
+
+class ReservationError(ValueError):
+    """A reservation that cannot be made: unknown show, bad party size or no seats."""
+
+
+@dataclasses.dataclass(frozen=True)
+class Reservation:
+    reservation_id: str
+    show_id: str
+    party_size: int
+    idempotency_key: Optional[str]
+    created_at: float
+    show_date: str
+
+    def as_dict(self) -> Dict[str, Any]:
+        return dataclasses.asdict(self)
+
+
+class ReservationBook:
+    """
+    Per-showing seat inventory backed by a SQLite journal.
+
+    Shows recur, so seats are counted per showing: a show ID and the date
+    it is on. Each showing has its own lock, so bookings for different
+    showings only meet at the journal write. A booking checks capacity,
+    appends its row to the journal and updates the in-memory count while
+    holding the showing's lock, so a showing can never be oversold. Seat
+    counts are rebuilt from the journal on startup.
+
+    Retried calls that pass the same idempotency key get the original
+    reservation back instead of booking again; the key is unique in the
+    journal, so this also holds across restarts and concurrent retries.
+
+    With `shared`, several processes (the server's workers) book from the
+    same journal: seat counts are read from it, and each booking checks
+    capacity and writes its row in one write transaction, which SQLite
+    serializes across processes.
+    """
+
+    def __init__(self, path: str, shared: bool = False):
+        """
+        Args:
+            path (str): SQLite journal file; created if missing.
+            shared (bool): Other processes book from the same journal.
+        """
+        self.path = path
+        self.shared = shared
+        # Connections inherited over fork; kept open, since closing them
+        # in a child would touch the parent's database state.
+        self._inherited: List[sqlite3.Connection] = []
+        self._conn = self._connect()
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS reservations (
+                reservation_id TEXT PRIMARY KEY,
+                show_id TEXT NOT NULL,
+                party_size INTEGER NOT NULL,
+                idempotency_key TEXT UNIQUE,
+                created_at REAL NOT NULL,
+                show_date TEXT NOT NULL
+            )
+            """
+        )
+        self._migrate()
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS reservations_showing"
+            " ON reservations (show_id, show_date, party_size)"
+        )
+        # Reentrant: a booking holds it across its lookups and its write.
+        self._journal_lock = threading.RLock()
+        self._locks_lock = threading.Lock()
+        self._show_locks: Dict[ShowingKey, threading.Lock] = {}
+
+        self._reserved: Dict[ShowingKey, int] = {
+            (show_id, show_date): seats
+            for show_id, show_date, seats in self._conn.execute(
+                "SELECT show_id, show_date, SUM(party_size) FROM reservations"
+                " GROUP BY show_id, show_date"
+            )
+        }
+
+        self.confirmed = 0
+        self.rejected = 0
+        self.replayed = 0
+        self.journal_seconds_total = 0.0
+
+    def _migrate(self):
+        """Adds show_date to a journal written before seats were counted per showing."""
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(reservations)")}
+        if "show_date" in columns:
+            return
+        # Earlier bookings were for the day they were made (in UTC).
+        with self._conn:
+            self._conn.execute("ALTER TABLE reservations ADD COLUMN show_date TEXT")
+            self._conn.execute(
+                "UPDATE reservations SET show_date = date(created_at, 'unixepoch')"
+            )
+            self._conn.execute("DROP INDEX IF EXISTS reservations_show")
+        logger.info(f"📒 Added show dates to the reservation journal {self.path}.")
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        # WAL with synchronous=NORMAL survives process crashes and keeps
+        # commits cheap; only an OS crash can lose the last transactions.
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    def reopen(self):
+        """Opens this process's own connection, as a forked worker must before booking."""
+        self._inherited.append(self._conn)
+        self._conn = self._connect()
+        self._journal_lock = threading.RLock()
+        self._locks_lock = threading.Lock()
+        self._show_locks = {}
+
+    @contextlib.contextmanager
+    def _booking(self):
+        """Holds the journal's write lock across processes while a shared booking runs."""
+        if not self.shared:
+            yield
+            return
+        with self._journal_lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._conn.execute("COMMIT")
+
+    def _show_lock(self, showing: ShowingKey) -> threading.Lock:
+        lock = self._show_locks.get(showing)
+        if lock is None:
+            with self._locks_lock:
+                lock = self._show_locks.setdefault(showing, threading.Lock())
+        return lock
+
+    def _find(self, idempotency_key: str) -> Optional[Reservation]:
+        with self._journal_lock:
+            row = self._conn.execute(
+                "SELECT reservation_id, show_id, party_size, idempotency_key, created_at,"
+                " show_date FROM reservations WHERE idempotency_key = ?",
+                (idempotency_key,),
+            ).fetchone()
+        return Reservation(*row) if row else None
+
+    def _replay(
+        self, existing: Reservation, show_id: str, show_date: str, party_size: int
+    ) -> Reservation:
+        if (existing.show_id, existing.show_date, existing.party_size) != (
+            show_id,
+            show_date,
+            party_size,
+        ):
+            self.rejected += 1
+            raise ReservationError(
+                f"idempotency key '{existing.idempotency_key}' was already used"
+                f" for {existing.party_size} seat(s) at show {existing.show_id}"
+                f" on {existing.show_date}"
+            )
+        self.replayed += 1
+        return existing
+
+    def reserved(self, show_id: str, show_date: str) -> int:
+        """Returns the number of seats booked for a show on a date (YYYY-MM-DD)."""
+        if self.shared:
+            with self._journal_lock:
+                (seats,) = self._conn.execute(
+                    "SELECT COALESCE(SUM(party_size), 0) FROM reservations"
+                    " WHERE show_id = ? AND show_date = ?",
+                    (show_id, show_date),
+                ).fetchone()
+            return seats
+        return self._reserved.get((show_id, show_date), 0)
+
+    def reserve(
+        self,
+        show_id: str,
+        show_date: str,
+        party_size: int,
+        capacity: int,
+        idempotency_key: Optional[str] = None,
+    ) -> Reservation:
+        """
+        Books seats for a showing, or returns the reservation made under the same key.
+
+        Args:
+            show_id (str): The show to book.
+            show_date (str): The date of the showing (YYYY-MM-DD, in the show's timezone).
+            party_size (int): Number of seats.
+            capacity (int): Total seats of each showing of the show.
+            idempotency_key (Optional[str]): Makes retries of this call safe.
+
+        Raises:
+            ReservationError: The party size is invalid, the showing does not
+                have enough seats left, or the key was used for another booking.
+        """
+        if party_size < 1:
+            self.rejected += 1
+            raise ReservationError("party_size must be at least 1")
+
+        showing = (show_id, show_date)
+        with self._show_lock(showing), self._booking():
+            if idempotency_key:
+                existing = self._find(idempotency_key)
+                if existing:
+                    return self._replay(existing, show_id, show_date, party_size)
+
+            remaining = capacity - self.reserved(show_id, show_date)
+            if party_size > remaining:
+                self.rejected += 1
+                raise ReservationError(
+                    f"not enough seats for show {show_id} on {show_date}:"
+                    f" {max(remaining, 0)} remaining"
+                )
+
+            reservation = Reservation(
+                reservation_id=uuid.uuid4().hex[:12],
+                show_id=show_id,
+                party_size=party_size,
+                idempotency_key=idempotency_key or None,
+                created_at=time.time(),
+                show_date=show_date,
+            )
+            start = time.perf_counter()
+            try:
+                with self._journal_lock:
+                    self._conn.execute(
+                        "INSERT INTO reservations (reservation_id, show_id, party_size,"
+                        " idempotency_key, created_at, show_date) VALUES (?, ?, ?, ?, ?, ?)",
+                        dataclasses.astuple(reservation),
+                    )
+            except sqlite3.IntegrityError:
+                # The same key was committed concurrently for another showing.
+                existing = self._find(idempotency_key)
+                return self._replay(existing, show_id, show_date, party_size)
+            finally:
+                self.journal_seconds_total += time.perf_counter() - start
+
+            # Shared books read counts from the journal, which has this row already.
+            if not self.shared:
+                self._reserved[showing] = self._reserved.get(showing, 0) + party_size
+            self.confirmed += 1
+            return reservation
+
+    def metrics(self) -> Dict[str, Any]:
+        return {
+            "path": self.path,
+            "confirmed": self.confirmed,
+            "rejected": self.rejected,
+            "replayed": self.replayed,
+            "journal_ms_avg": (
+                1000 * self.journal_seconds_total / self.confirmed
+                if self.confirmed
+                else 0.0
+            ),
+        }
+
+    def close(self):
+        with self._journal_lock:
+            self._conn.close()
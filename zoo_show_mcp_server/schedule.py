@@ -0,0 +1,334 @@
+import bisect
+import dataclasses
+import datetime
+import functools
+import heapq
+import itertools
+import re
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+from zoneinfo import ZoneInfo
+
+from storage import filter_key, species_keys
+
+DEFAULT_TIMEZONE = "Asia/Seoul"
+# Used when a show's duration is missing or cannot be read.
+DEFAULT_DURATION_MINUTES = 30
+# Farthest ahead next_shows looks for daily shows that match a filter.
+HORIZON_DAYS = 7
+# The record fields a schedule is built from.
+SCHEDULE_FIELDS = ("show_id", "time", "duration", "date", "timezone", "species", "species_kr")
+
+# Durations such as "30 mins", "1 hour", "1h 15m", "1시간 30분" or "90".
+_DURATION_PART = re.compile(
+    r"(\d+(?:\.\d+)?)\s*(h|hrs?|hours?|시간|m|mins?|minutes?|분)?", re.IGNORECASE
+)
+
+
+def parse_duration(text: Any) -> Optional[int]:
+    """Returns a duration in minutes, or None if the text is not a duration."""
+    if isinstance(text, (int, float)):
+        return int(text)
+    parts = _DURATION_PART.findall(str(text or ""))
+    if not parts:
+        return None
+    minutes = 0.0
+    for amount, unit in parts:
+        hours = unit and unit.lower()[0] in "h시"
+        minutes += float(amount) * (60 if hours else 1)
+    return round(minutes)
+
+
+def parse_clock(text: Any) -> Optional[int]:
+    """Returns a clock time ("09:30 AM", "14:00") as minutes past midnight."""
+    if not isinstance(text, str):
+        return None
+    kind, value = filter_key(text)
+    return value if kind == 0 else None
+
+
+def parse_when(text: Optional[str], now: datetime.datetime, tz: ZoneInfo) -> datetime.datetime:
+    """
+    Reads a point in time given to a tool.
+
+    Accepts ISO datetimes, with or without an offset (without one, they are
+    in `tz`), or a clock time, which means that time today in `tz`. None
+    and "now" mean `now`.
+    """
+    if text is None or text.strip().lower() == "now":
+        return now
+    minutes = parse_clock(text.strip())
+    if minutes is not None:
+        midnight = datetime.datetime.combine(now.astimezone(tz).date(), datetime.time(), tz)
+        return midnight + datetime.timedelta(minutes=minutes)
+    try:
+        when = datetime.datetime.fromisoformat(text.strip())
+    except ValueError:
+        raise ValueError(
+            f"cannot read the time '{text}'; use e.g. '14:30', '2:30 PM' or '2026-05-01T14:30'"
+        )
+    return when if when.tzinfo else when.replace(tzinfo=tz)
+
+
+@dataclasses.dataclass(frozen=True)
+class Slot:
+    """One showing: a show record at a concrete start and end time."""
+
+    start: datetime.datetime
+    end: datetime.datetime
+    record_id: int
+    load: Callable[[Sequence[int]], List[Dict[str, Any]]] = dataclasses.field(
+        compare=False, repr=False
+    )
+
+    @functools.cached_property
+    def record(self) -> Dict[str, Any]:
+        """The show record, loaded from its store on first use."""
+        return self.load([self.record_id])[0]
+
+    def as_dict(self, now: datetime.datetime) -> Dict[str, Any]:
+        return {
+            **self.record,
+            "start": self.start.isoformat(),
+            "end": self.end.isoformat(),
+            "starts_in_minutes": round((self.start - now).total_seconds() / 60),
+        }
+
+
+def load_records(slots: Sequence[Slot]):
+    """Loads the records of showings from one schedule with one call to its store."""
+    missing = [slot for slot in slots if "record" not in slot.__dict__]
+    if missing:
+        records = missing[0].load([slot.record_id for slot in missing])
+        for slot, record in zip(missing, records):
+            # Fills the cached property, as reading it would.
+            slot.__dict__["record"] = record
+
+
+class _DailyTimes:
+    """Shows repeated every day in one timezone, sorted by start minute."""
+
+    def __init__(self, tz: ZoneInfo, entries: List[Tuple[int, int, int]]):
+        self.tz = tz
+        entries.sort()
+        self.starts = [start for start, _, _ in entries]
+        self.entries = entries
+        self.max_duration = max((duration for _, duration, _ in entries), default=0)
+
+    def midnight(self, day: datetime.date) -> datetime.datetime:
+        return datetime.datetime.combine(day, datetime.time(), self.tz)
+
+    def dst_shift(self, day: datetime.date) -> float:
+        """Returns how many minutes the clocks change by on a day, 0 on most days."""
+        offset = self.midnight(day).utcoffset()
+        next_offset = self.midnight(day + datetime.timedelta(days=1)).utcoffset()
+        return abs((next_offset - offset).total_seconds()) / 60
+
+    def slot(self, day: datetime.date, entry: Tuple[int, int, int], load) -> Slot:
+        start_minute, duration, record_id = entry
+        # Wall-clock arithmetic, so a show stays at its listed time across DST changes.
+        start = self.midnight(day) + datetime.timedelta(minutes=start_minute)
+        return Slot(start, start + datetime.timedelta(minutes=duration), record_id, load)
+
+    def between(self, low: datetime.datetime, high: datetime.datetime, load) -> Iterator[Slot]:
+        """Yields the showings starting in [low, high), in order."""
+        local_low = low.astimezone(self.tz).replace(tzinfo=None)
+        local_high = high.astimezone(self.tz).replace(tzinfo=None)
+        day = local_low.date()
+        while day <= local_high.date():
+            # Starts are wall-clock minutes; on a DST change day the bounds
+            # are widened by the shift and the slots checked exactly.
+            midnight = datetime.datetime.combine(day, datetime.time())
+            shift = self.dst_shift(day)
+            low_minute = (local_low - midnight).total_seconds() / 60 - shift
+            high_minute = (local_high - midnight).total_seconds() / 60 + shift
+            first = bisect.bisect_left(self.starts, low_minute)
+            last = bisect.bisect_left(self.starts, high_minute)
+            # Indexed rather than sliced, so next_shows stops after a few entries.
+            for i in range(first, last):
+                slot = self.slot(day, self.entries[i], load)
+                if low <= slot.start < high:
+                    yield slot
+            day += datetime.timedelta(days=1)
+
+    def after(self, when: datetime.datetime, load, days: int) -> Iterator[Slot]:
+        """Yields the showings starting at or after `when`, in order, for `days` days."""
+        return self.between(when, when + datetime.timedelta(days=days), load)
+
+
+class ShowSchedule:
+    """
+    Show times read from the records' free-text fields, indexed by start time.
+
+    Each record's "time" ("09:30 AM") and "duration" ("30 mins") are parsed
+    once, when the index is built. A record with a "date" (YYYY-MM-DD) is a
+    single showing on that day; without one, the show runs daily. Times are
+    wall-clock times in the record's "timezone" (an IANA name), or in
+    `default_timezone`, so sites in several timezones share one schedule.
+
+    Only record ids are kept, with their parsed times: the records come
+    from `load` when a showing's record is read (`load_records` fetches
+    those of many showings at once), so a store that pages records from
+    disk keeps doing so. Daily shows are kept sorted by start
+    minute per timezone and dated ones by absolute start, so a query is a
+    binary search per timezone and day it spans. Showings running at a
+    time are found by searching back by the longest duration in the index.
+    Each species also gets its own index.
+    """
+
+    def __init__(
+        self,
+        rows: Iterable[Tuple[int, Dict[str, Any]]],
+        load: Callable[[Sequence[int]], List[Dict[str, Any]]],
+        default_timezone: str = DEFAULT_TIMEZONE,
+        by_species: bool = True,
+    ):
+        """
+        Args:
+            rows (Iterable[Tuple[int, Dict[str, Any]]]): Each show's record id and
+                its SCHEDULE_FIELDS, as a store's `project` yields them.
+            load (Callable[[Sequence[int]], List[Dict[str, Any]]]): Returns show
+                records by id, as a store's `get_records` does.
+            default_timezone (str): Timezone of records without a "timezone".
+            by_species (bool): Also build an index per species key.
+        """
+        self.default_timezone = ZoneInfo(default_timezone)
+        self._load = load
+        self.unparsed: List[str] = []
+
+        entries: List[Tuple[Optional[datetime.date], str, int, int, int]] = []
+        groups: Dict[str, List[Tuple[Optional[datetime.date], str, int, int, int]]] = {}
+        for record_id, record in rows:
+            start_minute = parse_clock(record.get("time"))
+            if start_minute is None:
+                self.unparsed.append(str(record.get("show_id", record_id)))
+                continue
+            duration = parse_duration(record.get("duration")) or DEFAULT_DURATION_MINUTES
+            tz_name = record.get("timezone") or default_timezone
+            day = datetime.date.fromisoformat(record["date"]) if record.get("date") else None
+            entry = (day, tz_name, start_minute, duration, record_id)
+            entries.append(entry)
+            if by_species:
+                for key in species_keys(record):
+                    groups.setdefault(key, []).append(entry)
+        self._index(entries)
+
+        self._species: Dict[str, "ShowSchedule"] = {}
+        for key, group in groups.items():
+            self._species[key] = ShowSchedule((), load, default_timezone, by_species=False)
+            self._species[key]._index(group)
+
+    def _index(self, entries: List[Tuple[Optional[datetime.date], str, int, int, int]]):
+        self._count = len(entries)
+        daily: Dict[str, List[Tuple[int, int, int]]] = {}
+        dated: List[Tuple[datetime.datetime, int, int]] = []
+        for day, tz_name, start_minute, duration, record_id in entries:
+            if day is not None:
+                start = datetime.datetime.combine(day, datetime.time(), ZoneInfo(tz_name))
+                start += datetime.timedelta(minutes=start_minute)
+                dated.append((start, duration, record_id))
+            else:
+                daily.setdefault(tz_name, []).append((start_minute, duration, record_id))
+
+        self._daily = [_DailyTimes(ZoneInfo(name), entries) for name, entries in daily.items()]
+        dated.sort(key=lambda entry: (entry[0], entry[2]))
+        self._dated = dated
+        self._dated_starts = [start for start, _, _ in dated]
+        self._dated_max_duration = max((duration for _, duration, _ in dated), default=0)
+
+    @classmethod
+    def from_records(
+        cls,
+        records: Sequence[Dict[str, Any]],
+        default_timezone: str = DEFAULT_TIMEZONE,
+        by_species: bool = True,
+    ) -> "ShowSchedule":
+        """Indexes a list of show records; a record's id is its position."""
+        return cls(
+            enumerate(records),
+            lambda ids: [records[record_id] for record_id in ids],
+            default_timezone,
+            by_species,
+        )
+
+    def __len__(self) -> int:
+        return self._count
+
+    def for_species(self, key: Optional[str]) -> "ShowSchedule":
+        """Returns the index of one species key, or this one for None."""
+        if key is None:
+            return self
+        return self._species.get(key) or self.empty()
+
+    def empty(self) -> "ShowSchedule":
+        """Returns an index with no shows, in this one's timezone."""
+        return ShowSchedule((), self._load, self.default_timezone.key, by_species=False)
+
+    @property
+    def max_duration(self) -> datetime.timedelta:
+        longest = max([self._dated_max_duration, *(d.max_duration for d in self._daily)])
+        return datetime.timedelta(minutes=longest)
+
+    def _dated_slot(self, i: int) -> Slot:
+        start, duration, record_id = self._dated[i]
+        return Slot(start, start + datetime.timedelta(minutes=duration), record_id, self._load)
+
+    def _dated_between(self, low: datetime.datetime, high: datetime.datetime) -> Iterator[Slot]:
+        first = bisect.bisect_left(self._dated_starts, low)
+        last = bisect.bisect_left(self._dated_starts, high)
+        return (self._dated_slot(i) for i in range(first, last))
+
+    def starting_between(self, low: datetime.datetime, high: datetime.datetime) -> Iterator[Slot]:
+        """Yields the showings that start in [low, high), in start order."""
+        sources = [self._dated_between(low, high)]
+        sources += [daily.between(low, high, self._load) for daily in self._daily]
+        return heapq.merge(*sources, key=lambda slot: slot.start)
+
+    def running_between(self, low: datetime.datetime, high: datetime.datetime) -> Iterator[Slot]:
+        """Yields the showings that overlap [low, high): started earlier and still on, or starting."""
+        for slot in self.starting_between(low - self.max_duration, high):
+            if slot.end > low:
+                yield slot
+
+    def next_shows(
+        self,
+        when: datetime.datetime,
+        count: int,
+        where: Optional[Callable[[Dict[str, Any]], bool]] = None,
+    ) -> List[Slot]:
+        """Returns the first `count` showings starting at or after `when` that match `where`."""
+        first = bisect.bisect_left(self._dated_starts, when)
+        dated = (self._dated_slot(i) for i in range(first, len(self._dated)))
+        merged = heapq.merge(
+            dated,
+            *(daily.after(when, self._load, HORIZON_DAYS) for daily in self._daily),
+            key=lambda slot: slot.start,
+        )
+        if where is not None:
+            merged = (slot for slot in merged if where(slot.record))
+        return list(itertools.islice(merged, count))
+
+    def occurrence(self, record_id: int, on: datetime.datetime) -> Optional[Slot]:
+        """Returns a show's showing on the day of `on` (in the show's timezone), if it has one."""
+        (record,) = self._load([record_id])
+        start_minute = parse_clock(record.get("time"))
+        if start_minute is None:
+            return None
+        tz = ZoneInfo(record.get("timezone") or self.default_timezone.key)
+        day = (
+            datetime.date.fromisoformat(record["date"])
+            if record.get("date")
+            else on.astimezone(tz).date()
+        )
+        start = datetime.datetime.combine(day, datetime.time(), tz)
+        start += datetime.timedelta(minutes=start_minute)
+        duration = parse_duration(record.get("duration")) or DEFAULT_DURATION_MINUTES
+        return Slot(start, start + datetime.timedelta(minutes=duration), record_id, self._load)
+
+    def conflicts(self, slots: Iterable[Slot]) -> List[Tuple[Slot, Slot]]:
+        """Returns the pairs of the given showings that overlap, by a sweep over their starts."""
+        pairs, running = [], []
+        for slot in sorted(slots, key=lambda slot: slot.start):
+            running = [other for other in running if other.end > slot.start]
+            pairs.extend((other, slot) for other in running)
+            running.append(slot)
+        return pairs
@@ -1,101 +1,580 @@
-import asyncio
+import datetime
+import hashlib
 import logging
 import os
-import json
-from typing import List, Dict, Any
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
 
 from fastmcp import FastMCP
+from fastmcp.server.middleware import Middleware
+from fastmcp.tools import ToolResult
+from opentelemetry import trace
+from starlette.requests import Request
+from starlette.responses import JSONResponse
+
+from async_logging import setup_async_logging
+from data_reloader import DataReloader
+from reservations import ReservationBook, ReservationError
+from schedule import (
+    DEFAULT_TIMEZONE,
+    SCHEDULE_FIELDS,
+    ShowSchedule,
+    Slot,
+    load_records,
+    parse_when,
+)
+from serving import serve, worker_count
+from storage import MemoryStore, ResultView, build_response, open_store
+from tracing import flush_on_sigterm, payload_bytes, setup_tracing
 
 logger = logging.getLogger(__name__)
 logging.basicConfig(format="[%(levelname)s]: %(message)s", level=logging.INFO)
+# Records are queued and written in batches from a thread (LOG_ASYNC).
+log_handler = setup_async_logging()
+
+# Export FastMCP's tool spans (TRACE_EXPORTER), which continue the calling
+# agent's trace from the request's _meta.traceparent.
+setup_tracing("zoo-show-mcp-server")
+if log_handler:
+    flush_on_sigterm(log_handler.flush)
+
+# Version advertised to clients, which cache tool schemas until it changes.
+# Cloud Run sets K_REVISION per deploy; locally the source hash stands in.
+SERVER_VERSION = os.getenv("K_REVISION")
+if not SERVER_VERSION:
+    with open(__file__, "rb") as f:
+        SERVER_VERSION = hashlib.sha256(f.read()).hexdigest()[:12]
 
 # Initialize FastMCP server for zoo show data.
-mcp = FastMCP("Zoo Show MCP Server 🎟️")
+mcp = FastMCP("Zoo Show MCP Server 🎟️", version=SERVER_VERSION)
 
-# Global Data Stores
-ZOO_SHOWS: List[Dict[str, Any]] = []
-# Index for querying shows by species (e.g., "lion" -> [Show1, Show2...], "사자" -> [Show1...])
-ZOO_SHOWS_BY_SPECIES: Dict[str, List[Dict[str, Any]]] = {}
 
+class ResultSizeMiddleware(Middleware):
+    """Records the size of each tool result on the tool call's span."""
 
-def load_show_data():
-    """Loads zoo show data from JSON and builds species-based indexes."""
-    global ZOO_SHOWS, ZOO_SHOWS_BY_SPECIES
+    async def on_call_tool(self, context, call_next):
+        result = await call_next(context)
+        span = trace.get_current_span()
+        if span.is_recording():
+            text_bytes = sum(len(getattr(c, "text", "").encode()) for c in result.content)
+            span.set_attribute("zoo.tool.content_bytes", text_bytes)
+            span.set_attribute(
+                "zoo.tool.structured_bytes", payload_bytes(result.structured_content)
+            )
+        return result
 
-    current_dir = os.path.dirname(os.path.abspath(__file__))
-    json_path = os.path.join(current_dir, "zoo_shows.json")
 
-    try:
-        logger.info(f"📂 Loading zoo show data from {json_path}...")
-        with open(json_path, "r", encoding="utf-8") as f:
-            loaded_shows = json.load(f)
-            ZOO_SHOWS = loaded_shows
-
-        # Build index for O(1) lookup by species (English and Korean)
-        ZOO_SHOWS_BY_SPECIES = {}
-        for show in ZOO_SHOWS:
-            species_en = show.get("species", "").lower()
-            species_kr = show.get("species_kr", "")
-
-            # Index by English species name
-            if species_en:
-                if species_en not in ZOO_SHOWS_BY_SPECIES:
-                    ZOO_SHOWS_BY_SPECIES[species_en] = []
-                ZOO_SHOWS_BY_SPECIES[species_en].append(show)
-
-            # Index by Korean species name
-            if species_kr:
-                if species_kr not in ZOO_SHOWS_BY_SPECIES:
-                    ZOO_SHOWS_BY_SPECIES[species_kr] = []
-                ZOO_SHOWS_BY_SPECIES[species_kr].append(show)
+mcp.add_middleware(ResultSizeMiddleware())
+
+# Output schemas matching what FastMCP derives from the list return types,
+# plus the {"columns", "rows"} table returned in compact mode.
+RECORDS_SCHEMA = {
+    "anyOf": [
+        {"type": "array", "items": {"type": "object", "additionalProperties": True}},
+        {
+            "type": "object",
+            "properties": {
+                "columns": {"type": "array", "items": {"type": "string"}},
+                "rows": {"type": "array", "items": {"type": "array"}},
+            },
+            "required": ["columns", "rows"],
+        },
+    ]
+}
+RECORDS_OUTPUT_SCHEMA = {
+    "type": "object",
+    "properties": {"result": RECORDS_SCHEMA},
+    "required": ["result"],
+    "x-fastmcp-wrap-result": True,
+}
+NAMES_OUTPUT_SCHEMA = {
+    "type": "object",
+    "properties": {"result": {"type": "array", "items": {"type": "string"}}},
+    "required": ["result"],
+    "x-fastmcp-wrap-result": True,
+}
+GROUPS_OUTPUT_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "result": {
+            "type": "object",
+            "additionalProperties": RECORDS_SCHEMA,
+        }
+    },
+    "required": ["result"],
+    "x-fastmcp-wrap-result": True,
+}
+
+
+# The data file can point at a mounted volume; it is reloaded when it changes.
+# A .db/.sqlite file (built with `python storage.py`) is served from SQLite,
+# anything else is loaded as JSON into memory. FILTER_FIELDS get secondary
+# indexes for the batch tool; pass them to the SQLite build as well (without
+# show_id, show lookups by ID scan the records instead):
+#   python storage.py zoo_shows.json zoo_shows.db location time show_id
+DATA_PATH = os.getenv(
+    "DATA_PATH",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "zoo_shows.json"),
+)
+FILTER_FIELDS = ("location", "time", "show_id")
+
+# Timezone of show times that do not name their own (a record's "timezone").
+ZOO_TIMEZONE = os.getenv("ZOO_TIMEZONE", DEFAULT_TIMEZONE)
+
+
+show_data = DataReloader(
+    DATA_PATH,
+    build=lambda path: open_store(path, "name", FILTER_FIELDS),
+    empty=lambda: MemoryStore([], "", "name", FILTER_FIELDS),
+    interval=float(os.getenv("DATA_RELOAD_INTERVAL", "30")),
+)
 
+schedule_lock = threading.Lock()
+
+
+def show_schedule(store) -> ShowSchedule:
+    """
+    Returns a store's index of show times, built on its first schedule query.
+
+    Only the time fields are read (SQLite extracts them from its rows) and
+    records are loaded by id for the showings a query returns, so a SQLite
+    store still opens without reading its records. The index is kept on
+    its store, so it is swapped out with it on reload.
+    """
+    schedule = getattr(store, "schedule", None)
+    if schedule is None:
+        with schedule_lock:
+            schedule = getattr(store, "schedule", None)
+            if schedule is None:
+                schedule = ShowSchedule(
+                    store.project(SCHEDULE_FIELDS),
+                    store.get_records,
+                    default_timezone=ZOO_TIMEZONE,
+                )
+                if schedule.unparsed:
+                    logger.warning(f"⚠️ Shows without a readable time: {schedule.unparsed}")
+                store.schedule = schedule
+    return schedule
+
+
+def load_show_data():
+    """Loads zoo show data into the configured storage backend."""
+    logger.info(f"📂 Loading zoo show data from {DATA_PATH}...")
+    if show_data.load():
+        store = show_data.current
         logger.info(
-            f"✅ Successfully loaded {len(ZOO_SHOWS)} shows across {len(ZOO_SHOWS_BY_SPECIES)} species keys."
+            f"✅ Successfully loaded {len(store)} shows ({store.backend} backend)."
         )
 
-    except Exception as e:
-        logger.error(f"❌ Unexpected error loading data: {e}")
-        ZOO_SHOWS = []
-        ZOO_SHOWS_BY_SPECIES = {}
-
 
 # Load data on startup
 load_show_data()
 
+# Seats per showing, unless the show record has its own "capacity".
+DEFAULT_SHOW_CAPACITY = int(os.getenv("SHOW_CAPACITY", "50"))
+
+# File systems whose files are gone when the instance is.
+EPHEMERAL_FILESYSTEMS = ("overlay", "tmpfs", "ramfs")
+
+
+def on_mounted_volume(path: str) -> bool:
+    """
+    Returns True unless `path` is on the container's own, ephemeral file system.
+
+    Reads the mount table; when it cannot be read, the path is assumed to
+    be on a volume.
+    """
+    path = os.path.realpath(path)
+    try:
+        with open("/proc/mounts") as f:
+            mounts = [line.split()[1:3] for line in f if len(line.split()) > 2]
+    except OSError:
+        return True
+    mount_point, fs_type = max(
+        (
+            (point, fs)
+            for point, fs in mounts
+            if path == point or path.startswith(point.rstrip("/") + "/")
+        ),
+        key=lambda mount: len(mount[0]),
+        default=("/", "overlay"),
+    )
+    return mount_point != "/" and fs_type not in EPHEMERAL_FILESYSTEMS
+
+
+# Returns the booking journal's path, refusing one that would lose bookings on Cloud Run.
+def reservations_path() -> str:
+    path = os.getenv("RESERVATIONS_PATH")
+    if not os.getenv("K_SERVICE"):
+        return path or os.path.join(os.path.dirname(os.path.abspath(__file__)), "reservations.db")
+    # Every Cloud Run instance has its own container file system, so a
+    # journal there is lost on restart and each instance would sell the
+    # same seats again.
+    if not path:
+        raise ValueError("The environment variable RESERVATIONS_PATH is not set.")
+    if not on_mounted_volume(path):
+        raise ValueError(
+            f"RESERVATIONS_PATH {path} is not on a mounted volume; mount one that all"
+            " instances share (e.g. a Filestore NFS volume) and put the journal there."
+        )
+    return path
+
+
+# Durable booking journal, shared by every process that books from it:
+# the worker processes (WORKERS), and on Cloud Run every instance, so
+# counts are read from it.
+reservation_book = ReservationBook(
+    reservations_path(),
+    shared=worker_count() > 1 or bool(os.getenv("K_SERVICE")),
+)
+
+
+def after_fork():
+    """Opens a forked worker's own SQLite connections."""
+    reservation_book.reopen()
+    show_data.current.reopen()
+
+
+def find_show_id(store, show_id: str) -> int:
+    """Returns the record id of the show with this ID in a snapshot's store."""
+    record_id = store.find_id("show_id", show_id)
+    if record_id is None:
+        raise ReservationError(f"unknown show_id '{show_id}'")
+    return record_id
+
+
+def find_showing(
+    show_id: str, date: Optional[str]
+) -> Tuple[Dict[str, Any], str, Optional[Slot]]:
+    """
+    Returns a show, the date of the showing meant and that showing.
+
+    Daily shows are on every day: `date` (YYYY-MM-DD) picks one, and
+    without it the next showing that has not started is meant. One-off
+    shows only have their own date. A show without a readable time has
+    no showing; its date is then `date`, or today.
+    """
+    store = show_data.current
+    record_id = find_show_id(store, show_id)
+    schedule = show_schedule(store)
+    now = datetime.datetime.now(datetime.timezone.utc)
+    on = parse_when(date, now, schedule.default_timezone) if date else now
+    slot = schedule.occurrence(record_id, on)
+    if slot is None:
+        day = on.astimezone(schedule.default_timezone).date()
+        return store.record(record_id), day.isoformat(), None
+    if not date and slot.start <= now and not slot.record.get("date"):
+        slot = schedule.occurrence(record_id, on + datetime.timedelta(days=1))
+    return slot.record, slot.start.date().isoformat(), slot
+
 
-@mcp.tool()
-def get_shows_by_species(species: str) -> List[Dict[str, Any]]:
+@mcp.tool(output_schema=RECORDS_OUTPUT_SCHEMA)
+def get_shows_by_species(
+    species: str,
+    fields: Optional[List[str]] = None,
+    limit: Optional[int] = None,
+    cursor: Optional[str] = None,
+    compact: bool = False,
+) -> ToolResult:
     """
     Retrieves a list of shows featuring a specific species.
     Args:
         species: The species name in English (e.g., 'lion') or Korean (e.g., '사자').
+            Plurals, spacing variants, common synonyms and small typos are
+            resolved to the closest species; the match and its confidence are
+            returned in the response meta.
+        fields: Only return these keys of each record (e.g., ['name', 'time']).
+        limit: Return at most this many records; the response meta has a
+            next_cursor when more remain.
+        cursor: The next_cursor of a previous response, to fetch the next page.
+        compact: Return a {"columns", "rows"} table instead of a list of objects.
     """
-    logger.info(f">>> 🛠️ Tool: 'get_shows_by_species' called for '{species}'")
-    # O(1) Lookup using the pre-built index
-    return ZOO_SHOWS_BY_SPECIES.get(species.lower(), [])
+    logger.info(">>> 🛠️ Tool: 'get_shows_by_species' called for '%s'", species)
+    # Indexed lookup in the current snapshot's store, resolving near misses
+    view = ResultView(tuple(fields) if fields else None, limit, cursor, compact)
+    return show_data.current.find_by_species(species, view)
 
 
-@mcp.tool()
-def list_available_shows() -> List[str]:
+@mcp.tool(output_schema=GROUPS_OUTPUT_SCHEMA)
+def get_shows_by_species_batch(
+    species: List[str],
+    location: Optional[str] = None,
+    start_time: Optional[str] = None,
+    end_time: Optional[str] = None,
+    fields: Optional[List[str]] = None,
+    limit: Optional[int] = None,
+    cursor: Optional[str] = None,
+    compact: bool = False,
+) -> ToolResult:
+    """
+    Retrieves shows for several species in one call, grouped by the species asked for.
+    Use this instead of repeated get_shows_by_species calls when a question
+    mentions more than one species or filters by place or time.
+    Args:
+        species: Species names in English or Korean (e.g., ['lion', '펭귄']).
+            An empty list matches every species.
+        location: Only shows at this location (e.g., 'The Big Cat Plains').
+        start_time: Only shows starting at or after this time (e.g., '10:00 AM' or '14:00').
+        end_time: Only shows starting at or before this time.
+        fields: Only return these keys of each record (e.g., ['name', 'time']).
+        limit: Return at most this many records per species; the response meta has a
+            next_cursor when more remain.
+        cursor: The next_cursor of a previous response, to fetch the next page.
+        compact: Return a {"columns", "rows"} table instead of a list of objects.
+    """
+    logger.info(">>> 🛠️ Tool: 'get_shows_by_species_batch' called for %s", species)
+    ranges = {}
+    if location is not None:
+        ranges["location"] = (location, location)
+    if start_time is not None or end_time is not None:
+        ranges["time"] = (start_time, end_time)
+    view = ResultView(tuple(fields) if fields else None, limit, cursor, compact)
+    return show_data.current.find_many(species, ranges, view)
+
+
+@mcp.tool(output_schema=NAMES_OUTPUT_SCHEMA)
+def list_available_shows() -> ToolResult:
     """
     Retrieves a list of all unique show names available in the zoo.
     """
     logger.info(">>> 🛠️ Tool: 'list_available_shows' called")
-    unique_shows = set()
-    for show in ZOO_SHOWS:
-        if "name" in show:
-            unique_shows.add(show["name"])
-    return sorted(list(unique_shows))
+    return show_data.current.list_names()
+
+
+@mcp.tool
+def get_show_details(show_id: str, date: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Retrieves a show's details and how many seats are still available for one showing.
+    Args:
+        show_id: The show's ID from get_shows_by_species (e.g., 'S001').
+        date: The day of the showing (YYYY-MM-DD) for daily shows; defaults to
+            the next showing.
+    """
+    logger.info(">>> 🛠️ Tool: 'get_show_details' called for '%s'", show_id)
+    show, show_date, slot = find_showing(show_id, date)
+    capacity = show.get("capacity", DEFAULT_SHOW_CAPACITY)
+    return {
+        **show,
+        "show_date": show_date,
+        "start": slot.start.isoformat() if slot else None,
+        "capacity": capacity,
+        "seats_remaining": capacity - reservation_book.reserved(show["show_id"], show_date),
+    }
+
+
+@mcp.tool
+def reserve_show(
+    show_id: str,
+    party_size: int,
+    idempotency_key: Optional[str] = None,
+    date: Optional[str] = None,
+) -> Dict[str, Any]:
+    """
+    Reserves seats for one showing of a show.
+    Args:
+        show_id: The show's ID from get_shows_by_species (e.g., 'S001').
+        party_size: Number of people to book seats for.
+        idempotency_key: A unique string for this booking. Reuse it when retrying
+            the same booking so it is not made twice.
+        date: The day of the showing (YYYY-MM-DD) for daily shows; defaults to
+            the next showing.
+    """
+    logger.info(">>> 🛠️ Tool: 'reserve_show' called for '%s' x%s", show_id, party_size)
+    show, show_date, slot = find_showing(show_id, date)
+    if slot and slot.start <= datetime.datetime.now(datetime.timezone.utc):
+        raise ReservationError(f"show {show_id} on {show_date} has already started")
+    capacity = show.get("capacity", DEFAULT_SHOW_CAPACITY)
+    reservation = reservation_book.reserve(
+        show["show_id"], show_date, party_size, capacity, idempotency_key
+    )
+    return {
+        **reservation.as_dict(),
+        "show_name": show.get("name"),
+        "time": show.get("time"),
+        "start": slot.start.isoformat() if slot else None,
+        "seats_remaining": capacity - reservation_book.reserved(show["show_id"], show_date),
+    }
+
+
+def schedule_scope(
+    species: Optional[str], location: Optional[str], timezone: Optional[str]
+):
+    """Returns the store, schedule index, record filter, timezone and meta of a schedule query."""
+    store = show_data.current
+    meta: Dict[str, Any] = {}
+    key = None
+    if species:
+        key, resolution = store.resolve_species(species)
+        if resolution is not None:
+            meta["resolution"] = resolution
+    schedule = show_schedule(store)
+    if species:
+        # An unresolved species matches no show, rather than every show.
+        schedule = schedule.for_species(key) if key else schedule.empty()
+    where = None
+    if location:
+        wanted = location.casefold()
+        where = lambda record: str(record.get("location", "")).casefold() == wanted  # noqa: E731
+    try:
+        tz = ZoneInfo(timezone) if timezone else schedule.default_timezone
+    except (ZoneInfoNotFoundError, ValueError):
+        raise ValueError(f"unknown timezone '{timezone}'; use an IANA name such as 'Asia/Seoul'")
+    return store, schedule, where, tz, meta
+
+
+def schedule_response(store, slots, now, tz, meta, view: ResultView) -> ToolResult:
+    load_records(slots)
+    records = view.shape([slot.as_dict(now) for slot in slots])
+    response = build_response(records, store.version)
+    response.meta.update(meta, now=now.astimezone(tz).isoformat())
+    return response
+
+
+@mcp.tool(output_schema=RECORDS_OUTPUT_SCHEMA)
+def get_next_shows(
+    count: int = 5,
+    after: Optional[str] = None,
+    species: Optional[str] = None,
+    location: Optional[str] = None,
+    timezone: Optional[str] = None,
+    fields: Optional[List[str]] = None,
+    compact: bool = False,
+) -> ToolResult:
+    """
+    Retrieves the next shows to start, soonest first, with their start and end times.
+    Use this for questions like "what's the next show?" or "when is the next penguin show?".
+    Args:
+        count: How many shows to return.
+        after: Only shows starting at or after this time: a clock time today
+            ('2:30 PM', '14:30') or an ISO datetime. Defaults to now.
+        species: Only shows of this species, in English or Korean.
+        location: Only shows at this location (e.g., 'The Arctic Exhibit').
+        timezone: IANA timezone of `after` and of the returned "now"; defaults to the zoo's.
+        fields: Only return these keys of each record (e.g., ['name', 'start']).
+        compact: Return a {"columns", "rows"} table instead of a list of objects.
+    """
+    logger.info(">>> 🛠️ Tool: 'get_next_shows' called for %s after %s", species, after)
+    if count < 1:
+        raise ValueError("count must be at least 1")
+    store, schedule, where, tz, meta = schedule_scope(species, location, timezone)
+    now = datetime.datetime.now(datetime.timezone.utc)
+    slots = schedule.next_shows(parse_when(after, now, tz), count, where)
+    view = ResultView(tuple(fields) if fields else None, compact=compact)
+    return schedule_response(store, slots, now, tz, meta, view)
+
+
+@mcp.tool(output_schema=RECORDS_OUTPUT_SCHEMA)
+def get_shows_in_window(
+    start: Optional[str] = None,
+    end: Optional[str] = None,
+    within_minutes: Optional[int] = None,
+    include_running: bool = True,
+    species: Optional[str] = None,
+    location: Optional[str] = None,
+    timezone: Optional[str] = None,
+    fields: Optional[List[str]] = None,
+    compact: bool = False,
+) -> ToolResult:
+    """
+    Retrieves the shows on during a time window, in start order.
+    Use this for questions like "what's on in the next hour?" or "what can I see between 1 and 3 PM?".
+    Args:
+        start: Window start: a clock time today ('1 PM', '13:00') or an ISO datetime. Defaults to now.
+        end: Window end, in the same forms.
+        within_minutes: The window's length from `start`, instead of `end`.
+        include_running: Also return shows that started before the window and are still on.
+        species: Only shows of this species, in English or Korean.
+        location: Only shows at this location (e.g., 'The Arctic Exhibit').
+        timezone: IANA timezone of `start` and `end`; defaults to the zoo's.
+        fields: Only return these keys of each record (e.g., ['name', 'start']).
+        compact: Return a {"columns", "rows"} table instead of a list of objects.
+    """
+    logger.info(">>> 🛠️ Tool: 'get_shows_in_window' called for %s to %s", start, end)
+    store, schedule, where, tz, meta = schedule_scope(species, location, timezone)
+    now = datetime.datetime.now(datetime.timezone.utc)
+    low = parse_when(start, now, tz)
+    if end is not None:
+        high = parse_when(end, now, tz)
+    elif within_minutes is not None:
+        high = low + datetime.timedelta(minutes=within_minutes)
+    else:
+        raise ValueError("give the window's end or within_minutes")
+    if high <= low:
+        raise ValueError("the window must end after it starts")
+
+    find = schedule.running_between if include_running else schedule.starting_between
+    slots = list(find(low, high))
+    if where is not None:
+        load_records(slots)
+        slots = [slot for slot in slots if where(slot.record)]
+    view = ResultView(tuple(fields) if fields else None, compact=compact)
+    return schedule_response(store, slots, now, tz, meta, view)
+
+
+@mcp.tool
+def check_show_conflicts(show_ids: List[str], date: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Checks whether shows overlap in time, e.g. before booking several of them.
+    With one show_id, lists every show that overlaps it; with several, lists
+    the pairs among them that overlap.
+    Args:
+        show_ids: Show IDs from the other show tools (e.g., ['S002', 'S006']).
+        date: The day to check (YYYY-MM-DD) for daily shows; defaults to today.
+    """
+    logger.info(">>> 🛠️ Tool: 'check_show_conflicts' called for %s", show_ids)
+    store = show_data.current
+    schedule = show_schedule(store)
+    now = datetime.datetime.now(datetime.timezone.utc)
+    on = parse_when(date, now, schedule.default_timezone) if date else now
+    slots = []
+    for show_id in show_ids:
+        slot = schedule.occurrence(find_show_id(store, show_id), on)
+        if slot is None:
+            raise ValueError(f"show '{show_id}' has no readable time")
+        slots.append(slot)
+
+    if len(slots) == 1:
+        mine = slots[0]
+        overlapping = [
+            slot
+            for slot in schedule.running_between(mine.start, mine.end)
+            if slot.record_id != mine.record_id
+        ]
+        load_records(overlapping)
+        return {
+            "show": mine.as_dict(now),
+            "overlapping": [slot.as_dict(now) for slot in overlapping],
+        }
+
+    conflicts = [
+        {
+            "show_ids": [first.record.get("show_id"), second.record.get("show_id")],
+            "overlap_minutes": round(
+                (min(first.end, second.end) - second.start).total_seconds() / 60
+            ),
+        }
+        for first, second in schedule.conflicts(slots)
+    ]
+    return {
+        "shows": [slot.as_dict(now) for slot in slots],
+        "conflicts": conflicts,
+    }
+
+
+# Exposes data reload and reservation metrics.
+@mcp.custom_route("/metrics", methods=["GET"])
+async def metrics(request: Request) -> JSONResponse:
+    return JSONResponse(
+        {
+            "data": {**show_data.metrics(), "version": show_data.current.version},
+            "reservations": reservation_book.metrics(),
+            "pid": os.getpid(),
+        }
+    )
 
 
 # Entry point for running the MCP server.
+# WORKERS=auto serves from a process per CPU; see serving.py.
 if __name__ == "__main__":
-    port = int(os.getenv("PORT", 8080))
-    logger.info(f"🚀 MCP server started on port {port}")
-    asyncio.run(
-        mcp.run_async(
-            transport="streamable-http",
-            host="0.0.0.0",
-            port=port,
-        )
-    )
\ No newline at end of file
+    serve(mcp, show_data, after_fork=after_fork)
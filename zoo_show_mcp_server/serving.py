@@ -0,0 +1,265 @@
+import asyncio
+import gc
+import logging
+import os
+import signal
+import socket
+import threading
+import time
+from typing import Any, Callable, Dict, Optional, Set
+
+from fastmcp import FastMCP
+from opentelemetry import trace
+
+from data_reloader import DataReloader
+
+logger = logging.getLogger(__name__)
+
+# A worker that exits sooner than this after starting is restarted only after
+# the same delay, so a crashing worker cannot fork in a tight loop.
+MIN_WORKER_UPTIME = 1.0
+
+
+# Returns the configured number of worker processes.
+def worker_count() -> int:
+    """
+    Reads WORKERS: a number, or "auto" for one per CPU available to the
+    process (the instance's vCPUs on Cloud Run). Defaults to 1, a single
+    process without a supervisor.
+    """
+    workers = os.getenv("WORKERS", "1").strip().lower()
+    if workers == "auto":
+        return len(os.sched_getaffinity(0))
+    return max(1, int(workers))
+
+
+# Returns the uvicorn settings each serving process runs with.
+def uvicorn_settings() -> Dict[str, Any]:
+    """
+    Configured through WORKER_CONCURRENCY, the requests and connections a
+    process takes on at once before answering 503 (unlimited by default),
+    BACKLOG, the connections waiting to be accepted, and GRACEFUL_TIMEOUT,
+    the seconds in-flight requests get to finish on shutdown.
+    """
+    concurrency = os.getenv("WORKER_CONCURRENCY")
+    return {
+        "limit_concurrency": int(concurrency) if concurrency else None,
+        "backlog": int(os.getenv("BACKLOG", 2048)),
+        "timeout_graceful_shutdown": float(os.getenv("GRACEFUL_TIMEOUT", 8)),
+    }
+
+
+class PreforkServer:
+    """
+    Serves one listening socket from several forked worker processes.
+
+    The parent loads the data, binds the socket and forks the workers, so
+    they share its loaded snapshot copy-on-write instead of each parsing
+    the data file; gc.freeze() keeps the collector from writing to (and so
+    copying) the shared objects. The kernel spreads connections over the
+    workers accepting on the socket.
+
+    The parent only supervises: it restarts workers that exit, and polls
+    the data file itself. When the data changes it reloads once and
+    replaces the workers, new ones first, so they share the new snapshot.
+    On SIGTERM or SIGINT it stops the workers, which finish their
+    in-flight requests, and kills any left after `graceful_timeout`.
+    """
+
+    def __init__(
+        self,
+        run_worker: Callable[[socket.socket], None],
+        workers: int,
+        port: int,
+        host: str = "0.0.0.0",
+        reloader: Optional[DataReloader] = None,
+        after_fork: Optional[Callable[[], None]] = None,
+        graceful_timeout: float = 8.0,
+        backlog: int = 2048,
+    ):
+        """
+        Args:
+            run_worker (Callable[[socket.socket], None]): Serves the socket until shut down.
+            workers (int): Number of worker processes.
+            port (int): Port to listen on.
+            host (str): Address to listen on.
+            reloader (Optional[DataReloader]): Data the parent reloads and workers share.
+            after_fork (Optional[Callable[[], None]]): Runs in each worker before it
+                serves, e.g. to open its own database connections.
+            graceful_timeout (float): Seconds workers get to finish on shutdown.
+            backlog (int): Connections waiting to be accepted.
+        """
+        self._run_worker = run_worker
+        self.workers = workers
+        self.port = port
+        self.host = host
+        self._reloader = reloader
+        self._after_fork = after_fork
+        self._graceful_timeout = graceful_timeout
+        self._backlog = backlog
+        self._pids: Dict[int, float] = {}
+        self._retiring: Set[int] = set()
+        self._stopping = threading.Event()
+        self._handlers: Dict[int, Any] = {}
+        self.restarts = 0
+        self.rollovers = 0
+
+    def _spawn(self, sock: socket.socket):
+        # Objects allocated so far are left alone by the collector in the child.
+        gc.freeze()
+        pid = os.fork()
+        if pid:
+            gc.unfreeze()
+            self._pids[pid] = time.monotonic()
+            return
+        code = 0
+        try:
+            for signum, handler in self._handlers.items():
+                signal.signal(signum, handler)
+            if self._after_fork:
+                self._after_fork()
+            self._run_worker(sock)
+        except BaseException:
+            logger.exception(f"❌ Worker {os.getpid()} failed")
+            code = 1
+        finally:
+            # Exits without unwinding into the parent's stack; atexit hooks
+            # do not run, so queued spans and log records are flushed here.
+            provider = trace.get_tracer_provider()
+            if hasattr(provider, "force_flush"):
+                provider.force_flush()
+            logging.shutdown()
+            os._exit(code)
+
+    def _stop(self, signum, frame):
+        self._stopping.set()
+
+    def _reap(self, sock: socket.socket):
+        while self._pids:
+            try:
+                pid, status = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                return
+            if pid == 0:
+                return
+            started = self._pids.pop(pid, None)
+            if pid in self._retiring or started is None:
+                self._retiring.discard(pid)
+                continue
+            if self._stopping.is_set():
+                continue
+            logger.warning(
+                f"⚠️ Worker {pid} exited ({os.waitstatus_to_exitcode(status)}); restarting it."
+            )
+            if time.monotonic() - started < MIN_WORKER_UPTIME:
+                time.sleep(MIN_WORKER_UPTIME)
+            self.restarts += 1
+            self._spawn(sock)
+
+    def _roll(self, sock: socket.socket):
+        """Replaces every worker with one forked from the current snapshot."""
+        old = list(self._pids)
+        for _ in range(self.workers):
+            self._spawn(sock)
+        for pid in old:
+            self._retiring.add(pid)
+            os.kill(pid, signal.SIGTERM)
+        self.rollovers += 1
+
+    def _shutdown(self):
+        for pid in self._pids:
+            os.kill(pid, signal.SIGTERM)
+        # A little longer than the workers' own graceful timeout.
+        deadline = time.monotonic() + self._graceful_timeout + 1
+        while self._pids and time.monotonic() < deadline:
+            pid, _ = os.waitpid(-1, os.WNOHANG)
+            if pid:
+                self._pids.pop(pid, None)
+            else:
+                time.sleep(0.05)
+        for pid in self._pids:
+            logger.warning(f"⚠️ Worker {pid} did not stop in time; killing it.")
+            os.kill(pid, signal.SIGKILL)
+            os.waitpid(pid, 0)
+        self._pids.clear()
+
+    def serve(self):
+        """Runs the workers until SIGTERM or SIGINT, then shuts them down."""
+        sock = socket.create_server((self.host, self.port), backlog=self._backlog)
+        # Workers get the handlers the parent had (log and span flushing).
+        for signum in (signal.SIGTERM, signal.SIGINT):
+            self._handlers[signum] = signal.signal(signum, self._stop)
+        logger.info(
+            f"🚀 MCP server started on port {self.port} with {self.workers} workers"
+        )
+        for _ in range(self.workers):
+            self._spawn(sock)
+
+        interval = self._reloader.interval if self._reloader else 0
+        next_check = time.monotonic() + interval
+        try:
+            while not self._stopping.wait(0.2):
+                self._reap(sock)
+                if interval > 0 and time.monotonic() >= next_check:
+                    next_check = time.monotonic() + interval
+                    if self._reloader.check():
+                        self._roll(sock)
+        finally:
+            logger.info(f"🛑 Stopping {len(self._pids)} workers...")
+            self._shutdown()
+            sock.close()
+            for signum, handler in self._handlers.items():
+                signal.signal(signum, handler)
+
+
+# Entry point shared by the MCP servers.
+def serve(
+    mcp: FastMCP,
+    reloader: DataReloader,
+    after_fork: Optional[Callable[[], None]] = None,
+):
+    """
+    Serves an MCP server over streamable HTTP on PORT, with WORKERS processes.
+
+    One worker serves from this process, as before. With more, workers are
+    forked by a PreforkServer and run stateless: any worker can answer any
+    request, as requests of one client spread over them.
+    """
+    port = int(os.getenv("PORT", 8080))
+    workers = worker_count()
+    settings = uvicorn_settings()
+    if workers == 1:
+        reloader.start()
+        logger.info(f"🚀 MCP server started on port {port}")
+        asyncio.run(
+            mcp.run_async(
+                transport="streamable-http",
+                host="0.0.0.0",
+                port=port,
+                uvicorn_config=settings,
+            )
+        )
+        return
+
+    def run_worker(sock: socket.socket):
+        asyncio.run(
+            mcp.run_async(
+                transport="streamable-http",
+                show_banner=False,
+                host="0.0.0.0",
+                port=port,
+                sockets=[sock],
+                stateless_http=True,
+                uvicorn_config=settings,
+            )
+        )
+
+    PreforkServer(
+        run_worker,
+        workers,
+        port,
+        reloader=reloader,
+        after_fork=after_fork,
+        graceful_timeout=settings["timeout_graceful_shutdown"],
+        backlog=settings["backlog"],
+    ).serve()
@@ -0,0 +1,256 @@
+import collections
+import re
+import threading
+import unicodedata
+from typing import Dict, Iterable, List, NamedTuple, Optional
+
+# Fuzzy matches below this similarity are reported as suggestions only.
+MIN_CONFIDENCE = 0.6
+
+# Names no normalization rule can derive, mapped to dataset species keys.
+# Entries whose target is not in the dataset are ignored.
+SYNONYMS = {
+    "african lion": "lion",
+    "lioness": "lion",
+    "bunny": "rabbit",
+    "croc": "crocodile",
+    "grizzly": "bear",
+    "grizzly bear": "bear",
+    "brown bear": "bear",
+    "ice bear": "polar bear",
+    "white bear": "polar bear",
+    "emperor penguin": "penguin",
+    "수사자": "사자",
+    "숫사자": "사자",
+    "암사자": "사자",
+    "백곰": "북극곰",
+    "흰곰": "북극곰",
+    "불곰": "곰",
+    "반달가슴곰": "곰",
+    "황제펭귄": "펭귄",
+}
+
+# English plurals that suffix rules get wrong.
+IRREGULAR_PLURALS = {
+    "mice": "mouse",
+    "geese": "goose",
+    "oxen": "ox",
+    "wolves": "wolf",
+    "calves": "calf",
+}
+
+# Korean plural marker and subject/topic/object particles.
+KOREAN_SUFFIXES = ("들", "은", "는", "이", "가", "을", "를", "의")
+
+CONFIDENCE = {
+    "normalized": 1.0,
+    "synonym": 0.95,
+    "plural": 0.95,
+    "head_noun": 0.8,
+}
+
+_SEPARATORS = re.compile(r"[\s\-_.,!?'\"()]+")
+
+
+class Match(NamedTuple):
+    """The dataset key a query resolved to and how it got there."""
+
+    species: str
+    confidence: float
+    method: str
+
+
+def normalize(text: str) -> str:
+    """NFC-normalizes, case-folds and collapses separators to single spaces."""
+    text = unicodedata.normalize("NFC", text).casefold()
+    return _SEPARATORS.sub(" ", text).strip()
+
+
+def singular_forms(word: str) -> List[str]:
+    """Returns candidate singulars of an English or Korean word, most likely first."""
+    if word in IRREGULAR_PLURALS:
+        return [IRREGULAR_PLURALS[word]]
+    forms = []
+    if word.endswith("ies") and len(word) > 4:
+        forms.append(word[:-3] + "y")
+    if word.endswith("ves") and len(word) > 4:
+        forms += [word[:-3] + "f", word[:-3] + "fe"]
+    if word.endswith(("ses", "xes", "zes", "ches", "shes")):
+        forms.append(word[:-2])
+    if word.endswith("s") and not word.endswith("ss") and len(word) > 3:
+        forms.append(word[:-1])
+    if word.endswith(KOREAN_SUFFIXES) and len(word) > 1:
+        forms.append(word[:-1])
+        if word.endswith("들", 0, len(word) - 1) and len(word) > 2:
+            forms.append(word[:-2])
+    return forms
+
+
+def _jamo(text: str) -> str:
+    # NFD splits Hangul syllables into jamo, so a one-letter Korean typo
+    # costs one edit instead of a whole syllable.
+    return unicodedata.normalize("NFD", text.replace(" ", ""))
+
+
+def _trigrams(text: str) -> set:
+    padded = f"^{text}$"
+    return {padded[i : i + 3] for i in range(max(len(padded) - 2, 1))}
+
+
+def edit_distance(a: str, b: str, limit: Optional[int] = None) -> int:
+    """
+    Optimal string alignment distance: Levenshtein plus adjacent transpositions.
+
+    With a limit, gives up and returns limit + 1 once every alignment in a
+    row already costs more than the limit.
+    """
+    if limit is not None and abs(len(a) - len(b)) > limit:
+        return limit + 1
+    previous2 = None
+    previous = list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        current = [i] + [0] * len(b)
+        for j in range(1, len(b) + 1):
+            cost = 0 if a[i - 1] == b[j - 1] else 1
+            current[j] = min(
+                previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost
+            )
+            if (
+                previous2 is not None
+                and i > 1
+                and j > 1
+                and a[i - 1] == b[j - 2]
+                and a[i - 2] == b[j - 1]
+            ):
+                current[j] = min(current[j], previous2[j - 2] + 1)
+        if limit is not None and min(current) > limit:
+            return limit + 1
+        previous2, previous = previous, current
+    return previous[len(b)]
+
+
+class SpeciesResolver:
+    """
+    Resolves free-form species names to a dataset's index keys.
+
+    Everything is precomputed from the vocabulary: normalized and
+    space-free forms, the synonym table, and a trigram index over the
+    jamo-decomposed keys. A query tries, in order, the normalized form,
+    synonyms, singular forms and the trailing head noun ("african lion" ->
+    "lion"), then falls back to the closest keys by edit distance among
+    those sharing trigrams. Results are cached per query.
+    """
+
+    def __init__(
+        self,
+        species_keys: Iterable[str],
+        max_candidates: int = 16,
+        cache_size: int = 4096,
+    ):
+        self._keys: List[str] = []
+        self._exact: Dict[str, str] = {}
+        for key in species_keys:
+            normalized = normalize(key)
+            self._keys.append(key)
+            self._exact.setdefault(normalized, key)
+            self._exact.setdefault(normalized.replace(" ", ""), key)
+
+        for alias, target in SYNONYMS.items():
+            if target in self._exact:
+                self._exact.setdefault(normalize(alias), self._exact[target])
+
+        self._fuzzy_forms = [_jamo(normalize(key)) for key in self._keys]
+        self._postings: Dict[str, List[int]] = collections.defaultdict(list)
+        for index, form in enumerate(self._fuzzy_forms):
+            for gram in _trigrams(form):
+                self._postings[gram].append(index)
+
+        self.max_candidates = max_candidates
+        self._cache: collections.OrderedDict[str, Optional[Match]] = collections.OrderedDict()
+        self._cache_size = cache_size
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def _lookup(self, text: str, method: str) -> Optional[Match]:
+        key = self._exact.get(text) or self._exact.get(text.replace(" ", ""))
+        if key is None:
+            return None
+        if method == "normalized" and (
+            text in SYNONYMS or text.replace(" ", "") in SYNONYMS
+        ):
+            method = "synonym"
+        return Match(key, CONFIDENCE[method], method)
+
+    def _rule_match(self, text: str, method: str) -> Optional[Match]:
+        match = self._lookup(text, method)
+        if match:
+            return match
+        words = text.split(" ")
+        for singular in singular_forms(words[-1]):
+            match = self._lookup(
+                " ".join(words[:-1] + [singular]),
+                "plural" if method == "normalized" else method,
+            )
+            if match:
+                return match
+        return None
+
+    def _fuzzy_match(self, text: str) -> Optional[Match]:
+        form = _jamo(text)
+        if not form:
+            return None
+        counts = collections.Counter()
+        for gram in _trigrams(form):
+            counts.update(self._postings.get(gram, ()))
+
+        best = None
+        for index, _ in counts.most_common(self.max_candidates):
+            candidate = self._fuzzy_forms[index]
+            longest = max(len(form), len(candidate))
+            # Only distances that would beat the best match so far matter.
+            limit = None
+            if best is not None:
+                limit = int((1 - best.confidence) * longest)
+            distance = edit_distance(form, candidate, limit)
+            similarity = 1 - distance / longest
+            if best is None or similarity > best.confidence:
+                best = Match(self._keys[index], round(similarity, 3), "fuzzy")
+                if distance == 0:
+                    break
+        return best
+
+    def _resolve(self, text: str) -> Optional[Match]:
+        match = self._rule_match(text, "normalized")
+        if match:
+            return match
+
+        # English puts the head noun last: "african lion" -> "lion".
+        words = text.split(" ")
+        for start in range(1, len(words)):
+            match = self._rule_match(" ".join(words[start:]), "head_noun")
+            if match:
+                return match
+
+        return self._fuzzy_match(text)
+
+    def resolve(self, query: str) -> Optional[Match]:
+        """
+        Returns the best match for a query, or None if nothing is similar.
+
+        Fuzzy matches are returned even below MIN_CONFIDENCE so callers can
+        offer them as suggestions.
+        """
+        text = normalize(query)
+        with self._lock:
+            if text in self._cache:
+                self._cache.move_to_end(text)
+                return self._cache[text]
+
+        match = self._resolve(text)
+        with self._lock:
+            self._cache[text] = match
+            if len(self._cache) > self._cache_size:
+                self._cache.popitem(last=False)
+        return match